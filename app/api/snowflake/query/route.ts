@@ -1,15 +1,19 @@
 import { NextResponse } from 'next/server';
+import { queryViaWorker } from '@/lib/snowflakeQueryWorker';
 
 /**
  * Snowflake 쿼리 실행 API
- * 
+ *
  * 사용법:
  * POST /api/snowflake/query
- * Body: { "query": "SELECT * FROM table_name LIMIT 10" }
+ * Body: { "query": "SELECT * FROM table_name LIMIT 10", "noCache": false }
+ *
+ * 상주 Python 워커(scripts/snowflake_query.py --worker)를 재사용합니다.
+ * (연결 풀 + 결과 캐시, 요청마다 프로세스를 새로 띄우지 않음)
  */
 export async function POST(request: Request) {
   try {
-    const { query } = await request.json();
+    const { query, noCache } = await request.json();
 
     if (!query) {
       return NextResponse.json(
@@ -18,48 +22,17 @@ export async function POST(request: Request) {
       );
     }
 
-    // Python 스크립트 실행
-    const { spawn } = await import('child_process');
-    const path = await import('path');
-    
-    const scriptPath = path.join(process.cwd(), 'scripts', 'snowflake_query.py');
-    
-    return new Promise<NextResponse>((resolve, reject) => {
-      const python = spawn('python', [scriptPath, query]);
-      
-      let output = '';
-      let errorOutput = '';
+    const result = await queryViaWorker(query, { noCache: !!noCache });
 
-      python.stdout.on('data', (data: Buffer) => {
-        output += data.toString();
-      });
-
-      python.stderr.on('data', (data: Buffer) => {
-        errorOutput += data.toString();
-      });
+    if (!result.success) {
+      return NextResponse.json({
+        success: false,
+        error: '쿼리 실행 실패',
+        errorOutput: result.error
+      }, { status: 500 });
+    }
 
-      python.on('close', (code: number) => {
-        if (code === 0) {
-          try {
-            const result = JSON.parse(output);
-            resolve(NextResponse.json(result));
-          } catch (e) {
-            resolve(NextResponse.json({
-              success: false,
-              error: '결과 파싱 실패',
-              output,
-              errorOutput
-            }, { status: 500 }));
-          }
-        } else {
-          resolve(NextResponse.json({
-            success: false,
-            error: '쿼리 실행 실패',
-            errorOutput
-          }, { status: 500 }));
-        }
-      });
-    });
+    return NextResponse.json(result);
   } catch (error: any) {
     return NextResponse.json(
       { success: false, error: error.message },
@@ -67,4 +40,3 @@ export async function POST(request: Request) {
     );
   }
 }
-
@@ -161,6 +161,16 @@ if !STEP_ERR! neq 0 (
 )
 echo.
 
+REM [Step 9.5] Legacy data_YYYYMMDD.js bundle from section store (raw\_artifact_sections\DATE)
+call "%PYTHON_CMD%" scripts\artifact_store.py !DATE_STR! --assemble-js
+set STEP_ERR=!errorlevel!
+if !STEP_ERR! neq 0 (
+    echo [Step 9.5] Skipped (no sections)
+) else (
+    echo [Step 9.5] Completed
+)
+echo.
+
 call "%PYTHON_CMD%" scripts\generate_ai_insights.py --date !DATE_STR! --overview --all-brands
 set STEP_ERR=!errorlevel!
 if !STEP_ERR! neq 0 (
@@ -0,0 +1,136 @@
+/**
+ * Snowflake 쿼리 워커 클라이언트
+ *
+ * scripts/snowflake_query.py --worker 프로세스를 한 번만 띄우고
+ * stdin/stdout JSON-lines로 요청을 주고받습니다.
+ * (요청마다 Python 실행, .env 로드, Snowflake 로그인을 반복하지 않음)
+ *
+ * 워커가 종료되면 다음 요청에서 다시 띄웁니다.
+ */
+
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import path from 'path';
+
+export interface SnowflakeQueryResult {
+  success: boolean;
+  columns?: string[];
+  data?: Record<string, any>[];
+  rowCount?: number;
+  error?: string;
+}
+
+interface PendingRequest {
+  resolve: (result: SnowflakeQueryResult) => void;
+  reject: (error: Error) => void;
+  timer: NodeJS.Timeout;
+}
+
+const QUERY_TIMEOUT_MS = 120000; // 2분
+
+let worker: ChildProcessWithoutNullStreams | null = null;
+let ready: Promise<void> | null = null;
+let nextId = 1;
+const pending = new Map<string, PendingRequest>();
+
+function failAll(error: Error) {
+  for (const [id, request] of pending) {
+    clearTimeout(request.timer);
+    request.reject(error);
+    pending.delete(id);
+  }
+}
+
+function startWorker(): Promise<void> {
+  const scriptPath = path.join(process.cwd(), 'scripts', 'snowflake_query.py');
+  const child = spawn('python', [scriptPath, '--worker']);
+  worker = child;
+
+  let buffer = '';
+  let errorOutput = '';
+
+  return new Promise<void>((resolve, reject) => {
+    child.stdout.on('data', (data: Buffer) => {
+      buffer += data.toString();
+      let newline = buffer.indexOf('\n');
+      while (newline >= 0) {
+        const line = buffer.slice(0, newline).trim();
+        buffer = buffer.slice(newline + 1);
+        newline = buffer.indexOf('\n');
+        if (!line) continue;
+
+        let message: any;
+        try {
+          message = JSON.parse(line);
+        } catch (e) {
+          console.error('[Snowflake 워커] 응답 파싱 실패:', line.slice(0, 200));
+          continue;
+        }
+
+        if (message.ready) {
+          console.log('[Snowflake 워커] 준비 완료');
+          resolve();
+          continue;
+        }
+
+        const id = String(message.id);
+        const request = pending.get(id);
+        if (!request) continue;
+        pending.delete(id);
+        clearTimeout(request.timer);
+        delete message.id;
+        request.resolve(message as SnowflakeQueryResult);
+      }
+    });
+
+    child.stderr.on('data', (data: Buffer) => {
+      errorOutput = (errorOutput + data.toString()).slice(-4000);
+    });
+
+    child.on('error', (error) => {
+      reject(error);
+    });
+
+    child.on('close', (code: number) => {
+      console.error(`[Snowflake 워커] 종료 (code=${code})`);
+      if (worker === child) {
+        worker = null;
+        ready = null;
+      }
+      const error = new Error(`Snowflake 워커 종료 (code=${code}) ${errorOutput}`.trim());
+      reject(error);
+      failAll(error);
+    });
+  });
+}
+
+/**
+ * 상주 워커로 쿼리 실행
+ *
+ * @param query SQL 쿼리 문자열
+ * @param options.noCache true면 워커의 결과 캐시를 사용하지 않음
+ */
+export async function queryViaWorker(
+  query: string,
+  options: { noCache?: boolean } = {}
+): Promise<SnowflakeQueryResult> {
+  if (!worker || !ready) {
+    ready = startWorker();
+  }
+  await ready;
+
+  const child = worker;
+  if (!child) {
+    throw new Error('Snowflake 워커를 시작할 수 없습니다.');
+  }
+
+  const id = String(nextId++);
+  return new Promise<SnowflakeQueryResult>((resolve, reject) => {
+    const timer = setTimeout(() => {
+      pending.delete(id);
+      reject(new Error(`Snowflake 쿼리 타임아웃 (${QUERY_TIMEOUT_MS / 1000}초)`));
+    }, QUERY_TIMEOUT_MS);
+
+    pending.set(id, { resolve, reject, timer });
+    child.stdin.write(JSON.stringify({ id, query, noCache: !!options.noCache }) + '\n');
+  });
+}
@@ -15,6 +15,11 @@ from typing import Dict
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+scripts_dir = project_root / "scripts"
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from master_registry import direct_cost_categories
 
 # 경로 설정
 MASTER_DIR = project_root / "Master"
@@ -23,7 +28,7 @@ DIRECT_COST_MASTER_PATH = MASTER_DIR / "직접비마스터.csv"
 
 def load_direct_cost_master() -> Dict[str, str]:
     """
-    직접비 마스터 파일 로드: 계정명 -> 계정전환 매핑
+    직접비 마스터 파일 로드: 계정명 -> 계정전환 매핑 (master_registry 캐시 사용)
     
     Returns:
         Dict[str, str]: 계정명 -> 계정전환 매핑 딕셔너리
@@ -31,35 +36,7 @@ def load_direct_cost_master() -> Dict[str, str]:
     if not DIRECT_COST_MASTER_PATH.exists():
         raise FileNotFoundError(f"[ERROR] 직접비 마스터 파일이 없습니다: {DIRECT_COST_MASTER_PATH}")
     
-    df = pd.read_csv(DIRECT_COST_MASTER_PATH, encoding="utf-8-sig")
-    
-    # 컬럼 찾기
-    account_col = None  # 계정명 컬럼
-    conversion_col = None  # 계정전환 컬럼
-    
-    for col in df.columns:
-        col_str = str(col).strip()
-        if account_col is None and ("계정명" in col_str or "세부" in col_str):
-            account_col = col
-        if conversion_col is None and ("계정전환" in col_str or "대분류" in col_str):
-            conversion_col = col
-    
-    if account_col is None or conversion_col is None:
-        # 기본값: 두 번째와 세 번째 컬럼
-        if len(df.columns) >= 3:
-            account_col, conversion_col = df.columns[1], df.columns[2]
-        elif len(df.columns) >= 2:
-            account_col, conversion_col = df.columns[0], df.columns[1]
-        else:
-            raise ValueError(f"[ERROR] 직접비 마스터 컬럼을 찾을 수 없습니다. 현재 컬럼: {list(df.columns)}")
-    
-    mapping = {}
-    for _, row in df[[account_col, conversion_col]].dropna().iterrows():
-        account = str(row[account_col]).strip()
-        conversion = str(row[conversion_col]).strip()
-        if account and conversion:
-            mapping[account] = conversion
-    
+    mapping = direct_cost_categories(DIRECT_COST_MASTER_PATH)
     print(f"[OK] 직접비 마스터 로드: {len(mapping)}개 매핑")
     return mapping
 
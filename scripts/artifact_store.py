@@ -0,0 +1,279 @@
+"""
+대시보드 데이터 섹션 저장소 (data_<date>.js 대체)
+===============================================================
+
+data_YYYYMMDD.js 번들의 각 섹션(var brandKPI, var channelProfitLossData,
+window.D.xxx 등)을 섹션별 JSON 파일로 저장합니다.
+
+각 단계는 자기 섹션만 읽고 쓰므로, 번들 전체를 다시 읽거나 정규식으로
+치환할 필요가 없습니다. 기존 JS 번들이 필요하면 마지막에 assemble_js()로
+한 번에 생성합니다.
+
+저장 위치 (중간 산출물이므로 배포되는 public/ 밖에 둠):
+    raw/_artifact_sections/YYYYMMDD/<섹션명>.json
+    - var 섹션: brandKPI.json, channelPL.json ...
+    - window.D 섹션: D.by_brand.json ...
+    raw/_artifact_sections/YYYYMMDD/_manifest.json  (섹션 순서)
+
+사용법:
+    from artifact_store import ArtifactStore
+
+    store = ArtifactStore(date_str)
+    kpi = store.get('brandKPI', {})
+    store.put('brandKPI', kpi)
+
+    # 기존 JS 번들 생성 (선택)
+    python scripts/artifact_store.py 20251124 --assemble-js
+
+작성일: 2025-12
+"""
+
+import os
+import sys
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent
+PUBLIC_DIR = ROOT / "public"
+SECTIONS_DIR = ROOT / "raw" / "_artifact_sections"
+
+MANIFEST_NAME = "_manifest.json"
+
+# window.D 속성 섹션 접두사
+D_PREFIX = "D."
+
+# 번들에서 var 섹션 기본 순서 (create_treemap_data.save_data_js와 동일)
+DEFAULT_VAR_ORDER = [
+    'brandNames', 'channelItemSalesData', 'channelMetrics', 'channelItemMetrics',
+    'itemMetrics', 'itemChannelMetrics', 'brandKPI', 'channelPL', 'brandPLData',
+    'channelProfitLossData'
+]
+
+
+def _write_atomic(path: Path, text: str):
+    """임시 파일에 쓴 뒤 교체 (쓰기 중 중단되어도 기존 파일 유지)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class ArtifactStore:
+    """
+    날짜별 섹션 저장소
+
+    섹션 하나 = JSON 파일 하나. 읽은 섹션은 메모리에 캐시합니다.
+    """
+
+    def __init__(self, date_str: str, root_dir: str = None):
+        self.date_str = date_str
+        self.root_dir = Path(root_dir) if root_dir else SECTIONS_DIR / date_str
+        self._cache: Dict[str, Any] = {}
+        self._order: Optional[List[str]] = None
+
+    @classmethod
+    def for_js_bundle(cls, js_path: str) -> "ArtifactStore":
+        """
+        data_YYYYMMDD.js 경로에 대응하는 저장소
+
+        public/의 번들은 기본 저장소(raw/_artifact_sections/YYYYMMDD),
+        그 밖의 위치에 만드는 번들은 번들 옆 _sections/YYYYMMDD를 사용합니다.
+        """
+        match = re.search(r'data_(\d{8})\.js$', str(js_path))
+        if not match:
+            raise ValueError(f"[ERROR] 날짜를 알 수 없는 JS 번들 경로입니다: {js_path}")
+        bundle_dir = Path(js_path).resolve().parent
+        if bundle_dir == PUBLIC_DIR.resolve():
+            return cls(match.group(1))
+        return cls(match.group(1), root_dir=bundle_dir / "_sections" / match.group(1))
+
+    # ------------------------------------------------------------------
+    # 섹션 읽기/쓰기
+    # ------------------------------------------------------------------
+    def section_path(self, name: str) -> Path:
+        return self.root_dir / f"{name}.json"
+
+    def has(self, name: str) -> bool:
+        return name in self._cache or self.section_path(name).exists()
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """섹션 읽기 (없으면 default)"""
+        if name in self._cache:
+            return self._cache[name]
+        path = self.section_path(name)
+        if not path.exists():
+            return default
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self._cache[name] = data
+        return data
+
+    def put(self, name: str, data: Any):
+        """섹션 저장 (해당 섹션 파일만 다시 씀)"""
+        _write_atomic(self.section_path(name), json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+        self._cache[name] = data
+        order = self.names()
+        if name not in order:
+            order.append(name)
+            self._write_manifest(order)
+
+    def update(self, name: str, updater: Callable[[Any], Any], default: Any = None) -> Any:
+        """섹션을 읽어 updater로 변경 후 저장"""
+        data = updater(self.get(name, default))
+        self.put(name, data)
+        return data
+
+    def names(self) -> List[str]:
+        """저장된 섹션 이름 (저장 순서)"""
+        if self._order is None:
+            manifest_path = self.root_dir / MANIFEST_NAME
+            if manifest_path.exists():
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    self._order = json.load(f).get("sections", [])
+            else:
+                self._order = []
+            # 매니페스트에 없는 섹션 파일도 포함
+            if self.root_dir.exists():
+                for path in sorted(self.root_dir.glob("*.json")):
+                    if path.name != MANIFEST_NAME and path.stem not in self._order:
+                        self._order.append(path.stem)
+        return self._order
+
+    def _write_manifest(self, order: List[str]):
+        self._order = order
+        _write_atomic(
+            self.root_dir / MANIFEST_NAME,
+            json.dumps({"date": self.date_str, "sections": order}, ensure_ascii=False, indent=2)
+        )
+
+    # ------------------------------------------------------------------
+    # 기존 JS 번들과의 호환
+    # ------------------------------------------------------------------
+    def import_js_bundle(self, js_path: str, overwrite: bool = False) -> List[str]:
+        """
+        기존 data_YYYYMMDD.js 번들의 섹션을 저장소로 가져오기 (최초 1회 마이그레이션용)
+
+        Args:
+            js_path: JS 번들 경로
+            overwrite: 이미 저장된 섹션도 덮어쓸지 여부
+
+        Returns:
+            List[str]: 가져온 섹션 이름
+        """
+        from export_to_json import read_js_literals, parse_json_safe
+
+        js_path = Path(js_path)
+        if not js_path.exists():
+            return []
+
+        # 한 번의 순회로 모든 var / window.D 리터럴 추출
+        blocks = read_js_literals(js_path)
+
+        imported = []
+        for name, json_str in blocks.items():
+            if not overwrite and self.has(name):
+                continue
+            data = parse_json_safe(json_str, name)
+            if data is not None:
+                self.put(name, data)
+                imported.append(name)
+
+        if imported:
+            print(f"[저장소] {js_path.name}에서 섹션 가져옴: {', '.join(imported)}")
+        return imported
+
+    def get_or_import(self, name: str, js_path: str, default: Any = None) -> Any:
+        """섹션이 없으면 기존 JS 번들에서 가져온 뒤 반환"""
+        if not self.has(name) and js_path and os.path.exists(js_path):
+            self.import_js_bundle(js_path)
+        return self.get(name, default)
+
+    def assemble_js(self, output_path: str = None) -> Path:
+        """
+        저장된 섹션으로 기존 형식의 data_YYYYMMDD.js 번들을 한 번에 생성
+
+        Args:
+            output_path: 출력 경로 (기본: public/data_YYYYMMDD.js)
+
+        Returns:
+            Path: 생성된 파일 경로
+        """
+        output_path = Path(output_path) if output_path else PUBLIC_DIR / f"data_{self.date_str}.js"
+
+        names = self.names()
+        var_names = [name for name in DEFAULT_VAR_ORDER if name in names]
+        var_names += [name for name in names if not name.startswith(D_PREFIX) and name not in var_names]
+        d_names = [name for name in names if name.startswith(D_PREFIX)]
+
+        parts = [
+            "// 모든 대시보드 데이터 (window 전역 할당 전용)\n",
+            f"// 자동 생성 일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+            "(function(){\n"
+        ]
+        for name in var_names:
+            parts.append(f"  var {name} = {json.dumps(self.get(name), ensure_ascii=False, indent=2)};\n")
+
+        parts.append("  if (typeof window !== 'undefined') {\n")
+        for name in var_names:
+            parts.append(f"    window.{name} = {name};\n")
+        parts.append("    if (typeof window.DASHBOARD_DATA === 'undefined') {\n")
+        parts.append("      window.DASHBOARD_DATA = {};\n")
+        parts.append("    }\n")
+        parts.append("    if (typeof window.D === 'undefined') {\n")
+        parts.append("      window.D = window.DASHBOARD_DATA || {};\n")
+        parts.append("    }\n")
+        if 'brandPLData' in var_names:
+            parts.append("    window.DASHBOARD_DATA.brandPLData = brandPLData;\n")
+            parts.append("    window.D.brandPLData = brandPLData;\n")
+        for name in d_names:
+            prop = name[len(D_PREFIX):]
+            parts.append(f"    window.D.{prop} = {json.dumps(self.get(name), ensure_ascii=False, indent=2)};\n")
+        parts.append("  }\n")
+        parts.append("  console.log('[Data.js] 모든 대시보드 데이터 로드 완료');\n")
+        parts.append("})();\n")
+
+        _write_atomic(output_path, "".join(parts))
+        print(f"[OK] JS 번들 생성: {output_path} ({len(var_names) + len(d_names)}개 섹션)")
+        return output_path
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="대시보드 데이터 섹션 저장소 관리")
+    parser.add_argument("date", help="YYYYMMDD 형식의 날짜 (예: 20251124)")
+    parser.add_argument("--import-js", action="store_true", help="기존 data_YYYYMMDD.js에서 섹션 가져오기")
+    parser.add_argument("--assemble-js", action="store_true", help="섹션으로 data_YYYYMMDD.js 번들 생성")
+    parser.add_argument("--output", help="번들 출력 경로 (선택사항)")
+
+    args = parser.parse_args()
+
+    if len(args.date) != 8 or not args.date.isdigit():
+        print("[ERROR] 날짜 형식이 올바르지 않습니다. YYYYMMDD 형식이어야 합니다.")
+        sys.exit(1)
+
+    store = ArtifactStore(args.date)
+
+    if args.import_js:
+        store.import_js_bundle(str(PUBLIC_DIR / f"data_{args.date}.js"), overwrite=True)
+
+    if args.assemble_js:
+        if not store.names():
+            print(f"[WARNING] 저장된 섹션이 없습니다: {store.root_dir}")
+            sys.exit(1)
+        store.assemble_js(args.output)
+
+    if not args.import_js and not args.assemble_js:
+        print(f"[저장소] {store.root_dir}")
+        for name in store.names():
+            size_kb = store.section_path(name).stat().st_size / 1024 if store.section_path(name).exists() else 0
+            print(f"  - {name} ({size_kb:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,11 @@ import pandas as pd
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+scripts_dir = Path(__file__).parent
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from progress_rate_calendar import ProgressRateCalendar, build_daily_coefficients
 
 def parse_analysis_month(analysis_month: str) -> tuple:
     """
@@ -164,37 +169,10 @@ def calculate_weighted_progress_rate(year: int, month: int, holiday_df: pd.DataF
     _, days_in_month = monthrange(year, month)
     print(f"   월 일수: {days_in_month}일")
     
-    # 결과 저장용 리스트
-    results = []
-    
-    # 각 날짜별 계수 계산
-    for day in range(1, days_in_month + 1):
-        date = datetime(year, month, day)
-        weekday = date.strftime('%a')
-        
-        # 계수 가져오기
-        coefficient, coef_type = get_daily_coefficient(date, holiday_df, weekday_dict)
-        
-        results.append({
-            '월': month,
-            '일': day,
-            '요일': weekday,
-            '계수구분': coef_type,
-            '계수': coefficient
-        })
-    
-    # DataFrame 생성
-    df = pd.DataFrame(results)
-    
-    # 월말계수 계산 (전체 일자 계수의 합)
-    total_coefficient = df['계수'].sum()
-    df['월말계수'] = total_coefficient
-    
-    # 진척계수 계산 (누적 합)
-    df['진척계수'] = df['계수'].cumsum()
-    
-    # 진척율 계산 (진척계수 / 월말계수)
-    df['진척율'] = df['진척계수'] / df['월말계수']
+    # 해당 연도 일자별 계수를 한 번에 계산 (명절계수 우선, 없으면 요일계수)
+    daily = build_daily_coefficients(year, year, holiday_df, weekday_dict)
+    df = ProgressRateCalendar(daily).month_frame(year, month)
+    total_coefficient = df['월말계수'].iloc[0]
     
     print(f"✅ 진척율 계산 완료")
     print(f"   월말계수 합계: {total_coefficient:.6f}")
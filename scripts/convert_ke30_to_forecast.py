@@ -40,6 +40,8 @@ if str(scripts_dir) not in sys.path:
     sys.path.insert(0, str(scripts_dir))
 
 import extract_direct_cost_rates as extract_direct
+from csv_sink import CsvSink
+from progress_rate_calendar import get_progress_rate_calendar
 
 # 진척율 계산 필드
 PROGRESS_RATE_FIELDS = [
@@ -69,9 +71,26 @@ FIXED_COST_ITEMS = [
 ]
 
 
+def resolve_progress_day(analysis_month: str, update_date: datetime) -> int:
+    """
+    진척율 기준 일자 결정
+    
+    - 같은 달: 업데이트일자 전날까지의 진척율 (예: 1월 12일 업데이트 → 1월 11일)
+    - 다른 달 (주로 다음 달): 분석월 말일의 진척율 (예: 2월에 1월 업데이트 → 1월 31일, = 100%)
+    """
+    year = int(analysis_month[:4])
+    month = int(analysis_month[4:6])
+    
+    if update_date.year == year and update_date.month == month:
+        return (update_date - timedelta(days=1)).day
+    
+    _, last_day = monthrange(year, month)
+    return last_day
+
+
 def load_weighted_progress_rate(analysis_month: str, update_date: datetime) -> float:
     """
-    가중치 진척율 파일에서 진척율 읽기
+    가중치 진척율 읽기
     
     사용 케이스:
     - 월 중간 업데이트 (예: 1월 12일에 1~11일 매출로 1월 말 예측)
@@ -79,6 +98,9 @@ def load_weighted_progress_rate(analysis_month: str, update_date: datetime) -> f
     - 월 완료 후 업데이트 (예: 2월 2일에 1월 전체 매출 처리)
       → 1월 31일 진척율 사용 (= 100%, 분석월 말일)
     
+    Master 명절계수/요일계수로 만든 진척율 달력(progress_rate_calendar)에서 바로 조회하고,
+    마스터 파일이 없을 때만 raw/<분석월>/progress_rate의 진척율 CSV를 읽습니다.
+    
     Args:
         analysis_month: 분석월 (YYYYMM)
         update_date: 업데이트일자 (datetime 객체)
@@ -87,52 +109,44 @@ def load_weighted_progress_rate(analysis_month: str, update_date: datetime) -> f
         float: 진척율 (0~1 사이 값)
     
     Raises:
-        FileNotFoundError: 진척율 파일이 없는 경우
+        FileNotFoundError: 마스터 파일과 진척율 파일이 모두 없는 경우
         ValueError: 진척율이 비정상적인 경우
     """
-    file_path = project_root / "raw" / analysis_month / "progress_rate" / f"weighted_progress_rate_{analysis_month}.csv"
-    
-    # 진척율 파일 존재 확인
-    if not file_path.exists():
-        raise FileNotFoundError(
-            "진척율 정보가 없습니다. "
-            "전년 계획 업데이트 배치파일을 실행하여 진척율을 업데이트하세요.\n"
-            f"필요 파일: {file_path}"
-        )
-    
-    df = pd.read_csv(file_path, encoding='utf-8-sig')
-    
-    # 분석월 추출
     year = int(analysis_month[:4])
     month = int(analysis_month[4:6])
+    target_day = resolve_progress_day(analysis_month, update_date)
     
-    # 업데이트일자의 월과 분석월 비교
-    update_year = update_date.year
-    update_month = update_date.month
-    
-    if update_year == year and update_month == month:
-        # 같은 달: 업데이트일자 전날까지의 진척율 사용
-        # 예: 1월 12일 업데이트 → 1월 11일 진척율
-        target_day = (update_date - timedelta(days=1)).day
-    else:
-        # 다른 달 (주로 다음 달): 분석월 말일의 진척율 사용
-        # 예: 2월에 1월 업데이트 → 1월 31일 진척율 (= 100%)
-        _, last_day = monthrange(year, month)
-        target_day = last_day
-    
-    # 해당 일자의 진척율 추출
-    row = df[df['일'] == target_day]
-    if row.empty:
-        raise ValueError(f"진척율 파일에 {target_day}일 데이터가 없습니다")
-    
-    progress_rate = row['진척율'].values[0]
+    try:
+        calendar = get_progress_rate_calendar(year)
+        progress_rate = calendar.progress_rate(year, month, target_day)
+        source = "진척율 달력 (Master/명절계수.csv, Master/요일계수.csv)"
+    except FileNotFoundError:
+        file_path = project_root / "raw" / analysis_month / "progress_rate" / f"weighted_progress_rate_{analysis_month}.csv"
+        
+        # 진척율 파일 존재 확인
+        if not file_path.exists():
+            raise FileNotFoundError(
+                "진척율 정보가 없습니다. "
+                "전년 계획 업데이트 배치파일을 실행하여 진척율을 업데이트하세요.\n"
+                f"필요 파일: {file_path}"
+            )
+        
+        df = pd.read_csv(file_path, encoding='utf-8-sig')
+        
+        # 해당 일자의 진척율 추출
+        row = df[df['일'] == target_day]
+        if row.empty:
+            raise ValueError(f"진척율 파일에 {target_day}일 데이터가 없습니다")
+        
+        progress_rate = row['진척율'].values[0]
+        source = f"파일: {file_path}"
     
     # 진척율 유효성 검증
     if progress_rate <= 0 or progress_rate > 1:
         raise ValueError(
             f"비정상적인 진척율입니다: {progress_rate:.4f}\n"
             f"(0 < 진척율 <= 1 범위여야 함)\n"
-            f"파일: {file_path}\n"
+            f"{source}\n"
             f"대상 일자: {target_day}일"
         )
     
@@ -157,6 +171,77 @@ def calculate_forecast_value(current_value: float, progress_rate: float) -> floa
     return round(forecast_value, 0)
 
 
+def find_progress_rate_columns(columns) -> list:
+    """
+    진척율 계산 필드별 실제 컬럼명 찾기
+    
+    Returns:
+        list: [(필드명, 컬럼명 또는 None), ...] (PROGRESS_RATE_FIELDS 순서)
+    """
+    found = []
+    for field in PROGRESS_RATE_FIELDS:
+        # 유사한 컬럼명 찾기 (대소문자 무시)
+        matching_cols = []
+        field_lower = field.lower()
+        for col in columns:
+            col_str = str(col)
+            # 정확한 매칭 우선, 그 다음 부분 매칭
+            if col_str == field:
+                matching_cols = [col]
+                break
+            elif field_lower in col_str.lower() or col_str.lower() in field_lower:
+                # 부분 매칭이지만, 더 긴 필드명이 짧은 필드명에 포함되는 경우 제외
+                # 예: '합계 : 실판매액'이 '합계 : 실판매액(V-)'에 포함되는 경우는 제외
+                if field != '합계 : 실판매액' or '합계 : 실판매액(V-)' not in col_str:
+                    matching_cols.append(col)
+        found.append((field, matching_cols[0] if matching_cols else None))
+    return found
+
+
+def find_forecast_sales_column(columns):
+    """예상 실판매액 컬럼 (V- 포함 우선, 없으면 일반 실판매액, 없으면 None)"""
+    for col in columns:
+        if '실판매액' in str(col) and ('v-' in str(col).lower() or 'V-' in str(col)):
+            return col
+    for col in columns:
+        if '실판매액' in str(col):
+            return col
+    return None
+
+
+def find_shipping_column(columns):
+    """로열티 기준용 출고매출액(V-) 컬럼 (없으면 None)"""
+    for col in columns:
+        if '출고매출액' in str(col) and ('v-' in str(col).lower() or 'V-' in str(col)):
+            return col
+    return None
+
+
+def load_forecast_cost_rates(plan_dir: str) -> tuple:
+    """
+    직접비 재계산용 비율 로드
+    
+    Returns:
+        tuple: (직접비율 {(브랜드, 유통채널, 직접비항목): 비율(소수)}, 로열티율 마스터)
+    """
+    # 채널 마스터 로드
+    channel_master = extract_direct.load_channel_master()
+    
+    # 직접비율 및 계획 금액 추출 (계획 파일당 한 번만 파싱, 변환 파일 간 재사용)
+    rates_df, _ = extract_direct.load_direct_cost_tables(plan_dir, channel_master)
+    
+    # 로열티율 마스터 로드
+    royalty_master = extract_direct.load_royalty_rate_master()
+    
+    # 직접비율 데이터를 브랜드/유통채널별로 딕셔너리로 변환 (퍼센트를 소수로 변환)
+    rates_dict = {
+        (brand, channel, item): rate / 100
+        for brand, channel, item, rate in zip(rates_df['브랜드'], rates_df['유통채널'], rates_df['직접비항목'], rates_df['비율'])
+    }
+    
+    return rates_dict, royalty_master
+
+
 def calculate_direct_costs_for_forecast(
     df: pd.DataFrame, 
     plan_dir: str, 
@@ -177,37 +262,11 @@ def calculate_direct_costs_for_forecast(
     """
     print("\n[직접비 계산] 예상 매출액에 대해 직접비 계산 로직 적용 중...")
     
-    # 채널 마스터 로드
-    channel_master = extract_direct.load_channel_master()
-    
-    # 계획 금액 추출 (지급임차료_매장(고정), 감가상각비_임차시설물 등)
-    plan_amounts_df = extract_direct.extract_plan_amounts(plan_dir, channel_master)
-    
-    # 직접비율 추출
-    rates_df = extract_direct.extract_direct_cost_rates(plan_dir, channel_master)
-    
-    # 로열티율 마스터 로드
-    royalty_master = extract_direct.load_royalty_rate_master()
-    
-    # 직접비율 데이터를 브랜드/유통채널별로 딕셔너리로 변환
-    rates_dict = {}
-    for _, row in rates_df.iterrows():
-        key = (row['브랜드'], row['유통채널'], row['직접비항목'])
-        rates_dict[key] = row['비율'] / 100  # 퍼센트를 소수로 변환
-    
-    # 계획 파일 금액을 브랜드/유통채널별로 딕셔너리로 변환
-    plan_amounts_dict = {}
-    if not plan_amounts_df.empty:
-        for _, row in plan_amounts_df.iterrows():
-            key = (row['브랜드'], row['유통채널'], row['직접비항목'])
-            plan_amounts_dict[key] = row['금액']
+    # 직접비율 및 로열티율 로드
+    rates_dict, royalty_master = load_forecast_cost_rates(plan_dir)
     
     # 출고매출액(V-) 컬럼 찾기
-    shipping_col = None
-    for col in df.columns:
-        if '출고매출액' in str(col) and ('v-' in str(col).lower() or 'V-' in str(col)):
-            shipping_col = col
-            break
+    shipping_col = find_shipping_column(df.columns)
     
     # 직접비 마스터에서 항목 로드 (고정비 제외)
     DIRECT_COST_ITEMS = extract_direct.DIRECT_COST_ITEMS
@@ -302,7 +361,8 @@ def convert_ke30_to_forecast(
     output_file_path: Path,
     progress_rate: float,
     plan_dir: str,
-    analysis_month: str
+    analysis_month: str,
+    sink: CsvSink = None
 ) -> pd.DataFrame:
     """
     KE30 파일을 월말 예상 데이터로 변환
@@ -314,16 +374,55 @@ def convert_ke30_to_forecast(
         progress_rate: 가중치 진척율 (0~1 사이 값)
         plan_dir: 계획 파일 디렉토리
         analysis_month: 분석월 (YYYYMM 형식)
+        sink: 중간 결과 저장소 (이번 실행에서 만든 입력은 CSV 재파싱 없이 사용, 출력 저장도 위임)
     
     Returns:
         pd.DataFrame: 변환된 데이터프레임
     """
     print(f"\n[변환 시작] {input_file_path.name} -> {output_file_path.name}")
     
-    # CSV 파일 읽기
-    df = pd.read_csv(input_file_path, encoding='utf-8-sig')
+    if sink is None:
+        sink = CsvSink()
+    
+    # 입력 읽기 (같은 실행에서 만든 데이터프레임이면 메모리에서)
+    df = sink.read(input_file_path)
     print(f"  원본 데이터: {len(df)}행 × {len(df.columns)}열")
     
+    # Shop_item 파일인지 확인 (직접비 계산 제외)
+    is_shop_item = 'Shop_item' in str(input_file_path) or 'shop_item' in str(input_file_path).lower()
+    
+    df_forecast = build_forecast_frame(df, progress_rate, plan_dir, analysis_month, is_shop_item)
+    
+    # CSV 저장
+    sink.write(df_forecast, output_file_path)
+    print(f"\n[OK] 변환 완료: {output_file_path}")
+    print(f"   데이터: {len(df_forecast)}행 × {len(df_forecast.columns)}열")
+    
+    return df_forecast
+
+
+def build_forecast_frame(
+    df: pd.DataFrame,
+    progress_rate: float,
+    plan_dir: str,
+    analysis_month: str,
+    is_shop_item: bool
+) -> pd.DataFrame:
+    """
+    KE30 데이터프레임을 월말 예상 데이터프레임으로 변환 (입력은 변경하지 않음)
+    
+    Args:
+        df: KE30 Shop 또는 Shop_item 데이터프레임
+        progress_rate: 가중치 진척율 (0~1 사이 값)
+        plan_dir: 계획 파일 디렉토리
+        analysis_month: 분석월 (YYYYMM 형식)
+        is_shop_item: Shop_item 데이터 여부 (직접비 계산 제외)
+    
+    Returns:
+        pd.DataFrame: 변환된 데이터프레임
+    """
+    df = df.reset_index(drop=True)
+    
     # 브랜드와 유통채널 컬럼 확인
     if '브랜드' not in df.columns:
         raise ValueError("'브랜드' 컬럼이 없습니다.")
@@ -335,27 +434,11 @@ def convert_ke30_to_forecast(
     
     # 1) 진척율 계산 필드 처리
     print("\n[1단계] 진척율 계산 필드 처리 중...")
-    for field in PROGRESS_RATE_FIELDS:
-        # 유사한 컬럼명 찾기 (대소문자 무시)
-        matching_cols = []
-        field_lower = field.lower()
-        for col in df.columns:
-            col_str = str(col)
-            # 정확한 매칭 우선, 그 다음 부분 매칭
-            if col_str == field:
-                matching_cols = [col]
-                break
-            elif field_lower in col_str.lower() or col_str.lower() in field_lower:
-                # 부분 매칭이지만, 더 긴 필드명이 짧은 필드명에 포함되는 경우 제외
-                # 예: '합계 : 실판매액'이 '합계 : 실판매액(V-)'에 포함되는 경우는 제외
-                if field != '합계 : 실판매액' or '합계 : 실판매액(V-)' not in col_str:
-                    matching_cols.append(col)
-        
-        if not matching_cols:
+    for field, col_name in find_progress_rate_columns(df.columns):
+        if col_name is None:
             print(f"  [WARNING] '{field}' 컬럼을 찾을 수 없습니다.")
             continue
         
-        col_name = matching_cols[0]
         print(f"  처리 중: {col_name}")
         
         # 각 행에 대해 진척율 적용하여 계산
@@ -374,27 +457,13 @@ def convert_ke30_to_forecast(
     # 2) 동일한 필드값 유지 (이미 복사했으므로 그대로 사용)
     print("\n[2단계] 동일한 필드값 유지 (변경 없음)")
     
-    # Shop_item 파일인지 확인 (직접비 계산 제외)
-    is_shop_item = 'Shop_item' in str(input_file_path) or 'shop_item' in str(input_file_path).lower()
-    
     # 3) 직접비 계산 필드 처리 (Shop 파일에만 적용)
     if is_shop_item:
         print("\n[3단계] 직접비 계산 필드 처리 건너뜀 (Shop_item 파일은 직접비 계산 제외)")
     else:
         print("\n[3단계] 직접비 계산 필드 처리 중...")
         # 예상 실판매액 컬럼 찾기 (V- 포함 우선, 없으면 일반 실판매액)
-        forecast_sales_col = None
-        for col in df_forecast.columns:
-            if '실판매액' in str(col) and ('v-' in str(col).lower() or 'V-' in str(col)):
-                forecast_sales_col = col
-                break
-        
-        # V-가 포함된 컬럼이 없으면 일반 실판매액 컬럼 사용
-        if not forecast_sales_col:
-            for col in df_forecast.columns:
-                if '실판매액' in str(col):
-                    forecast_sales_col = col
-                    break
+        forecast_sales_col = find_forecast_sales_column(df_forecast.columns)
         
         if forecast_sales_col:
             print(f"  예상 실판매액 컬럼: {forecast_sales_col}")
@@ -454,15 +523,87 @@ def convert_ke30_to_forecast(
             print("  [WARNING] 직접이익 계산에 필요한 컬럼을 찾을 수 없습니다.")
             df_forecast['직접이익'] = 0
     
-    # CSV 저장
-    output_file_path.parent.mkdir(parents=True, exist_ok=True)
-    df_forecast.to_csv(output_file_path, index=False, encoding='utf-8-sig')
-    print(f"\n[OK] 변환 완료: {output_file_path}")
-    print(f"   데이터: {len(df_forecast)}행 × {len(df_forecast.columns)}열")
-    
     return df_forecast
 
 
+def convert_update_date(update_date_str: str, sink: CsvSink = None):
+    """
+    업데이트일자의 KE30 Shop/Shop_item을 forecast 파일로 변환
+    
+    Args:
+        update_date_str: 업데이트일자 (YYYYMMDD 형식)
+        sink: 중간 결과 저장소 (당년 파이프라인에서 넘기면 KE30 결과를 CSV 재파싱 없이 사용)
+    """
+    if sink is None:
+        sink = CsvSink()
+    
+    # 업데이트일자 파싱
+    update_date = datetime(int(update_date_str[:4]), int(update_date_str[4:6]), int(update_date_str[6:8]))
+    
+    print(f"[INFO] 업데이트일자: {update_date.strftime('%Y-%m-%d')}")
+    print(f"[INFO] 실제 매출 기간 종료일: {(update_date - timedelta(days=1)).strftime('%Y-%m-%d')}")
+    
+    # 분석월 계산 (업데이트일자의 월)
+    analysis_year = update_date.year
+    analysis_month_num = update_date.month
+    analysis_month = f"{analysis_year}{analysis_month_num:02d}"
+    print(f"[INFO] 분석월: {analysis_month}")
+    
+    # 월 총 일수 계산
+    _, total_days = monthrange(analysis_year, analysis_month_num)
+    print(f"[INFO] 월 총 일수: {total_days}일")
+    print()
+    
+    # 가중치 진척율 파일 읽기
+    print("[가중치 진척율 파일 읽기] 시작...")
+    progress_rate = load_weighted_progress_rate(analysis_month, update_date)
+    print(f"[OK] 진척율 로드 완료: {progress_rate * 100:.4f}%")
+    print(f"   전 브랜드 동일한 진척율 사용")
+    print()
+    
+    # 계획 파일 디렉토리
+    plan_dir = project_root / "raw" / analysis_month / "plan"
+    
+    # 입력/출력 파일 경로
+    date_output_dir = project_root / "raw" / analysis_month / "current_year" / update_date_str
+    
+    # Shop 파일 변환
+    shop_input_path = date_output_dir / f"ke30_{update_date_str}_{analysis_month}_Shop.csv"
+    shop_output_path = date_output_dir / f"forecast_{update_date_str}_{analysis_month}_Shop.csv"
+    
+    if sink.exists(shop_input_path):
+        print("=" * 60)
+        convert_ke30_to_forecast(
+            update_date_str,
+            shop_input_path,
+            shop_output_path,
+            progress_rate,
+            str(plan_dir),
+            analysis_month,
+            sink
+        )
+    else:
+        print(f"[WARNING] Shop 파일을 찾을 수 없습니다: {shop_input_path}")
+    
+    # Shop_item 파일 변환
+    shop_item_input_path = date_output_dir / f"ke30_{update_date_str}_{analysis_month}_Shop_item.csv"
+    shop_item_output_path = date_output_dir / f"forecast_{update_date_str}_{analysis_month}_Shop_item.csv"
+    
+    if sink.exists(shop_item_input_path):
+        print("\n" + "=" * 60)
+        convert_ke30_to_forecast(
+            update_date_str,
+            shop_item_input_path,
+            shop_item_output_path,
+            progress_rate,
+            str(plan_dir),
+            analysis_month,
+            sink
+        )
+    else:
+        print(f"[WARNING] Shop_item 파일을 찾을 수 없습니다: {shop_item_input_path}")
+
+
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(
@@ -502,69 +643,7 @@ def main():
     print()
     
     try:
-        # 업데이트일자 파싱
-        update_date = datetime(int(update_date_str[:4]), int(update_date_str[4:6]), int(update_date_str[6:8]))
-        
-        print(f"[INFO] 업데이트일자: {update_date.strftime('%Y-%m-%d')}")
-        print(f"[INFO] 실제 매출 기간 종료일: {(update_date - timedelta(days=1)).strftime('%Y-%m-%d')}")
-        
-        # 분석월 계산 (업데이트일자의 월)
-        analysis_year = update_date.year
-        analysis_month_num = update_date.month
-        analysis_month = f"{analysis_year}{analysis_month_num:02d}"
-        print(f"[INFO] 분석월: {analysis_month}")
-        
-        # 월 총 일수 계산
-        _, total_days = monthrange(analysis_year, analysis_month_num)
-        print(f"[INFO] 월 총 일수: {total_days}일")
-        print()
-        
-        # 가중치 진척율 파일 읽기
-        print("[가중치 진척율 파일 읽기] 시작...")
-        progress_rate = load_weighted_progress_rate(analysis_month, update_date)
-        print(f"[OK] 진척율 로드 완료: {progress_rate * 100:.4f}%")
-        print(f"   전 브랜드 동일한 진척율 사용")
-        print()
-        
-        # 계획 파일 디렉토리
-        plan_dir = project_root / "raw" / analysis_month / "plan"
-        
-        # 입력/출력 파일 경로
-        date_output_dir = project_root / "raw" / analysis_month / "current_year" / update_date_str
-        
-        # Shop 파일 변환
-        shop_input_path = date_output_dir / f"ke30_{update_date_str}_{analysis_month}_Shop.csv"
-        shop_output_path = date_output_dir / f"forecast_{update_date_str}_{analysis_month}_Shop.csv"
-        
-        if shop_input_path.exists():
-            print("=" * 60)
-            convert_ke30_to_forecast(
-                update_date_str,
-                shop_input_path,
-                shop_output_path,
-                progress_rate,
-                str(plan_dir),
-                analysis_month
-            )
-        else:
-            print(f"[WARNING] Shop 파일을 찾을 수 없습니다: {shop_input_path}")
-        
-        # Shop_item 파일 변환
-        shop_item_input_path = date_output_dir / f"ke30_{update_date_str}_{analysis_month}_Shop_item.csv"
-        shop_item_output_path = date_output_dir / f"forecast_{update_date_str}_{analysis_month}_Shop_item.csv"
-        
-        if shop_item_input_path.exists():
-            print("\n" + "=" * 60)
-            convert_ke30_to_forecast(
-                update_date_str,
-                shop_item_input_path,
-                shop_item_output_path,
-                progress_rate,
-                str(plan_dir),
-                analysis_month
-            )
-        else:
-            print(f"[WARNING] Shop_item 파일을 찾을 수 없습니다: {shop_item_input_path}")
+        convert_update_date(update_date_str)
         
         print()
         print("=" * 60)
@@ -21,6 +21,9 @@ import json
 import pandas as pd
 from typing import Dict, Optional
 from pathlib import Path
+from numeric_utils import numeric_frame
+from master_registry import direct_cost_categories
+from plan_table import load_plan_table
 from path_utils import get_current_year_dir, get_current_year_file_path, get_plan_file_path, get_previous_year_file_path, extract_year_month_from_date
 
 ROOT = os.path.dirname(os.path.dirname(__file__))
@@ -39,9 +42,16 @@ BRAND_NAME_MAP = {
     'W': 'SUPRA'
 }
 
+# 직접비 세부 항목 (직접비마스터 계정전환 기준)
+DIRECT_COST_CATEGORIES = ['인건비', '임차관리비', '물류운송비', '로열티', '감가상각비', '기타']
+
+# YOY/Achievement 계산 항목 (할인율 제외)
+RATIO_METRICS = ['tagRevenue', 'revenue', 'cog', 'grossProfit', 'directCost', 'directProfit', 'operatingExpense', 'opProfit']
+
+
 def load_direct_cost_master() -> Dict[str, str]:
     """
-    직접비 마스터 파일 로드: 계정명 -> 계정전환 매핑
+    직접비 마스터 파일 로드: 계정명 -> 계정전환 매핑 (master_registry 캐시 사용)
     
     Returns:
         Dict[str, str]: 계정명 -> 계정전환 매핑 딕셔너리
@@ -50,181 +60,352 @@ def load_direct_cost_master() -> Dict[str, str]:
         print(f"[WARNING] 직접비 마스터 파일이 없습니다: {DIRECT_COST_MASTER_PATH}")
         return {}
     
-    df = pd.read_csv(DIRECT_COST_MASTER_PATH, encoding="utf-8-sig")
-    
-    # 컬럼 찾기
-    account_col = None  # 계정명 컬럼
-    conversion_col = None  # 계정전환 컬럼
-    
-    for col in df.columns:
-        col_str = str(col).strip()
-        if account_col is None and ("계정명" in col_str or "세부" in col_str):
-            account_col = col
-        if conversion_col is None and ("계정전환" in col_str or "대분류" in col_str):
-            conversion_col = col
-    
-    if account_col is None or conversion_col is None:
-        # 기본값: 두 번째와 세 번째 컬럼
-        if len(df.columns) >= 3:
-            account_col, conversion_col = df.columns[1], df.columns[2]
-        elif len(df.columns) >= 2:
-            account_col, conversion_col = df.columns[0], df.columns[1]
-        else:
-            print(f"[WARNING] 직접비 마스터 컬럼을 찾을 수 없습니다. 현재 컬럼: {list(df.columns)}")
-            return {}
-    
-    mapping = {}
-    for _, row in df[[account_col, conversion_col]].dropna().iterrows():
-        account = str(row[account_col]).strip()
-        conversion = str(row[conversion_col]).strip()
-        if account and conversion:
-            mapping[account] = conversion
+    try:
+        mapping = direct_cost_categories(DIRECT_COST_MASTER_PATH)
+    except ValueError as e:
+        print(f"[WARNING] {e}")
+        return {}
     
     print(f"[OK] 직접비 마스터 로드: {len(mapping)}개 매핑")
     return mapping
 
 
+def build_direct_cost_matrix(columns, direct_cost_master: Dict[str, str]) -> pd.DataFrame:
+    """
+    데이터 컬럼 × 직접비 세부 항목 0/1 행렬 (컬럼 목록당 한 번만 계산)
+    
+    정확히 일치하는 계정명을 먼저 찾고, 없으면 계정명이 컬럼명에 포함된 첫 항목으로 매칭합니다.
+    (예: "지급임차료_매장(고정) 등" -> "지급임차료_매장(고정)")
+    
+    Returns:
+        pd.DataFrame: 인덱스 = 매칭된 데이터 컬럼, 컬럼 = DIRECT_COST_CATEGORIES
+    """
+    matched = {}
+    for col in columns:
+        if col in direct_cost_master:
+            category = direct_cost_master[col]
+        else:
+            category = next((category for master_col, category in direct_cost_master.items() if master_col in str(col)), None)
+        if category in DIRECT_COST_CATEGORIES:
+            matched[col] = category
+    
+    matrix = pd.DataFrame(0.0, index=pd.Index(list(matched), dtype=object), columns=DIRECT_COST_CATEGORIES)
+    for col, category in matched.items():
+        matrix.loc[col, category] = 1.0
+    return matrix
+
+
 def aggregate_direct_cost_details(df: pd.DataFrame, brand_code: str, direct_cost_master: Dict[str, str]) -> Dict[str, float]:
     """
     직접비 세부 항목을 마스터 기준으로 집계
     
     Args:
-        df: 데이터프레임
+        df: 데이터프레임 (브랜드 필터링된 데이터)
         brand_code: 브랜드 코드
         direct_cost_master: 직접비 마스터 매핑 딕셔너리
     
     Returns:
         Dict[str, float]: 마스터 항목별 합계 (원 단위)
     """
-    result = {
-        '인건비': 0.0,
-        '임차관리비': 0.0,
-        '물류운송비': 0.0,
-        '로열티': 0.0,
-        '감가상각비': 0.0,
-        '기타': 0.0
-    }
+    matrix = build_direct_cost_matrix(df.columns, direct_cost_master)
+    totals = numeric_frame(df, list(matrix.index)).sum().to_numpy() @ matrix.to_numpy()
+    return {category: float(value) for category, value in zip(DIRECT_COST_CATEGORIES, totals)}
+
+
+def brand_sums(df: pd.DataFrame, keys: pd.Series, cols: list, direct_cost_matrix: pd.DataFrame = None,
+               rows: pd.Series = None) -> pd.DataFrame:
+    """
+    브랜드별 합계 (한 번의 groupby)
     
-    # 직접비 마스터에 있는 컬럼 찾기
-    for col in df.columns:
-        if col in direct_cost_master:
-            master_category = direct_cost_master[col]
-            if master_category in result:
-                # 해당 컬럼의 값 합산
-                for val in df[col]:
-                    result[master_category] += extract_numeric(val)
+    direct_cost_matrix를 주면 직접비 세부 항목 합계(컬럼 합계 × 행렬)도 함께 붙입니다.
+    rows(불리언 마스크)를 주면 해당 행만 합산합니다. (숫자 변환은 원본 df 기준으로 캐시)
     
-    return result
+    Returns:
+        pd.DataFrame: 인덱스 = 브랜드 코드, 컬럼 = cols (+ DIRECT_COST_CATEGORIES)
+    """
+    cols = [col for col in dict.fromkeys(cols) if col is not None]
+    cost_cols = list(direct_cost_matrix.index) if direct_cost_matrix is not None else []
+    value_cols = list(dict.fromkeys(cols + cost_cols))
+    values = numeric_frame(df, value_cols)
+    if rows is not None:
+        values, keys = values[rows], keys[rows]
+    sums = values.groupby(keys.to_numpy()).sum()
+    if direct_cost_matrix is not None:
+        details = sums[cost_cols].to_numpy() @ direct_cost_matrix.to_numpy()
+        for j, category in enumerate(DIRECT_COST_CATEGORIES):
+            sums[category] = details[:, j]
+    return sums
 
 
-def load_direct_cost_master() -> Dict[str, str]:
+def _brand_keys(series: pd.Series) -> pd.Series:
+    return series.astype(str).str.strip()
+
+
+def find_forecast_columns(columns) -> Dict[str, Optional[str]]:
+    """당년 forecast 데이터의 지표별 컬럼 찾기 (컬럼 목록당 한 번)"""
+    found = dict.fromkeys(['brand', 'tag', 'sales', 'shipping', 'cogs', 'gross_profit', 'direct_cost', 'direct_profit'])
+    for col in columns:
+        col_str = str(col)
+        if '브랜드' in col_str:
+            found['brand'] = col
+        elif 'TAG가' in col_str or 'TAG매출' in col_str or ('판매금액' in col_str and 'TAG' in col_str):
+            if '합계' in col_str:
+                found['tag'] = col
+        elif '실판매액' in col_str and ('합계' in col_str or col_str.strip() == '실판매액'):
+            # V+ 우선
+            if '(V+)' in col_str:
+                found['sales'] = col
+            elif not found['sales']:
+                found['sales'] = col
+        elif '출고매출' in col_str or ('출고' in col_str and '매출' in col_str):
+            # 출고매출액 컬럼 찾기 (매출총이익 계산용)
+            if 'Actual' in col_str or '(V-)' in col_str:
+                found['shipping'] = col
+            elif not found['shipping']:
+                found['shipping'] = col
+        elif '매출원가' in col_str:
+            # 우선순위: 평가감환입반영 > Actual > 기타
+            if '평가감환입반영' in col_str or '평가감환입' in col_str:
+                found['cogs'] = col
+            elif 'Actual' in col_str and not found['cogs']:
+                found['cogs'] = col
+            elif not found['cogs']:
+                found['cogs'] = col
+        elif '매출총이익' in col_str:
+            found['gross_profit'] = col  # 매출총이익 직접 컬럼
+        elif '직접비' in col_str and '합계' in col_str:
+            found['direct_cost'] = col
+        elif '직접이익' in col_str:
+            found['direct_profit'] = col
+    return found
+
+
+def find_previous_columns(columns) -> Dict[str, Optional[str]]:
+    """전년 데이터의 지표별 컬럼 찾기 (컬럼 목록당 한 번)"""
+    found = dict.fromkeys(['brand', 'tag', 'sales', 'shipping', 'cogs', 'gross_profit', 'direct_cost', 'direct_profit', 'op_expense', 'channel'])
+    for col in columns:
+        col_str = str(col)
+        if '브랜드코드' in col_str or ('브랜드' in col_str and '코드' in col_str):
+            found['brand'] = col
+        elif 'TAG매출' in col_str or 'TAG매출액' in col_str or ('TAG' in col_str and '매출' in col_str):
+            found['tag'] = col
+        elif '실매출액' in col_str or ('실판매액' in col_str and '전년' not in col_str):
+            # ★★★ 실매출액이 부가세 포함(V+)이므로 우선 사용 ★★★
+            if found['sales'] is None:
+                found['sales'] = col
+            # '부가세제외'가 없는 실매출액이 부가세 포함이므로 우선 사용
+            if '부가세제외' not in col_str and '실매출액' in col_str:
+                found['sales'] = col
+        elif '출고매출' in col_str or ('출고' in col_str and '매출' in col_str) or '부가세제외 실판매액' in col_str:
+            # 출고매출(V-) 또는 부가세제외 실판매액 (전년 데이터)
+            found['shipping'] = col
+        elif '매출원가' in col_str:
+            # 우선순위: 환입후매출원가+평가감 > 기타
+            if '환입후매출원가' in col_str or '평가감' in col_str:
+                found['cogs'] = col
+            elif not found['cogs']:
+                found['cogs'] = col
+        elif '매출총이익' in col_str:
+            found['gross_profit'] = col
+        elif '직접비' in col_str and '합계' in col_str:
+            found['direct_cost'] = col
+        elif '직접이익' in col_str:
+            found['direct_profit'] = col
+        elif '영업비' in col_str:
+            found['op_expense'] = col
+    
+    # 영업비 컬럼 재검색 (다른 조건에 먼저 걸린 경우)
+    if not found['op_expense']:
+        found['op_expense'] = next((col for col in columns if '영업비' in str(col).strip()), None)
+    
+    # 채널 컬럼 (공통 채널 분리용)
+    found['channel'] = next((col for col in columns if '채널' in str(col)), None)
+    return found
+
+
+def find_plan_columns(columns) -> Dict[str, Optional[str]]:
+    """계획 데이터(내수합계 행)의 지표별 컬럼 찾기 (컬럼 목록당 한 번)"""
+    columns = list(columns)
+    has_v_plus = any('[v+]' in str(col) for col in columns)
+    
+    def first(condition):
+        return next((col for col in columns if condition(col)), None)
+    
+    return {
+        # TAG매출 (TAG가 [v+] 또는 TAG가)
+        'tag': first(lambda col: 'TAG가 [v+]' in str(col) or 'TAG가' == str(col).strip()
+                     or ('TAG' in str(col) and '매출' in str(col))),
+        # 실판매액 [v+]
+        'sales': first(lambda col: '실판매액 [v+]' in str(col) or (col == '실판매액' and not has_v_plus)),
+        # 매출원가 (매출원가(환입후) 필드 사용, 폴백: 기존 '매출원가' 컬럼)
+        'cogs': first(lambda col: '매출원가(환입후)' in str(col).strip()
+                      or str(col).strip() == '매출원가'
+                      or ('매출원가' in str(col) and '환입후' not in str(col))),
+        'gross_profit': first(lambda col: col == '매출총이익'),
+        'direct_cost': first(lambda col: col == '직접비' or col == '직접비 합계'),
+        'direct_profit': first(lambda col: col == '직접이익'),
+        'op_profit': first(lambda col: col == '영업이익'),
+        'op_expense': first(lambda col: col == '영업비'),
+    }
+
+
+def aggregate_forecast(df_forecast: pd.DataFrame, direct_cost_master: Dict[str, str]) -> Optional[Dict]:
     """
-    직접비 마스터 파일 로드: 계정명 -> 계정전환 매핑
+    당년 forecast 데이터 브랜드별 집계 (미지정 채널 포함)
     
     Returns:
-        Dict[str, str]: 계정명 -> 계정전환 매핑 딕셔너리
+        dict: {'columns': 지표별 컬럼, 'sums': 브랜드 × 지표 합계 (원 단위)} 또는 None
     """
-    if not os.path.exists(DIRECT_COST_MASTER_PATH):
-        print(f"[WARNING] 직접비 마스터 파일이 없습니다: {DIRECT_COST_MASTER_PATH}")
-        return {}
+    if df_forecast is None or df_forecast.empty:
+        return None
+    columns = find_forecast_columns(df_forecast.columns)
+    if not columns['brand']:
+        return None
     
-    df = pd.read_csv(DIRECT_COST_MASTER_PATH, encoding="utf-8-sig")
-    
-    # 컬럼 찾기
-    account_col = None  # 계정명 컬럼
-    conversion_col = None  # 계정전환 컬럼
-    
-    for col in df.columns:
-        col_str = str(col).strip()
-        if account_col is None and ("계정명" in col_str or "세부" in col_str):
-            account_col = col
-        if conversion_col is None and ("계정전환" in col_str or "대분류" in col_str):
-            conversion_col = col
-    
-    if account_col is None or conversion_col is None:
-        # 기본값: 두 번째와 세 번째 컬럼
-        if len(df.columns) >= 3:
-            account_col, conversion_col = df.columns[1], df.columns[2]
-        elif len(df.columns) >= 2:
-            account_col, conversion_col = df.columns[0], df.columns[1]
-        else:
-            print(f"[WARNING] 직접비 마스터 컬럼을 찾을 수 없습니다. 현재 컬럼: {list(df.columns)}")
-            return {}
+    matrix = build_direct_cost_matrix(df_forecast.columns, direct_cost_master)
+    value_cols = [columns[key] for key in ['tag', 'sales', 'shipping', 'cogs', 'gross_profit', 'direct_cost', 'direct_profit']]
+    sums = brand_sums(df_forecast, _brand_keys(df_forecast[columns['brand']]), value_cols, matrix)
+    return {'columns': columns, 'sums': sums}
+
+
+def aggregate_previous(df_previous: pd.DataFrame, direct_cost_master: Dict[str, str]) -> Optional[Dict]:
+    """
+    전년 데이터 브랜드별 집계
     
-    mapping = {}
-    for _, row in df[[account_col, conversion_col]].dropna().iterrows():
-        account = str(row[account_col]).strip()
-        conversion = str(row[conversion_col]).strip()
-        if account and conversion:
-            mapping[account] = conversion
+    - 실판매출/출고매출/매출원가/매출총이익: 공통 채널 포함 전체 합산
+    - TAG매출/직접비/직접이익/직접비 세부: 공통 채널 제외
+    - 영업비: 공통 채널 합계 (공통 채널이 없으면 브랜드 전체 합계)
     
-    print(f"[OK] 직접비 마스터 로드: {len(mapping)}개 매핑")
-    return mapping
+    Returns:
+        dict: {'columns', 'all': 공통 포함 합계, 'channels': 공통 제외 합계, 'op_expense': 브랜드별 영업비}
+    """
+    if df_previous is None or df_previous.empty:
+        return None
+    columns = find_previous_columns(df_previous.columns)
+    if not columns['brand']:
+        return None
+    
+    keys = _brand_keys(df_previous[columns['brand']])
+    if columns['channel']:
+        is_common = df_previous[columns['channel']].astype(str).str.strip() == '공통'
+    else:
+        is_common = pd.Series(False, index=df_previous.index)
+    
+    all_sums = brand_sums(df_previous, keys, [columns[key] for key in ['sales', 'shipping', 'cogs', 'gross_profit']])
+    matrix = build_direct_cost_matrix(df_previous.columns, direct_cost_master)
+    channel_sums = brand_sums(
+        df_previous, keys, [columns[key] for key in ['tag', 'direct_cost', 'direct_profit']], matrix, rows=~is_common
+    )
+    
+    # 전년 영업비 (원본 컬럼 합계, 브랜드별)
+    op_expense = {}
+    op_col = columns['op_expense']
+    if op_col:
+        common_values = dict(tuple(df_previous.loc[is_common, op_col].groupby(keys[is_common])))
+        for brand, values in df_previous[op_col].groupby(keys):
+            op_expense[brand] = common_values[brand].sum() if brand in common_values else values.sum()
+    
+    return {'columns': columns, 'all': all_sums, 'channels': channel_sums, 'op_expense': op_expense, 'common_brands': set(keys[is_common])}
 
 
-def aggregate_direct_cost_details(df: pd.DataFrame, brand_code: str, direct_cost_master: Dict[str, str]) -> Dict[str, float]:
+def aggregate_plan(df_plan: pd.DataFrame, direct_cost_master: Dict[str, str]) -> Optional[Dict]:
     """
-    직접비 세부 항목을 마스터 기준으로 집계
+    계획 데이터 브랜드별 집계 (채널='내수합계' 행)
     
-    Args:
-        df: 데이터프레임 (브랜드 필터링된 데이터)
-        brand_code: 브랜드 코드
-        direct_cost_master: 직접비 마스터 매핑 딕셔너리
+    지표는 브랜드의 첫 번째 내수합계 행 값, 직접비 세부 항목은 내수합계 행 합계입니다.
     
     Returns:
-        Dict[str, float]: 마스터 항목별 합계 (원 단위)
+        dict: {'columns', 'rows': 브랜드 × 지표 값 (첫 행), 'details': 브랜드 × 직접비 세부 합계}
     """
-    result = {
-        '인건비': 0.0,
-        '임차관리비': 0.0,
-        '물류운송비': 0.0,
-        '로열티': 0.0,
-        '감가상각비': 0.0,
-        '기타': 0.0
+    if df_plan is None or df_plan.empty or '브랜드' not in df_plan.columns:
+        return None
+    channel_col = '채널' if '채널' in df_plan.columns else '채널명'
+    if channel_col not in df_plan.columns:
+        return {'columns': {}, 'rows': pd.DataFrame(), 'details': pd.DataFrame()}
+    
+    columns = find_plan_columns(df_plan.columns)
+    is_total = df_plan[channel_col].astype(str).str.strip() == '내수합계'
+    keys = _brand_keys(df_plan['브랜드'])
+    
+    value_cols = [col for col in dict.fromkeys(columns.values()) if col is not None]
+    is_first = is_total.copy()
+    is_first[is_total] = ~keys[is_total].duplicated()
+    rows = numeric_frame(df_plan, value_cols)[is_first]
+    rows.index = keys[is_first].to_numpy()
+    
+    matrix = build_direct_cost_matrix(df_plan.columns, direct_cost_master)
+    details = brand_sums(df_plan, keys, [], matrix, rows=is_total)[DIRECT_COST_CATEGORIES]
+    return {'columns': columns, 'rows': rows, 'details': details}
+
+
+def _억원(value: float) -> float:
+    return round(value / 100000000, 2)
+
+
+def _empty_pl_data() -> Dict:
+    def metric():
+        return {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0}
+    
+    return {
+        'tagRevenue': metric(),
+        'revenue': metric(),
+        'discountRate': metric(),
+        'cog': metric(),
+        'grossProfit': metric(),
+        'directCost': metric(),
+        'directCostDetail': {category: metric() for category in DIRECT_COST_CATEGORIES},
+        'directProfit': metric(),
+        'operatingExpense': metric(),
+        'opProfit': metric()
     }
+
+
+def _fill_actuals(pl_data: Dict, period: str, sums: Dict[str, float], columns: Dict, label: str):
+    """
+    당년(forecast)/전년(prev) 집계값을 PL 항목으로 변환 (억원)
     
-    # 직접비 마스터에 있는 컬럼 찾기 (부분 매칭 지원)
-    # 예: "지급임차료_매장(고정) 등" -> "지급임차료_매장(고정)" 매핑
-    for col in df.columns:
-        matched = False
-        # 정확한 매칭 먼저 시도
-        if col in direct_cost_master:
-            master_category = direct_cost_master[col]
-            if master_category in result:
-                # 해당 컬럼의 값 합산
-                for val in df[col]:
-                    result[master_category] += extract_numeric(val)
-                matched = True
-        else:
-            # 부분 매칭 시도 (예: "지급임차료_매장(고정) 등" -> "지급임차료_매장(고정)")
-            for master_col, master_category in direct_cost_master.items():
-                # 마스터 컬럼명이 데이터 컬럼명에 포함되어 있는지 확인
-                if master_col in col:
-                    if master_category in result:
-                        # 해당 컬럼의 값 합산
-                        for val in df[col]:
-                            result[master_category] += extract_numeric(val)
-                        matched = True
-                        break  # 매칭되면 다음 컬럼으로
-    
-    return result
-
-
-def extract_numeric(value) -> float:
-    """숫자 문자열(콤마 포함)을 float로 변환"""
-    if pd.isna(value):
-        return 0.0
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        value = value.replace(",", "").replace(" ", "").strip()
-        if value == "" or value == "-":
-            return 0.0
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return 0.0
-    return 0.0
+    sums: tag, sales, shipping, cogs, gross_profit, direct_cost + 직접비 세부 항목 (원 단위)
+    """
+    pl_data['tagRevenue'][period] = _억원(sums['tag'])
+    pl_data['revenue'][period] = _억원(sums['sales'])
+    pl_data['cog'][period] = _억원(sums['cogs'])
+    
+    # 매출총이익: 컬럼에서 직접 가져오기 (없으면 출고매출(V-) - 매출원가로 계산)
+    if columns['gross_profit'] and sums['gross_profit'] > 0:
+        pl_data['grossProfit'][period] = _억원(sums['gross_profit'])
+    elif columns['shipping'] and sums['shipping'] > 0:
+        # 폴백: 출고매출(V-) - 매출원가
+        pl_data['grossProfit'][period] = round(_억원(sums['shipping']) - pl_data['cog'][period], 2)
+        print(f"    [매출총이익-{label}] 컬럼이 없어 계산값 사용 (출고매출 - 매출원가): {pl_data['grossProfit'][period]:.2f}억원")
+    else:
+        # 최종 폴백: 실판매출 - 매출원가
+        pl_data['grossProfit'][period] = round(pl_data['revenue'][period] - pl_data['cog'][period], 2)
+        print(f"    [WARNING] 매출총이익 계산에 필요한 컬럼이 없어 실판매출-매출원가 계산값 사용: {pl_data['grossProfit'][period]:.2f}억원")
+    
+    pl_data['directCost'][period] = _억원(sums['direct_cost'])
+    # 직접이익 = 매출총이익 - 직접비 (직접 계산)
+    pl_data['directProfit'][period] = round(pl_data['grossProfit'][period] - pl_data['directCost'][period], 2)
+    print(f"    [직접이익-{label}] 계산값 사용 (매출총이익 - 직접비): {pl_data['directProfit'][period]:.2f}억원")
+    
+    # 직접비 세부 항목 (억원 단위)
+    for category in DIRECT_COST_CATEGORIES:
+        pl_data['directCostDetail'][category][period] = _억원(sums[category])
+    
+    # 할인율 계산: 1 - 실판매출 / TAG매출
+    if sums['tag'] > 0:
+        pl_data['discountRate'][period] = round((1 - (sums['sales'] / sums['tag'])) * 100, 1)
+    else:
+        pl_data['discountRate'][period] = 0.0
+
+
+def _row_sums(table: pd.DataFrame, brand_code: str, keys: Dict[str, Optional[str]]) -> Dict[str, float]:
+    """브랜드 합계 행 → {지표 키: 합계} (컬럼이 없으면 0.0)"""
+    row = table.loc[brand_code] if brand_code in table.index else None
+    sums = {}
+    for key, col in keys.items():
+        sums[key] = float(row[col]) if row is not None and col is not None and col in table.columns else 0.0
+    return sums
+
 
 def load_forecast_data(date_str: str) -> Optional[pd.DataFrame]:
     """당년 forecast 데이터 로드"""
@@ -259,7 +440,7 @@ def load_forecast_data(date_str: str) -> Optional[pd.DataFrame]:
     return df
 
 def load_plan_data(year_month: str) -> Optional[pd.DataFrame]:
-    """계획 데이터 로드"""
+    """계획 데이터 로드 (숫자형 typed 파일 우선)"""
     plan_path = get_plan_file_path(year_month)  # 기본값: plan_YYYYMM_전처리완료.csv
     
     if not os.path.exists(plan_path):
@@ -267,7 +448,7 @@ def load_plan_data(year_month: str) -> Optional[pd.DataFrame]:
         return None
     
     print(f"  [LOAD] 계획 데이터: {os.path.basename(plan_path)}")
-    df = pd.read_csv(plan_path, encoding='utf-8-sig')
+    df = load_plan_table(plan_path)
     return df
 
 def load_previous_year_kpi(year_month: str) -> Optional[pd.DataFrame]:
@@ -286,46 +467,18 @@ def load_previous_year_kpi(year_month: str) -> Optional[pd.DataFrame]:
 
 def get_plan_operating_expense(df_plan: pd.DataFrame, brand_code: str) -> float:
     """계획 데이터에서 브랜드별 영업비 추출 (pivot 후 구조: 채널='내수합계' 행의 '영업비' 컬럼)"""
-    if df_plan is None or df_plan.empty:
-        return 0.0
-    
-    # pivot 후 구조: 브랜드, Version, 채널 컬럼이 있고, 지표들이 컬럼으로 변환됨
-    # 채널='내수합계'인 행에서 '영업비' 컬럼 값 추출
-    
-    # 브랜드 필터링
-    if '브랜드' not in df_plan.columns:
+    plan = aggregate_plan(df_plan, {})
+    if not plan or brand_code not in plan['rows'].index or not plan['columns'].get('op_expense'):
         return 0.0
-    
-    brand_df = df_plan[df_plan['브랜드'].astype(str).str.strip() == brand_code]
-    
-    if brand_df.empty:
-        return 0.0
-    
-    # 채널='내수합계'인 행 찾기
-    if '채널' in brand_df.columns:
-        내수합계_df = brand_df[brand_df['채널'].astype(str).str.strip() == '내수합계']
-    elif '채널명' in brand_df.columns:
-        내수합계_df = brand_df[brand_df['채널명'].astype(str).str.strip() == '내수합계']
-    else:
-        return 0.0
-    
-    if 내수합계_df.empty:
-        return 0.0
-    
-    # '영업비' 컬럼 찾기
-    영업비 = 0.0
-    for col in 내수합계_df.columns:
-        if col == '영업비':
-            값 = extract_numeric(내수합계_df[col].iloc[0] if len(내수합계_df) > 0 else 0)
-            영업비 = 값
-            break
-    
-    return 영업비
+    return float(plan['rows'].loc[brand_code, plan['columns']['op_expense']])
 
 def create_brand_pl_data(date_str: str) -> Dict:
     """
     브랜드별 손익계산서 데이터 생성
     
+    소스별(당년/계획/전년)로 한 번씩 브랜드 groupby 집계한 뒤 브랜드별 PL을 조립합니다.
+    직접비 세부 항목은 직접비마스터로 만든 컬럼 × 항목 행렬을 곱해 구합니다.
+    
     Args:
         date_str: YYYYMMDD 형식의 날짜 문자열
         
@@ -340,305 +493,77 @@ def create_brand_pl_data(date_str: str) -> Dict:
     # 직접비 마스터 로드
     direct_cost_master = load_direct_cost_master()
     
-    # 1. 데이터 로드
+    # 1. 데이터 로드 및 소스별 브랜드 집계 (브랜드 수와 무관하게 소스당 한 번)
     df_forecast = load_forecast_data(date_str)
     df_plan = load_plan_data(year_month)
     df_previous = load_previous_year_kpi(year_month)
     
-    # 브랜드 목록 (M, I, X, V, ST, W)
-    brand_codes = ['M', 'I', 'X', 'V', 'ST', 'W']
+    forecast = aggregate_forecast(df_forecast, direct_cost_master)
+    plan = aggregate_plan(df_plan, direct_cost_master)
+    previous = aggregate_previous(df_previous, direct_cost_master)
+    
+    if forecast:
+        print(f"  [당년] 매출원가 컬럼: {forecast['columns']['cogs']}, 매출총이익 컬럼: {forecast['columns']['gross_profit']}")
+    if previous:
+        print(f"  [전년] 실판매출(V+) 컬럼: {previous['columns']['sales']}, 매출원가 컬럼: {previous['columns']['cogs']}, 영업비 컬럼: {previous['columns']['op_expense']}")
     
-    for brand_code in brand_codes:
-        brand_name = BRAND_NAME_MAP.get(brand_code, brand_code)
+    actual_keys = ['tag', 'sales', 'shipping', 'cogs', 'gross_profit', 'direct_cost']
+    
+    for brand_code, brand_name in BRAND_NAME_MAP.items():
         print(f"\n  [브랜드] {brand_name} ({brand_code})")
+        pl_data = _empty_pl_data()
         
-        # 초기값
-        pl_data = {
-            'tagRevenue': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-            'revenue': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-            'discountRate': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-            'cog': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-            'grossProfit': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-            'directCost': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-            'directCostDetail': {
-                '인건비': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-                '임차관리비': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-                '물류운송비': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-                '로열티': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-                '감가상각비': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-                '기타': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0}
-            },
-            'directProfit': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-            'operatingExpense': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0},
-            'opProfit': {'prev': 0.0, 'target': 0.0, 'forecast': 0.0, 'yoy': 0, 'achievement': 0}
-        }
+        # 2. 당년 데이터 (forecast)
+        if forecast and brand_code in forecast['sums'].index:
+            columns = forecast['columns']
+            keys = {key: columns[key] for key in actual_keys}
+            keys.update({category: category for category in DIRECT_COST_CATEGORIES})
+            sums = _row_sums(forecast['sums'], brand_code, keys)
+            print(f"    [매출원가-forecast] 합계: {sums['cogs']:,.0f}원 ({sums['cogs']/100000000:.2f}억원)")
+            _fill_actuals(pl_data, 'forecast', sums, columns, 'forecast')
         
-        # 2. 당년 데이터 (forecast) 집계
-        if df_forecast is not None and not df_forecast.empty:
-            brand_col = None
-            tag_col = None
-            sales_col = None
-            cogs_col = None
-            direct_cost_col = None
-            direct_profit_col = None
-            
-            # 컬럼 찾기
-            출고매출_col = None  # 매출총이익 계산용
-            gross_profit_col = None  # 매출총이익 직접 컬럼
-            for col in df_forecast.columns:
-                col_str = str(col)
-                if '브랜드' in col_str:
-                    brand_col = col
-                elif 'TAG가' in col_str or 'TAG매출' in col_str or ('판매금액' in col_str and 'TAG' in col_str):
-                    if '합계' in col_str:
-                        tag_col = col
-                elif '실판매액' in col_str and ('합계' in col_str or col_str.strip() == '실판매액'):
-                    # V+ 우선
-                    if '(V+)' in col_str:
-                        sales_col = col
-                    elif not sales_col:
-                        sales_col = col
-                elif '출고매출' in col_str or ('출고' in col_str and '매출' in col_str):
-                    # 출고매출액 컬럼 찾기 (매출총이익 계산용)
-                    if 'Actual' in col_str or '(V-)' in col_str:
-                        출고매출_col = col
-                    elif not 출고매출_col:
-                        출고매출_col = col
-                elif '매출원가' in col_str:
-                    # 우선순위: 평가감환입반영 > Actual > 기타
-                    if '평가감환입반영' in col_str or '평가감환입' in col_str:
-                        cogs_col = col
-                    elif 'Actual' in col_str and not cogs_col:
-                        cogs_col = col
-                    elif not cogs_col:
-                        cogs_col = col
-                elif '매출총이익' in col_str:
-                    gross_profit_col = col  # 매출총이익 직접 컬럼
-                elif '직접비' in col_str and '합계' in col_str:
-                    direct_cost_col = col
-                elif '직접이익' in col_str:
-                    direct_profit_col = col
+        # 3. 계획 데이터 (내수합계 행)
+        if plan is not None:
+            columns = plan['columns']
+            has_row = brand_code in plan['rows'].index
+            row = plan['rows'].loc[brand_code] if has_row else None
             
-            if brand_col:
-                brand_df = df_forecast[df_forecast[brand_col].astype(str).str.strip() == brand_code]
-                
-                if not brand_df.empty:
-                    # forecast 값 집계 (원 단위) - 미지정 채널 포함
-                    tag_revenue_sum = 0.0
-                    revenue_sum = 0.0
-                    출고매출_sum = 0.0  # 출고매출(V-) 합산 (매출총이익 계산용)
-                    cogs_sum = 0.0
-                    gross_profit_sum = 0.0  # 매출총이익 합산
-                    direct_cost_sum = 0.0
-                    direct_profit_sum = 0.0
-                    인건비_sum = 0.0
-                    임차관리비_sum = 0.0
-                    물류운송비_sum = 0.0
-                    로열티_sum = 0.0
-                    감가상각비_sum = 0.0
-                    기타_sum = 0.0
-                    
-                    if tag_col:
-                        for val in brand_df[tag_col]:
-                            tag_revenue_sum += extract_numeric(val)
-                    
-                    if sales_col:
-                        for val in brand_df[sales_col]:
-                            revenue_sum += extract_numeric(val)
-                    
-                    # 출고매출(V-) 합산 (매출총이익 계산용)
-                    if 출고매출_col:
-                        for val in brand_df[출고매출_col]:
-                            출고매출_sum += extract_numeric(val)
-                    
-                    if cogs_col:
-                        print(f"    [매출원가-forecast] 컬럼: {cogs_col}")
-                        for val in brand_df[cogs_col]:
-                            cogs_sum += extract_numeric(val)
-                        print(f"    [매출원가-forecast] 합계: {cogs_sum:,.0f}원 ({cogs_sum/100000000:.2f}억원)")
-                    else:
-                        print(f"    [WARNING] 매출원가 컬럼을 찾을 수 없습니다.")
-                    
-                    # 매출총이익 컬럼에서 직접 가져오기
-                    if gross_profit_col:
-                        print(f"    [매출총이익-forecast] 컬럼: {gross_profit_col}")
-                        for val in brand_df[gross_profit_col]:
-                            gross_profit_sum += extract_numeric(val)
-                        print(f"    [매출총이익-forecast] 합계: {gross_profit_sum:,.0f}원 ({gross_profit_sum/100000000:.2f}억원)")
-                    
-                    if direct_cost_col:
-                        for val in brand_df[direct_cost_col]:
-                            direct_cost_sum += extract_numeric(val)
-                    
-                    if direct_profit_col:
-                        for val in brand_df[direct_profit_col]:
-                            direct_profit_sum += extract_numeric(val)
-                    
-                    # 직접비 세부 항목 집계 (직접비마스터 사용)
-                    direct_cost_details = aggregate_direct_cost_details(brand_df, brand_code, direct_cost_master)
-                    인건비_sum = direct_cost_details['인건비']
-                    임차관리비_sum = direct_cost_details['임차관리비']
-                    물류운송비_sum = direct_cost_details['물류운송비']
-                    로열티_sum = direct_cost_details['로열티']
-                    감가상각비_sum = direct_cost_details['감가상각비']
-                    기타_sum = direct_cost_details['기타']
-                    
-                    # 억원 단위로 변환하여 저장
-                    pl_data['tagRevenue']['forecast'] = round(tag_revenue_sum / 100000000, 2)
-                    pl_data['revenue']['forecast'] = round(revenue_sum / 100000000, 2)
-                    pl_data['cog']['forecast'] = round(cogs_sum / 100000000, 2)
-                    
-                    # 매출총이익: 컬럼에서 직접 가져오기 (없으면 출고매출(V-) - 매출원가로 계산)
-                    if gross_profit_col and gross_profit_sum > 0:
-                        pl_data['grossProfit']['forecast'] = round(gross_profit_sum / 100000000, 2)
-                    elif 출고매출_col and 출고매출_sum > 0:
-                        # 폴백: 출고매출(V-) - 매출원가
-                        출고매출_억원 = round(출고매출_sum / 100000000, 2)
-                        pl_data['grossProfit']['forecast'] = round(출고매출_억원 - pl_data['cog']['forecast'], 2)
-                        print(f"    [매출총이익-forecast] 컬럼이 없어 계산값 사용 (출고매출 - 매출원가): {pl_data['grossProfit']['forecast']:.2f}억원")
-                    else:
-                        # 최종 폴백: 실판매출 - 매출원가
-                        pl_data['grossProfit']['forecast'] = round(
-                            pl_data['revenue']['forecast'] - pl_data['cog']['forecast'], 2
-                        )
-                        print(f"    [WARNING] 매출총이익 계산에 필요한 컬럼이 없어 실판매출-매출원가 계산값 사용: {pl_data['grossProfit']['forecast']:.2f}억원")
-                    
-                    pl_data['directCost']['forecast'] = round(direct_cost_sum / 100000000, 2)
-                    # 직접이익 = 매출총이익 - 직접비 (직접 계산)
-                    pl_data['directProfit']['forecast'] = round(
-                        pl_data['grossProfit']['forecast'] - pl_data['directCost']['forecast'], 2
-                    )
-                    print(f"    [직접이익-forecast] 계산값 사용 (매출총이익 - 직접비): {pl_data['directProfit']['forecast']:.2f}억원")
-                    
-                    # 직접비 세부 항목 (억원 단위)
-                    pl_data['directCostDetail']['인건비']['forecast'] = round(인건비_sum / 100000000, 2)
-                    pl_data['directCostDetail']['임차관리비']['forecast'] = round(임차관리비_sum / 100000000, 2)
-                    pl_data['directCostDetail']['물류운송비']['forecast'] = round(물류운송비_sum / 100000000, 2)
-                    pl_data['directCostDetail']['로열티']['forecast'] = round(로열티_sum / 100000000, 2)
-                    pl_data['directCostDetail']['감가상각비']['forecast'] = round(감가상각비_sum / 100000000, 2)
-                    pl_data['directCostDetail']['기타']['forecast'] = round(기타_sum / 100000000, 2)
-                    
-                    # 할인율 계산: 1 - 실판매출 / TAG매출
-                    if tag_revenue_sum > 0:
-                        pl_data['discountRate']['forecast'] = round((1 - (revenue_sum / tag_revenue_sum)) * 100, 1)
-                    else:
-                        pl_data['discountRate']['forecast'] = 0.0
-        
-        # 3. 계획 데이터 집계
-        if df_plan is not None and not df_plan.empty:
-            # 계획 영업비 추출
-            plan_op_expense = get_plan_operating_expense(df_plan, brand_code)
-            plan_op_expense_억원 = round(plan_op_expense / 100000000, 2)
+            def plan_value(key):
+                col = columns.get(key)
+                return float(row[col]) if has_row and col is not None else 0.0
             
             # 영업비 저장 (목표 = 월말예상 = 계획 영업비)
+            plan_op_expense_억원 = _억원(plan_value('op_expense'))
             pl_data['operatingExpense']['target'] = plan_op_expense_억원
             pl_data['operatingExpense']['forecast'] = plan_op_expense_억원
             
-            # 계획 데이터에서 다른 값들 추출 (pivot 후 구조: 채널='내수합계' 행에서 지표 컬럼 값 추출)
-            if '브랜드' in df_plan.columns:
-                plan_brand_df = df_plan[df_plan['브랜드'].astype(str).str.strip() == brand_code]
+            if has_row:
+                tag_revenue_target = plan_value('tag')
+                revenue_target = plan_value('sales')
+                if columns['tag']:
+                    pl_data['tagRevenue']['target'] = _억원(tag_revenue_target)
+                if columns['sales']:
+                    pl_data['revenue']['target'] = _억원(revenue_target)
+                
+                # 할인율 계산: 1 - 실판매출 / TAG매출
+                if tag_revenue_target > 0:
+                    pl_data['discountRate']['target'] = round((1 - (revenue_target / tag_revenue_target)) * 100, 1)
+                
+                for key, metric in [('cogs', 'cog'), ('gross_profit', 'grossProfit'), ('direct_cost', 'directCost'), ('op_profit', 'opProfit')]:
+                    if columns[key]:
+                        pl_data[metric]['target'] = _억원(plan_value(key))
                 
-                # 채널='내수합계'인 행 찾기
-                채널_col = '채널' if '채널' in plan_brand_df.columns else '채널명'
-                if 채널_col in plan_brand_df.columns:
-                    내수합계_df = plan_brand_df[plan_brand_df[채널_col].astype(str).str.strip() == '내수합계']
-                    
-                    if not 내수합계_df.empty:
-                        # 각 지표 컬럼에서 값 추출
-                        row = 내수합계_df.iloc[0]
-                        
-                        # TAG매출 (TAG가 [v+] 또는 TAG가)
-                        tag_revenue_target = 0.0
-                        for col in 내수합계_df.columns:
-                            col_str = str(col)
-                            if ('TAG가 [v+]' in col_str or 'TAG가' == col_str.strip() or 
-                                ('TAG' in col_str and '매출' in col_str)):
-                                tag_revenue_target = extract_numeric(row[col])
-                                pl_data['tagRevenue']['target'] = round(tag_revenue_target / 100000000, 2)
-                                break
-                        
-                        # 실판매액 [v+]
-                        revenue_target = 0.0
-                        for col in 내수합계_df.columns:
-                            if '실판매액 [v+]' in str(col) or (col == '실판매액' and '[v+]' not in str(row)):
-                                revenue_target = extract_numeric(row[col])
-                                pl_data['revenue']['target'] = round(revenue_target / 100000000, 2)
-                                break
-                        
-                        # 할인율 계산: 1 - 실판매출 / TAG매출
-                        if tag_revenue_target > 0:
-                            pl_data['discountRate']['target'] = round((1 - (revenue_target / tag_revenue_target)) * 100, 1)
-                        else:
-                            pl_data['discountRate']['target'] = 0.0
-                        
-                        # 매출원가 (매출원가(환입후) 필드 사용)
-                        for col in 내수합계_df.columns:
-                            col_str = str(col).strip()
-                            if col_str == '매출원가(환입후)' or ('매출원가(환입후)' in col_str):
-                                값 = extract_numeric(row[col])
-                                pl_data['cog']['target'] = round(값 / 100000000, 2)
-                                print(f"    [매출원가-target] 컬럼: {col}, 값: {값:,.0f}원 ({pl_data['cog']['target']:.2f}억원)")
-                                break
-                            # 폴백: 기존 '매출원가' 컬럼도 허용
-                            elif col_str == '매출원가' or ('매출원가' in col_str and '원가' in col_str and '환입후' not in col_str):
-                                값 = extract_numeric(row[col])
-                                pl_data['cog']['target'] = round(값 / 100000000, 2)
-                                print(f"    [매출원가-target] 컬럼: {col}, 값: {값:,.0f}원 ({pl_data['cog']['target']:.2f}억원)")
-                                break
-                        
-                        # 매출총이익
-                        for col in 내수합계_df.columns:
-                            if col == '매출총이익':
-                                값 = extract_numeric(row[col])
-                                pl_data['grossProfit']['target'] = round(값 / 100000000, 2)
-                                break
-                        
-                        # 직접비
-                        for col in 내수합계_df.columns:
-                            if col == '직접비' or (col == '직접비 합계'):
-                                값 = extract_numeric(row[col])
-                                pl_data['directCost']['target'] = round(값 / 100000000, 2)
-                                break
-                        
-                        # 직접비 세부 항목 (직접비 마스터 사용)
-                        # 내수합계_df를 DataFrame으로 변환하여 aggregate_direct_cost_details 함수 사용
-                        direct_cost_details = aggregate_direct_cost_details(내수합계_df, brand_code, direct_cost_master)
-                        인건비_sum = direct_cost_details['인건비']
-                        임차관리비_sum = direct_cost_details['임차관리비']
-                        물류운송비_sum = direct_cost_details['물류운송비']
-                        로열티_sum = direct_cost_details['로열티']
-                        감가상각비_sum = direct_cost_details['감가상각비']
-                        기타_sum = direct_cost_details['기타']
-                        
-                        # 억원 단위로 변환하여 저장
-                        pl_data['directCostDetail']['인건비']['target'] = round(인건비_sum / 100000000, 2)
-                        pl_data['directCostDetail']['임차관리비']['target'] = round(임차관리비_sum / 100000000, 2)
-                        pl_data['directCostDetail']['물류운송비']['target'] = round(물류운송비_sum / 100000000, 2)
-                        pl_data['directCostDetail']['로열티']['target'] = round(로열티_sum / 100000000, 2)
-                        pl_data['directCostDetail']['감가상각비']['target'] = round(감가상각비_sum / 100000000, 2)
-                        pl_data['directCostDetail']['기타']['target'] = round(기타_sum / 100000000, 2)
-                        
-                        # 직접이익 = 매출총이익 - 직접비 (직접 계산)
-                        if pl_data['grossProfit']['target'] > 0 and pl_data['directCost']['target'] > 0:
-                            pl_data['directProfit']['target'] = round(
-                                pl_data['grossProfit']['target'] - pl_data['directCost']['target'], 2
-                            )
-                            print(f"    [직접이익-target] 계산값 사용 (매출총이익 - 직접비): {pl_data['directProfit']['target']:.2f}억원")
-                        else:
-                            # 폴백: 계획 데이터에서 직접이익 컬럼 찾기
-                            for col in 내수합계_df.columns:
-                                if col == '직접이익':
-                                    값 = extract_numeric(row[col])
-                                    pl_data['directProfit']['target'] = round(값 / 100000000, 2)
-                                    print(f"    [직접이익-target] 컬럼에서 가져옴: {pl_data['directProfit']['target']:.2f}억원")
-                                    break
-                        
-                        # 영업이익
-                        for col in 내수합계_df.columns:
-                            if col == '영업이익':
-                                값 = extract_numeric(row[col])
-                                pl_data['opProfit']['target'] = round(값 / 100000000, 2)
-                                break
+                # 직접비 세부 항목 (직접비 마스터 사용)
+                for category in DIRECT_COST_CATEGORIES:
+                    pl_data['directCostDetail'][category]['target'] = _억원(float(plan['details'].loc[brand_code, category]))
+                
+                # 직접이익 = 매출총이익 - 직접비 (직접 계산, 폴백: 계획 데이터의 직접이익 컬럼)
+                if pl_data['grossProfit']['target'] > 0 and pl_data['directCost']['target'] > 0:
+                    pl_data['directProfit']['target'] = round(
+                        pl_data['grossProfit']['target'] - pl_data['directCost']['target'], 2
+                    )
+                elif columns['direct_profit']:
+                    pl_data['directProfit']['target'] = _억원(plan_value('direct_profit'))
             
             # 당년 영업이익(forecast) = 직접이익(forecast) - 계획 영업비
             pl_data['opProfit']['forecast'] = round(
@@ -646,265 +571,36 @@ def create_brand_pl_data(date_str: str) -> Dict:
             )
             print(f"    당년 영업이익: {pl_data['directProfit']['forecast']:.2f} - {plan_op_expense_억원:.2f} = {pl_data['opProfit']['forecast']:.2f}억원")
         
-        # 4. 전년 데이터 집계
-        if df_previous is not None and not df_previous.empty:
-            brand_col = None
-            tag_col = None
-            sales_col = None
-            cogs_col = None
-            direct_cost_col = None
-            direct_profit_col = None
-            op_expense_col = None
+        # 4. 전년 데이터
+        if previous and brand_code in previous['all'].index:
+            columns = previous['columns']
+            sums = _row_sums(previous['all'], brand_code, {key: columns[key] for key in ['sales', 'shipping', 'cogs', 'gross_profit']})
+            sums.update(_row_sums(
+                previous['channels'], brand_code,
+                {'tag': columns['tag'], 'direct_cost': columns['direct_cost'], **{category: category for category in DIRECT_COST_CATEGORIES}}
+            ))
+            print(f"    [실판매출(V+)-prev] 합계 (공통 포함): {sums['sales']:,.0f}원 ({sums['sales']/100000000:.2f}억원)")
+            _fill_actuals(pl_data, 'prev', sums, columns, 'prev')
             
-            # 컬럼 찾기
-            출고매출_col_prev = None  # 전년 출고매출(V-) 컬럼 (매출총이익 계산용)
-            gross_profit_col_prev = None  # 전년 매출총이익 컬럼
-            for col in df_previous.columns:
-                col_str = str(col)
-                if '브랜드코드' in col_str or ('브랜드' in col_str and '코드' in col_str):
-                    brand_col = col
-                elif 'TAG매출' in col_str or 'TAG매출액' in col_str or ('TAG' in col_str and '매출' in col_str):
-                    tag_col = col
-                elif '실매출액' in col_str or ('실판매액' in col_str and '전년' not in col_str):
-                    # ★★★ 실매출액이 부가세 포함(V+)이므로 우선 사용 ★★★
-                    if sales_col is None:
-                        sales_col = col
-                    # '부가세제외'가 없는 실매출액이 부가세 포함이므로 우선 사용
-                    if '부가세제외' not in col_str and '실매출액' in col_str:
-                        sales_col = col
-                elif '출고매출' in col_str or ('출고' in col_str and '매출' in col_str) or '부가세제외 실판매액' in col_str:
-                    # 출고매출(V-) 또는 부가세제외 실판매액 (전년 데이터)
-                    출고매출_col_prev = col
-                elif '매출원가' in col_str:
-                    # 우선순위: 환입후매출원가+평가감 > 기타
-                    if '환입후매출원가' in col_str or '평가감' in col_str:
-                        cogs_col = col
-                    elif not cogs_col:
-                        cogs_col = col
-                elif '매출총이익' in col_str:
-                    gross_profit_col_prev = col
-                elif '직접비' in col_str and '합계' in col_str:
-                    direct_cost_col = col
-                elif '직접이익' in col_str:
-                    direct_profit_col = col
-                elif '영업비' in col_str:
-                    op_expense_col = col
+            # 전년 영업비 (공통 채널)
+            prev_op_expense = previous['op_expense'].get(brand_code, 0.0)
+            if columns['op_expense'] and brand_code not in previous['common_brands']:
+                print(f"    [WARNING] 전년 영업비 공통 채널 데이터가 없습니다.")
+            print(f"    [영업비-prev] 합계: {prev_op_expense:,.0f}원 ({prev_op_expense/100000000:.2f}억원)")
+            pl_data['operatingExpense']['prev'] = round(prev_op_expense / 100000000, 2)
             
-            if brand_col:
-                brand_df = df_previous[df_previous[brand_col].astype(str).str.strip() == brand_code].copy()
-                
-                if not brand_df.empty:
-                    # 공통 채널 분리 (영업비만 공통 채널에서 추출, 매출원가는 공통 포함하여 전체 합산)
-                    채널_col = None
-                    for col in brand_df.columns:
-                        if '채널' in str(col):
-                            채널_col = col
-                            break
-                    
-                    if 채널_col:
-                        prev_brand_df = brand_df[brand_df[채널_col].astype(str).str.strip() != '공통']
-                        op_expense_df = brand_df[brand_df[채널_col].astype(str).str.strip() == '공통']
-                    else:
-                        prev_brand_df = brand_df
-                        op_expense_df = pd.DataFrame()
-                    
-                    # 전년 값 집계 (원 단위)
-                    # 매출원가는 공통 채널 포함 (전체 brand_df 사용)
-                    tag_revenue_sum = 0.0
-                    revenue_sum = 0.0
-                    출고매출_sum_prev = 0.0  # 전년 출고매출(V-) 합산 (매출총이익 계산용)
-                    cogs_sum = 0.0
-                    gross_profit_sum_prev = 0.0  # 전년 매출총이익 합산
-                    direct_cost_sum = 0.0
-                    direct_profit_sum = 0.0
-                    
-                    if tag_col:
-                        for val in prev_brand_df[tag_col]:
-                            tag_revenue_sum += extract_numeric(val)
-                    
-                    # ★★★ 전년 실판금액(V+): 실매출액 컬럼 사용, 공통 채널 포함하여 전체 합산 ★★★
-                    if sales_col:
-                        # 공통 채널 포함하여 전체 합산 (실판 V+ = 부가세 포함 실매출액)
-                        # brand_df는 공통 채널 포함한 전체 데이터
-                        revenue_sum = 0.0
-                        for val in brand_df[sales_col]:
-                            revenue_sum += extract_numeric(val)
-                        print(f"    [실판매출(V+)-prev] 컬럼: {sales_col}")
-                        print(f"    [실판매출(V+)-prev] 브랜드 데이터 행 수: {len(brand_df)}")
-                        print(f"    [실판매출(V+)-prev] 합계 (공통 포함): {revenue_sum:,.0f}원 ({revenue_sum/100000000:.2f}억원)")
-                    else:
-                        print(f"    [WARNING] 전년 실매출액 컬럼을 찾을 수 없습니다.")
-                    
-                    # 출고매출(V-) 또는 부가세제외 실판매액 합산 (공통 채널 포함하여 전체 합산)
-                    if 출고매출_col_prev:
-                        for val in brand_df[출고매출_col_prev]:
-                            출고매출_sum_prev += extract_numeric(val)
-                    
-                    if cogs_col:
-                        print(f"    [매출원가-prev] 컬럼: {cogs_col}")
-                        # 매출원가는 공통 채널 포함하여 전체 합산
-                        for val in brand_df[cogs_col]:
-                            cogs_sum += extract_numeric(val)
-                        print(f"    [매출원가-prev] 합계 (공통 포함): {cogs_sum:,.0f}원 ({cogs_sum/100000000:.2f}억원)")
-                    else:
-                        print(f"    [WARNING] 전년 매출원가 컬럼을 찾을 수 없습니다.")
-                    
-                    # 매출총이익 컬럼에서 직접 가져오기 (공통 채널 포함하여 전체 합산)
-                    if gross_profit_col_prev:
-                        print(f"    [매출총이익-prev] 컬럼: {gross_profit_col_prev}")
-                        for val in brand_df[gross_profit_col_prev]:
-                            gross_profit_sum_prev += extract_numeric(val)
-                        print(f"    [매출총이익-prev] 합계 (공통 포함): {gross_profit_sum_prev:,.0f}원 ({gross_profit_sum_prev/100000000:.2f}억원)")
-                    
-                    if direct_cost_col:
-                        for val in prev_brand_df[direct_cost_col]:
-                            direct_cost_sum += extract_numeric(val)
-                    
-                    if direct_profit_col:
-                        for val in prev_brand_df[direct_profit_col]:
-                            direct_profit_sum += extract_numeric(val)
-                    
-                    # 직접비 세부 항목 집계 (직접비마스터 사용)
-                    direct_cost_details = aggregate_direct_cost_details(prev_brand_df, brand_code, direct_cost_master)
-                    인건비_sum = direct_cost_details['인건비']
-                    임차관리비_sum = direct_cost_details['임차관리비']
-                    물류운송비_sum = direct_cost_details['물류운송비']
-                    로열티_sum = direct_cost_details['로열티']
-                    감가상각비_sum = direct_cost_details['감가상각비']
-                    기타_sum = direct_cost_details['기타']
-                    
-                    # 억원 단위로 변환하여 저장
-                    pl_data['tagRevenue']['prev'] = round(tag_revenue_sum / 100000000, 2)
-                    pl_data['revenue']['prev'] = round(revenue_sum / 100000000, 2)
-                    pl_data['cog']['prev'] = round(cogs_sum / 100000000, 2)
-                    
-                    # 매출총이익: 컬럼에서 직접 가져오기 (없으면 출고매출(V-) - 매출원가로 계산)
-                    if gross_profit_col_prev and gross_profit_sum_prev > 0:
-                        pl_data['grossProfit']['prev'] = round(gross_profit_sum_prev / 100000000, 2)
-                    elif 출고매출_col_prev and 출고매출_sum_prev > 0:
-                        # 폴백: 출고매출(V-) - 매출원가
-                        출고매출_억원_prev = round(출고매출_sum_prev / 100000000, 2)
-                        pl_data['grossProfit']['prev'] = round(출고매출_억원_prev - pl_data['cog']['prev'], 2)
-                        print(f"    [매출총이익-prev] 컬럼이 없어 계산값 사용 (출고매출 - 매출원가): {pl_data['grossProfit']['prev']:.2f}억원")
-                    else:
-                        # 최종 폴백: 실판매출 - 매출원가
-                        pl_data['grossProfit']['prev'] = round(
-                            pl_data['revenue']['prev'] - pl_data['cog']['prev'], 2
-                        )
-                        print(f"    [WARNING] 전년 매출총이익 계산에 필요한 컬럼이 없어 실판매출-매출원가 계산값 사용: {pl_data['grossProfit']['prev']:.2f}억원")
-                    
-                    pl_data['directCost']['prev'] = round(direct_cost_sum / 100000000, 2)
-                    # 직접이익 = 매출총이익 - 직접비 (직접 계산)
-                    pl_data['directProfit']['prev'] = round(
-                        pl_data['grossProfit']['prev'] - pl_data['directCost']['prev'], 2
-                    )
-                    print(f"    [직접이익-prev] 계산값 사용 (매출총이익 - 직접비): {pl_data['directProfit']['prev']:.2f}억원")
-                    
-                    # 직접비 세부 항목 (억원 단위)
-                    pl_data['directCostDetail']['인건비']['prev'] = round(인건비_sum / 100000000, 2)
-                    pl_data['directCostDetail']['임차관리비']['prev'] = round(임차관리비_sum / 100000000, 2)
-                    pl_data['directCostDetail']['물류운송비']['prev'] = round(물류운송비_sum / 100000000, 2)
-                    pl_data['directCostDetail']['로열티']['prev'] = round(로열티_sum / 100000000, 2)
-                    pl_data['directCostDetail']['감가상각비']['prev'] = round(감가상각비_sum / 100000000, 2)
-                    pl_data['directCostDetail']['기타']['prev'] = round(기타_sum / 100000000, 2)
-                    
-                    # 할인율 계산: 1 - 실판매출 / TAG매출
-                    if tag_revenue_sum > 0:
-                        pl_data['discountRate']['prev'] = round((1 - (revenue_sum / tag_revenue_sum)) * 100, 1)
-                    else:
-                        pl_data['discountRate']['prev'] = 0.0
-                    
-                    # 전년 영업비 (공통 채널)
-                    prev_op_expense = 0.0
-                    
-                    # 영업비 컬럼 재확인 (brand_df에서 다시 검색)
-                    if not op_expense_col:
-                        for col in brand_df.columns:
-                            col_str = str(col).strip()
-                            if '영업비' in col_str:
-                                op_expense_col = col
-                                print(f"    [영업비-prev] 컬럼 재검색 성공: {op_expense_col}")
-                                break
-                    
-                    # 공통 채널 데이터 재확인
-                    if 채널_col and op_expense_col:
-                        op_expense_df = brand_df[brand_df[채널_col].astype(str).str.strip() == '공통']
-                    
-                    if op_expense_col and not op_expense_df.empty:
-                        prev_op_expense = op_expense_df[op_expense_col].sum()
-                        print(f"    [영업비-prev] 컬럼: {op_expense_col}")
-                        print(f"    [영업비-prev] 공통 채널 데이터 행 수: {len(op_expense_df)}")
-                        print(f"    [영업비-prev] 합계: {prev_op_expense:,.0f}원 ({prev_op_expense/100000000:.2f}억원)")
-                    else:
-                        if not op_expense_col:
-                            print(f"    [WARNING] 전년 영업비 컬럼을 찾을 수 없습니다.")
-                            print(f"    [DEBUG] 사용 가능한 컬럼: {list(brand_df.columns)}")
-                        if op_expense_df.empty:
-                            print(f"    [WARNING] 전년 영업비 공통 채널 데이터가 없습니다.")
-                            # 공통 채널이 없으면 전체 브랜드 데이터에서 영업비 합산 시도
-                            if op_expense_col and not brand_df.empty:
-                                prev_op_expense = brand_df[op_expense_col].sum()
-                                if prev_op_expense > 0:
-                                    print(f"    [영업비-prev] 공통 채널 없음, 전체 브랜드 데이터에서 합산: {prev_op_expense:,.0f}원 ({prev_op_expense/100000000:.2f}억원)")
-                    
-                    # 전년 영업비 저장 (억원 단위)
-                    pl_data['operatingExpense']['prev'] = round(prev_op_expense / 100000000, 2)
-                    
-                    # 전년 영업이익 = 전년 직접이익 - 전년 영업비
-                    pl_data['opProfit']['prev'] = round(
-                        pl_data['directProfit']['prev'] - pl_data['operatingExpense']['prev'], 2
-                    )
-        
-        # 5. YOY 및 Achievement 계산
-        # YOY: (forecast / prev) * 100
-        if pl_data['tagRevenue']['prev'] > 0:
-            pl_data['tagRevenue']['yoy'] = round((pl_data['tagRevenue']['forecast'] / pl_data['tagRevenue']['prev']) * 100)
-        if pl_data['revenue']['prev'] > 0:
-            pl_data['revenue']['yoy'] = round((pl_data['revenue']['forecast'] / pl_data['revenue']['prev']) * 100)
-        if pl_data['cog']['prev'] > 0:
-            pl_data['cog']['yoy'] = round((pl_data['cog']['forecast'] / pl_data['cog']['prev']) * 100)
-        if pl_data['grossProfit']['prev'] > 0:
-            pl_data['grossProfit']['yoy'] = round((pl_data['grossProfit']['forecast'] / pl_data['grossProfit']['prev']) * 100)
-        if pl_data['directCost']['prev'] > 0:
-            pl_data['directCost']['yoy'] = round((pl_data['directCost']['forecast'] / pl_data['directCost']['prev']) * 100)
-        if pl_data['directProfit']['prev'] > 0:
-            pl_data['directProfit']['yoy'] = round((pl_data['directProfit']['forecast'] / pl_data['directProfit']['prev']) * 100)
-        if pl_data['operatingExpense']['prev'] > 0:
-            pl_data['operatingExpense']['yoy'] = round((pl_data['operatingExpense']['forecast'] / pl_data['operatingExpense']['prev']) * 100)
-        if pl_data['opProfit']['prev'] > 0:
-            pl_data['opProfit']['yoy'] = round((pl_data['opProfit']['forecast'] / pl_data['opProfit']['prev']) * 100)
-        
-        # 직접비 세부 항목 YOY
-        for detail_name in pl_data['directCostDetail'].keys():
-            if pl_data['directCostDetail'][detail_name]['prev'] > 0:
-                pl_data['directCostDetail'][detail_name]['yoy'] = round(
-                    (pl_data['directCostDetail'][detail_name]['forecast'] / pl_data['directCostDetail'][detail_name]['prev']) * 100
-                )
-        
-        # Achievement: (forecast / target) * 100
-        if pl_data['tagRevenue']['target'] > 0:
-            pl_data['tagRevenue']['achievement'] = round((pl_data['tagRevenue']['forecast'] / pl_data['tagRevenue']['target']) * 100)
-        if pl_data['revenue']['target'] > 0:
-            pl_data['revenue']['achievement'] = round((pl_data['revenue']['forecast'] / pl_data['revenue']['target']) * 100)
-        if pl_data['cog']['target'] > 0:
-            pl_data['cog']['achievement'] = round((pl_data['cog']['forecast'] / pl_data['cog']['target']) * 100)
-        if pl_data['grossProfit']['target'] > 0:
-            pl_data['grossProfit']['achievement'] = round((pl_data['grossProfit']['forecast'] / pl_data['grossProfit']['target']) * 100)
-        if pl_data['directCost']['target'] > 0:
-            pl_data['directCost']['achievement'] = round((pl_data['directCost']['forecast'] / pl_data['directCost']['target']) * 100)
-        if pl_data['directProfit']['target'] > 0:
-            pl_data['directProfit']['achievement'] = round((pl_data['directProfit']['forecast'] / pl_data['directProfit']['target']) * 100)
-        if pl_data['operatingExpense']['target'] > 0:
-            pl_data['operatingExpense']['achievement'] = round((pl_data['operatingExpense']['forecast'] / pl_data['operatingExpense']['target']) * 100)
-        if pl_data['opProfit']['target'] > 0:
-            pl_data['opProfit']['achievement'] = round((pl_data['opProfit']['forecast'] / pl_data['opProfit']['target']) * 100)
+            # 전년 영업이익 = 전년 직접이익 - 전년 영업비
+            pl_data['opProfit']['prev'] = round(
+                pl_data['directProfit']['prev'] - pl_data['operatingExpense']['prev'], 2
+            )
         
-        # 직접비 세부 항목 Achievement
-        for detail_name in pl_data['directCostDetail'].keys():
-            if pl_data['directCostDetail'][detail_name]['target'] > 0:
-                pl_data['directCostDetail'][detail_name]['achievement'] = round(
-                    (pl_data['directCostDetail'][detail_name]['forecast'] / pl_data['directCostDetail'][detail_name]['target']) * 100
-                )
+        # 5. YOY: (forecast / prev) * 100, Achievement: (forecast / target) * 100
+        targets = [pl_data[metric] for metric in RATIO_METRICS] + list(pl_data['directCostDetail'].values())
+        for values in targets:
+            if values['prev'] > 0:
+                values['yoy'] = round((values['forecast'] / values['prev']) * 100)
+            if values['target'] > 0:
+                values['achievement'] = round((values['forecast'] / values['target']) * 100)
         
         brand_pl_data[brand_name] = pl_data
         print(f"    [OK] {brand_name} PL 데이터 생성 완료")
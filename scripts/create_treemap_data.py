@@ -26,6 +26,7 @@ OUTPUT_DIR = os.path.join(ROOT, "public")
 # brandPLData 생성 모듈 import
 sys.path.append(os.path.dirname(__file__))
 from create_brand_pl_data import create_brand_pl_data
+from artifact_store import ArtifactStore
 
 # 브랜드 코드 → 이름
 BRAND_MAPPING = {
@@ -387,6 +388,19 @@ def save_data_js(treemap_data: dict, metrics: dict, brand_kpi: dict, channel_pl:
         f.write("})();\n")
     print(f"[OK] data.js 저장: {out_path}")
 
+    # 섹션 저장소도 새 값으로 갱신 (이후 단계는 섹션 단위로 읽고 씀)
+    try:
+        store = ArtifactStore.for_js_bundle(out_path)
+    except ValueError:
+        return
+    store.put("brandNames", BRAND_MAPPING)
+    store.put("channelItemSalesData", treemap_data)
+    for key in ["channelMetrics", "channelItemMetrics", "itemMetrics", "itemChannelMetrics"]:
+        store.put(key, metrics.get(key, {}))
+    store.put("brandKPI", brand_kpi)
+    store.put("channelPL", channel_pl)
+    store.put("brandPLData", brand_pl_data)
+
 def main(date_str: str = None):
     """
     메인 함수
@@ -0,0 +1,115 @@
+"""
+중간 결과 CSV 저장소 (메모리 전달 + 지연 저장)
+===============================================================
+
+파이프라인 단계끼리는 데이터프레임을 메모리로 주고받고,
+CSV 저장은 별도로 (즉시 또는 마지막에 한 번) 처리합니다.
+
+같은 경로를 여러 번 쓰면 지연 모드에서는 마지막 결과만 저장되고,
+read()는 이번 실행에서 쓴 데이터프레임을 CSV 재파싱 없이 반환합니다.
+(CSV를 다시 읽은 것과 같은 dtype으로 정리, as_csv_dtypes 참조)
+
+사용법:
+    from csv_sink import CsvSink
+
+    sink = CsvSink(deferred=True)
+    sink.write(df_shop, shop_path)
+    df = sink.read(shop_path)      # 메모리에서 반환
+    sink.flush()                   # 대기 중인 CSV 저장
+
+작성일: 2025-12
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class CsvSink:
+    """
+    데이터프레임 CSV 저장소
+
+    Args:
+        deferred: True면 write()는 메모리에만 보관하고 flush()에서 저장
+    """
+
+    def __init__(self, deferred: bool = False):
+        self.deferred = deferred
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._pending: Dict[str, pd.DataFrame] = {}
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.abspath(str(path))
+
+    def write(self, df: pd.DataFrame, path, label: str = None) -> Path:
+        """
+        데이터프레임 저장 (지연 모드면 flush()까지 보관)
+
+        Args:
+            df: 저장할 데이터프레임
+            path: CSV 경로
+            label: 로그용 이름 (예: "[채널별 전처리]")
+        """
+        key = self._key(path)
+        self._frames[key] = as_csv_dtypes(df)
+        if self.deferred:
+            self._pending[key] = df
+            if label:
+                print(f"\n[OK] {label} 저장 예약: {path}")
+        else:
+            self._save(df, key)
+            if label:
+                print(f"\n[OK] {label} 파일 저장: {path}")
+        if label:
+            print(f"   데이터: {len(df)}행 × {len(df.columns)}열")
+        return Path(path)
+
+    def read(self, path) -> pd.DataFrame:
+        """이번 실행에서 쓴 데이터프레임 (없으면 CSV 읽기)"""
+        key = self._key(path)
+        if key in self._frames:
+            return self._frames[key]
+        df = pd.read_csv(key, encoding="utf-8-sig")
+        self._frames[key] = df
+        return df
+
+    def exists(self, path) -> bool:
+        """메모리 또는 디스크에 있는지 여부"""
+        return self._key(path) in self._frames or os.path.exists(str(path))
+
+    def flush(self) -> List[Path]:
+        """대기 중인 CSV를 모두 저장"""
+        saved = []
+        for key, df in self._pending.items():
+            self._save(df, key)
+            saved.append(Path(key))
+        self._pending.clear()
+        if saved:
+            print(f"[OK] 지연 저장 완료: {len(saved)}개 파일")
+        return saved
+
+    @staticmethod
+    def _save(df: pd.DataFrame, key: str):
+        Path(key).parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(key, index=False, encoding="utf-8-sig")
+
+
+def as_csv_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    CSV로 저장 후 다시 읽은 것과 같은 dtype으로 정리 (메모리 전달용)
+
+    집계 결과의 object 컬럼 중 값이 모두 숫자(결측은 None)인 컬럼은
+    CSV 재파싱 시 float/int가 되므로 같은 형태로 변환합니다.
+    """
+    converted = {}
+    for col in df.columns[df.dtypes == object]:
+        values = df[col].dropna()
+        if len(values) and values.map(lambda value: isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))).all():
+            converted[col] = pd.to_numeric(df[col])
+    if not converted:
+        return df
+    return df.assign(**converted)
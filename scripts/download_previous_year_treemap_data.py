@@ -35,6 +35,11 @@ if sys.platform == 'win32':
 
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+scripts_dir = project_root / "scripts"
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from master_registry import load_master_frame
 
 env_path = project_root / '.env'
 if env_path.exists():
@@ -223,48 +228,76 @@ def execute_query_to_dataframe(conn, query: str):
         raise
 
 def load_channel_master():
-    """채널 마스터 로드"""
+    """채널 마스터 로드 (master_registry 캐시의 복사본)"""
     master_path = project_root / "Master" / "채널마스터.csv"
     if not master_path.exists():
         raise FileNotFoundError(f"채널 마스터를 찾을 수 없습니다: {master_path}")
     
-    df = pd.read_csv(master_path, encoding='utf-8-sig')
+    df = load_master_frame(master_path)
     print(f"✅ 채널 마스터 로드: {len(df)}건")
     return df
 
 def load_item_master():
-    """아이템 마스터 로드"""
+    """아이템 마스터 로드 (master_registry 캐시의 복사본)"""
     master_path = project_root / "Master" / "아이템마스터.csv"
     if not master_path.exists():
         raise FileNotFoundError(f"아이템 마스터를 찾을 수 없습니다: {master_path}")
     
-    df = pd.read_csv(master_path, encoding='utf-8-sig')
+    df = load_master_frame(master_path)
     print(f"✅ 아이템 마스터 로드: {len(df)}건")
     return df
 
-def map_channel_name(row, channel_master):
-    """
-    채널명 매핑 로직
-    CUST_CD가 채널마스터의 SAP_CD에 있으면 RF 반환
-    없으면 채널코드에 해당하는 채널명 반환
+def build_channel_lookup(channel_master):
     """
-    cust_cd = str(row['고객코드']).strip()
-    chnl_cd = str(row['채널코드']).strip()
+    채널명 매핑용 조회 테이블 (마스터당 한 번 생성)
     
-    # RF 체크: CUST_CD가 SAP_CD에 존재하는지 확인
+    Returns:
+        (RF SAP_CD 집합, 채널번호 -> 채널명 딕셔너리)
+    """
     # SAP_CD는 숫자일 수 있으므로 NULL이 아닌 값만 필터링하고 문자열로 변환
     rf_sap_codes = channel_master[channel_master['구분'] == 'RF']['SAP_CD'].dropna()
-    rf_sap_codes_str = [str(int(float(code))).strip() for code in rf_sap_codes]
+    rf_sap_codes_str = {str(int(float(code))).strip() for code in rf_sap_codes}
+    
+    # 같은 채널번호가 여러 행이면 첫 번째 행의 채널명 사용
+    channel_names = {}
+    for chnl_no, chnl_nm in zip(channel_master['채널번호'].astype(str), channel_master['채널명']):
+        channel_names.setdefault(chnl_no, str(chnl_nm).strip())
     
-    if cust_cd in rf_sap_codes_str:
+    return rf_sap_codes_str, channel_names
+
+def _lookup_channel_name(cust_cd, chnl_cd, channel_lookup):
+    rf_sap_codes_str, channel_names = channel_lookup
+    
+    # RF 체크: CUST_CD가 SAP_CD에 존재하는지 확인
+    if str(cust_cd).strip() in rf_sap_codes_str:
         return 'RF'
     
     # 채널코드로 채널명 찾기
-    channel_row = channel_master[channel_master['채널번호'].astype(str) == chnl_cd]
-    if not channel_row.empty:
-        return str(channel_row.iloc[0]['채널명']).strip()
-    
-    return '기타'
+    return channel_names.get(str(chnl_cd).strip(), '기타')
+
+def map_channel_name(row, channel_master):
+    """
+    채널명 매핑 로직
+    CUST_CD가 채널마스터의 SAP_CD에 있으면 RF 반환
+    없으면 채널코드에 해당하는 채널명 반환
+    """
+    return _lookup_channel_name(row['고객코드'], row['채널코드'], build_channel_lookup(channel_master))
+
+def _classify_distinct(df: pd.DataFrame, key_cols, classify) -> pd.Series:
+    """
+    key_cols 조합의 고유값만 classify로 분류한 뒤 join으로 전체 행에 매핑
+    (분류 비용이 행 수가 아닌 고유 조합 수에 비례)
+    """
+    keys = df[key_cols].drop_duplicates()
+    keys = keys.assign(_result=[classify(*values) for values in zip(*(keys[col] for col in key_cols))])
+    mapped = df[key_cols].merge(keys, on=key_cols, how='left')['_result']
+    return pd.Series(mapped.to_numpy(), index=df.index)
+
+def map_channel_names(df: pd.DataFrame, channel_master) -> pd.Series:
+    """채널명 매핑 (고유 (고객코드, 채널코드) 조합 기준)"""
+    channel_lookup = build_channel_lookup(channel_master)
+    return _classify_distinct(df, ['고객코드', '채널코드'],
+                              lambda cust_cd, chnl_cd: _lookup_channel_name(cust_cd, chnl_cd, channel_lookup))
 
 def prepare_item_master_for_merge(item_master):
     """
@@ -284,41 +317,20 @@ def prepare_item_master_for_merge(item_master):
     
     return item_master_clean
 
-def determine_season_category(row, current_date_str: str):
+def get_current_season(current_date_str: str):
     """
-    시즌 로직을 반영한 아이템_중분류 계산
-    
-    시즌 로직:
-    - SS시즌: 3월~8월, FW시즌: 9월~익년 2월
-    - 현재 시즌: 당시즌의류
-    - 과거 시즌: 과시즌의류
-    - 미래 시즌: 차시즌의류
-    - ACC: PRDT_HRRC2_NM 그대로 반환
+    현재 시즌 결정 (SS: 3-8월, FW: 9월~익년 2월)
     
     Args:
-        row: 데이터 행
         current_date_str: 현재 날짜 (YYYYMMDD)
     
     Returns:
-        str: 아이템_중분류
+        (시즌 구분 'S'/'F', 시즌 년도 2자리)
     """
-    prdt_hrrc_cd1 = str(row['prdt_hrrc_cd1']).strip().upper()
-    season_code = str(row['시즌']).strip().upper()
-    prdt_hrrc2_nm = str(row['PRDT_HRRC2_NM']).strip()
-    
-    # ACC인 경우 PRDT_HRRC2_NM 반환
-    if prdt_hrrc_cd1 == 'ACC' or prdt_hrrc_cd1.startswith('E02'):
-        return prdt_hrrc2_nm
-    
-    # 의류가 아닌 경우 PRDT_HRRC2_NM 반환
-    if not (prdt_hrrc_cd1 == '의류' or prdt_hrrc_cd1.startswith('E01') or prdt_hrrc_cd1 == 'L0100'):
-        return prdt_hrrc2_nm
-    
     # 현재 날짜에서 년/월 추출
     current_year = int(current_date_str[:4])
     current_month = int(current_date_str[4:6])
     
-    # 현재 시즌 결정 (SS: 3-8월, FW: 9-2월)
     if 3 <= current_month <= 8:
         current_season = 'S'
         current_season_year = current_year % 100  # 2025 -> 25
@@ -331,9 +343,29 @@ def determine_season_category(row, current_date_str: str):
         else:
             current_season_year = current_year % 100
     
+    return current_season, current_season_year
+
+def classify_season(prdt_hrrc_cd1, season_code, current_season: str, current_season_year: int):
+    """
+    의류 시즌 구분 (당시즌의류/과시즌의류/차시즌의류)
+    
+    Returns:
+        str: 시즌 구분, ACC/의류 외/시즌 코드 해석 불가이면 None (PRDT_HRRC2_NM 사용)
+    """
+    prdt_hrrc_cd1 = str(prdt_hrrc_cd1).strip().upper()
+    season_code = str(season_code).strip().upper()
+    
+    # ACC인 경우 PRDT_HRRC2_NM 반환
+    if prdt_hrrc_cd1 == 'ACC' or prdt_hrrc_cd1.startswith('E02'):
+        return None
+    
+    # 의류가 아닌 경우 PRDT_HRRC2_NM 반환
+    if not (prdt_hrrc_cd1 == '의류' or prdt_hrrc_cd1.startswith('E01') or prdt_hrrc_cd1 == 'L0100'):
+        return None
+    
     # 시즌 코드 파싱 (예: 25F, 25S, 25N)
     if not season_code or len(season_code) < 2:
-        return prdt_hrrc2_nm
+        return None
     
     try:
         # N을 포함하는 경우 (예: 25N) - 년도만 비교
@@ -365,7 +397,40 @@ def determine_season_category(row, current_date_str: str):
             return '차시즌의류'
             
     except (ValueError, IndexError):
-        return prdt_hrrc2_nm
+        return None
+
+def determine_season_category(row, current_date_str: str):
+    """
+    시즌 로직을 반영한 아이템_중분류 계산
+    
+    시즌 로직:
+    - SS시즌: 3월~8월, FW시즌: 9월~익년 2월
+    - 현재 시즌: 당시즌의류
+    - 과거 시즌: 과시즌의류
+    - 미래 시즌: 차시즌의류
+    - ACC: PRDT_HRRC2_NM 그대로 반환
+    
+    Args:
+        row: 데이터 행
+        current_date_str: 현재 날짜 (YYYYMMDD)
+    
+    Returns:
+        str: 아이템_중분류
+    """
+    category = classify_season(row['prdt_hrrc_cd1'], row['시즌'], *get_current_season(current_date_str))
+    return category if category is not None else str(row['PRDT_HRRC2_NM']).strip()
+
+def map_season_categories(df: pd.DataFrame, current_date_str: str) -> pd.Series:
+    """
+    아이템_중분류 계산 (determine_season_category와 같은 결과)
+    
+    현재 시즌은 한 번만 계산하고, 고유 (prdt_hrrc_cd1, 시즌) 조합만 분류해 join합니다.
+    """
+    current_season, current_season_year = get_current_season(current_date_str)
+    categories = _classify_distinct(df, ['prdt_hrrc_cd1', '시즌'],
+                                    lambda cd1, season: classify_season(cd1, season, current_season, current_season_year))
+    hrrc2_names = _classify_distinct(df, ['PRDT_HRRC2_NM'], lambda name: str(name).strip())
+    return categories.where(categories.notna(), hrrc2_names)
 
 def preprocess_treemap_data(df: pd.DataFrame, current_date_str: str) -> pd.DataFrame:
     """
@@ -411,7 +476,7 @@ def preprocess_treemap_data(df: pd.DataFrame, current_date_str: str) -> pd.DataF
     
     # 2) 채널명 매핑
     print("  [2/5] 채널명 매핑 중...")
-    df_agg['채널명'] = df_agg.apply(lambda row: map_channel_name(row, channel_master), axis=1)
+    df_agg['채널명'] = map_channel_names(df_agg, channel_master)
     rf_count = (df_agg['채널명'] == 'RF').sum()
     print(f"    RF 매핑: {rf_count:,}건")
     
@@ -440,7 +505,7 @@ def preprocess_treemap_data(df: pd.DataFrame, current_date_str: str) -> pd.DataF
     
     # 4) 아이템_중분류 필드 추가 (시즌 로직)
     print("  [4/5] 아이템_중분류 계산 중 (시즌 로직 적용)...")
-    df_agg['아이템_중분류'] = df_agg.apply(lambda row: determine_season_category(row, current_date_str), axis=1)
+    df_agg['아이템_중분류'] = map_season_categories(df_agg, current_date_str)
     
     # 당/과/차시즌 통계
     season_counts = df_agg['아이템_중분류'].value_counts()
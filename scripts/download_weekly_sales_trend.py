@@ -13,6 +13,7 @@
     - 당년 매출과 전년 동주차 매출을 모두 조회
     - X축에는 주차종료 일요일 날짜 표시
     - YOY(전년 대비 성장률) 계산
+    - 주차별 저장소(raw/_weekly_sales_store)에 없거나 확정 전인 주차만 Snowflake에서 조회
     
 환경 변수:
     SNOWFLAKE_ACCOUNT: Snowflake 계정명
@@ -25,6 +26,7 @@
 import os
 import sys
 import json
+import hashlib
 import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -39,8 +41,18 @@ warnings.filterwarnings('ignore')
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# scripts 내부 모듈끼리의 import(update_brand_radar → path_utils 등)도 되도록 scripts 경로 추가
+# (scripts.download_weekly_sales_trend로 import되는 경우)
+scripts_dir = project_root / "scripts"
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
 # path_utils 임포트
 from scripts.path_utils import get_plan_file_path, extract_year_month_from_date
+from scripts.master_registry import channel_code_to_name
+from scripts.weekly_sales_store import WeeklySalesStore
+from scripts.weekly_trend_summary import build_weekly_summary, week_label, to_raw_table, RAW_FILE_NAME
+from scripts.update_brand_radar import load_plan_data, extract_brand_total_plan_data
 
 # .env 파일 로드
 env_path = project_root / '.env'
@@ -110,19 +122,8 @@ def load_channel_master() -> dict:
         return default_mapping
     
     try:
-        master_df = pd.read_csv(master_path, encoding='utf-8-sig')
-        
-        # 채널번호 → 채널명 매핑 생성
-        channel_mapping = {}
-        for _, row in master_df.iterrows():
-            channel_code = str(row['채널번호']).strip()
-            channel_name = str(row['채널명']).strip()
-            
-            # 숫자인 경우 앞에 0 붙이기 (1 → 01)
-            if channel_code.isdigit() and len(channel_code) == 1:
-                channel_code = f"0{channel_code}"
-            
-            channel_mapping[channel_code] = channel_name
+        # 채널번호 → 채널명 매핑 (한 자리 숫자는 앞에 0: 1 → 01, master_registry 캐시 사용)
+        channel_mapping = channel_code_to_name(master_path)
         
         print(f"✅ 채널마스터 로드 완료: {len(channel_mapping)}개 채널")
         return channel_mapping
@@ -195,25 +196,31 @@ def calculate_week_end_dates(update_date: datetime, weeks: int = 9) -> tuple:
     return week_end_dates, start_date, end_date
 
 
-def get_weekly_sales_query(start_date: datetime, end_date: datetime) -> str:
+def get_weekly_sales_query(start_date: datetime, end_date: datetime, week_end_dates: list = None) -> str:
     """
     주차별 매출추세 조회 쿼리 생성
     
     Args:
         start_date: 조회 시작일 (첫 주 월요일)
         end_date: 조회 종료일 (마지막 주 일요일)
+        week_end_dates: 조회할 주차 종료일 목록 (주면 기간 조건 대신 해당 주차만 조회)
     
     Returns:
         str: SQL 쿼리
     """
-    start_str = start_date.strftime('%Y-%m-%d')
-    end_str = end_date.strftime('%Y-%m-%d')
+    if week_end_dates:
+        week_list = ", ".join(f"'{d.strftime('%Y-%m-%d')}'::DATE" for d in week_end_dates)
+        week_filter = f"END_DT IN ({week_list})"
+    else:
+        start_str = start_date.strftime('%Y-%m-%d')
+        end_str = end_date.strftime('%Y-%m-%d')
+        week_filter = f"END_DT BETWEEN '{start_str}'::DATE AND '{end_str}'::DATE"
     
     query = f"""
 WITH weeks AS (
     SELECT DISTINCT END_DT
     FROM FNF.PRCS.DB_SH_S_W
-    WHERE END_DT BETWEEN '{start_str}'::DATE AND '{end_str}'::DATE
+    WHERE {week_filter}
 ),
 
 curr AS (  -- 당년
@@ -305,6 +312,20 @@ ORDER BY "종료일", "브랜드", "유통채널", "구분"
     return query
 
 
+def get_query_version() -> str:
+    """
+    주차별 매출추세 쿼리 버전 (쿼리 본문 해시)
+    
+    쿼리를 수정하면 버전이 바뀌어 저장소의 기존 주차를 다시 조회합니다.
+    
+    Returns:
+        str: 쿼리 해시 앞 12자리
+    """
+    sample_week = datetime(2000, 1, 2)
+    query = get_weekly_sales_query(sample_week, sample_week, week_end_dates=[sample_week])
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()[:12]
+
+
 def execute_query_to_dataframe(conn, query: str):
     """
     Snowflake 쿼리 실행 및 결과를 pandas DataFrame으로 반환
@@ -424,11 +445,34 @@ def save_to_csv(df: pd.DataFrame, output_path: Path, description: str = ""):
         raise
 
 
+def load_brand_total_plan(update_date: datetime) -> dict:
+    """
+    브랜드별 전체 계획 매출 (내수합계, 원) - weekly_trend.json summary.byBrand[].totalPlan용
+    
+    Args:
+        update_date: 업데이트 일자
+    
+    Returns:
+        dict: {브랜드명: 전체계획매출액} (계획 파일이 없으면 빈 dict)
+    """
+    try:
+        year_month = extract_year_month_from_date(update_date.strftime('%Y%m%d'))
+        return extract_brand_total_plan_data(load_plan_data(year_month))
+    except Exception as e:
+        # totalPlan은 선택 항목이므로 계획 파일 문제로 주간 다운로드를 중단하지 않음
+        print(f"⚠️ 브랜드별 전체 계획 로드 실패 (totalPlan 생략): {type(e).__name__}: {e}")
+        return {}
+
+
 def save_to_js(df: pd.DataFrame, output_path: Path, update_date: datetime, 
-               week_end_dates: list, channel_mapping: dict, description: str = ""):
+               week_end_dates: list, channel_mapping: dict, description: str = "",
+               brand_total_plan: dict = None):
     """
     DataFrame을 JavaScript 파일로 저장
     
+    weekly_trend.json에는 요약만 저장하고, 원본 행(rawData)은
+    컬럼 단위 weekly_trend_raw.json으로 따로 저장합니다.
+    
     Args:
         df: 저장할 DataFrame
         output_path: 저장할 파일 경로
@@ -436,6 +480,7 @@ def save_to_js(df: pd.DataFrame, output_path: Path, update_date: datetime,
         week_end_dates: 주차 종료일 리스트
         channel_mapping: 채널 매핑 딕셔너리
         description: 파일 설명
+        brand_total_plan: 브랜드별 전체 계획 {브랜드명: 원} (summary.byBrand[].totalPlan)
     """
     import json
     
@@ -449,74 +494,10 @@ def save_to_js(df: pd.DataFrame, output_path: Path, update_date: datetime,
         data_list = df_copy.to_dict('records')
         
         # 주차 표시 리스트
-        weeks = [f"{d.month}/{d.day}" for d in week_end_dates]
-        
-        # 브랜드별, 채널명별 집계 데이터 생성
-        brand_summary = {}
-        for brand in df['브랜드'].unique():
-            brand_df = df[df['브랜드'] == brand]
-            brand_summary[brand] = {
-                'weekly': {},
-                'channels': {}
-            }
-            
-            # 주차별 합계
-            for end_date in week_end_dates:
-                date_str = str(end_date.date())
-                week_label = f"{end_date.month}/{end_date.day}"
-                week_df = brand_df[brand_df['종료일'].astype(str) == date_str]
-                
-                curr = week_df[week_df['구분'] == '당년']['실판매출'].sum()
-                prev = week_df[week_df['구분'] == '전년']['실판매출'].sum()
-                yoy = round((curr - prev) / prev * 100, 2) if prev != 0 else 0
-                
-                brand_summary[brand]['weekly'][week_label] = {
-                    '당년': int(curr),
-                    '전년': int(prev),
-                    'YOY': yoy
-                }
-            
-            # 채널별 합계
-            for channel_name in brand_df['채널명'].unique():
-                ch_df = brand_df[brand_df['채널명'] == channel_name]
-                curr = ch_df[ch_df['구분'] == '당년']['실판매출'].sum()
-                prev = ch_df[ch_df['구분'] == '전년']['실판매출'].sum()
-                yoy = round((curr - prev) / prev * 100, 2) if prev != 0 else 0
-                
-                brand_summary[brand]['channels'][channel_name] = {
-                    '당년': int(curr),
-                    '전년': int(prev),
-                    'YOY': yoy
-                }
-        
-        # 전체 집계
-        total_summary = {'weekly': {}, 'channels': {}}
-        for end_date in week_end_dates:
-            date_str = str(end_date.date())
-            week_label = f"{end_date.month}/{end_date.day}"
-            week_df = df[df['종료일'].astype(str) == date_str]
-            
-            curr = week_df[week_df['구분'] == '당년']['실판매출'].sum()
-            prev = week_df[week_df['구분'] == '전년']['실판매출'].sum()
-            yoy = round((curr - prev) / prev * 100, 2) if prev != 0 else 0
-            
-            total_summary['weekly'][week_label] = {
-                '당년': int(curr),
-                '전년': int(prev),
-                'YOY': yoy
-            }
+        weeks = [week_label(d) for d in week_end_dates]
         
-        for channel_name in df['채널명'].unique():
-            ch_df = df[df['채널명'] == channel_name]
-            curr = ch_df[ch_df['구분'] == '당년']['실판매출'].sum()
-            prev = ch_df[ch_df['구분'] == '전년']['실판매출'].sum()
-            yoy = round((curr - prev) / prev * 100, 2) if prev != 0 else 0
-            
-            total_summary['channels'][channel_name] = {
-                '당년': int(curr),
-                '전년': int(prev),
-                'YOY': yoy
-            }
+        # 브랜드별/전체 주차·채널 집계 (피벗 1회)
+        summary = build_weekly_summary(df, week_end_dates, brand_total_plan)
         
         # JavaScript 객체 구조
         js_data = {
@@ -529,10 +510,7 @@ def save_to_js(df: pd.DataFrame, output_path: Path, update_date: datetime,
             'channelMapping': channel_mapping,
             'brands': list(df['브랜드'].unique()),
             'channels': list(df['채널명'].unique()),
-            'summary': {
-                'total': total_summary,
-                'byBrand': brand_summary
-            },
+            'summary': summary,
             'rawData': data_list
         }
         
@@ -567,12 +545,23 @@ if (typeof module !== 'undefined' && module.exports) {{
         json_dir.mkdir(parents=True, exist_ok=True)
         json_path = json_dir / "weekly_trend.json"
         
+        # 요약 (rawData 제외, 원본 행 파일 위치만 기록)
+        trend_data = {key: value for key, value in js_data.items() if key != 'rawData'}
+        trend_data['rawDataFile'] = RAW_FILE_NAME
         with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(js_data, f, ensure_ascii=False, indent=2)
+            json.dump(trend_data, f, ensure_ascii=False, indent=2)
         
         print(f"✅ JSON 저장 완료: {json_path}")
         print(f"   파일 크기: {json_path.stat().st_size / 1024:.2f} KB")
         
+        # 원본 행 (컬럼 단위, 드릴다운 시 로드)
+        raw_path = json_dir / RAW_FILE_NAME
+        with open(raw_path, 'w', encoding='utf-8') as f:
+            json.dump(to_raw_table(df), f, ensure_ascii=False, separators=(',', ':'))
+        
+        print(f"✅ JSON 저장 완료: {raw_path}")
+        print(f"   파일 크기: {raw_path.stat().st_size / 1024:.2f} KB")
+        
     except Exception as e:
         print(f"❌ JS 저장 실패: {e}")
         raise
@@ -587,6 +576,8 @@ def main():
 예시:
   python scripts/download_weekly_sales_trend.py 2025-11-24
   python scripts/download_weekly_sales_trend.py  # 오늘 날짜 사용
+  python scripts/download_weekly_sales_trend.py 2025-11-24 --import-csv  # 기존 CSV로 저장소 채우기
+  python scripts/download_weekly_sales_trend.py 2025-11-24 --refresh     # 구간 전체 다시 조회
   
 설명:
   업데이트일자를 기준으로 이전 주차까지의 9주치 매출 데이터를 조회합니다.
@@ -618,6 +609,18 @@ def main():
         help='출력 디렉토리 경로 (기본값: raw/YYYYMM/ETC)'
     )
     
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='저장소에 있는 주차도 Snowflake에서 다시 조회'
+    )
+    
+    parser.add_argument(
+        '--import-csv',
+        action='store_true',
+        help='기존 raw/*/ETC/weekly_sales_trend_*.csv를 주차별 저장소로 가져오기 (최초 1회)'
+    )
+    
     args = parser.parse_args()
     
     # 업데이트일자 파싱
@@ -649,29 +652,55 @@ def main():
         # 채널마스터 로드
         channel_mapping = load_channel_master()
         
-        # Snowflake 연결
-        conn = get_snowflake_connection()
+        # 주차별 저장소 (저장소에 없는 주차만 조회)
+        store = WeeklySalesStore(query_version=get_query_version())
+        if args.import_csv:
+            # 최신 파일부터 가져오기 (같은 주차는 최신 다운로드 값 유지, 파일명 일자를 조회일로 기록)
+            for csv_path in sorted(project_root.glob("raw/*/ETC/weekly_sales_trend_*.csv"), reverse=True):
+                fetched_on = datetime.strptime(csv_path.stem.rsplit('_', 1)[-1], '%Y%m%d')
+                imported = store.import_csv(csv_path, fetched_on=fetched_on)
+                if imported:
+                    print(f"📦 저장소로 가져옴: {csv_path.name} ({len(imported)}주)")
+        
+        fetch_weeks = list(week_end_dates) if args.refresh else store.weeks_to_fetch(week_end_dates)
+        print(f"📦 주차별 저장소: {store.root_dir}")
+        print(f"   확정 주차: {len(week_end_dates) - len(fetch_weeks)}주, 조회 필요: {len(fetch_weeks)}주")
+        
+        if fetch_weeks:
+            # Snowflake 연결
+            conn = get_snowflake_connection()
+            
+            # 웨어하우스 상태 확인
+            print("\n🏭 웨어하우스 상태 확인 중...")
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT CURRENT_WAREHOUSE(), CURRENT_DATABASE()")
+                wh_info = cursor.fetchone()
+                print(f"   웨어하우스: {wh_info[0]}")
+                print(f"   데이터베이스: {wh_info[1]}")
+                cursor.close()
+            except Exception as e:
+                print(f"   ⚠️ 상태 확인 실패: {e}")
+            
+            # 쿼리 생성 및 실행 (조회 필요 주차만)
+            query = get_weekly_sales_query(start_date, end_date, week_end_dates=fetch_weeks)
+            print("\n📝 생성된 쿼리:")
+            print("-" * 50)
+            print(query[:500] + "..." if len(query) > 500 else query)
+            print("-" * 50)
+            
+            fetched = execute_query_to_dataframe(conn, query)
+            written = store.append(fetched)
+            print(f"📦 저장소에 추가: {', '.join(written) if written else '없음'}")
+            
+            not_loaded = [d for d in fetch_weeks if not store.has(d)]
+            if not_loaded:
+                print(f"⚠️ 조회 결과가 없는 주차 (다음 실행 때 다시 조회): {', '.join(d.strftime('%Y-%m-%d') for d in not_loaded)}")
+        else:
+            print("   모든 주차가 확정되어 Snowflake 조회를 생략합니다.")
         
-        # 웨어하우스 상태 확인
-        print("\n🏭 웨어하우스 상태 확인 중...")
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT CURRENT_WAREHOUSE(), CURRENT_DATABASE()")
-            wh_info = cursor.fetchone()
-            print(f"   웨어하우스: {wh_info[0]}")
-            print(f"   데이터베이스: {wh_info[1]}")
-            cursor.close()
-        except Exception as e:
-            print(f"   ⚠️ 상태 확인 실패: {e}")
-        
-        # 쿼리 생성 및 실행
-        query = get_weekly_sales_query(start_date, end_date)
-        print("\n📝 생성된 쿼리:")
-        print("-" * 50)
-        print(query[:500] + "..." if len(query) > 500 else query)
-        print("-" * 50)
-        
-        df = execute_query_to_dataframe(conn, query)
+        # 분석 구간 데이터는 저장소에서 읽기
+        df = store.read(week_end_dates)
         
         if df.empty:
             print("⚠️ 조회된 데이터가 없습니다.")
@@ -713,7 +742,8 @@ def main():
             update_date,
             week_end_dates,
             channel_mapping,
-            "주차별 매출추세 (JS)"
+            "주차별 매출추세 (JS)",
+            brand_total_plan=load_brand_total_plan(update_date)
         )
         
         # 결과 요약 출력
@@ -20,109 +20,103 @@ from datetime import datetime, timedelta
 ROOT = Path(__file__).parent.parent
 PUBLIC_DIR = ROOT / "public"
 
+sys.path.insert(0, str(Path(__file__).parent))
+from artifact_store import ArtifactStore, D_PREFIX
+from weekly_trend_summary import split_raw_data, RAW_FILE_NAME
+from stock_analysis_artifact import STOCK_SECTIONS, STOCK_ANALYSIS_FILE, build_stock_analysis, save_stock_analysis, dedupe_date
+
+
+# 문자열 리터럴 (이스케이프 포함)
+_JS_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+# 리터럴 내부 토큰: 문자열 또는 괄호
+_LITERAL_TOKEN_RE = re.compile(_JS_STRING + r'|[\{\}\[\]]')
+
+# 리터럴 외부 토큰: 문자열, 한 줄 주석, 선언 (var/const/let X = {, window.D.X = {)
+_DECLARATION_RE = re.compile(
+    _JS_STRING
+    + r'|//[^\n]*'
+    + r'|\b(?:var|const|let)\s+(?P<var>[\w$]+)\s*=\s*(?=[\{\[])'
+    + r'|\bwindow\.D\.(?P<prop>[\w$]+)\s*=\s*(?=[\{\[])'
+)
+
+
+def _find_literal_end(content: str, start: int) -> int:
+    """start 위치의 {...} 또는 [...] 리터럴 끝 위치 (닫히지 않으면 None)"""
+    depth = 0
+    pos = start
+    while True:
+        match = _LITERAL_TOKEN_RE.search(content, pos)
+        if not match:
+            return None
+        pos = match.end()
+        token = match.group()
+        if token[0] == '"':
+            continue
+        if token in '{[':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def index_js_literals(content: str) -> dict:
+    """
+    JS 파일의 모든 데이터 리터럴을 한 번의 순회로 추출
+    
+    `var X = {...}` (const/let 포함)과 `window.D.X = {...}` 리터럴을 찾아
+    JSON 문자열로 반환합니다. 문자열/괄호 단위로 건너뛰므로 파일 크기에 선형입니다.
+    변수 참조 (예: window.D.brandPLData = brandPLData;)는 제외됩니다.
+    
+    Returns:
+        dict: {'X': json_str, 'D.X': json_str} (같은 이름은 첫 번째 선언 사용)
+    """
+    blocks = {}
+    pos = 0
+    while True:
+        match = _DECLARATION_RE.search(content, pos)
+        if not match:
+            break
+        pos = match.end()
+        if match.group('var'):
+            name = match.group('var')
+        elif match.group('prop'):
+            name = D_PREFIX + match.group('prop')
+        else:
+            continue  # 문자열/주석
+        
+        end = _find_literal_end(content, pos)
+        if end is None:
+            break
+        blocks.setdefault(name, content[pos:end])
+        pos = end
+    return blocks
+
+
+def read_js_literals(js_path) -> dict:
+    """JS 파일을 한 번 읽어 모든 데이터 리터럴 추출 (index_js_literals 참조)"""
+    with open(js_path, 'r', encoding='utf-8') as f:
+        return index_js_literals(f.read())
+
 
 def find_var_in_iife(content: str, var_name: str) -> str:
-    """IIFE 내부의 var 선언에서 JSON 추출"""
+    """IIFE 내부의 var 선언에서 JSON 추출 (여러 변수는 index_js_literals 사용)"""
     # var varName = { 또는 var varName = [ 패턴
-    pattern = rf'\bvar\s+{re.escape(var_name)}\s*=\s*'
-    match = re.search(pattern, content)
-    
+    match = re.search(rf'\bvar\s+{re.escape(var_name)}\s*=\s*(?=[\{{\[])', content)
     if not match:
         return None
-    
-    start = match.end()
-    
-    # 시작 문자 찾기
-    while start < len(content) and content[start] not in '{[':
-        start += 1
-    
-    if start >= len(content):
-        return None
-    
-    # 중괄호/대괄호 매칭
-    brace_count = 0
-    in_string = False
-    escape_next = False
-    end = start
-    
-    for i in range(start, len(content)):
-        char = content[i]
-        
-        if escape_next:
-            escape_next = False
-            continue
-        
-        if char == '\\':
-            escape_next = True
-            continue
-        
-        if char == '"' and not escape_next:
-            in_string = not in_string
-            continue
-        
-        if not in_string:
-            if char in '{[':
-                brace_count += 1
-            elif char in '}]':
-                brace_count -= 1
-                if brace_count == 0:
-                    end = i + 1
-                    break
-    
-    return content[start:end]
+    end = _find_literal_end(content, match.end())
+    return content[match.end():end] if end else None
 
 
 def find_window_d_property(content: str, prop_name: str) -> str:
-    """window.D.property = 패턴에서 JSON 추출"""
-    pattern = rf'window\.D\.{re.escape(prop_name)}\s*=\s*'
-    match = re.search(pattern, content)
-    
+    """window.D.property = 패턴에서 JSON 추출 (변수 참조는 None)"""
+    match = re.search(rf'window\.D\.{re.escape(prop_name)}\s*=\s*(?=[\{{\[])', content)
     if not match:
         return None
-    
-    start = match.end()
-    
-    # 변수 참조인 경우 스킵 (예: window.D.brandPLData = brandPLData;)
-    rest = content[start:start+50].strip()
-    if rest and not rest.startswith('{') and not rest.startswith('['):
-        return None
-    
-    while start < len(content) and content[start] not in '{[':
-        start += 1
-    
-    if start >= len(content):
-        return None
-    
-    brace_count = 0
-    in_string = False
-    escape_next = False
-    end = start
-    
-    for i in range(start, len(content)):
-        char = content[i]
-        
-        if escape_next:
-            escape_next = False
-            continue
-        
-        if char == '\\':
-            escape_next = True
-            continue
-        
-        if char == '"' and not escape_next:
-            in_string = not in_string
-            continue
-        
-        if not in_string:
-            if char in '{[':
-                brace_count += 1
-            elif char in '}]':
-                brace_count -= 1
-                if brace_count == 0:
-                    end = i + 1
-                    break
-    
-    return content[start:end]
+    end = _find_literal_end(content, match.end())
+    return content[match.end():end] if end else None
 
 
 def calculate_analysis_month_from_update_date(update_date_str: str) -> str:
@@ -224,12 +218,23 @@ def export_to_json(date_str: str):
     print(f"[출력] {output_dir}")
     print()
     
-    # 1. data.js에서 추출 (선택적, JS 파일이 있으면 변환)
+    # 1. data.js 섹션 추출 (섹션 저장소 우선, 없는 섹션만 JS 파일에서 변환)
     data_js_path = PUBLIC_DIR / f"data_{date_str}.js"
-    if data_js_path.exists():
-        print(f"[읽기] {data_js_path.name} (선택적 변환)")
-        with open(data_js_path, 'r', encoding='utf-8') as f:
-            data_content = f.read()
+    store = ArtifactStore(date_str)
+    if data_js_path.exists() or store.names():
+        data_blocks = None
+        
+        def load_section(name: str) -> dict:
+            """섹션 저장소에서 읽고, 없으면 data.js를 (한 번만) 읽어 파싱"""
+            nonlocal data_blocks
+            if store.has(name):
+                return store.get(name)
+            if not data_js_path.exists():
+                return None
+            if data_blocks is None:
+                print(f"[읽기] {data_js_path.name} (선택적 변환)")
+                data_blocks = read_js_literals(data_js_path)
+            return parse_json_safe(data_blocks.get(name), name)
         
         # Overview 데이터 (window.D.xxx) - 이미 개별 JSON 파일이 있으면 스킵
         overview_files_exist = all([
@@ -244,8 +249,7 @@ def export_to_json(date_str: str):
         else:
             overview_data = {}
             for prop in ['by_brand', 'overviewPL', 'waterfallData', 'cumulativeTrendData']:
-                json_str = find_window_d_property(data_content, prop)
-                data = parse_json_safe(json_str, f"D.{prop}")
+                data = load_section(D_PREFIX + prop)
                 if data:
                     overview_data[prop] = data
                     print(f"  ✓ D.{prop}")
@@ -269,8 +273,7 @@ def export_to_json(date_str: str):
             if (output_dir / filename).exists():
                 print(f"  [스킵] {filename} 이미 존재, {var_name} 추출 생략")
             else:
-                json_str = find_var_in_iife(data_content, var_name)
-                data = parse_json_safe(json_str, var_name)
+                data = load_section(var_name)
                 if data:
                     with open(output_dir / filename, 'w', encoding='utf-8') as f:
                         json.dump(data, f, ensure_ascii=False, indent=2)
@@ -283,8 +286,7 @@ def export_to_json(date_str: str):
             metrics_data = {}
             for var_name in ['brandNames', 'channelItemSalesData', 'channelMetrics', 
                              'channelItemMetrics', 'itemMetrics', 'itemChannelMetrics']:
-                json_str = find_var_in_iife(data_content, var_name)
-                data = parse_json_safe(json_str, var_name)
+                data = load_section(var_name)
                 if data:
                     metrics_data[var_name] = data
                     print(f"  ✓ {var_name}")
@@ -304,65 +306,47 @@ def export_to_json(date_str: str):
             print(f"[스킵] weekly_trend.json 이미 존재, {weekly_js_path.name} 변환 생략")
         else:
             print(f"[읽기] {weekly_js_path.name} (선택적 변환)")
-        with open(weekly_js_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        json_str = find_var_in_iife(content, 'weeklySalesTrend')
-        if not json_str:
-            # const 패턴 시도
-            pattern = r'\bconst\s+weeklySalesTrend\s*=\s*'
-            match = re.search(pattern, content)
-            if match:
-                start = match.end()
-                while start < len(content) and content[start] not in '{[':
-                    start += 1
-                brace_count = 0
-                in_string = False
-                end = start
-                for i in range(start, len(content)):
-                    char = content[i]
-                    if char == '"':
-                        in_string = not in_string
-                    if not in_string:
-                        if char in '{[':
-                            brace_count += 1
-                        elif char in '}]':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                end = i + 1
-                                break
-                json_str = content[start:end]
-        
-        data = parse_json_safe(json_str, 'weeklySalesTrend')
-        if data:
-            with open(output_dir / "weekly_trend.json", 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            print(f"  ✓ weeklySalesTrend → weekly_trend.json")
+            blocks = read_js_literals(weekly_js_path)
+            
+            # var/const 선언 모두 인덱싱됨
+            json_str = blocks.get('weeklySalesTrend')
+            
+            data = parse_json_safe(json_str, 'weeklySalesTrend')
+            if data:
+                # rawData는 컬럼 단위 weekly_trend_raw.json으로 분리
+                data, raw_table = split_raw_data(data)
+                with open(output_dir / "weekly_trend.json", 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                print(f"  ✓ weeklySalesTrend → weekly_trend.json")
+                if raw_table is not None:
+                    with open(output_dir / RAW_FILE_NAME, 'w', encoding='utf-8') as f:
+                        json.dump(raw_table, f, ensure_ascii=False, separators=(',', ':'))
+                    print(f"  ✓ weeklySalesTrend.rawData → {RAW_FILE_NAME}")
     
     # 3. brand_stock_analysis.js (선택적, JS 파일이 있으면 변환)
     stock_js_path = PUBLIC_DIR / f"brand_stock_analysis_{date_str}.js"
     if stock_js_path.exists():
         # 이미 JSON 파일이 있으면 스킵
-        if (output_dir / "stock_analysis.json").exists():
-            print(f"[스킵] stock_analysis.json 이미 존재, {stock_js_path.name} 변환 생략")
+        if (output_dir / STOCK_ANALYSIS_FILE).exists():
+            print(f"[스킵] {STOCK_ANALYSIS_FILE} 이미 존재, {stock_js_path.name} 변환 생략")
         else:
             print(f"[읽기] {stock_js_path.name} (선택적 변환)")
-        with open(stock_js_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        stock_data = {}
-        for var_name in ['brandStockMetadata', 'clothingBrandStatus', 'accStockAnalysis', 
-                         'clothingSummary', 'accSummary']:
-            json_str = find_var_in_iife(content, var_name)
-            data = parse_json_safe(json_str, var_name)
-            if data:
-                stock_data[var_name] = data
-                print(f"  ✓ {var_name}")
-        
-        if stock_data:
-            with open(output_dir / "stock_analysis.json", 'w', encoding='utf-8') as f:
-                json.dump(stock_data, f, ensure_ascii=False, indent=2)
-            print(f"  → stock_analysis.json")
+            blocks = read_js_literals(stock_js_path)
+            
+            stock_data = {}
+            for var_name in STOCK_SECTIONS:
+                data = parse_json_safe(blocks.get(var_name), var_name)
+                if data:
+                    stock_data[var_name] = data
+                    print(f"  ✓ {var_name}")
+            
+            # 브랜드/전체현황 섹션을 하나의 stock_analysis.json으로 저장
+            if stock_data:
+                save_stock_analysis(output_dir, build_stock_analysis(stock_data))
+                print(f"  → {STOCK_ANALYSIS_FILE}")
+    
+    # 예전 overview_stock_analysis.json이 남아 있으면 stock_analysis.json으로 합치고 삭제
+    dedupe_date(date_str)
     
     # 4. treemap_data_v2.js (선택적, JS 파일이 있으면 변환)
     treemap_js_path = PUBLIC_DIR / f"treemap_data_v2_{date_str}.js"
@@ -372,15 +356,12 @@ def export_to_json(date_str: str):
             print(f"[스킵] treemap.json 이미 존재, {treemap_js_path.name} 변환 생략")
         else:
             print(f"[읽기] {treemap_js_path.name} (선택적 변환)")
-        with open(treemap_js_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        json_str = find_var_in_iife(content, 'channelTreemapData')
-        data = parse_json_safe(json_str, 'channelTreemapData')
-        if data:
-            with open(output_dir / "treemap.json", 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            print(f"  ✓ channelTreemapData → treemap.json")
+            blocks = read_js_literals(treemap_js_path)
+            data = parse_json_safe(blocks.get('channelTreemapData'), 'channelTreemapData')
+            if data:
+                with open(output_dir / "treemap.json", 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                print(f"  ✓ channelTreemapData → treemap.json")
     
     print()
     print("=" * 50)
@@ -13,6 +13,9 @@
 작성일: 2025-11-24
 """
 
+import hashlib
+import json
+import numpy as np
 import pandas as pd
 import os
 import sys
@@ -23,6 +26,13 @@ from typing import Dict, List, Optional
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+scripts_dir = project_root / "scripts"
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from plan_repository import get_plan_file, get_plan_repository
+from master_registry import channel_sap_to_number, royalty_rates
+
 # 경로 설정
 MASTER_DIR = project_root / "Master"
 CHANNEL_MASTER_PATH = MASTER_DIR / "채널마스터.csv"
@@ -48,6 +58,9 @@ CHANNEL_NAME_MAPPING = {
     '직영(가두)2': '직영몰'
 }
 
+# 계획 폴더에 함께 저장되는 직접비 결과 파일 (계획 파일 아님)
+DERIVED_FILE_MARKERS = ('직접비율', '직접비금액')
+
 # 직접비 항목 목록
 DIRECT_COST_ITEMS = [
     '지급수수료_중간관리수수료',
@@ -66,10 +79,19 @@ DIRECT_COST_ITEMS = [
     '감가상각비_임차시설물'
 ]
 
+# 계획 파일 금액으로 처리하는 항목
+PLAN_AMOUNT_ITEMS = ['지급임차료_매장(고정)', '감가상각비_임차시설물']
+
+# 비율 계산 대상 항목 (금액 처리 항목 제외)
+RATE_ITEMS = [
+    item for item in DIRECT_COST_ITEMS
+    if item not in EXCLUDED_COSTS and item not in PLAN_AMOUNT_ITEMS
+]
+
 
 def load_channel_master() -> Dict[str, int]:
     """
-    채널 마스터 파일 로드하여 채널명 -> 채널번호 매핑 반환
+    채널 마스터 파일 로드하여 채널명 -> 채널번호 매핑 반환 (master_registry 캐시 사용)
     
     Returns:
         Dict[str, int]: 채널명 -> 채널번호 매핑
@@ -77,53 +99,14 @@ def load_channel_master() -> Dict[str, int]:
     if not CHANNEL_MASTER_PATH.exists():
         raise FileNotFoundError(f"[ERROR] 채널 마스터 파일이 없습니다: {CHANNEL_MASTER_PATH}")
     
-    df = pd.read_csv(CHANNEL_MASTER_PATH, encoding="utf-8-sig")
-    
-    # 채널sap 컬럼 찾기
-    channel_sap_col = None
-    channel_num_col = None
-    
-    for col in df.columns:
-        col_str = str(col).strip()
-        if channel_sap_col is None and ("채널sap" in col_str.lower() or "채널 sap" in col_str.lower()):
-            channel_sap_col = col
-        if channel_num_col is None and ("채널번호" in col_str or "채널 번호" in col_str):
-            channel_num_col = col
-    
-    if not channel_sap_col or not channel_num_col:
-        # 기본값: 첫 번째와 세 번째 컬럼
-        if len(df.columns) >= 3:
-            channel_num_col = df.columns[0]
-            channel_sap_col = df.columns[2]
-        else:
-            raise ValueError(f"[ERROR] 채널 마스터 컬럼을 찾을 수 없습니다. 현재 컬럼: {list(df.columns)}")
-    
-    mapping = {}
-    for _, row in df[[channel_num_col, channel_sap_col]].dropna().iterrows():
-        channel_name = str(row[channel_sap_col]).strip()
-        channel_num = row[channel_num_col]
-        
-        # 채널번호를 정수로 변환
-        try:
-            if pd.notna(channel_num):
-                if isinstance(channel_num, str) and channel_num.strip() == '':
-                    continue
-                channel_num_int = int(float(channel_num)) if channel_num != 'RF' else 0
-            else:
-                continue
-        except (ValueError, TypeError):
-            continue
-        
-        if channel_name and channel_name != '':
-            mapping[channel_name] = channel_num_int
-    
+    mapping = channel_sap_to_number(CHANNEL_MASTER_PATH)
     print(f"[OK] 채널 마스터 로드: {len(mapping)}개 매핑")
     return mapping
 
 
 def load_royalty_rate_master() -> Dict[tuple, Dict]:
     """
-    로열티율 마스터 파일 로드
+    로열티율 마스터 파일 로드 (master_registry 캐시 사용)
     
     Returns:
         Dict: {(브랜드, 유통채널): {'rate': 비율, 'base': 기준매출}} 형태의 딕셔너리
@@ -131,33 +114,7 @@ def load_royalty_rate_master() -> Dict[tuple, Dict]:
     if not ROYALTY_RATE_MASTER_PATH.exists():
         raise FileNotFoundError(f"[ERROR] 로열티율 마스터 파일이 없습니다: {ROYALTY_RATE_MASTER_PATH}")
     
-    df = pd.read_csv(ROYALTY_RATE_MASTER_PATH, encoding="utf-8-sig")
-    
-    # 빈 행 제거
-    df = df.dropna(subset=['브랜드', '유통채널'])
-    
-    royalty_dict = {}
-    for _, row in df.iterrows():
-        brand = str(row['브랜드']).strip()
-        channel_num = row['유통채널']
-        rate_str = str(row['%/원']).strip().replace('%', '')
-        base = str(row['기준매출']).strip()
-        
-        if pd.isna(channel_num) or brand == '' or rate_str == '' or rate_str == 'nan':
-            continue
-        
-        try:
-            channel_num_int = int(float(channel_num))
-            rate = float(rate_str) / 100  # 퍼센트를 소수로 변환
-        except (ValueError, TypeError):
-            continue
-        
-        key = (brand, channel_num_int)
-        royalty_dict[key] = {
-            'rate': rate,
-            'base': base  # '실판가(V-)' 또는 '출고가(V-)'
-        }
-    
+    royalty_dict = royalty_rates(ROYALTY_RATE_MASTER_PATH)
     print(f"[OK] 로열티율 마스터 로드: {len(royalty_dict)}개 매핑")
     return royalty_dict
 
@@ -167,29 +124,16 @@ def is_rf_file(filename: str) -> bool:
     return "RF" in filename.upper() and "_RF" in filename.upper()
 
 
-def read_plan_file(filepath: str):
+def plan_brand_code(filepath: str, plan_file=None) -> str:
     """
-    계획 파일 읽기
-    
-    Args:
-        filepath: 계획 파일 경로
+    계획 파일 브랜드 코드 (1행, 없으면 파일명에서 추출)
     
-    Returns:
-        tuple: (데이터프레임, 채널목록, 브랜드코드)
+    파싱 결과는 plan_repository에 캐시되므로 같은 파일을 여러 단계에서 읽어도
+    CSV는 한 번만 파싱됩니다.
     """
-    df = pd.read_csv(filepath, encoding="utf-8-sig", header=None)
-    
-    # 첫 3행이 헤더 정보
-    if len(df) < 3:
-        raise ValueError(f"[ERROR] 파일 형식이 올바르지 않습니다: {filepath}")
-    
-    # 브랜드 코드 추출 (1행)
-    brand_row = df.iloc[0]
-    brand_code = None
-    for val in brand_row.values[1:]:
-        if pd.notna(val) and str(val).strip() in ['M', 'I', 'ST', 'V', 'W', 'X']:
-            brand_code = str(val).strip()
-            break
+    if plan_file is None:
+        plan_file = get_plan_file(filepath)
+    brand_code = plan_file.brand_code
     
     if not brand_code:
         # 파일명에서 추출 시도
@@ -209,29 +153,159 @@ def read_plan_file(filepath: str):
         else:
             brand_code = "UNKNOWN"
     
-    # 채널명 추출 (3행)
-    channel_row = df.iloc[2]
-    channels = [str(val).strip() if pd.notna(val) else "" for val in channel_row.values[1:]]
+    return brand_code
+
+
+def find_sales_row_label(first_rows: Dict[str, int]) -> Optional[str]:
+    """구분 목록에서 실판매액 [v-] 행 찾기 (파일 내 첫 번째 행)"""
+    for label, idx in sorted(first_rows.items(), key=lambda item: item[1]):
+        if '실판매액' in label and '[v-]' in label.lower():
+            return label
+    return None
+
+
+def resolve_channel_number(channel: str, channel_master: Dict[str, int]) -> Optional[int]:
+    """
+    계획 파일 채널명을 채널번호로 변환 (정확 매칭 후 부분 매칭)
+    
+    Returns:
+        Optional[int]: 채널번호 (찾지 못하면 None)
+    """
+    channel_num = channel_master.get(channel, None)
+    if channel_num is None:
+        for key, val in channel_master.items():
+            if channel in key or key in channel:
+                return val
+    return channel_num
+
+
+def get_plan_channels(channels: List[str], channel_master: Dict[str, int]) -> Dict[str, int]:
+    """
+    직접비 계산 대상 채널 -> 채널번호 매핑 (파일 내 채널 순서 유지)
     
-    # 데이터 부분 (4행부터)
-    data_df = df.iloc[3:].copy()
-    data_df.columns = ["구분"] + channels
+    Unassigned/수출/빈 채널, 중복 채널 컬럼, 채널번호가 없는 채널은 제외합니다.
+    """
+    counts = pd.Series(channels, dtype=object).value_counts()
+    duplicated = set(counts[counts > 1].index)
+    plan_channels = {}
+    for channel in channels:
+        if not channel or channel == "Unassigned" or channel == "수출" or channel.strip() == "":
+            continue
+        if channel in duplicated or channel in plan_channels:
+            continue
+        channel_num = resolve_channel_number(channel, channel_master)
+        if channel_num is None:
+            continue
+        plan_channels[channel] = channel_num
+    return plan_channels
+
+
+def _flatten_plan_matrix(matrix: pd.DataFrame, *aligned: pd.DataFrame):
+    """
+    항목 × 채널 행렬에서 값이 있는 셀을 채널 순 → 항목 순으로 펼치기
     
-    # 구분 컬럼 정리
-    data_df["구분"] = data_df["구분"].astype(str).str.strip()
-    data_df = data_df[data_df["구분"].notna() & (data_df["구분"] != "")]
-    data_df = data_df.reset_index(drop=True)
+    Args:
+        matrix: 기준 행렬 (NaN 셀은 제외)
+        *aligned: 같은 모양의 행렬 (기준 행렬과 같은 셀을 함께 펼침)
     
-    return data_df, channels, brand_code
+    Returns:
+        tuple: (채널 배열, 항목 배열, 값 배열, *aligned 값 배열)
+    """
+    values = matrix.to_numpy().T
+    channel_pos, item_pos = np.nonzero(~np.isnan(values))
+    channels = np.asarray(matrix.columns, dtype=object)[channel_pos]
+    items = np.asarray(matrix.index, dtype=object)[item_pos]
+    extra = tuple(other.to_numpy().T[channel_pos, item_pos] for other in aligned)
+    return (channels, items, values[channel_pos, item_pos]) + extra
+
+
+def list_plan_source_files(plan_dir: str) -> List[str]:
+    """
+    직접비 추출 대상 계획 파일 목록 (파일명 순)
+    
+    RF 파일과 이 스크립트가 같은 폴더에 저장하는 직접비 결과 파일은 제외합니다.
+    """
+    if not os.path.exists(plan_dir):
+        raise FileNotFoundError(f"[ERROR] 계획 데이터 폴더가 없습니다: {plan_dir}")
+    
+    plan_files = []
+    for filename in sorted(os.listdir(plan_dir)):
+        if not filename.endswith(".csv") or is_rf_file(filename):
+            continue
+        if any(marker in filename for marker in DERIVED_FILE_MARKERS):
+            continue
+        plan_files.append(os.path.join(plan_dir, filename))
+    
+    if not plan_files:
+        raise FileNotFoundError(f"[ERROR] 계획 파일을 찾을 수 없습니다: {plan_dir}")
+    return plan_files
+
 
+def extract_file_amounts(filepath: str, channel_master: Dict[str, int]) -> pd.DataFrame:
+    """계획 파일 하나에서 지급임차료_매장(고정), 감가상각비_임차시설물 금액 추출 (롱 포맷 조회)"""
+    plan_file = get_plan_file(filepath)
+    plan_channels = get_plan_channels(plan_file.channels, channel_master)
+    
+    # 항목 × 채널 금액 행렬 (계획 파일의 금액은 *1000하여 가져옴: 1275 -> 1,275,000)
+    amount_matrix = plan_file.value_matrix(PLAN_AMOUNT_ITEMS, list(plan_channels)) * 1000
+    channel_arr, item_arr, amount_arr = _flatten_plan_matrix(amount_matrix)
+    
+    return pd.DataFrame({
+        '브랜드': plan_brand_code(filepath, plan_file),
+        '유통채널': [plan_channels[ch] for ch in channel_arr],
+        '직접비항목': item_arr,
+        '금액': amount_arr
+    })
 
-def extract_plan_amounts(plan_dir: str, channel_master: Dict[str, int]) -> pd.DataFrame:
+
+def extract_file_rates(filepath: str, channel_master: Dict[str, int]) -> Optional[pd.DataFrame]:
+    """
+    계획 파일 하나에서 직접비율 추출 (롱 포맷 조회)
+    
+    직접비 행렬 ÷ 실판매액 [v-] 행으로 전체 채널의 비율을 한 번에 계산합니다.
+    
+    Returns:
+        pd.DataFrame: 직접비율 (실판매액 [v-] 행이 없으면 None)
+    """
+    plan_file = get_plan_file(filepath)
+    
+    # 실판매액 [v-] 행 찾기
+    sales_label = find_sales_row_label(plan_file.first_rows())
+    
+    if sales_label is None:
+        print(f"  [WARNING] 실판매액 [v-] 행을 찾을 수 없습니다. 스킵합니다.")
+        return None
+    
+    plan_channels = get_plan_channels(plan_file.channels, channel_master)
+    
+    # 실판매액 [v-]이 없거나 0인 채널 제외
+    sales = plan_file.value_matrix([sales_label], list(plan_channels)).iloc[0]
+    sales = sales[sales.notna() & (sales != 0)]
+    
+    # 직접비 행렬 ÷ 실판매액 행 (전체 채널 한 번에 계산)
+    cost_matrix = plan_file.value_matrix(RATE_ITEMS, list(sales.index))
+    rate_matrix = cost_matrix.div(sales, axis=1) * 100
+    channel_arr, item_arr, rate_arr, cost_arr = _flatten_plan_matrix(rate_matrix, cost_matrix)
+    
+    return pd.DataFrame({
+        '브랜드': plan_brand_code(filepath, plan_file),
+        '유통채널': [plan_channels[ch] for ch in channel_arr],
+        '채널': channel_arr,  # 참고용으로 유지
+        '직접비항목': item_arr,
+        '직접비값': cost_arr,
+        '실판매액V-': sales.loc[channel_arr].to_numpy(),
+        '비율': rate_arr
+    })
+
+
+def extract_plan_amounts(plan_dir: str, channel_master: Dict[str, int], plan_files: List[str] = None) -> pd.DataFrame:
     """
     계획 파일에서 지급임차료_매장(고정), 감가상각비_임차시설물 금액 추출
     
     Args:
         plan_dir: 계획 파일 디렉토리
         channel_master: 채널 마스터 매핑
+        plan_files: 대상 파일 목록 (None이면 폴더의 전체 계획 파일)
     
     Returns:
         pd.DataFrame: 브랜드별/유통채널별 금액 데이터프레임
@@ -240,96 +314,40 @@ def extract_plan_amounts(plan_dir: str, channel_master: Dict[str, int]) -> pd.Da
     print("계획 파일에서 금액 추출 시작 (지급임차료_매장(고정), 감가상각비_임차시설물)")
     print("=" * 60)
     
-    if not os.path.exists(plan_dir):
-        raise FileNotFoundError(f"[ERROR] 계획 데이터 폴더가 없습니다: {plan_dir}")
-    
-    # 계획 파일 찾기 (RF 파일 제외)
-    plan_files = []
-    for filename in os.listdir(plan_dir):
-        if filename.endswith(".csv") and not is_rf_file(filename):
-            filepath = os.path.join(plan_dir, filename)
-            plan_files.append(filepath)
-    
-    if not plan_files:
-        raise FileNotFoundError(f"[ERROR] 계획 파일을 찾을 수 없습니다: {plan_dir}")
+    if plan_files is None:
+        plan_files = list_plan_source_files(plan_dir)
     
     all_amounts = []
-    cost_items = ['지급임차료_매장(고정)', '감가상각비_임차시설물']
     
     for filepath in plan_files:
         filename = os.path.basename(filepath)
         
         try:
-            df, channels, brand_code = read_plan_file(filepath)
-            
-            for channel in channels:
-                if not channel or channel == "Unassigned" or channel == "수출" or channel.strip() == "":
-                    continue
-                
-                if channel not in df.columns:
-                    continue
-                
-                # 채널번호 변환
-                channel_num = channel_master.get(channel, None)
-                if channel_num is None:
-                    for key, val in channel_master.items():
-                        if channel in key or key in channel:
-                            channel_num = val
-                            break
-                
-                if channel_num is None:
-                    continue
-                
-                # 각 직접비 항목별로 금액 추출
-                for cost_item in cost_items:
-                    cost_row_idx = None
-                    for idx, row in df.iterrows():
-                        if str(row["구분"]).strip() == cost_item:
-                            cost_row_idx = idx
-                            break
-                    
-                    if cost_row_idx is None:
-                        continue
-                    
-                    cost_val = df.at[cost_row_idx, channel]
-                    if pd.isna(cost_val) or cost_val == "":
-                        continue
-                    
-                    try:
-                        cost_amount = float(cost_val)
-                        # 계획 파일의 금액은 *1000하여 가져옴 (1275 -> 1,275,000)
-                        cost_amount = cost_amount * 1000
-                    except (ValueError, TypeError):
-                        continue
-                    
-                    all_amounts.append({
-                        '브랜드': brand_code,
-                        '유통채널': channel_num,
-                        '직접비항목': cost_item,
-                        '금액': cost_amount
-                    })
+            all_amounts.append(extract_file_amounts(filepath, channel_master))
         
         except Exception as e:
             print(f"  [ERROR] 파일 처리 실패: {filename} - {e}")
             continue
     
+    all_amounts = [amounts for amounts in all_amounts if not amounts.empty]
     if not all_amounts:
         print("[WARNING] 추출된 금액이 없습니다.")
         return pd.DataFrame()
     
-    amounts_df = pd.DataFrame(all_amounts)
+    amounts_df = pd.concat(all_amounts, ignore_index=True)
     print(f"[OK] 금액 추출 완료: {len(amounts_df)}건")
     
     return amounts_df
 
 
-def extract_direct_cost_rates(plan_dir: str, channel_master: Dict[str, int]) -> pd.DataFrame:
+def extract_direct_cost_rates(plan_dir: str, channel_master: Dict[str, int], plan_files: List[str] = None) -> pd.DataFrame:
     """
     계획 파일에서 직접비율 추출
     
     Args:
         plan_dir: 계획 파일 디렉토리
         channel_master: 채널 마스터 매핑 (채널명 -> 채널번호)
+        plan_files: 대상 파일 목록 (None이면 폴더의 전체 계획 파일)
     
     Returns:
         pd.DataFrame: 브랜드별/유통채널별 직접비율 데이터프레임
@@ -338,18 +356,8 @@ def extract_direct_cost_rates(plan_dir: str, channel_master: Dict[str, int]) ->
     print("계획 파일에서 직접비율 추출 시작")
     print("=" * 60)
     
-    if not os.path.exists(plan_dir):
-        raise FileNotFoundError(f"[ERROR] 계획 데이터 폴더가 없습니다: {plan_dir}")
-    
-    # 계획 파일 찾기 (RF 파일 제외)
-    plan_files = []
-    for filename in os.listdir(plan_dir):
-        if filename.endswith(".csv") and not is_rf_file(filename):
-            filepath = os.path.join(plan_dir, filename)
-            plan_files.append(filepath)
-    
-    if not plan_files:
-        raise FileNotFoundError(f"[ERROR] 계획 파일을 찾을 수 없습니다: {plan_dir}")
+    if plan_files is None:
+        plan_files = list_plan_source_files(plan_dir)
     
     print(f"[INFO] 처리 대상 파일 수: {len(plan_files)}")
     
@@ -360,97 +368,9 @@ def extract_direct_cost_rates(plan_dir: str, channel_master: Dict[str, int]) ->
         print(f"\n[처리 중] {filename}")
         
         try:
-            df, channels, brand_code = read_plan_file(filepath)
-            
-            # 실판매액 [v-] 행 찾기
-            sales_row_idx = None
-            for idx, row in df.iterrows():
-                if '실판매액' in str(row["구분"]) and '[v-]' in str(row["구분"]).lower():
-                    sales_row_idx = idx
-                    break
-            
-            if sales_row_idx is None:
-                print(f"  [WARNING] 실판매액 [v-] 행을 찾을 수 없습니다. 스킵합니다.")
-                continue
-            
-            # 각 채널별로 직접비율 계산
-            for channel in channels:
-                if not channel or channel == "Unassigned" or channel == "수출" or channel.strip() == "":
-                    continue
-                
-                # 채널 컬럼이 있는지 확인
-                if channel not in df.columns:
-                    continue
-                
-                # 실판매액 [v-] 값 가져오기
-                sales_val = df.at[sales_row_idx, channel]
-                if pd.isna(sales_val) or sales_val == "":
-                    continue
-                
-                try:
-                    sales_value = float(sales_val)
-                except (ValueError, TypeError):
-                    continue
-                
-                if sales_value == 0:
-                    continue
-                
-                # 각 직접비 항목별로 비율 계산
-                for cost_item in DIRECT_COST_ITEMS:
-                    # 제외 항목은 스킵
-                    if cost_item in EXCLUDED_COSTS:
-                        continue
-                    
-                    # 지급임차료_매장(고정), 감가상각비_임차시설물은 비율 계산 대상이 아님 (금액으로 처리)
-                    if cost_item in ['지급임차료_매장(고정)', '감가상각비_임차시설물']:
-                        continue
-                    
-                    # 직접비 행 찾기
-                    cost_row_idx = None
-                    for idx, row in df.iterrows():
-                        if str(row["구분"]).strip() == cost_item:
-                            cost_row_idx = idx
-                            break
-                    
-                    if cost_row_idx is None:
-                        continue
-                    
-                    
-                    # 직접비 값 가져오기
-                    cost_val = df.at[cost_row_idx, channel]
-                    if pd.isna(cost_val) or cost_val == "":
-                        continue
-                    
-                    try:
-                        cost_value = float(cost_val)
-                    except (ValueError, TypeError):
-                        continue
-                    
-                    # 비율 계산
-                    rate = (cost_value / sales_value) * 100 if sales_value != 0 else 0
-                    
-                    # 계획 파일의 채널명을 채널번호로 변환
-                    channel_num = channel_master.get(channel, None)
-                    if channel_num is None:
-                        # 부분 매칭 시도
-                        for key, val in channel_master.items():
-                            if channel in key or key in channel:
-                                channel_num = val
-                                break
-                    
-                    # 채널번호를 찾지 못하면 스킵
-                    if channel_num is None:
-                        continue
-                    
-                    all_rates.append({
-                        '브랜드': brand_code,
-                        '유통채널': channel_num,
-                        '채널': channel,  # 참고용으로 유지
-                        '직접비항목': cost_item,
-                        '직접비값': cost_value,
-                        '실판매액V-': sales_value,
-                        '비율': rate
-                    })
+            rates = extract_file_rates(filepath, channel_master)
+            if rates is not None:
+                all_rates.append(rates)
         
         except Exception as e:
             print(f"  [ERROR] 파일 처리 실패: {e}")
@@ -458,17 +378,205 @@ def extract_direct_cost_rates(plan_dir: str, channel_master: Dict[str, int]) ->
             traceback.print_exc()
             continue
     
+    all_rates = [rates for rates in all_rates if not rates.empty]
     if not all_rates:
         raise ValueError("[ERROR] 추출된 직접비율이 없습니다.")
     
     # 데이터프레임으로 변환
-    rates_df = pd.DataFrame(all_rates)
+    rates_df = pd.concat(all_rates, ignore_index=True)
     
     print(f"\n[OK] 직접비율 추출 완료: {len(rates_df)}건")
     
     return rates_df
 
 
+def load_direct_cost_tables(plan_dir: str, channel_master: Dict[str, int]) -> tuple:
+    """
+    계획 금액과 직접비율을 계획 폴더 단위로 한 번만 추출 (plan_repository 캐시)
+    
+    같은 프로세스에서 여러 번 호출해도 계획 파일이 바뀌지 않았으면
+    추출 결과를 재사용합니다.
+    
+    Args:
+        plan_dir: 계획 파일 디렉토리
+        channel_master: 채널 마스터 매핑
+    
+    Returns:
+        tuple: (rates_df, plan_amounts_df)
+    """
+    repo = get_plan_repository(plan_dir)
+    return repo.derived(
+        'direct_cost_tables',
+        lambda: (
+            extract_direct_cost_rates(str(plan_dir), channel_master),
+            extract_plan_amounts(str(plan_dir), channel_master)
+        ),
+        key=tuple(sorted(channel_master.items()))
+    )
+
+
+def file_sha256(filepath) -> str:
+    """파일 내용 해시 (SHA-256)"""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _plan_file_brand(filepath: str) -> str:
+    """계획 파일의 브랜드 코드 (읽기 실패 시 None)"""
+    try:
+        return plan_brand_code(filepath)
+    except Exception:
+        return None
+
+
+def _read_cached_csv(path: Path) -> pd.DataFrame:
+    """캐시된 결과 CSV 읽기 (빈 파일이면 빈 데이터프레임)"""
+    try:
+        return pd.read_csv(path, encoding='utf-8-sig')
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+
+def _replace_brand_rows(cached: pd.DataFrame, fresh: pd.DataFrame, brands: set) -> pd.DataFrame:
+    """캐시된 결과에서 해당 브랜드 행을 새 추출 결과로 교체"""
+    if not cached.empty:
+        cached = cached[~cached['브랜드'].isin(brands)]
+    frames = [frame for frame in [cached, fresh] if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_direct_cost_tables_cached(plan_dir, analysis_month: str, channel_master: Dict[str, int]) -> tuple:
+    """
+    직접비율/계획 금액 파생 파일 캐시
+    
+    계획 파일과 마스터(채널마스터.csv, 로열티율.csv)의 해시를 매니페스트에 기록하고,
+    바뀐 계획 파일이 속한 브랜드만 다시 추출해 기존 결과에 병합합니다.
+    마스터가 바뀌거나 결과 파일이 없으면 전체를 다시 추출합니다.
+    
+    파생 파일 (plan_dir):
+        {YYYYMM}R_직접비율_추출결과.csv  - 피벗 결과
+        {YYYYMM}R_직접비율_상세.csv      - rates_df
+        {YYYYMM}R_직접비금액_상세.csv    - plan_amounts_df
+        {YYYYMM}R_직접비율_캐시.json     - 소스 해시 매니페스트
+    
+    Args:
+        plan_dir: 계획 파일 디렉토리
+        analysis_month: 분석월 (YYYYMM)
+        channel_master: 채널 마스터 매핑
+    
+    Returns:
+        tuple: (rates_df, plan_amounts_df, rates_pivoted_df)
+    """
+    plan_dir = Path(plan_dir)
+    rates_output_path = plan_dir / f"{analysis_month}R_직접비율_추출결과.csv"
+    rates_df_path = plan_dir / f"{analysis_month}R_직접비율_상세.csv"
+    plan_amounts_path = plan_dir / f"{analysis_month}R_직접비금액_상세.csv"
+    manifest_path = plan_dir / f"{analysis_month}R_직접비율_캐시.json"
+    
+    # 현재 소스 해시
+    plan_files = list_plan_source_files(str(plan_dir))
+    file_hashes = {os.path.basename(filepath): file_sha256(filepath) for filepath in plan_files}
+    master_hashes = {
+        path.name: file_sha256(path) if path.exists() else None
+        for path in [CHANNEL_MASTER_PATH, ROYALTY_RATE_MASTER_PATH]
+    }
+    
+    manifest = None
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = None
+    
+    outputs_exist = rates_output_path.exists() and rates_df_path.exists() and plan_amounts_path.exists()
+    cache_valid = (
+        manifest is not None
+        and outputs_exist
+        and manifest.get("masters") == master_hashes
+    )
+    
+    if cache_valid:
+        cached_files = manifest.get("files", {})
+        changed = [name for name, digest in file_hashes.items()
+                   if cached_files.get(name, {}).get("hash") != digest]
+        removed = [name for name in cached_files if name not in file_hashes]
+        
+        if not changed and not removed:
+            print(f"  [INFO] 직접비율 캐시 사용 (계획 파일/마스터 변경 없음): {rates_output_path.name}")
+            rates_df = _read_cached_csv(rates_df_path)
+            plan_amounts_df = _read_cached_csv(plan_amounts_path)
+            rates_pivoted_df = _read_cached_csv(rates_output_path)
+            return rates_df, plan_amounts_df, rates_pivoted_df
+        
+        # 바뀐 파일의 브랜드 (이전/현재 브랜드 모두) 단위로 다시 추출
+        file_brands = {name: info.get("brand") for name, info in cached_files.items() if name in file_hashes}
+        affected_brands = {cached_files[name].get("brand") for name in changed + removed if name in cached_files}
+        for name in changed:
+            file_brands[name] = _plan_file_brand(str(plan_dir / name))
+            affected_brands.add(file_brands[name])
+        affected_brands.discard(None)
+        
+        print(f"  [INFO] 변경된 계획 파일: {', '.join(changed + removed)}")
+        print(f"  [INFO] 브랜드만 재추출: {', '.join(sorted(affected_brands))}")
+        
+        target_files = [filepath for filepath in plan_files
+                        if file_brands.get(os.path.basename(filepath)) in affected_brands]
+        cached_rates = _read_cached_csv(rates_df_path)
+        cached_amounts = _read_cached_csv(plan_amounts_path)
+        
+        new_rates = pd.DataFrame()
+        new_amounts = pd.DataFrame()
+        if target_files:
+            try:
+                new_rates = extract_direct_cost_rates(str(plan_dir), channel_master, target_files)
+            except ValueError as e:
+                print(f"  [WARNING] {e}")
+            new_amounts = extract_plan_amounts(str(plan_dir), channel_master, target_files)
+        
+        rates_df = _replace_brand_rows(cached_rates, new_rates, affected_brands)
+        plan_amounts_df = _replace_brand_rows(cached_amounts, new_amounts, affected_brands)
+    else:
+        if manifest is None and outputs_exist:
+            print(f"  [INFO] 직접비율 캐시 매니페스트가 없어 전체 재추출합니다.")
+        elif manifest is not None:
+            print(f"  [INFO] 마스터 파일 변경 또는 결과 파일 누락으로 전체 재추출합니다.")
+        else:
+            print(f"  [INFO] 직접비율 파일이 없어 계획 파일에서 새로 추출합니다...")
+        rates_df = extract_direct_cost_rates(str(plan_dir), channel_master, plan_files)
+        plan_amounts_df = extract_plan_amounts(str(plan_dir), channel_master, plan_files)
+        file_brands = {os.path.basename(filepath): _plan_file_brand(filepath) for filepath in plan_files}
+    
+    rates_pivoted_df = pivot_and_format_rates(rates_df, channel_master)
+    
+    # 파생 파일 저장 (매니페스트는 마지막에 기록)
+    plan_dir.mkdir(parents=True, exist_ok=True)
+    rates_pivoted_df.to_csv(rates_output_path, index=False, encoding='utf-8-sig')
+    rates_df.to_csv(rates_df_path, index=False, encoding='utf-8-sig')
+    plan_amounts_df.to_csv(plan_amounts_path, index=False, encoding='utf-8-sig')
+    
+    manifest = {
+        "masters": master_hashes,
+        "files": {
+            name: {"hash": digest, "brand": file_brands.get(name)}
+            for name, digest in file_hashes.items()
+        }
+    }
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+    
+    print(f"  [OK] 직접비율 파일 저장: {rates_output_path.name}, {rates_df_path.name}, {plan_amounts_path.name}")
+    
+    return rates_df, plan_amounts_df, rates_pivoted_df
+
+
 def pivot_and_format_rates(rates_df: pd.DataFrame, channel_master: Dict[str, int]) -> pd.DataFrame:
     """
     직접비율 데이터를 피벗하여 브랜드/채널별로 정리
@@ -570,7 +678,7 @@ def pivot_and_format_rates(rates_df: pd.DataFrame, channel_master: Dict[str, int
 
 def apply_direct_costs_to_ke30(ke30_file: str, rates_df: pd.DataFrame, plan_amounts_df: pd.DataFrame, royalty_master: Dict) -> pd.DataFrame:
     """
-    ke30 전처리 완료 파일에 직접비 계산 적용
+    ke30 전처리 완료 파일에 직접비 계산 적용 (파일 경로 버전)
     
     Args:
         ke30_file: ke30 전처리 완료 파일 경로
@@ -578,6 +686,24 @@ def apply_direct_costs_to_ke30(ke30_file: str, rates_df: pd.DataFrame, plan_amou
         plan_amounts_df: 계획 파일에서 추출한 금액 데이터프레임
         royalty_master: 로열티율 마스터 딕셔너리
     
+    Returns:
+        pd.DataFrame: 직접비가 계산된 데이터프레임
+    """
+    print(f"[읽기] {ke30_file}")
+    df_ke30 = pd.read_csv(ke30_file, encoding="utf-8-sig")
+    return apply_direct_costs(df_ke30, rates_df, plan_amounts_df, royalty_master)
+
+
+def apply_direct_costs(df_ke30: pd.DataFrame, rates_df: pd.DataFrame, plan_amounts_df: pd.DataFrame, royalty_master: Dict) -> pd.DataFrame:
+    """
+    ke30 데이터프레임에 직접비 계산 적용 (입력 데이터프레임은 변경하지 않음)
+    
+    Args:
+        df_ke30: ke30 집계 데이터프레임
+        rates_df: 직접비율 데이터프레임 (피벗 전)
+        plan_amounts_df: 계획 파일에서 추출한 금액 데이터프레임
+        royalty_master: 로열티율 마스터 딕셔너리
+    
     Returns:
         pd.DataFrame: 직접비가 계산된 데이터프레임
     """
@@ -585,8 +711,7 @@ def apply_direct_costs_to_ke30(ke30_file: str, rates_df: pd.DataFrame, plan_amou
     print("ke30 파일에 직접비 계산 적용 시작")
     print("=" * 60)
     
-    print(f"[읽기] {ke30_file}")
-    df_ke30 = pd.read_csv(ke30_file, encoding="utf-8-sig")
+    df_ke30 = df_ke30.reset_index(drop=True)
     print(f"  원본 데이터: {len(df_ke30)}행 × {len(df_ke30.columns)}열")
     
     # 실판매액(V-) 컬럼 찾기
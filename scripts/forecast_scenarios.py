@@ -0,0 +1,451 @@
+"""
+월말 예상 What-if 시나리오 일괄 계산
+===============================================================
+
+KE30 Shop 데이터에 여러 진척율 시나리오를 한 번에(NumPy 브로드캐스트) 적용해
+브랜드별 월말 예상 실판매액/매출총이익/직접비/직접이익을 비교합니다.
+(convert_ke30_to_forecast.build_forecast_frame과 같은 계산 규칙)
+
+- 시나리오 = 행별 진척율 벡터 (브랜드, 면세/면세제외별로 다르게 지정 가능)
+- 직접비는 시나리오별 예상 매출로 다시 계산 (고정비는 KE30 값 유지)
+- 채널명 "미지정" 행은 진척율을 적용하지 않음
+- 행 분류, 직접비율 매칭은 시나리오 수와 관계없이 한 번만 수행
+
+진척율 구분 표기 (progress_days_YYYYMM.csv와 동일):
+    전체           모든 행
+    M              브랜드 M 전체
+    M(면세)        브랜드 M, 유통채널 2
+    M(면세제외)    브랜드 M, 유통채널 2 이외
+    (구체적인 구분이 우선: M(면세) > M > 전체)
+
+사용법:
+    python scripts/forecast_scenarios.py 20260112 --rates 0.35,0.40,0.45
+    python scripts/forecast_scenarios.py 20260112 --progress-days raw/202601/previous_year/progress_days_202601.csv
+    python scripts/forecast_scenarios.py 20260112 --scenarios my_scenarios.csv
+
+    시나리오 CSV 형식: 시나리오,구분,진척율  (예: 면세보수,M(면세),0.42)
+
+출력:
+    raw/YYYYMM/current_year/YYYYMMDD/forecast_scenarios_YYYYMMDD.csv
+    (시나리오 × 브랜드 행, 지표 열. '기본' 시나리오 = 가중치 진척율 달력 값)
+
+작성일: 2026-10
+"""
+
+import sys
+import time
+import argparse
+from calendar import monthrange
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+scripts_dir = project_root / "scripts"
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+import extract_direct_cost_rates as extract_direct
+from convert_ke30_to_forecast import (
+    FIXED_COST_ITEMS,
+    find_forecast_sales_column,
+    find_progress_rate_columns,
+    find_shipping_column,
+    load_forecast_cost_rates,
+    load_weighted_progress_rate,
+)
+
+# 면세 유통채널 번호
+DUTY_FREE_CHANNEL = 2
+
+# 전체 행에 적용되는 진척율 구분
+ALL_GROUP = '전체'
+
+BASE_SCENARIO = '기본'
+
+# 시나리오 결과 지표 (진척율 계산 필드 외)
+RESULT_FIELDS = ['매출총이익', '직접비 합계', '직접이익']
+
+
+def _to_channel_number(value) -> Optional[int]:
+    """유통채널 값을 정수로 (변환 불가/결측이면 None)"""
+    if pd.isna(value):
+        return None
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return None
+
+
+def _distinct_map(values: pd.Series, func) -> list:
+    """고유값에만 func를 적용하고 행 순서대로 펼침"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    mapped = [func(value) for value in uniques]
+    return [mapped[code] for code in codes]
+
+
+class ForecastScenarioEngine:
+    """
+    KE30 Shop 데이터 × 진척율 시나리오 일괄 계산기
+
+    Args:
+        df: KE30 Shop 데이터프레임
+        rates_dict: 직접비율 {(브랜드, 유통채널, 직접비항목): 비율(소수)}
+        royalty_master: 로열티율 마스터 {(브랜드, 유통채널): {'rate', 'base'}}
+    """
+
+    def __init__(self, df: pd.DataFrame, rates_dict: dict, royalty_master: dict):
+        if '브랜드' not in df.columns:
+            raise ValueError("'브랜드' 컬럼이 없습니다.")
+        if '유통채널' not in df.columns:
+            raise ValueError("'유통채널' 컬럼이 없습니다.")
+
+        self.df = df.reset_index(drop=True)
+        self.scenarios: Dict[str, np.ndarray] = {}
+        n_rows = len(self.df)
+
+        # 행 분류 (고유값 단위로 한 번만)
+        if '채널명' in self.df.columns:
+            channel_names = _distinct_map(self.df['채널명'], lambda v: str(v).strip() if pd.notna(v) else '')
+            self.unassigned = np.array([name == '미지정' for name in channel_names], dtype=bool)
+        else:
+            self.unassigned = np.zeros(n_rows, dtype=bool)
+        self.brands = _distinct_map(self.df['브랜드'], lambda v: str(v).strip())
+        self.channels = _distinct_map(self.df['유통채널'], _to_channel_number)
+
+        # 진척율 적용 컬럼 (행 × 필드)
+        self.progress_cols = [col for _, col in find_progress_rate_columns(self.df.columns) if col is not None]
+        self.base_values = self.df[self.progress_cols].to_numpy(dtype=float) if self.progress_cols else np.zeros((n_rows, 0))
+
+        self.sales_col = find_forecast_sales_column(self.df.columns)
+        self.shipping_col = find_shipping_column(self.df.columns)
+
+        # 직접비 재계산 항목별 행 계수 (시나리오와 무관)
+        self.cost_items = []
+        if self.sales_col is not None:
+            self.cost_items = [item for item in extract_direct.DIRECT_COST_ITEMS if item not in FIXED_COST_ITEMS]
+        n_items = len(self.cost_items)
+        self.cost_coef = np.zeros((n_rows, n_items))
+        self.cost_active = np.zeros((n_rows, n_items), dtype=bool)
+        self.cost_on_shipping = np.zeros((n_rows, n_items), dtype=bool)
+        self.cost_is_royalty = np.zeros(n_items, dtype=bool)
+        self.cost_original = np.zeros((n_rows, n_items))
+
+        for j, item in enumerate(self.cost_items):
+            if item in self.df.columns:
+                self.cost_original[:, j] = self.df[item].to_numpy(dtype=float)
+            self.cost_is_royalty[j] = item == '지급수수료_로열티'
+            for i in range(n_rows):
+                channel = self.channels[i]
+                if self.unassigned[i] or channel is None:
+                    continue
+                brand = self.brands[i]
+                if self.cost_is_royalty[j]:
+                    royalty_info = royalty_master.get((brand, channel))
+                    if royalty_info:
+                        base = royalty_info['base']
+                        self.cost_active[i, j] = True
+                        self.cost_coef[i, j] = royalty_info['rate']
+                        self.cost_on_shipping[i, j] = (
+                            ('출고가' in base or '출고매출' in base)
+                            and not ('실판가' in base or '실판매' in base)
+                            and self.shipping_col is not None
+                        )
+                else:
+                    rate = rates_dict.get((brand, channel, item), 0)
+                    # 기타 채널(유통채널 99)의 물류운송비/물류용역비는 사입 채널(유통채널 8)의 비율 사용
+                    if channel == 99 and item in ['지급수수료_물류운송비', '지급수수료_물류용역비']:
+                        rate = rates_dict.get((brand, 8, item), 0)
+                    if rate > 0:
+                        self.cost_active[i, j] = True
+                        self.cost_coef[i, j] = rate
+
+        # 매출총이익 계산 컬럼 (build_forecast_frame과 같은 탐색 규칙)
+        columns = list(self.df.columns) + [item for item in self.cost_items if item not in self.df.columns]
+        self.gross_sales_col = None
+        self.cost_of_sales_col = None
+        for col in columns:
+            if '출고매출액(V-)' in str(col) or '출고매출액(V-) Actual' in str(col):
+                self.gross_sales_col = col
+            if '매출원가(평가감환입반영)' in str(col):
+                self.cost_of_sales_col = col
+        self.direct_cost_cols = [col for col in extract_direct.DIRECT_COST_ITEMS if col in columns]
+
+    # ------------------------------------------------------------------
+    # 시나리오 정의
+    # ------------------------------------------------------------------
+    def row_rates(self, rates: Dict[str, float]) -> np.ndarray:
+        """
+        구분별 진척율을 행별 진척율 벡터로 변환
+
+        Args:
+            rates: {'전체': 0.4, 'M': 0.42, 'M(면세)': 0.38, ...}
+        """
+        for group, rate in rates.items():
+            if not 0 < rate <= 1:
+                raise ValueError(f"비정상적인 진척율입니다: {group} = {rate} (0 < 진척율 <= 1 범위여야 함)")
+
+        row_rates = np.empty(len(self.df))
+        for i, (brand, channel) in enumerate(zip(self.brands, self.channels)):
+            duty_group = f"{brand}(면세)" if channel == DUTY_FREE_CHANNEL else f"{brand}(면세제외)"
+            for group in (duty_group, brand, ALL_GROUP):
+                if group in rates:
+                    row_rates[i] = rates[group]
+                    break
+            else:
+                raise ValueError(f"진척율이 지정되지 않은 행이 있습니다: 브랜드 {brand}, 유통채널 {channel}")
+        return row_rates
+
+    def add_scenario(self, name: str, rates) -> np.ndarray:
+        """
+        시나리오 추가
+
+        Args:
+            name: 시나리오 이름
+            rates: 진척율 (float = 전체 동일, dict = 구분별, 배열 = 행별)
+        """
+        if isinstance(rates, dict):
+            vector = self.row_rates(rates)
+        elif np.isscalar(rates):
+            vector = self.row_rates({ALL_GROUP: float(rates)})
+        else:
+            vector = np.asarray(rates, dtype=float)
+            if vector.shape != (len(self.df),):
+                raise ValueError(f"시나리오 '{name}'의 진척율 벡터 길이가 행 수와 다릅니다: {vector.shape}")
+        self.scenarios[name] = vector
+        return vector
+
+    # ------------------------------------------------------------------
+    # 계산 (시나리오 × 행 × 필드 브로드캐스트)
+    # ------------------------------------------------------------------
+    def _column_source(self, col, forecast: np.ndarray, costs: np.ndarray) -> np.ndarray:
+        """시나리오 × 행 값 (예상값/재계산 직접비/원본 중 해당 컬럼)"""
+        if col in self.progress_cols:
+            return forecast[:, :, self.progress_cols.index(col)]
+        if col in self.cost_items:
+            return costs[:, :, self.cost_items.index(col)]
+        values = self.df[col].to_numpy(dtype=float)
+        return np.broadcast_to(values, (forecast.shape[0], len(values)))
+
+    def evaluate(self, names: List[str] = None) -> dict:
+        """
+        시나리오 일괄 계산
+
+        Returns:
+            dict: 'names', 'forecast' (S×행×진척율 필드), 'costs' (S×행×직접비 항목),
+                  '매출총이익', '직접비 합계', '직접이익' (S×행)
+        """
+        names = list(names) if names is not None else list(self.scenarios)
+        rates = np.stack([self.scenarios[name] for name in names]) if names else np.zeros((0, len(self.df)))
+
+        # 1) 진척율 적용: 예상값 = round(현재값 / 진척율), 미지정 채널은 원본 유지
+        current = np.nan_to_num(self.base_values, nan=0.0)[None, :, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scaled = np.round(current / rates[:, :, None], 0)
+        scaled = np.where(rates[:, :, None] == 0, 0.0, scaled)
+        forecast = np.where(self.unassigned[None, :, None], self.base_values[None, :, :], scaled)
+
+        # 2) 직접비 재계산: 조건을 만족하는 행만 round(기준매출 × 비율), 나머지는 원본 유지
+        n_scenarios = len(names)
+        if self.cost_items:
+            empty_costs = np.zeros((n_scenarios, len(self.df), 0))
+            sales = self._column_source(self.sales_col, forecast, empty_costs)
+            shipping = self._column_source(self.shipping_col, forecast, empty_costs) if self.shipping_col is not None else sales
+            base = np.where(self.cost_on_shipping[None, :, :], shipping[:, :, None], sales[:, :, None])
+            valid = ~np.isnan(base)
+            applies = np.where(self.cost_is_royalty[None, None, :], valid & (base > 0), valid & (base != 0))
+            applies &= self.cost_active[None, :, :]
+            costs = np.where(applies, np.round(base * self.cost_coef[None, :, :]), self.cost_original[None, :, :])
+        else:
+            costs = np.zeros((n_scenarios, len(self.df), 0))
+
+        # 3) 재계산 필드 (정수 변환은 소수점 이하 버림)
+        result = {'names': names, 'forecast': forecast, 'costs': costs}
+        if self.gross_sales_col is not None and self.cost_of_sales_col is not None:
+            gross = np.nan_to_num(self._column_source(self.gross_sales_col, forecast, costs), nan=0.0)
+            cost_of_sales = np.nan_to_num(self._column_source(self.cost_of_sales_col, forecast, costs), nan=0.0)
+            result['매출총이익'] = np.trunc(gross - cost_of_sales)
+        else:
+            result['매출총이익'] = None
+        if self.direct_cost_cols:
+            direct = sum(np.nan_to_num(self._column_source(col, forecast, costs), nan=0.0) for col in self.direct_cost_cols)
+            result['직접비 합계'] = np.trunc(direct)
+        else:
+            result['직접비 합계'] = np.zeros((n_scenarios, len(self.df)))
+        if result['매출총이익'] is not None:
+            result['직접이익'] = result['매출총이익'] - result['직접비 합계']
+        else:
+            result['직접이익'] = np.zeros((n_scenarios, len(self.df)))
+        return result
+
+    def scenario_matrix(self, result: dict = None) -> pd.DataFrame:
+        """
+        시나리오 × 브랜드 요약표 (브랜드별 합계 + '전체' 행)
+
+        행별 값을 브랜드 원-핫 행렬과 곱해 모든 시나리오를 한 번에 집계합니다.
+        """
+        if result is None:
+            result = self.evaluate()
+        names = result['names']
+        brand_codes, brand_names = pd.factorize(pd.Series(self.brands), sort=True)
+        one_hot = np.zeros((len(self.df), len(brand_names) + 1))
+        one_hot[np.arange(len(self.df)), brand_codes] = 1.0
+        one_hot[:, -1] = 1.0
+        groups = list(brand_names) + [ALL_GROUP]
+
+        columns = {}
+        for j, col in enumerate(self.progress_cols):
+            columns[col] = np.nan_to_num(result['forecast'][:, :, j], nan=0.0) @ one_hot
+        for field in RESULT_FIELDS:
+            if result[field] is not None:
+                columns[field] = result[field] @ one_hot
+
+        matrix = pd.DataFrame({
+            '시나리오': np.repeat(names, len(groups)),
+            '브랜드': np.tile(groups, len(names)),
+        })
+        for col, values in columns.items():
+            matrix[col] = np.round(values.reshape(-1)).astype(np.int64)
+        if '직접이익' in matrix.columns and self.sales_col in matrix.columns:
+            sales = matrix[self.sales_col].where(matrix[self.sales_col] != 0)
+            matrix['직접이익율(%)'] = (matrix['직접이익'] / sales * 100).round(2)
+        return matrix
+
+    def forecast_frame(self, name: str) -> pd.DataFrame:
+        """
+        시나리오 하나의 전체 예상 데이터프레임 (build_forecast_frame 결과와 같은 형식)
+        """
+        result = self.evaluate([name])
+        df_forecast = self.df.copy()
+        assigned = ~self.unassigned
+        for j, col in enumerate(self.progress_cols):
+            df_forecast.loc[assigned, col] = result['forecast'][0, assigned, j]
+        for j, item in enumerate(self.cost_items):
+            if item not in df_forecast.columns:
+                df_forecast[item] = 0.0
+            df_forecast[item] = result['costs'][0, :, j]
+        if result['매출총이익'] is not None:
+            df_forecast['매출총이익'] = result['매출총이익'][0].astype(int)
+        df_forecast['직접비 합계'] = result['직접비 합계'][0].astype(int)
+        df_forecast['직접이익'] = result['직접이익'][0].astype(int)
+        return df_forecast
+
+
+def load_scenario_table(path) -> Dict[str, Dict[str, float]]:
+    """
+    시나리오 CSV 읽기 (시나리오,구분,진척율)
+
+    Returns:
+        dict: {시나리오: {구분: 진척율}}
+    """
+    df = pd.read_csv(path, encoding='utf-8-sig')
+    missing = [col for col in ['시나리오', '구분', '진척율'] if col not in df.columns]
+    if missing:
+        raise ValueError(f"시나리오 파일에 필수 컬럼이 없습니다: {missing}")
+    scenarios: Dict[str, Dict[str, float]] = {}
+    for name, group, rate in zip(df['시나리오'], df['구분'], df['진척율']):
+        scenarios.setdefault(str(name).strip(), {})[str(group).strip()] = float(rate)
+    return scenarios
+
+
+def scenarios_from_progress_days(path, total_days: int) -> Dict[str, Dict[str, float]]:
+    """
+    progress_days_YYYYMM.csv의 날짜 열마다 시나리오 생성 (진척율 = 진척일수 / 월 총일수)
+
+    Returns:
+        dict: {'진척일수_YYYY-MM-DD': {구분: 진척율}}
+    """
+    df = pd.read_csv(path, encoding='utf-8-sig')
+    if '브랜드' not in df.columns:
+        raise ValueError(f"진척일수 파일에 '브랜드' 컬럼이 없습니다: {path}")
+    groups = df['브랜드'].astype(str).str.strip()
+    scenarios = {}
+    for col in df.columns:
+        if col == '브랜드':
+            continue
+        days = pd.to_numeric(df[col], errors='coerce')
+        scenarios[f"진척일수_{col}"] = {
+            group: min(day / total_days, 1.0)
+            for group, day in zip(groups, days) if pd.notna(day) and day > 0
+        }
+    return scenarios
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description='KE30 Shop 데이터에 여러 진척율 시나리오를 한 번에 적용해 월말 예상 비교',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+예시:
+  python scripts/forecast_scenarios.py 20260112 --rates 0.35,0.40,0.45
+  python scripts/forecast_scenarios.py 20260112 --progress-days raw/202601/previous_year/progress_days_202601.csv
+  python scripts/forecast_scenarios.py 20260112 --scenarios my_scenarios.csv
+        """
+    )
+    parser.add_argument('update_date', type=str, help='업데이트일자 (예: 20260112)')
+    parser.add_argument('--rates', type=str, help='전체 동일 진척율 목록 (쉼표 구분, 예: 0.35,0.4)')
+    parser.add_argument('--progress-days', type=str, help='진척일수 파일 (날짜 열마다 시나리오 생성)')
+    parser.add_argument('--scenarios', type=str, help='시나리오 CSV (시나리오,구분,진척율)')
+    parser.add_argument('--output', type=str, help='출력 파일 경로 (기본: KE30 파일과 같은 폴더)')
+    args = parser.parse_args()
+
+    update_date_str = args.update_date
+    if len(update_date_str) != 8 or not update_date_str.isdigit():
+        print("[ERROR] 업데이트일자 형식이 올바르지 않습니다. (YYYYMMDD 형식 필요)")
+        sys.exit(1)
+
+    update_date = datetime.strptime(update_date_str, '%Y%m%d')
+    analysis_month = update_date.strftime('%Y%m')
+    _, total_days = monthrange(update_date.year, update_date.month)
+    date_dir = project_root / "raw" / analysis_month / "current_year" / update_date_str
+    shop_path = date_dir / f"ke30_{update_date_str}_{analysis_month}_Shop.csv"
+
+    if not shop_path.exists():
+        print(f"[ERROR] Shop 파일을 찾을 수 없습니다: {shop_path}")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("월말 예상 What-if 시나리오")
+    print("=" * 60)
+
+    base_rate = float(load_weighted_progress_rate(analysis_month, update_date))
+    print(f"[INFO] 기본 진척율: {base_rate * 100:.4f}%")
+
+    df = pd.read_csv(shop_path, encoding='utf-8-sig')
+    rates_dict, royalty_master = load_forecast_cost_rates(str(project_root / "raw" / analysis_month / "plan"))
+    engine = ForecastScenarioEngine(df, rates_dict, royalty_master)
+
+    # 지정하지 않은 구분은 기본 진척율 사용
+    engine.add_scenario(BASE_SCENARIO, base_rate)
+    specs: Dict[str, Dict[str, float]] = {}
+    if args.rates:
+        for value in args.rates.split(','):
+            if value.strip():
+                specs[f"전체_{float(value):.4f}"] = {ALL_GROUP: float(value)}
+    if args.progress_days:
+        specs.update(scenarios_from_progress_days(args.progress_days, total_days))
+    if args.scenarios:
+        specs.update(load_scenario_table(args.scenarios))
+    for name, rates in specs.items():
+        engine.add_scenario(name, {ALL_GROUP: base_rate, **rates})
+
+    start = time.perf_counter()
+    matrix = engine.scenario_matrix()
+    elapsed = time.perf_counter() - start
+    print(f"[OK] 시나리오 {len(engine.scenarios)}개 계산 완료 ({len(df)}행, {elapsed:.3f}초)")
+
+    output_path = Path(args.output) if args.output else date_dir / f"forecast_scenarios_{update_date_str}.csv"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    matrix.to_csv(output_path, index=False, encoding='utf-8-sig')
+    print(f"[OK] 시나리오 요약 저장: {output_path}")
+    print(f"   데이터: {len(matrix)}행 × {len(matrix.columns)}열")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,23 +5,40 @@ JSON 파일을 읽어 AI 분석을 생성하는 스크립트
     python scripts/generate_ai_insights.py --date 20251124 --brand MLB
     python scripts/generate_ai_insights.py --date 20251124 --all-brands
 
+    # 브랜드 병렬 처리 (스레드 4개) / 프롬프트 캐시 사용 안 함
+    python scripts/generate_ai_insights.py --date 20251124 --all-brands --workers 4 --no-cache
+
 환경 변수:
     OPENAI_API_KEY: OpenAI API 키 (선택사항, 없으면 로컬 분석만 수행)
+
+프롬프트 캐시:
+    OpenAI 응답은 (모델, 분석 유형, 프롬프트) 해시로 캐시 디렉토리에 저장되며,
+    데이터가 바뀌지 않은 섹션은 API를 다시 호출하지 않습니다.
+    (기본 위치: raw/_ai_prompt_cache - 웹에 배포되는 public/ 밖에 두고 날짜 간 공유)
 """
 
 import os
 import json
 import sys
+import time
+import random
+import hashlib
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+import pandas as pd
 import requests
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.weekly_trend_summary import RAW_FILE_NAME as WEEKLY_TREND_RAW_FILE, raw_table_to_records
+from scripts.stock_analysis_artifact import build_stock_analysis, load_stock_analysis, brand_view
+
 try:
     from openai import OpenAI
     OPENAI_AVAILABLE = True
@@ -45,17 +62,110 @@ BRAND_CODE_MAP = {
 
 BRAND_NAME_MAP = {v: k for k, v in BRAND_CODE_MAP.items()}
 
+# OpenAI 요청 재시도 설정 (요청 제한 429 / 일시적 서버 오류)
+LLM_MAX_RETRIES = 5
+LLM_RETRY_BASE_DELAY = 2.0   # 초 (시도마다 2배)
+LLM_RETRY_MAX_DELAY = 60.0   # 초
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {"RateLimitError", "APIConnectionError", "APITimeoutError", "InternalServerError"}
+
+# 프롬프트 캐시 (웹에 배포되지 않는 raw/ 아래, 날짜 간 공유)
+PROMPT_CACHE_DIR = project_root / "raw" / "_ai_prompt_cache"
+
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """
+    재시도 대기 시간 (재시도하지 않을 오류면 None)
+
+    응답의 Retry-After 헤더가 있으면 따르고, 없으면 지수 백오프 + 지터를 사용합니다.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status not in RETRYABLE_STATUS_CODES and type(error).__name__ not in RETRYABLE_ERROR_NAMES:
+        return None
+    
+    headers = getattr(response, "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        retry_after = None
+    if retry_after is not None and retry_after >= 0:
+        return min(retry_after, LLM_RETRY_MAX_DELAY)
+    return min(LLM_RETRY_BASE_DELAY * (2 ** attempt) + random.uniform(0, 1), LLM_RETRY_MAX_DELAY)
+
+
+class PromptCache:
+    """
+    OpenAI 응답 캐시 (키 하나 = JSON 파일 하나)
+
+    파일 단위로 원자적 교체하므로 여러 스레드/프로세스에서 같이 써도 안전합니다.
+    """
+    
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+    
+    @staticmethod
+    def make_key(model: str, analysis_type: str, prompt: str) -> str:
+        payload = json.dumps([model, analysis_type, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("content")
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, key: str, content: str, analysis_type: str, model: str):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "analysis_type": analysis_type,
+                "model": model,
+                "created_at": datetime.now().isoformat(),
+                "content": content
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
 class AIInsightGenerator:
-    """AI 인사이트 생성기"""
+    """
+    AI 인사이트 생성기
+
+    Args:
+        api_key: OpenAI API 키
+        use_local: True면 로컬 분석만 수행
+        client: chat.completions.create()를 제공하는 클라이언트 (지정 시 OpenAI 대신 사용, 테스트용 스텁 등)
+        cache_dir: 프롬프트 캐시 디렉토리 (None이면 캐시 안 함)
+        max_concurrent_requests: 동시에 보낼 수 있는 최대 API 요청 수
+    """
     
-    def __init__(self, api_key: Optional[str] = None, use_local: bool = False):
-        self.use_openai = OPENAI_AVAILABLE and api_key and not use_local
+    def __init__(self, api_key: Optional[str] = None, use_local: bool = False, client: Any = None,
+                 cache_dir: Optional[Path] = None, max_concurrent_requests: int = 4):
+        self.use_openai = not use_local and (client is not None or bool(OPENAI_AVAILABLE and api_key))
         if self.use_openai:
-            self.client = OpenAI(api_key=api_key)
+            self.client = client if client is not None else OpenAI(api_key=api_key)
             self.model = "gpt-4"
         else:
             self.client = None
             print("[INFO] OpenAI API를 사용하지 않습니다. 로컬 분석만 수행합니다.")
+        
+        self.cache = PromptCache(cache_dir) if cache_dir and self.use_openai else None
+        self._request_slots = threading.BoundedSemaphore(max(1, max_concurrent_requests))
+        self._stats_lock = threading.Lock()
+        self.stats = {"api_calls": 0, "cache_hits": 0, "retries": 0}
+    
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
     
     def generate_insight(self, data: Dict, context: str, analysis_type: str) -> str:
         """AI 인사이트 생성"""
@@ -66,31 +176,57 @@ class AIInsightGenerator:
             return self._generate_local_analysis(data, context, analysis_type)
     
     def _generate_with_openai(self, data: Dict, context: str, analysis_type: str) -> str:
-        """OpenAI API를 사용한 분석"""
+        """OpenAI API를 사용한 분석 (캐시 적중 시 API 호출 생략)"""
         try:
             prompt = self._build_prompt(data, context, analysis_type)
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "당신은 매출 데이터 분석 전문가입니다. 다음 데이터를 분석하여 실용적이고 실행 가능한 인사이트를 제공해주세요. 한국어로 응답해주세요."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
+            cache_key = None
+            if self.cache is not None:
+                cache_key = PromptCache.make_key(self.model, analysis_type, prompt)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    self._count("cache_hits")
+                    return cached
+            
+            content = self._request_completion(prompt)
             
-            return response.choices[0].message.content
+            if cache_key is not None and content:
+                self.cache.put(cache_key, content, analysis_type, self.model)
+            return content
         except Exception as e:
             print(f"❌ OpenAI API 오류: {e}")
             return self._generate_local_analysis(data, context, analysis_type)
     
+    def _request_completion(self, prompt: str) -> str:
+        """API 요청 (동시 요청 수 제한, 요청 제한 시 백오프 후 재시도)"""
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            try:
+                with self._request_slots:
+                    self._count("api_calls")
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": "당신은 매출 데이터 분석 전문가입니다. 다음 데이터를 분석하여 실용적이고 실행 가능한 인사이트를 제공해주세요. 한국어로 응답해주세요."
+                            },
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ],
+                        temperature=0.7,
+                        max_tokens=2000
+                    )
+                return response.choices[0].message.content
+            except Exception as e:
+                delay = _retry_delay(e, attempt)
+                if delay is None or attempt >= LLM_MAX_RETRIES:
+                    raise
+                self._count("retries")
+                print(f"[WARNING] OpenAI 요청 제한/일시 오류 ({type(e).__name__}), {delay:.1f}초 후 재시도 ({attempt + 1}/{LLM_MAX_RETRIES})")
+                time.sleep(delay)
+    
     def _generate_local_analysis(self, data: Dict, context: str, analysis_type: str) -> str:
         """로컬 분석 (규칙 기반)"""
         if analysis_type == "pl":
@@ -850,13 +986,87 @@ def fetch_sales_rate_api(api_base_url: str = "http://localhost:3000") -> Optiona
         return None
 
 
+STOCK_WEEKS_CY_SUMS = {
+    'SALE_QTY_7D': 'cySaleQty7d',
+    'SALE_TAG_7D': 'cySaleTag7d',
+    'SALE_QTY_28D': 'cySaleQty28d',
+    'STOCK_QTY': 'cyStockQty',
+    'STOCK_TAG_AMT': 'cyStockTagAmt'
+}
+STOCK_WEEKS_PY_SUMS = {
+    'SALE_QTY_28D': 'pySaleQty28d',
+    'STOCK_QTY': 'pyStockQty'
+}
+
+
+def _api_frame(rows: List[Dict], columns: List[str]) -> pd.DataFrame:
+    """
+    API 레코드 목록을 데이터프레임으로
+
+    값은 JSON에서 읽은 파이썬 객체(int/float/str/None) 그대로 두고, 없는 키는 NaN입니다.
+    """
+    return pd.DataFrame(rows or [], dtype=object).reindex(columns=columns).astype(object)
+
+
+def _truthy(series: pd.Series) -> pd.Series:
+    """파이썬 진리값 판정과 같은 마스크 (None/결측/빈 문자열/0 제외)"""
+    return series.notna() & series.astype(bool)
+
+
+def _row_get(series: pd.Series, default: Any) -> pd.Series:
+    """row.get(col, default) 와 같은 값 (키가 없을 때만 default, None 값은 유지)"""
+    return series.where(series.notna() | series.map(lambda value: value is None), default)
+
+
+def _value_or_zero(series: pd.Series) -> pd.Series:
+    """row.get(col, 0) or 0 과 같은 값 (파이썬 숫자형 유지)"""
+    return series.where(_truthy(series), 0)
+
+
+def _python_numbers(values: pd.Series, is_float: pd.Series) -> pd.Series:
+    """
+    계산 결과를 기존 dict 집계와 같은 파이썬 숫자형으로 변환
+
+    나눗셈 결과는 float, 나눗셈을 하지 않은 기본값 0은 int로 두어
+    JSON 출력(프롬프트 포함)이 이전과 같게 합니다.
+    """
+    result = values.astype(float).astype(object)
+    ints = ~is_float.to_numpy(dtype=bool)
+    if ints.any():
+        result[ints] = values[ints].round().astype('int64').astype(object)
+    return result
+
+
+def _sum_by_key(frame: pd.DataFrame, columns: Dict[str, str]) -> pd.DataFrame:
+    """
+    key별 합계
+
+    기존 dict 집계와 같이 0부터 행 순서대로 파이썬 덧셈을 하므로
+    정수만 더한 합계는 int, 실수가 섞이면 float이고 실수 합계 값도 같습니다.
+    """
+    positions = frame.groupby('key', sort=False).indices
+    sums = {}
+    for col, name in columns.items():
+        values = _value_or_zero(frame[col]).to_numpy()
+        sums[name] = [sum(values[pos].tolist()) for pos in positions.values()]
+    return pd.DataFrame(sums, index=list(positions), dtype=object)
+
+
+def _ratio(numerator: pd.Series, denominator: pd.Series, valid: pd.Series) -> pd.Series:
+    """valid일 때만 numerator / denominator, 아니면 0"""
+    return numerator.astype(float).div(denominator.astype(float).where(valid, 1.0)).where(valid, 0.0)
+
+
 def transform_api_to_stock_format(stock_weeks_api: Dict, sales_rate_api: Optional[Dict]) -> Dict:
     """
-    API 응답을 기존 stock_analysis.json 형식으로 변환
+    API 응답을 stock_analysis.json과 같은 형식으로 변환 (build_stock_analysis)
     
     stock_weeks_api: {success, date, asof_dt, data: {CY: [...], PY: [...]}}
     sales_rate_api: {success, date, periodInfo: {...}, data: {CUR: [...], PY: [...], PY_END: [...]}}
     
+    CY/PY/CUR 배열을 데이터프레임으로 읽어 브랜드×아이템 키로 그룹 합계/조인합니다.
+    (브랜드·아이템 순서는 CY, PY 순으로 처음 나온 순서)
+    
     Returns: {
         clothingBrandStatus: {브랜드코드: [아이템 리스트]},
         accStockAnalysis: {브랜드코드: [아이템 리스트]}
@@ -870,161 +1080,110 @@ def transform_api_to_stock_format(stock_weeks_api: Dict, sales_rate_api: Optiona
     if not stock_weeks_api or not stock_weeks_api.get('data'):
         return result
     
-    cy_data = stock_weeks_api['data'].get('CY', [])
-    py_data = stock_weeks_api['data'].get('PY', [])
-    
-    # 브랜드별, 아이템별로 집계
-    brand_item_map = {}
+    # CY/PY 레코드 (브랜드코드, 아이템코드가 없는 행 제외)
+    frames = []
+    for period in ('CY', 'PY'):
+        frame = _api_frame(stock_weeks_api['data'].get(period, []),
+                           ['BRD_CD', 'ITEM_CD', 'ITEM', 'ITEM_NM', 'PRDT_KIND_NM'] + list(STOCK_WEEKS_CY_SUMS))
+        frame['ITEM_CD'] = frame['ITEM_CD'].where(_truthy(frame['ITEM_CD']), frame['ITEM'])
+        frame = frame[_truthy(frame['BRD_CD']) & _truthy(frame['ITEM_CD'])].copy()
+        frame['key'] = frame['BRD_CD'].astype(str) + '_' + frame['ITEM_CD'].astype(str)
+        frames.append(frame)
+    cy_frame, py_frame = frames
+    
+    if cy_frame.empty and py_frame.empty:
+        return result
     
-    # CY 데이터 집계
-    for row in cy_data:
-        brd_cd = row.get('BRD_CD')
-        item_cd = row.get('ITEM_CD') or row.get('ITEM')
-        if not brd_cd or not item_cd:
-            continue
-        
-        key = f"{brd_cd}_{item_cd}"
-        if key not in brand_item_map:
-            brand_item_map[key] = {
-                'brand': brd_cd,
-                'itemCode': item_cd,
-                'itemName': row.get('ITEM_NM', ''),
-                'prdtKindNm': row.get('PRDT_KIND_NM', ''),
-                'cy': {
-                    'saleQty7d': 0,
-                    'saleTag7d': 0,
-                    'saleQty28d': 0,
-                    'stockQty': 0,
-                    'stockTagAmt': 0
-                },
-                'py': {
-                    'saleQty28d': 0,
-                    'stockQty': 0
-                }
-            }
-        
-        brand_item_map[key]['cy']['saleQty7d'] += row.get('SALE_QTY_7D', 0) or 0
-        brand_item_map[key]['cy']['saleTag7d'] += row.get('SALE_TAG_7D', 0) or 0
-        brand_item_map[key]['cy']['saleQty28d'] += row.get('SALE_QTY_28D', 0) or 0
-        brand_item_map[key]['cy']['stockQty'] += row.get('STOCK_QTY', 0) or 0
-        brand_item_map[key]['cy']['stockTagAmt'] += row.get('STOCK_TAG_AMT', 0) or 0
-    
-    # PY 데이터 집계
-    for row in py_data:
-        brd_cd = row.get('BRD_CD')
-        item_cd = row.get('ITEM_CD') or row.get('ITEM')
-        if not brd_cd or not item_cd:
-            continue
-        
-        key = f"{brd_cd}_{item_cd}"
-        if key not in brand_item_map:
-            brand_item_map[key] = {
-                'brand': brd_cd,
-                'itemCode': item_cd,
-                'itemName': row.get('ITEM_NM', ''),
-                'prdtKindNm': row.get('PRDT_KIND_NM', ''),
-                'cy': {'saleQty7d': 0, 'saleTag7d': 0, 'saleQty28d': 0, 'stockQty': 0, 'stockTagAmt': 0},
-                'py': {'saleQty28d': 0, 'stockQty': 0}
-            }
-        
-        brand_item_map[key]['py']['saleQty28d'] += row.get('SALE_QTY_28D', 0) or 0
-        brand_item_map[key]['py']['stockQty'] += row.get('STOCK_QTY', 0) or 0
+    # 브랜드×아이템 (처음 나온 행의 이름 사용)
+    items = pd.concat([cy_frame, py_frame], ignore_index=True).drop_duplicates('key', keep='first').set_index('key')
+    items = items[['BRD_CD', 'ITEM_CD', 'ITEM_NM', 'PRDT_KIND_NM']]
+    for col in ('ITEM_NM', 'PRDT_KIND_NM'):
+        items[col] = _row_get(items[col], '')
+    
+    table = items.join(_sum_by_key(cy_frame, STOCK_WEEKS_CY_SUMS)).join(_sum_by_key(py_frame, STOCK_WEEKS_PY_SUMS))
+    for name in list(STOCK_WEEKS_CY_SUMS.values()) + list(STOCK_WEEKS_PY_SUMS.values()):
+        table[name] = table[name].where(table[name].notna(), 0)
+    
+    # 재고주수 계산 (최근 4주 평균 판매량 대비 재고)
+    cy_sale_28d = table['cySaleQty28d'].astype(float)
+    py_sale_28d = table['pySaleQty28d'].astype(float)
+    avg4w = (cy_sale_28d / 4).where(cy_sale_28d > 0, 0.0)
+    py_avg4w = (py_sale_28d / 4).where(py_sale_28d > 0, 0.0)
+    stock_weeks = _ratio(table['cyStockQty'], avg4w, avg4w > 0)
+    py_stock_weeks = _ratio(table['pyStockQty'], py_avg4w, py_avg4w > 0)
+    
+    table['stockWeeks'] = _python_numbers(stock_weeks, avg4w > 0)
+    table['stockWeeksDiff'] = _python_numbers(stock_weeks - py_stock_weeks, (avg4w > 0) | (py_avg4w > 0))
+    # YOY 계산 (전년 대비 비율)
+    table['yoyRate'] = _python_numbers(_ratio(cy_sale_28d, py_sale_28d, py_sale_28d > 0) * 100, py_sale_28d > 0)
     
     # 판매율 데이터 추가 (sales_rate_api가 있으면)
     # sales_rate_api 구조: {data: {CUR: [...], PY: [...], PY_END: [...]}}
-    sales_rate_by_item = {}
+    rate_columns = ['cumSalesRate', 'cumSalesRateDiff', 'cumSalesTag', 'orderTag']
     if sales_rate_api and sales_rate_api.get('data'):
-        cur_sales_data = sales_rate_api['data'].get('CUR', [])
-        py_sales_data = sales_rate_api['data'].get('PY', [])
-        py_end_sales_data = sales_rate_api['data'].get('PY_END', [])
-        
-        # CUR 데이터를 기준으로 판매율 계산
-        for cur_row in cur_sales_data:
-            brd_cd = cur_row.get('BRD_CD')
-            item_cd = cur_row.get('ITEM_CD')
-            if not brd_cd or not item_cd:
-                continue
-            
-            key = f"{brd_cd}_{item_cd}"
-            
-            # 누적 판매율 계산: SALE_QTY / AC_ORD_QTY_KOR
-            cum_sales_rate = 0
-            ac_ord_qty = cur_row.get('AC_ORD_QTY_KOR', 0) or 0
-            sale_qty = cur_row.get('SALE_QTY', 0) or 0
-            if ac_ord_qty > 0:
-                cum_sales_rate = sale_qty / ac_ord_qty
-            
-            # 전년 동기 판매율 찾기
-            py_rate = 0
-            for py_row in py_sales_data:
-                if py_row.get('BRD_CD') == brd_cd and py_row.get('ITEM_CD') == item_cd:
-                    py_ord_qty = py_row.get('AC_ORD_QTY_KOR', 0) or 0
-                    py_sale_qty = py_row.get('SALE_QTY', 0) or 0
-                    if py_ord_qty > 0:
-                        py_rate = py_sale_qty / py_ord_qty
-                    break
-            
-            # 판매율 차이
-            cum_sales_rate_diff = cum_sales_rate - py_rate
-            
-            sales_rate_by_item[key] = {
-                'cumSalesRate': cum_sales_rate,
-                'cumSalesRateDiff': cum_sales_rate_diff,
-                'cumSalesTag': cur_row.get('SALE_TAG', 0) or 0,
-                'orderTag': cur_row.get('AC_ORD_TAG_AMT_KOR', 0) or 0
-            }
+        sales_columns = ['BRD_CD', 'ITEM_CD', 'AC_ORD_QTY_KOR', 'SALE_QTY', 'SALE_TAG', 'AC_ORD_TAG_AMT_KOR']
+        cur = _api_frame(sales_rate_api['data'].get('CUR', []), sales_columns)
+        cur = cur[_truthy(cur['BRD_CD']) & _truthy(cur['ITEM_CD'])]
+        cur = cur.assign(key=cur['BRD_CD'].astype(str) + '_' + cur['ITEM_CD'].astype(str))
+        
+        # 전년 동기: 브랜드·아이템별 첫 행 사용
+        py_sales = _api_frame(sales_rate_api['data'].get('PY', []), sales_columns)
+        py_sales = py_sales[py_sales['BRD_CD'].notna() & py_sales['ITEM_CD'].notna()]
+        py_sales = py_sales.assign(key=py_sales['BRD_CD'].astype(str) + '_' + py_sales['ITEM_CD'].astype(str))
+        py_sales = py_sales.drop_duplicates('key', keep='first').set_index('key')
+        py_ord_qty = _value_or_zero(py_sales['AC_ORD_QTY_KOR']).astype(float)
+        py_rates = _ratio(_value_or_zero(py_sales['SALE_QTY']), py_ord_qty, py_ord_qty > 0)
+        
+        # 누적 판매율 계산: SALE_QTY / AC_ORD_QTY_KOR
+        ord_qty = _value_or_zero(cur['AC_ORD_QTY_KOR']).astype(float)
+        cum_rate = _ratio(_value_or_zero(cur['SALE_QTY']), ord_qty, ord_qty > 0)
+        py_rate = cur['key'].map(py_rates).fillna(0.0)
+        py_is_float = cur['key'].map(py_ord_qty > 0).fillna(False).astype(bool)
+        
+        # 같은 키가 여러 번 나오면 마지막 행 사용
+        rates = pd.DataFrame({
+            'key': cur['key'],
+            'cumSalesRate': _python_numbers(cum_rate, ord_qty > 0),
+            'cumSalesRateDiff': _python_numbers(cum_rate - py_rate, (ord_qty > 0) | py_is_float),
+            'cumSalesTag': _value_or_zero(cur['SALE_TAG']),
+            'orderTag': _value_or_zero(cur['AC_ORD_TAG_AMT_KOR'])
+        }).drop_duplicates('key', keep='last').set_index('key')
+        table = table.join(rates)
+    else:
+        table = table.assign(**{col: None for col in rate_columns})
+    for col in rate_columns:
+        table[col] = table[col].where(table[col].notna(), 0)
     
     # accStockAnalysis 및 clothingBrandStatus 형식으로 변환
-    for key, item_data in brand_item_map.items():
-        brand = item_data['brand']
-        
-        # 재고주수 계산
-        avg4w = item_data['cy']['saleQty28d'] / 4 if item_data['cy']['saleQty28d'] > 0 else 0
-        stockWeeks = item_data['cy']['stockQty'] / avg4w if avg4w > 0 else 0
-        
-        pyAvg4w = item_data['py']['saleQty28d'] / 4 if item_data['py']['saleQty28d'] > 0 else 0
-        pyStockWeeks = item_data['py']['stockQty'] / pyAvg4w if pyAvg4w > 0 else 0
-        
-        stockWeeksDiff = stockWeeks - pyStockWeeks
-        
-        # YOY 계산 (전년 대비 비율)
-        yoyRate = (item_data['cy']['saleQty28d'] / item_data['py']['saleQty28d'] * 100) if item_data['py']['saleQty28d'] > 0 else 0
-        
-        # accStockAnalysis에 추가
-        if brand not in result['accStockAnalysis']:
-            result['accStockAnalysis'][brand] = []
-        
-        result['accStockAnalysis'][brand].append({
-            'itemName': item_data['itemName'],
-            'saleAmt': item_data['cy']['saleTag7d'],
-            'stockWeeks': stockWeeks,
-            'stockWeeksDiff': stockWeeksDiff,
-            'yoyRate': yoyRate
-        })
-        
-        # clothingBrandStatus에 추가 (판매율 데이터 포함)
-        if brand not in result['clothingBrandStatus']:
-            result['clothingBrandStatus'][brand] = []
-        
-        sales_rate_info = sales_rate_by_item.get(key, {})
-        
-        result['clothingBrandStatus'][brand].append({
-            'BRAND': brand,
-            'ITEM_CD': item_data['itemCode'],
-            'ITEM_NM': item_data['itemName'],
-            'PRDT_KIND_NM': item_data['prdtKindNm'],
-            'itemName': item_data['itemName'],
-            'stockWeeks': stockWeeks,
-            'stockWeeksDiff': stockWeeksDiff,
-            'cumSalesRate': sales_rate_info.get('cumSalesRate', 0),
-            'cumSalesRateDiff': sales_rate_info.get('cumSalesRateDiff', 0),
-            'cumSalesTag': sales_rate_info.get('cumSalesTag', 0),
-            'orderTag': sales_rate_info.get('orderTag', 0),
-            'stock': item_data['cy']['stockQty'],
-            'stockAmt': item_data['cy']['stockTagAmt']
-        })
-    
-    return result
+    acc_table = pd.DataFrame({
+        'itemName': table['ITEM_NM'],
+        'saleAmt': table['cySaleTag7d'],
+        'stockWeeks': table['stockWeeks'],
+        'stockWeeksDiff': table['stockWeeksDiff'],
+        'yoyRate': table['yoyRate']
+    })
+    clothing_table = pd.DataFrame({
+        'BRAND': table['BRD_CD'],
+        'ITEM_CD': table['ITEM_CD'],
+        'ITEM_NM': table['ITEM_NM'],
+        'PRDT_KIND_NM': table['PRDT_KIND_NM'],
+        'itemName': table['ITEM_NM'],
+        'stockWeeks': table['stockWeeks'],
+        'stockWeeksDiff': table['stockWeeksDiff'],
+        'cumSalesRate': table['cumSalesRate'],
+        'cumSalesRateDiff': table['cumSalesRateDiff'],
+        'cumSalesTag': table['cumSalesTag'],
+        'orderTag': table['orderTag'],
+        'stock': table['cyStockQty'],
+        'stockAmt': table['cyStockTagAmt']
+    })
+    brand_positions = table.groupby('BRD_CD', sort=False).indices
+    for brand in table['BRD_CD'].unique():
+        positions = brand_positions[brand]
+        result['accStockAnalysis'][brand] = acc_table.iloc[positions].astype(object).to_dict('records')
+        result['clothingBrandStatus'][brand] = clothing_table.iloc[positions].astype(object).to_dict('records')
+    
+    return build_stock_analysis(result)
 
 
 def load_json_file(file_path: Path) -> Optional[Dict]:
@@ -1040,42 +1199,196 @@ def load_json_file(file_path: Path) -> Optional[Dict]:
         return None
 
 
-def generate_insights_for_overview(date_str: str, generator: AIInsightGenerator, output_dir: Path, api_base_url: str = "http://localhost:3000"):
-    """전체 현황에 대한 모든 인사이트 생성"""
-    base_dir = project_root / "public" / "data" / date_str
+class InsightContext:
+    """
+    날짜별 인사이트 입력 데이터 (전체 현황/브랜드 분석이 공유)
+
+    JSON 파일과 재고주수/판매율 API 응답을 날짜당 한 번만 읽습니다.
+    브랜드 분석에는 brand_view()로 해당 브랜드 부분만 잘라서 넘깁니다.
+    로드한 데이터는 여러 스레드가 함께 읽으므로 수정하지 않습니다.
+    """
+    
+    def __init__(self, date_str: str, api_base_url: str = "http://localhost:3000", base_dir: Optional[Path] = None):
+        self.date_str = date_str
+        self.api_base_url = api_base_url
+        self.base_dir = Path(base_dir) if base_dir else project_root / "public" / "data" / date_str
+        self._files: Dict[str, Optional[Dict]] = {}
+        self._rows_by_brand: Dict[str, Dict[str, List[Dict]]] = {}
+        self._api_stock = None
+        self._stock_file = None
+        self._lock = threading.RLock()
+        self._views: Dict[str, "BrandInsightView"] = {}
+    
+    def has(self, name: str) -> bool:
+        """JSON 파일 존재 여부"""
+        return name in self._files or (self.base_dir / name).exists()
+    
+    def load(self, name: str) -> Optional[Dict]:
+        """JSON 파일 로드 (날짜당 한 번, 없거나 파싱 실패 시 None)"""
+        with self._lock:
+            if name not in self._files:
+                path = self.base_dir / name
+                self._files[name] = load_json_file(path) if path.exists() else None
+            return self._files[name]
+    
+    def rows_by_brand(self, name: str, key: Optional[str] = None) -> Optional[Dict[str, List[Dict]]]:
+        """
+        JSON 파일의 행 목록(key)을 브랜드 코드별로 묶은 결과 (목록이 없으면 None)
+        
+        key가 None이면 파일 전체를 행 목록으로 보고, 컬럼 단위 테이블
+        ({'columns', 'data'})은 행 목록으로 변환합니다.
+        """
+        with self._lock:
+            cache_key = f"{name}:{key}"
+            if cache_key not in self._rows_by_brand:
+                data = self.load(name)
+                rows = data if key is None else (data.get(key) if isinstance(data, dict) else None)
+                if isinstance(rows, dict) and "columns" in rows and "data" in rows:
+                    rows = raw_table_to_records(rows)
+                grouped = None
+                if isinstance(rows, list):
+                    grouped = {}
+                    for row in rows:
+                        grouped.setdefault(row.get("브랜드"), []).append(row)
+                self._rows_by_brand[cache_key] = grouped
+            return self._rows_by_brand[cache_key]
+    
+    def stock_file(self) -> Optional[Dict]:
+        """stock_analysis.json (예전 overview_stock_analysis.json 섹션 보충, 날짜당 한 번)"""
+        with self._lock:
+            if self._stock_file is None:
+                self._stock_file = (load_stock_analysis(self.base_dir),)
+            return self._stock_file[0]
+    
+    def api_stock(self) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        재고주수/판매율 API 조회 후 stock_analysis 형식으로 변환 (날짜당 한 번)
+
+        Returns:
+            (변환된 재고 데이터, API 기준일), API 실패 시 (None, None)
+        """
+        with self._lock:
+            if self._api_stock is None:
+                stock_weeks_api = fetch_stock_weeks_api(self.api_base_url)
+                sales_rate_api = fetch_sales_rate_api(self.api_base_url)
+                if stock_weeks_api and stock_weeks_api.get('success'):
+                    api_date = stock_weeks_api.get('asof_dt', stock_weeks_api.get('date'))
+                    self._api_stock = (transform_api_to_stock_format(stock_weeks_api, sales_rate_api), api_date)
+                else:
+                    self._api_stock = (None, None)
+            return self._api_stock
+    
+    def brand_view(self, brand: str) -> "BrandInsightView":
+        """브랜드별로 잘라낸 입력 데이터"""
+        with self._lock:
+            if brand not in self._views:
+                self._views[brand] = BrandInsightView(self, brand)
+            return self._views[brand]
+
+
+class BrandInsightView:
+    """
+    InsightContext에서 한 브랜드 부분만 잘라낸 입력 데이터
+
+    brand_pl.json은 브랜드명, 나머지 파일은 브랜드 코드로 구분됩니다.
+    """
+    
+    def __init__(self, context: InsightContext, brand: str):
+        self.context = context
+        self.brand = brand
+        self.brand_code = BRAND_CODE_MAP.get(brand, brand)
+    
+    def _entry(self, name: str, key: str) -> Optional[Any]:
+        data = self.context.load(name)
+        if data and key in data:
+            return data[key]
+        return None
+    
+    @property
+    def pl(self) -> Optional[Dict]:
+        """brand_pl.json의 브랜드 손익"""
+        return self._entry("brand_pl.json", self.brand)
+    
+    @property
+    def kpi(self) -> Optional[Dict]:
+        """brand_kpi.json의 브랜드 KPI"""
+        return self._entry("brand_kpi.json", self.brand_code)
+    
+    @property
+    def channel_pl(self) -> Optional[Dict]:
+        """channel_pl.json의 브랜드 채널별 손익"""
+        return self._entry("channel_pl.json", self.brand_code)
+    
+    def treemap_by_brand(self, section: str) -> Optional[Any]:
+        """treemap.json의 channelTreemapData / itemTreemapData 중 브랜드 부분 (없으면 None)"""
+        data = self.context.load("treemap.json")
+        if not data or section not in data:
+            return None
+        by_brand = data[section].get("byBrand", {})
+        return by_brand.get(self.brand_code) if isinstance(by_brand, dict) else None
+    
+    @property
+    def radar(self) -> Dict:
+        """radar_chart.json의 채널별 계획/실적/전년비 중 브랜드 부분"""
+        data = self.context.load("radar_chart.json") or {}
+        return {
+            key: {self.brand_code: data[key][self.brand_code]}
+            for key in ("channelPlan", "channelCurrent", "channelYoy")
+            if key in data and self.brand_code in data[key]
+        }
+    
+    @property
+    def weekly_raw_rows(self) -> Optional[List[Dict]]:
+        """주차별 매출 원본 행 중 브랜드 행 (weekly_trend_raw.json, 없으면 weekly_trend.json rawData)"""
+        if self.context.has(WEEKLY_TREND_RAW_FILE):
+            grouped = self.context.rows_by_brand(WEEKLY_TREND_RAW_FILE)
+        else:
+            grouped = self.context.rows_by_brand("weekly_trend.json", "rawData")
+        if grouped is None:
+            return None
+        return grouped.get(self.brand_code, [])
+    
+    def stock_section(self, stock_data: Optional[Dict], section: str) -> Optional[Any]:
+        """재고 데이터(clothingBrandStatus / accStockAnalysis)의 브랜드 부분"""
+        if not stock_data:
+            return None
+        return stock_data.get(section, {}).get(self.brand_code)
+
+
+def generate_insights_for_overview(date_str: str, generator: AIInsightGenerator, output_dir: Path, api_base_url: str = "http://localhost:3000",
+                                   context: Optional[InsightContext] = None):
+    """전체 현황에 대한 모든 인사이트 생성 (context: 브랜드 분석과 공유하는 입력 데이터)"""
+    if context is None:
+        context = InsightContext(date_str, api_base_url)
     
     insights = {}
     overview_data = {}
     
     # 1. 전체 KPI 분석
-    kpi_file = base_dir / "overview_kpi.json"
-    if kpi_file.exists():
+    if context.has("overview_kpi.json"):
         print("[ANALYZING] 전체 KPI 분석 중...")
-        kpi_data = load_json_file(kpi_file)
+        kpi_data = context.load("overview_kpi.json")
         if kpi_data and "OVERVIEW" in kpi_data:
             overview_data["kpi"] = kpi_data["OVERVIEW"]
     
     # 2. 전체 손익계산서 분석
-    pl_file = base_dir / "overview_pl.json"
-    if pl_file.exists():
+    if context.has("overview_pl.json"):
         print("[ANALYZING] 전체 손익계산서 분석 중...")
-        pl_data = load_json_file(pl_file)
+        pl_data = context.load("overview_pl.json")
         if pl_data:
             overview_data["pl"] = pl_data
     
     # 3. 브랜드별 기여도 분석
-    by_brand_file = base_dir / "overview_by_brand.json"
-    if by_brand_file.exists():
+    if context.has("overview_by_brand.json"):
         print("[ANALYZING] 브랜드별 기여도 분석 중...")
-        by_brand_data = load_json_file(by_brand_file)
+        by_brand_data = context.load("overview_by_brand.json")
         if by_brand_data:
             overview_data["by_brand"] = by_brand_data
     
     # 4. 월중누적매출추이 분석
-    trend_file = base_dir / "overview_trend.json"
-    if trend_file.exists():
+    if context.has("overview_trend.json"):
         print("[ANALYZING] 월중누적매출추이 분석 중...")
-        trend_data = load_json_file(trend_file)
+        trend_data = context.load("overview_trend.json")
         if trend_data:
             overview_data["trend"] = trend_data
     
@@ -1085,23 +1398,20 @@ def generate_insights_for_overview(date_str: str, generator: AIInsightGenerator,
     
     # API 데이터 조회 시도
     print("[ANALYZING] 전체 재고 분석 중...")
-    stock_weeks_api = fetch_stock_weeks_api(api_base_url)
-    sales_rate_api = fetch_sales_rate_api(api_base_url)
+    api_stock_data, api_date = context.api_stock()
     
-    if stock_weeks_api and stock_weeks_api.get('success'):
-        api_date = stock_weeks_api.get('asof_dt', stock_weeks_api.get('date'))
+    if api_stock_data:
         print(f"[INFO] API 데이터 사용 (기준일: {api_date})")
-        # API 데이터 변환 (기존 JSON 형식으로)
-        stock_data = transform_api_to_stock_format(stock_weeks_api, sales_rate_api)
+        # API 데이터 (기존 JSON 형식으로 변환됨, 공유 데이터이므로 복사 후 날짜 추가)
+        stock_data = dict(api_stock_data)
         stock_data['api_date'] = api_date  # API 날짜 저장
     else:
         # Fallback: JSON 파일 사용
         print("[INFO] API 데이터 없음 - JSON 파일 사용")
-        stock_file = base_dir / "stock_analysis.json"
-        if stock_file.exists():
-            stock_data = load_json_file(stock_file)
-            if stock_data:
-                stock_data['api_date'] = None  # JSON 사용 표시
+        stock_data = context.stock_file()
+        if stock_data:
+            stock_data = dict(stock_data)
+            stock_data['api_date'] = None  # JSON 사용 표시
     
     if stock_data:
         overview_data["stock"] = stock_data
@@ -1295,10 +1605,9 @@ def generate_insights_for_overview(date_str: str, generator: AIInsightGenerator,
     
     # 2. 트리맵 분석 (브랜드별 기여도)
     treemap_insight = ""
-    treemap_file = base_dir / "treemap.json"
-    if treemap_file.exists():
+    if context.has("treemap.json"):
         print("[ANALYZING] 전체 현황 트리맵 분석 중...")
-        treemap_data = load_json_file(treemap_file)
+        treemap_data = context.load("treemap.json")
         if treemap_data:
             # 전체 브랜드 데이터를 하나로 합침
             all_brand_treemap = {}
@@ -1311,10 +1620,9 @@ def generate_insights_for_overview(date_str: str, generator: AIInsightGenerator,
     
     # 3. 레이더 차트 분석
     radar_insight = ""
-    radar_file = base_dir / "radar_chart.json"
-    if radar_file.exists():
+    if context.has("radar_chart.json"):
         print("[ANALYZING] 전체 현황 레이더 차트 분석 중...")
-        radar_data = load_json_file(radar_file)
+        radar_data = context.load("radar_chart.json")
         if radar_data:
             radar_insight = generator.generate_insight(radar_data, "전체 현황", "radar")
     
@@ -1365,26 +1673,32 @@ def generate_insights_for_overview(date_str: str, generator: AIInsightGenerator,
     return overview_data_format
 
 
-def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightGenerator, output_dir: Path, api_base_url: str = "http://localhost:3000"):
-    """특정 브랜드에 대한 모든 인사이트 생성"""
-    base_dir = project_root / "public" / "data" / date_str
-    brand_code = BRAND_CODE_MAP.get(brand, brand)
+def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightGenerator, output_dir: Path, api_base_url: str = "http://localhost:3000",
+                                context: Optional[InsightContext] = None):
+    """
+    특정 브랜드에 대한 모든 인사이트 생성
+
+    context를 넘기면 날짜별 JSON 파일/API 데이터를 브랜드 간에 공유합니다.
+    (--all-brands 실행 시 파일과 API를 브랜드마다 다시 읽지 않음)
+    """
+    if context is None:
+        context = InsightContext(date_str, api_base_url)
+    view = context.brand_view(brand)
+    brand_code = view.brand_code
     
     insights = {}
     
     # 1. 손익계산서 분석
-    pl_file = base_dir / "brand_pl.json"
-    if pl_file.exists():
+    if context.has("brand_pl.json"):
         print(f"[ANALYZING] 손익계산서 분석 중... ({brand})")
-        pl_data = load_json_file(pl_file)
-        if pl_data and brand in pl_data:
-            insights["pl"] = generator.generate_insight(pl_data[brand], brand, "pl")
+        brand_pl = view.pl
+        if brand_pl is not None:
+            insights["pl"] = generator.generate_insight(brand_pl, brand, "pl")
     
     # 2. 트리맵 분석
-    treemap_file = base_dir / "treemap.json"
-    if treemap_file.exists():
+    if context.has("treemap.json"):
         print(f"[ANALYZING] 트리맵 분석 중... ({brand})")
-        treemap_data = load_json_file(treemap_file)
+        treemap_data = context.load("treemap.json")
         if treemap_data:
             # 브랜드별 데이터 필터링
             brand_treemap_data = {}
@@ -1393,7 +1707,7 @@ def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightG
                 if "byBrand" in channel_treemap and brand_code in channel_treemap["byBrand"]:
                     brand_treemap_data["channelTreemapData"] = {
                         "byBrand": {
-                            brand_code: channel_treemap["byBrand"][brand_code]
+                            brand_code: view.treemap_by_brand("channelTreemapData")
                         }
                     }
             
@@ -1404,7 +1718,7 @@ def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightG
                         brand_treemap_data["channelTreemapData"] = {}
                     brand_treemap_data["itemTreemapData"] = {
                         "byBrand": {
-                            brand_code: item_treemap["byBrand"][brand_code]
+                            brand_code: view.treemap_by_brand("itemTreemapData")
                         }
                     }
             
@@ -1412,36 +1726,26 @@ def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightG
                 insights["treemap"] = generator.generate_insight(brand_treemap_data, brand, "treemap")
     
     # 3. 레이더 차트 분석
-    radar_file = base_dir / "radar_chart.json"
-    if radar_file.exists():
+    if context.has("radar_chart.json"):
         print(f"[ANALYZING] 레이더 차트 분석 중... ({brand})")
-        radar_data = load_json_file(radar_file)
-        if radar_data:
+        if context.load("radar_chart.json"):
             # 브랜드별로 필터링
-            brand_radar_data = {}
-            if "channelPlan" in radar_data and brand_code in radar_data["channelPlan"]:
-                brand_radar_data["channelPlan"] = {brand_code: radar_data["channelPlan"][brand_code]}
-            if "channelCurrent" in radar_data and brand_code in radar_data["channelCurrent"]:
-                brand_radar_data["channelCurrent"] = {brand_code: radar_data["channelCurrent"][brand_code]}
-            if "channelYoy" in radar_data and brand_code in radar_data["channelYoy"]:
-                brand_radar_data["channelYoy"] = {brand_code: radar_data["channelYoy"][brand_code]}
+            brand_radar_data = view.radar
             
             if brand_radar_data:
                 insights["radar"] = generator.generate_insight(brand_radar_data, brand, "radar")
     
     # 4. 채널별 손익 분석
-    channel_pl_file = base_dir / "channel_pl.json"
-    if channel_pl_file.exists():
+    if context.has("channel_pl.json"):
         print(f"[ANALYZING] 채널별 손익 분석 중... ({brand})")
-        channel_pl_data = load_json_file(channel_pl_file)
-        if channel_pl_data and brand_code in channel_pl_data:
-            insights["channelPl"] = generator.generate_insight(channel_pl_data[brand_code], brand, "channel_pl")
+        brand_channel_pl = view.channel_pl
+        if brand_channel_pl is not None:
+            insights["channelPl"] = generator.generate_insight(brand_channel_pl, brand, "channel_pl")
     
     # 5. 주차별 매출추세 분석
-    weekly_file = base_dir / "weekly_trend.json"
-    if weekly_file.exists():
+    if context.has("weekly_trend.json"):
         print(f"[ANALYZING] 주차별 매출추세 분석 중... ({brand})")
-        weekly_data = load_json_file(weekly_file)
+        weekly_data = context.load("weekly_trend.json")
         if weekly_data:
             from collections import defaultdict
             
@@ -1559,14 +1863,14 @@ def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightG
                     channel_trends = []
                     
                     # rawData에서 최근 4주간 채널별 데이터 추출
-                    if "rawData" in weekly_data and isinstance(weekly_data.get("rawData"), list):
+                    brand_raw_rows = view.weekly_raw_rows
+                    if brand_raw_rows is not None:
                         # rawData에서 해당 브랜드의 모든 종료일 추출 및 정렬
                         brand_dates = set()
-                        for row in weekly_data["rawData"]:
-                            if row.get("브랜드") == brand_code:
-                                end_date = row.get("종료일")
-                                if end_date:
-                                    brand_dates.add(end_date)
+                        for row in brand_raw_rows:
+                            end_date = row.get("종료일")
+                            if end_date:
+                                brand_dates.add(end_date)
                         
                         # 종료일을 정렬하여 최근 4주 선택
                         sorted_dates = sorted(brand_dates)
@@ -1577,9 +1881,8 @@ def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightG
                         
                         # 채널별로 최근 4주간 데이터 집계
                         channel_sums = {}
-                        for row in weekly_data["rawData"]:
-                            if (row.get("브랜드") == brand_code and 
-                                row.get("종료일") in recent_4weeks_dates):
+                        for row in brand_raw_rows:
+                            if row.get("종료일") in recent_4weeks_dates:
                                 channel_name = row.get("채널명", "")
                                 if not channel_name:
                                     continue
@@ -1640,44 +1943,39 @@ def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightG
     api_date = None
     
     print(f"[ANALYZING] 재고주수 분석 중... ({brand})")
-    stock_weeks_api = fetch_stock_weeks_api(api_base_url)
-    sales_rate_api = fetch_sales_rate_api(api_base_url)
+    full_stock_data, api_date = context.api_stock()
     
-    if stock_weeks_api and stock_weeks_api.get('success'):
-        api_date = stock_weeks_api.get('asof_dt', stock_weeks_api.get('date'))
+    if full_stock_data:
         print(f"[INFO] API 데이터 사용 (기준일: {api_date})")
-        # API 데이터 변환 후 브랜드 필터링
-        full_stock_data = transform_api_to_stock_format(stock_weeks_api, sales_rate_api)
+        # API 데이터 (날짜당 한 번 변환) 브랜드 필터링
         
         # 브랜드별로 필터링
-        if brand_code in full_stock_data.get("clothingBrandStatus", {}):
-            brand_stock = {"clothingBrandStatus": full_stock_data["clothingBrandStatus"][brand_code]}
+        brand_stock = brand_view(full_stock_data, brand_code)
+        if "clothingBrandStatus" in brand_stock:
+            brand_stock = {"clothingBrandStatus": brand_stock["clothingBrandStatus"]}
             insights["inventory"] = generator.generate_insight(brand_stock, brand, "inventory")
             insights["saleRate"] = generator.generate_insight(brand_stock, brand, "sale_rate")
             stock_data = full_stock_data
     else:
         # Fallback: JSON 파일
         print(f"[INFO] API 데이터 없음 - JSON 파일 사용 ({brand})")
-        stock_file = base_dir / "stock_analysis.json"
-        if stock_file.exists():
-            stock_data = load_json_file(stock_file)
-            if stock_data and brand_code in stock_data.get("clothingBrandStatus", {}):
-                brand_stock = {"clothingBrandStatus": stock_data["clothingBrandStatus"][brand_code]}
-                insights["inventory"] = generator.generate_insight(brand_stock, brand, "inventory")
-                insights["saleRate"] = generator.generate_insight(brand_stock, brand, "sale_rate")
+        stock_data = context.stock_file()
+        brand_stock = brand_view(stock_data, brand_code)
+        if "clothingBrandStatus" in brand_stock:
+            brand_stock = {"clothingBrandStatus": brand_stock["clothingBrandStatus"]}
+            insights["inventory"] = generator.generate_insight(brand_stock, brand, "inventory")
+            insights["saleRate"] = generator.generate_insight(brand_stock, brand, "sale_rate")
     
     # 브랜드별 주요 내용(content)과 핵심인사이트(keyPoints) 생성
-    brand_kpi_file = base_dir / "brand_kpi.json"
     content = ""
     key_points = []
     
     # 날짜 표시 결정
     date_prefix = f"(현재기준 {api_date})" if api_date else f"(기준 {date_str[:4]}-{date_str[4:6]}-{date_str[6:]})"
     
-    if brand_kpi_file.exists():
-        kpi_data = load_json_file(brand_kpi_file)
-        if kpi_data and brand_code in kpi_data:
-            brand_kpi = kpi_data[brand_code]
+    if context.has("brand_kpi.json"):
+        brand_kpi = view.kpi
+        if brand_kpi is not None:
             
             # KPI 데이터 구조: 평면 구조 (revenueForecast, revenuePlan 등이 직접 키)
             revenue_forecast = brand_kpi.get("revenueForecast", 0) / 100000000
@@ -1752,13 +2050,12 @@ def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightG
             
             # 핵심인사이트 생성 (새로운 형식)
             # 1. 현재 시점 기준 판매매출 가장 높은 채널과 아이템
-            treemap_file = base_dir / "treemap.json"
-            if treemap_file.exists():
-                treemap_data = load_json_file(treemap_file)
+            if context.has("treemap.json"):
+                treemap_data = context.load("treemap.json")
                 if treemap_data:
                     # treemap 구조: channelTreemapData.byBrand.M.channel.channels
-                    brand_channel_data = treemap_data.get("channelTreemapData", {}).get("byBrand", {}).get(brand_code, {})
-                    brand_item_data = treemap_data.get("itemTreemapData", {}).get("byBrand", {}).get(brand_code, {})
+                    brand_channel_data = view.treemap_by_brand("channelTreemapData") or {}
+                    brand_item_data = view.treemap_by_brand("itemTreemapData") or {}
                     
                     channel_treemap = brand_channel_data.get("channel", {}) if isinstance(brand_channel_data, dict) else {}
                     item_treemap = brand_item_data.get("item", {}) if isinstance(brand_item_data, dict) else {}
@@ -1831,11 +2128,9 @@ def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightG
                                 key_points.append(f"- 현재시점기준({current_date_str}) 판매 비중이 가장 높은 채널은 <strong>{top_channel['name']}</strong>({top_channel_sales_billion:.0f}억원)으로 전체 비중 {top_channel_share:.0f}%입니다.")
             
             # 2. 채널 중 직접이익이 가장 높은 곳과 낮은 곳
-            channel_pl_file = base_dir / "channel_pl.json"
-            if channel_pl_file.exists():
-                channel_pl_data = load_json_file(channel_pl_file)
-                if channel_pl_data and brand_code in channel_pl_data:
-                    brand_channel_pl = channel_pl_data[brand_code]
+            if context.has("channel_pl.json"):
+                brand_channel_pl = view.channel_pl
+                if brand_channel_pl is not None:
                     if isinstance(brand_channel_pl, dict):
                         channels_profit = []
                         for ch_name, ch_data in brand_channel_pl.items():
@@ -1867,9 +2162,8 @@ def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightG
                                 key_points.append(f"- 월말 예상 직접이익이 가장 높은 채널은 <strong>{highest_profit['name']}</strong>으로 {highest_profit_billion:.1f}억원(직접이익율 {highest_profit['direct_profit_rate']:.0f}%)입니다.")
             
             # 3. 최근 4주간 매출추세가 가장 좋은 채널, 나쁜 채널
-            weekly_file = base_dir / "weekly_trend.json"
-            if weekly_file.exists():
-                weekly_data = load_json_file(weekly_file)
+            if context.has("weekly_trend.json"):
+                weekly_data = context.load("weekly_trend.json")
                 if weekly_data:
                     # 새로운 구조: weeklySalesTrend.byBrand.M
                     if "weeklySalesTrend" in weekly_data and brand_code in weekly_data["weeklySalesTrend"]:
@@ -2039,124 +2333,119 @@ def generate_insights_for_brand(date_str: str, brand: str, generator: AIInsightG
                                                 key_points.append(f"- 최근 4주간 <strong>{best_channel['name']}</strong> 채널이 {best_channel['trend']:+.1f}% 성장하여 긍정적 추세를 보이고 있습니다.")
             
             # 4. 누적판매매출 높은거 2개, 누적판매매출이 0원인곳 제외 상위 30%중 판매율 차이가 가장 작은곳
-            stock_file = base_dir / "stock_analysis.json"
-            if stock_file.exists():
-                stock_data = load_json_file(stock_file)
-                if stock_data:
-                    clothing_status = stock_data.get("clothingBrandStatus", {})
-                    if brand_code in clothing_status:
-                        brand_clothing = clothing_status[brand_code]
-                        if isinstance(brand_clothing, list):
-                            # 누적판매매출이 0원인곳 제외
-                            valid_items = [item for item in brand_clothing if isinstance(item, dict) and (item.get("cumSalesTag") or 0) > 0]
+            stock_data = context.stock_file()
+            if stock_data:
+                clothing_status = stock_data.get("clothingBrandStatus", {})
+                if brand_code in clothing_status:
+                    brand_clothing = clothing_status[brand_code]
+                    if isinstance(brand_clothing, list):
+                        # 누적판매매출이 0원인곳 제외
+                        valid_items = [item for item in brand_clothing if isinstance(item, dict) and (item.get("cumSalesTag") or 0) > 0]
+                        
+                        if valid_items:
+                            # 누적판매매출 기준 정렬
+                            sorted_by_sales = sorted(valid_items, key=lambda x: (x.get("cumSalesTag") or 0), reverse=True)
                             
-                            if valid_items:
-                                # 누적판매매출 기준 정렬
-                                sorted_by_sales = sorted(valid_items, key=lambda x: (x.get("cumSalesTag") or 0), reverse=True)
-                                
-                                # 상위 2개
-                                top2_items = sorted_by_sales[:2]
-                                
-                                # 상위 30% 계산
-                                top30_count = max(1, int(len(sorted_by_sales) * 0.3))
-                                top30_items = sorted_by_sales[:top30_count]
+                            # 상위 2개
+                            top2_items = sorted_by_sales[:2]
+                            
+                            # 상위 30% 계산
+                            top30_count = max(1, int(len(sorted_by_sales) * 0.3))
+                            top30_items = sorted_by_sales[:top30_count]
+                            
+                            # 판매율 차이(cumSalesRateDiff)가 가장 작은 것 (절대값 기준)
+                            if top30_items:
+                                min_diff_item = min(top30_items, key=lambda x: abs(x.get("cumSalesRateDiff", 999)) if x.get("cumSalesRateDiff") is not None else 999)
                                 
-                                # 판매율 차이(cumSalesRateDiff)가 가장 작은 것 (절대값 기준)
-                                if top30_items:
+                                # 상위 2개 아이템 정보
+                                if len(top2_items) >= 2:
+                                    item1 = top2_items[0]
+                                    item2 = top2_items[1]
+                                    item1_name = item1.get("itemName", "")
+                                    item1_rate = item1.get("cumSalesRate", 0) * 100 if item1.get("cumSalesRate") else 0
+                                    item1_diff = item1.get("cumSalesRateDiff", 0) * 100 if item1.get("cumSalesRateDiff") is not None else 0
+                                    item2_name = item2.get("itemName", "")
+                                    item2_rate = item2.get("cumSalesRate", 0) * 100 if item2.get("cumSalesRate") else 0
+                                    item2_diff = item2.get("cumSalesRateDiff", 0) * 100 if item2.get("cumSalesRateDiff") is not None else 0
+                                    
+                                    # 판매율 차이가 가장 작은 것 (절대값 기준, 0에 가까운 것)
                                     min_diff_item = min(top30_items, key=lambda x: abs(x.get("cumSalesRateDiff", 999)) if x.get("cumSalesRateDiff") is not None else 999)
+                                    min_diff_name = min_diff_item.get("itemName", "")
+                                    min_diff_rate = min_diff_item.get("cumSalesRate", 0) * 100 if min_diff_item.get("cumSalesRate") else 0
+                                    min_diff_value = min_diff_item.get("cumSalesRateDiff", 0) * 100 if min_diff_item.get("cumSalesRateDiff") is not None else 0
                                     
-                                    # 상위 2개 아이템 정보
-                                    if len(top2_items) >= 2:
-                                        item1 = top2_items[0]
-                                        item2 = top2_items[1]
-                                        item1_name = item1.get("itemName", "")
-                                        item1_rate = item1.get("cumSalesRate", 0) * 100 if item1.get("cumSalesRate") else 0
-                                        item1_diff = item1.get("cumSalesRateDiff", 0) * 100 if item1.get("cumSalesRateDiff") is not None else 0
-                                        item2_name = item2.get("itemName", "")
-                                        item2_rate = item2.get("cumSalesRate", 0) * 100 if item2.get("cumSalesRate") else 0
-                                        item2_diff = item2.get("cumSalesRateDiff", 0) * 100 if item2.get("cumSalesRateDiff") is not None else 0
-                                        
-                                        # 판매율 차이가 가장 작은 것 (절대값 기준, 0에 가까운 것)
-                                        min_diff_item = min(top30_items, key=lambda x: abs(x.get("cumSalesRateDiff", 999)) if x.get("cumSalesRateDiff") is not None else 999)
-                                        min_diff_name = min_diff_item.get("itemName", "")
-                                        min_diff_rate = min_diff_item.get("cumSalesRate", 0) * 100 if min_diff_item.get("cumSalesRate") else 0
-                                        min_diff_value = min_diff_item.get("cumSalesRateDiff", 0) * 100 if min_diff_item.get("cumSalesRateDiff") is not None else 0
-                                        
-                                        # 1위, 2위와 min_diff_item이 다른 경우만 추가
-                                        if min_diff_name != item1_name and min_diff_name != item2_name:
-                                            key_points.append(f"- {date_prefix}의류 누적 매출 1위: <strong>{item1_name}</strong>로 판매율 {item1_rate:.1f}%(전년대비 {item1_diff:+.1f}%p), 2위: <strong>{item2_name}</strong> 판매율 {item2_rate:.1f}%(전년대비 {item2_diff:+.1f}%p), 반면 <strong>{min_diff_name}</strong>는 누적판매율 전년대비 {min_diff_value:+.1f}%p로 조치 필요합니다.")
-                                        else:
-                                            key_points.append(f"- {date_prefix}의류 누적 매출 1위: <strong>{item1_name}</strong>로 판매율 {item1_rate:.1f}%(전년대비 {item1_diff:+.1f}%p), 2위: <strong>{item2_name}</strong> 판매율 {item2_rate:.1f}%(전년대비 {item2_diff:+.1f}%p)입니다.")
-                                    elif len(top2_items) >= 1:
-                                        item1 = top2_items[0]
-                                        item1_name = item1.get("itemName", "")
-                                        item1_rate = item1.get("cumSalesRate", 0) * 100 if item1.get("cumSalesRate") else 0
-                                        item1_diff = item1.get("cumSalesRateDiff", 0) * 100 if item1.get("cumSalesRateDiff") is not None else 0
-                                        min_diff_name = min_diff_item.get("itemName", "")
-                                        min_diff_value = min_diff_item.get("cumSalesRateDiff", 0) * 100 if min_diff_item.get("cumSalesRateDiff") is not None else 0
-                                        
-                                        key_points.append(f"- {date_prefix}의류 누적 매출 1위: <strong>{item1_name}</strong>로 판매율 {item1_rate:.1f}%(전년대비 {item1_diff:+.1f}%p), 반면 <strong>{min_diff_name}</strong>는 누적판매율 전년대비 {min_diff_value:+.1f}%p로 조치 필요합니다.")
-            
+                                    # 1위, 2위와 min_diff_item이 다른 경우만 추가
+                                    if min_diff_name != item1_name and min_diff_name != item2_name:
+                                        key_points.append(f"- {date_prefix}의류 누적 매출 1위: <strong>{item1_name}</strong>로 판매율 {item1_rate:.1f}%(전년대비 {item1_diff:+.1f}%p), 2위: <strong>{item2_name}</strong> 판매율 {item2_rate:.1f}%(전년대비 {item2_diff:+.1f}%p), 반면 <strong>{min_diff_name}</strong>는 누적판매율 전년대비 {min_diff_value:+.1f}%p로 조치 필요합니다.")
+                                    else:
+                                        key_points.append(f"- {date_prefix}의류 누적 매출 1위: <strong>{item1_name}</strong>로 판매율 {item1_rate:.1f}%(전년대비 {item1_diff:+.1f}%p), 2위: <strong>{item2_name}</strong> 판매율 {item2_rate:.1f}%(전년대비 {item2_diff:+.1f}%p)입니다.")
+                                elif len(top2_items) >= 1:
+                                    item1 = top2_items[0]
+                                    item1_name = item1.get("itemName", "")
+                                    item1_rate = item1.get("cumSalesRate", 0) * 100 if item1.get("cumSalesRate") else 0
+                                    item1_diff = item1.get("cumSalesRateDiff", 0) * 100 if item1.get("cumSalesRateDiff") is not None else 0
+                                    min_diff_name = min_diff_item.get("itemName", "")
+                                    min_diff_value = min_diff_item.get("cumSalesRateDiff", 0) * 100 if min_diff_item.get("cumSalesRateDiff") is not None else 0
+                                    
+                                    key_points.append(f"- {date_prefix}의류 누적 매출 1위: <strong>{item1_name}</strong>로 판매율 {item1_rate:.1f}%(전년대비 {item1_diff:+.1f}%p), 반면 <strong>{min_diff_name}</strong>는 누적판매율 전년대비 {min_diff_value:+.1f}%p로 조치 필요합니다.")
+        
             # 5. 재고주수 판매매출 높은거 2개, 판매매출이 0원인곳 제외 상위 30%중 재고주수가 가장 높은곳
-            if stock_file.exists():
-                stock_data = load_json_file(stock_file)
-                if stock_data:
-                    acc_stock = stock_data.get("accStockAnalysis", {})
-                    if brand_code in acc_stock:
-                        brand_acc = acc_stock[brand_code]
-                        if isinstance(brand_acc, list):
-                            # 판매매출이 0원인곳 제외
-                            valid_acc_items = [item for item in brand_acc if isinstance(item, dict) and (item.get("saleAmt") or 0) > 0]
+            stock_data = context.stock_file()
+            if stock_data:
+                acc_stock = stock_data.get("accStockAnalysis", {})
+                if brand_code in acc_stock:
+                    brand_acc = acc_stock[brand_code]
+                    if isinstance(brand_acc, list):
+                        # 판매매출이 0원인곳 제외
+                        valid_acc_items = [item for item in brand_acc if isinstance(item, dict) and (item.get("saleAmt") or 0) > 0]
+                        
+                        if valid_acc_items:
+                            # 판매매출 기준 정렬
+                            sorted_by_sales = sorted(valid_acc_items, key=lambda x: (x.get("saleAmt") or 0), reverse=True)
                             
-                            if valid_acc_items:
-                                # 판매매출 기준 정렬
-                                sorted_by_sales = sorted(valid_acc_items, key=lambda x: (x.get("saleAmt") or 0), reverse=True)
-                                
-                                # 상위 2개
-                                top2_acc = sorted_by_sales[:2]
-                                
-                                # 상위 30% 계산
-                                top30_count = max(1, int(len(sorted_by_sales) * 0.3))
-                                top30_acc = sorted_by_sales[:top30_count]
+                            # 상위 2개
+                            top2_acc = sorted_by_sales[:2]
+                            
+                            # 상위 30% 계산
+                            top30_count = max(1, int(len(sorted_by_sales) * 0.3))
+                            top30_acc = sorted_by_sales[:top30_count]
+                            
+                            # 재고주수가 가장 높은 것
+                            if top30_acc:
+                                max_stock_item = max(top30_acc, key=lambda x: x.get("stockWeeks", 0) if x.get("stockWeeks") is not None else 0)
                                 
-                                # 재고주수가 가장 높은 것
-                                if top30_acc:
-                                    max_stock_item = max(top30_acc, key=lambda x: x.get("stockWeeks", 0) if x.get("stockWeeks") is not None else 0)
+                                # 상위 2개 아이템 정보
+                                if len(top2_acc) >= 2:
+                                    acc1 = top2_acc[0]
+                                    acc2 = top2_acc[1]
+                                    acc1_name = acc1.get("itemName", "")
+                                    acc1_weeks = acc1.get("stockWeeks", 0) if acc1.get("stockWeeks") is not None else 0
+                                    acc1_diff = acc1.get("stockWeeksDiff", 0) if acc1.get("stockWeeksDiff") is not None else 0
+                                    acc2_name = acc2.get("itemName", "")
+                                    acc2_weeks = acc2.get("stockWeeks", 0) if acc2.get("stockWeeks") is not None else 0
+                                    acc2_diff = acc2.get("stockWeeksDiff", 0) if acc2.get("stockWeeksDiff") is not None else 0
                                     
-                                    # 상위 2개 아이템 정보
-                                    if len(top2_acc) >= 2:
-                                        acc1 = top2_acc[0]
-                                        acc2 = top2_acc[1]
-                                        acc1_name = acc1.get("itemName", "")
-                                        acc1_weeks = acc1.get("stockWeeks", 0) if acc1.get("stockWeeks") is not None else 0
-                                        acc1_diff = acc1.get("stockWeeksDiff", 0) if acc1.get("stockWeeksDiff") is not None else 0
-                                        acc2_name = acc2.get("itemName", "")
-                                        acc2_weeks = acc2.get("stockWeeks", 0) if acc2.get("stockWeeks") is not None else 0
-                                        acc2_diff = acc2.get("stockWeeksDiff", 0) if acc2.get("stockWeeksDiff") is not None else 0
-                                        
-                                        max_stock_name = max_stock_item.get("itemName", "")
-                                        max_stock_weeks = max_stock_item.get("stockWeeks", 0) if max_stock_item.get("stockWeeks") is not None else 0
-                                        max_stock_diff = max_stock_item.get("stockWeeksDiff", 0) if max_stock_item.get("stockWeeksDiff") is not None else 0
-                                        
-                                        key_points.append(f"- {date_prefix}아이템 누적판매매출 1위: <strong>{acc1_name}</strong> 재고주수 {acc1_weeks:.1f}주(전년대비 {acc1_diff:+.1f}주) 2위: <strong>{acc2_name}</strong> 재고주수 {acc2_weeks:.1f}주(전년대비 {acc2_diff:+.1f}주), 반면 <strong>{max_stock_name}</strong>는 재고주수 {max_stock_weeks:.1f}주(전년대비 {max_stock_diff:+.1f}주)로 관리필요합니다.")
-                                    elif len(top2_acc) >= 1:
-                                        acc1 = top2_acc[0]
-                                        acc1_name = acc1.get("itemName", "")
-                                        acc1_weeks = acc1.get("stockWeeks", 0) if acc1.get("stockWeeks") is not None else 0
-                                        acc1_diff = acc1.get("stockWeeksDiff", 0) if acc1.get("stockWeeksDiff") is not None else 0
-                                        
-                                        max_stock_name = max_stock_item.get("itemName", "")
-                                        max_stock_weeks = max_stock_item.get("stockWeeks", 0) if max_stock_item.get("stockWeeks") is not None else 0
-                                        max_stock_diff = max_stock_item.get("stockWeeksDiff", 0) if max_stock_item.get("stockWeeksDiff") is not None else 0
-                                        
-                                        key_points.append(f"- {date_prefix}아이템 누적판매매출 1위: <strong>{acc1_name}</strong> 재고주수 {acc1_weeks:.1f}주(전년대비 {acc1_diff:+.1f}주), 반면 <strong>{max_stock_name}</strong>는 재고주수 {max_stock_weeks:.1f}주(전년대비 {max_stock_diff:+.1f}주)로 관리필요합니다.")
-            
+                                    max_stock_name = max_stock_item.get("itemName", "")
+                                    max_stock_weeks = max_stock_item.get("stockWeeks", 0) if max_stock_item.get("stockWeeks") is not None else 0
+                                    max_stock_diff = max_stock_item.get("stockWeeksDiff", 0) if max_stock_item.get("stockWeeksDiff") is not None else 0
+                                    
+                                    key_points.append(f"- {date_prefix}아이템 누적판매매출 1위: <strong>{acc1_name}</strong> 재고주수 {acc1_weeks:.1f}주(전년대비 {acc1_diff:+.1f}주) 2위: <strong>{acc2_name}</strong> 재고주수 {acc2_weeks:.1f}주(전년대비 {acc2_diff:+.1f}주), 반면 <strong>{max_stock_name}</strong>는 재고주수 {max_stock_weeks:.1f}주(전년대비 {max_stock_diff:+.1f}주)로 관리필요합니다.")
+                                elif len(top2_acc) >= 1:
+                                    acc1 = top2_acc[0]
+                                    acc1_name = acc1.get("itemName", "")
+                                    acc1_weeks = acc1.get("stockWeeks", 0) if acc1.get("stockWeeks") is not None else 0
+                                    acc1_diff = acc1.get("stockWeeksDiff", 0) if acc1.get("stockWeeksDiff") is not None else 0
+                                    
+                                    max_stock_name = max_stock_item.get("itemName", "")
+                                    max_stock_weeks = max_stock_item.get("stockWeeks", 0) if max_stock_item.get("stockWeeks") is not None else 0
+                                    max_stock_diff = max_stock_item.get("stockWeeksDiff", 0) if max_stock_item.get("stockWeeksDiff") is not None else 0
+                                    
+                                    key_points.append(f"- {date_prefix}아이템 누적판매매출 1위: <strong>{acc1_name}</strong> 재고주수 {acc1_weeks:.1f}주(전년대비 {acc1_diff:+.1f}주), 반면 <strong>{max_stock_name}</strong>는 재고주수 {max_stock_weeks:.1f}주(전년대비 {max_stock_diff:+.1f}주)로 관리필요합니다.")
+        
             # 6. 직접비 실판대비 비율 (인건비, 임차관리비, 물류운송비)
-            pl_file = base_dir / "brand_pl.json"
-            if pl_file.exists():
-                pl_data = load_json_file(pl_file)
-                if pl_data and brand in pl_data:
-                    brand_pl = pl_data[brand]
+            if context.has("brand_pl.json"):
+                brand_pl = view.pl
+                if brand_pl is not None:
                     if isinstance(brand_pl, dict):
                         revenue = brand_pl.get("revenue", {})
                         direct_cost_detail = brand_pl.get("directCostDetail", {})
@@ -2224,6 +2513,10 @@ def main():
     parser.add_argument("--use-local", action="store_true", help="로컬 분석만 사용 (OpenAI API 사용 안 함)")
     parser.add_argument("--output-dir", type=str, help="출력 디렉토리 (기본값: public/data/{date}/ai_insights)")
     parser.add_argument("--api-url", type=str, default="http://localhost:3000", help="API 서버 URL (기본값: http://localhost:3000)")
+    parser.add_argument("--workers", type=int, default=1, help="브랜드 병렬 처리 스레드 수 (기본값: 1, 순차 처리)")
+    parser.add_argument("--max-concurrent-requests", type=int, default=4, help="동시 OpenAI 요청 수 상한 (기본값: 4)")
+    parser.add_argument("--no-cache", action="store_true", help="프롬프트 캐시 사용 안 함 (항상 OpenAI API 호출)")
+    parser.add_argument("--cache-dir", type=str, help="프롬프트 캐시 디렉토리 (기본값: raw/_ai_prompt_cache)")
     
     args = parser.parse_args()
     
@@ -2241,29 +2534,49 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # AI 생성기 초기화
-    generator = AIInsightGenerator(api_key=api_key, use_local=args.use_local)
-    
-    all_insights = {}
-    
-    # 전체 현황 분석 (--overview 옵션이 있거나 --all-brands 옵션이 있을 때)
-    if args.overview or args.all_brands:
-        overview_insights = generate_insights_for_overview(args.date, generator, output_dir, api_base_url)
-        all_insights["overview"] = overview_insights
-    
-    # 브랜드별 분석
+    cache_dir = None if args.no_cache else Path(args.cache_dir) if args.cache_dir else PROMPT_CACHE_DIR
+    generator = AIInsightGenerator(
+        api_key=api_key,
+        use_local=args.use_local,
+        cache_dir=cache_dir,
+        max_concurrent_requests=args.max_concurrent_requests
+    )
+    
+    # 분석 대상 (전체 현황은 --overview 옵션이 있거나 --all-brands 옵션이 있을 때)
     if args.all_brands:
         brands = list(BRAND_CODE_MAP.keys())
-        for brand in brands:
-            insights = generate_insights_for_brand(args.date, brand, generator, output_dir, api_base_url)
-            all_insights[brand] = insights
     elif args.brand:
         brands = [args.brand]
-        for brand in brands:
-            insights = generate_insights_for_brand(args.date, brand, generator, output_dir, api_base_url)
-            all_insights[brand] = insights
     elif not args.overview:
         print("[ERROR] --brand, --all-brands, 또는 --overview 옵션 중 하나를 지정해주세요.")
         return
+    else:
+        brands = []
+    
+    # 날짜별 JSON 파일/API 데이터는 한 번만 읽어 모든 분석이 공유
+    context = InsightContext(args.date, api_base_url)
+    
+    tasks = []
+    if args.overview or args.all_brands:
+        tasks.append(("overview", lambda: generate_insights_for_overview(args.date, generator, output_dir, api_base_url, context=context)))
+    for brand in brands:
+        tasks.append((brand, lambda brand=brand: generate_insights_for_brand(args.date, brand, generator, output_dir, api_base_url, context=context)))
+    
+    # 전체 현황 + 브랜드별 분석 (workers > 1이면 스레드 풀에서 병렬 처리, 결과 순서는 고정)
+    all_insights = {}
+    if args.workers > 1 and len(tasks) > 1:
+        print(f"[INFO] {len(tasks)}개 분석을 {args.workers}개 스레드로 병렬 처리합니다.")
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = [(name, executor.submit(task)) for name, task in tasks]
+            for name, future in futures:
+                all_insights[name] = future.result()
+    else:
+        for name, task in tasks:
+            all_insights[name] = task()
+    
+    if generator.use_openai:
+        stats = generator.stats
+        print(f"[INFO] OpenAI 호출 {stats['api_calls']}회, 캐시 적중 {stats['cache_hits']}회, 재시도 {stats['retries']}회")
     
     # 통합 결과 저장 (원본 형식)
     summary_file = output_dir / f"ai_insights_summary_{args.date}.json"
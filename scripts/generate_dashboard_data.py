@@ -159,6 +159,15 @@ def generate_dashboard_data(date_str: str, skip_preprocess: bool = False):
         'JSON 파일 변환'
     )
     
+    # Step 9.5: 섹션 저장소(raw/_artifact_sections/<date>)에서 data_YYYYMMDD.js 번들 조립
+    # (섹션이 없으면 스킵 - 배치 파일과 동일하게 실패로 집계하지 않음)
+    if not run_script(
+        'artifact_store.py',
+        [date_str, '--assemble-js'],
+        'data.js 번들 조립 (섹션 저장소)'
+    ):
+        print("  [INFO] 섹션 없음 - data.js 번들 조립 스킵")
+    
     # Step 10: AI 인사이트 생성
     results['ai_insights'] = run_script(
         'generate_ai_insights.py',
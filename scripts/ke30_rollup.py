@@ -0,0 +1,172 @@
+"""
+KE30 다단계 집계 (Shop_item / Shop 롤업)
+===============================================================
+
+전처리 완료 데이터(원가 계산 필드 포함)에서 필요한 집계 단위를 한 번에 만듭니다.
+
+    1. 모든 집계 단위의 기준 컬럼을 합친 가장 세밀한 단위로 1회 집계
+       (기준 컬럼은 카테고리형으로 변환, 정렬 집계)
+    2. 상위 단위(브랜드×채널 등)는 원본이 아니라 1단계 결과에서 다시 집계
+
+집계 대상 컬럼 찾기(합계 : 실판매액 / 실판매액(V-) 구분 등)와
+집계 기준 컬럼 대체(유통코드 → 고객, 유사 컬럼명)도 여기서 한 번만 수행합니다.
+
+사용처:
+    - process_ke30_current_year (Shop_item: 브랜드×고객×채널×아이템, Shop: 브랜드×채널×아이템)
+    - process_ke30_full_pipeline (Shop_item: 브랜드×유통채널×채널×아이템, Shop: 브랜드×유통채널×채널)
+
+사용법:
+    from ke30_rollup import find_groupby_columns, find_value_columns, rollup
+
+    value_map = find_value_columns(df)                  # {요청 이름: 실제 컬럼}
+    levels = {
+        'shop_item': find_groupby_columns(df, ['브랜드', '채널명', '아이템코드']),
+        'shop': find_groupby_columns(df, ['브랜드', '채널명'])
+    }
+    tables = rollup(df, levels, list(value_map.values()))
+
+작성일: 2026-10
+"""
+
+from typing import Dict, List
+
+import pandas as pd
+
+# 집계 대상 (요청 이름 순서 = 출력 컬럼 순서)
+VALUE_TARGETS = ['판매금액(TAG가)', '실판매액', '실판매액V-', '출고매출액V-', '매출원가(평가감환입)', '매출총이익']
+
+# 집계 대상 컬럼 찾기 (더 구체적인 패턴을 먼저 찾기 위해 순서 중요)
+VALUE_COL_PATTERNS = {
+    '판매금액(TAG가)': ['합계 : 판매금액(TAG가)', '판매금액(TAG가)', 'TAG매출'],
+    # 실판매액(V-)를 먼저 찾아야 함 (실판매액보다 구체적)
+    '실판매액V-': ['합계 : 실판매액(V-)', '실판매액(V-)', '실판매액V-'],
+    # 실판매액은 실판매액(V-)가 아닌 컬럼만 찾아야 함
+    '실판매액': ['합계 : 실판매액', '실판매액'],
+    '출고매출액V-': ['합계 : 출고매출액(V-) Actual', '출고매출액(V-) Actual', '출고매출액V-'],
+    '매출원가(평가감환입)': ['매출원가(평가감환입반영)', '매출원가(평가감환입)', '매출원가'],
+    '매출총이익': ['매출총이익']
+}
+
+# 집계 기준 컬럼이 없을 때 대신 사용할 컬럼
+GROUPBY_FALLBACKS = {
+    '유통코드': '고객'
+}
+
+
+def _normalize_name(name) -> str:
+    return str(name).replace(' ', '').replace('-', '')
+
+
+def find_groupby_columns(df: pd.DataFrame, groupby_cols: List[str]) -> List[str]:
+    """
+    집계 기준 컬럼 확인 (없으면 대체 컬럼 → 유사 컬럼명 순으로 찾고, 그래도 없으면 스킵)
+
+    Returns:
+        List[str]: 실제 데이터프레임 컬럼명 (요청 순서)
+    """
+    available = []
+    for col in groupby_cols:
+        if col in df.columns:
+            available.append(col)
+            continue
+        fallback = GROUPBY_FALLBACKS.get(col)
+        if fallback is not None:
+            if fallback in df.columns:
+                available.append(fallback)
+                print(f"   '{col}' → '{fallback}' 사용")
+            else:
+                print(f"   [WARNING] '{col}' 컬럼 없음 (스킵)")
+            continue
+        similar = [c for c in df.columns if col in str(c) or _normalize_name(c) == _normalize_name(col)]
+        if similar:
+            available.append(similar[0])
+            print(f"   '{col}' → '{similar[0]}' 사용")
+        else:
+            print(f"   [WARNING] '{col}' 컬럼 없음 (스킵)")
+    return available
+
+
+def find_value_columns(df: pd.DataFrame) -> Dict[str, str]:
+    """
+    집계 대상 컬럼 찾기 (정확히 일치 우선, 부분 일치 허용, 한 컬럼은 한 번만 사용)
+
+    Returns:
+        Dict[str, str]: {요청 이름: 실제 컬럼} (VALUE_TARGETS 순서, 찾지 못한 항목 제외)
+    """
+    found_map = {}
+    used_columns = set()
+
+    for target_name, patterns in VALUE_COL_PATTERNS.items():
+        match = None
+        for pattern in patterns:
+            for col in df.columns:
+                if col in used_columns:
+                    continue
+                col_str = str(col).strip()
+                if col_str == pattern:
+                    match = col
+                    break
+                if pattern in col_str:
+                    # 실판매액의 경우, 실판매액(V-)가 포함된 컬럼은 제외
+                    if target_name == '실판매액' and ('(V-)' in col_str or 'V-' in col_str):
+                        continue
+                    match = col
+                    break
+            if match is not None:
+                break
+        if match is None:
+            print(f"   [WARNING] '{target_name}' 컬럼 없음 (스킵)")
+            continue
+        found_map[target_name] = match
+        used_columns.add(match)
+        print(f"   '{target_name}' → '{match}' 사용")
+
+    return {target: found_map[target] for target in VALUE_TARGETS if target in found_map}
+
+
+def _restore_keys(table: pd.DataFrame, keys: List[str], dtypes: pd.Series) -> pd.DataFrame:
+    """카테고리형 기준 컬럼을 원래 dtype으로 되돌리고, 기준값이 빈 행 제거 (groupby 기본 동작과 동일)"""
+    table = table.reset_index()
+    table = table[table[keys].notna().all(axis=1)].reset_index(drop=True)
+    for col in keys:
+        table[col] = table[col].astype(dtypes[col])
+    return table
+
+
+def rollup(df: pd.DataFrame, levels: Dict[str, List[str]], value_cols: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    여러 집계 단위를 가장 세밀한 단위 1회 집계에서 파생
+
+    Args:
+        df: 집계할 데이터프레임 (변경하지 않음)
+        levels: {단위 이름: 집계 기준 컬럼} (모든 기준 컬럼을 합친 것이 가장 세밀한 단위)
+        value_cols: 합계를 낼 컬럼 (숫자로 변환, 변환 불가 값은 0)
+
+    Returns:
+        Dict[str, pd.DataFrame]: {단위 이름: 집계 결과} (기준 컬럼 + value_cols, 기준값 정렬 순)
+    """
+    finest = list(dict.fromkeys(col for keys in levels.values() for col in keys))
+
+    data = pd.DataFrame(
+        {col: pd.Categorical(df[col]) for col in finest}
+    ).assign(**{col: pd.to_numeric(df[col], errors='coerce').fillna(0) for col in value_cols})
+
+    # 가장 세밀한 단위 (빈 기준값도 그룹으로 유지 → 상위 단위 합계에 포함)
+    base = data.groupby(finest, observed=True, sort=True, dropna=False)[value_cols].sum()
+
+    tables = {}
+    for name, keys in levels.items():
+        if list(keys) == finest:
+            table = base
+        else:
+            table = base.groupby(level=list(keys), observed=True, sort=True, dropna=False).sum()
+        tables[name] = _restore_keys(table, list(keys), df.dtypes)
+    return tables
+
+
+def order_columns(df: pd.DataFrame, groupby_cols: List[str]) -> pd.DataFrame:
+    """컬럼 순서 정리 (요청한 집계 기준 → 집계 대상(VALUE_TARGETS) → 나머지)"""
+    ordered_cols = [col for col in groupby_cols if col in df.columns]
+    ordered_cols += [col for col in VALUE_TARGETS if col in df.columns]
+    ordered_cols += [col for col in df.columns if col not in ordered_cols]
+    return df[ordered_cols]
@@ -0,0 +1,348 @@
+"""
+마스터 파일 저장소 (Master/*.csv)
+===============================================================
+
+채널마스터/아이템마스터/로열티율/직접비마스터/표준제간비율/평가율마스터를
+프로세스당 파일별로 한 번만 읽고, 자주 쓰는 조회용 인덱스를 만들어 공유합니다.
+(여러 스크립트에 있던 load_channel_master / load_direct_cost_master 등은
+이 모듈을 사용하는 얇은 래퍼입니다.)
+
+파일이 수정되면 (mtime, size 변경) 해당 파일과 그 인덱스만 다시 만듭니다.
+
+인덱스:
+    channel_code_to_name     유통채널 코드('01', 'RF') -> 채널명
+    channel_sap_to_number    채널sap -> 채널번호 (RF -> 0)
+    channel_sap_to_name      채널sap -> 채널명
+    royalty_rates            (브랜드, 유통채널) -> {'rate', 'base'}
+    direct_cost_categories   계정명 -> 계정전환
+    jeonganbi_rates          (브랜드, 시즌) -> 표준제간비율
+    evaluation_rates(월)     (브랜드, 시즌) -> 평가율 (월 'YYYY.MM'별 캐시)
+
+사용법:
+    from master_registry import channel_sap_to_number, load_master_frame
+
+    channel_master = channel_sap_to_number()           # Master/채널마스터.csv
+    item_master = load_master_frame(ITEM_MASTER_PATH)   # 데이터프레임 복사본
+
+작성일: 2026-10
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent
+MASTER_DIR = ROOT / "Master"
+
+CHANNEL_MASTER_PATH = MASTER_DIR / "채널마스터.csv"
+ITEM_MASTER_PATH = MASTER_DIR / "아이템마스터.csv"
+ROYALTY_RATE_MASTER_PATH = MASTER_DIR / "로열티율.csv"
+DIRECT_COST_MASTER_PATH = MASTER_DIR / "직접비마스터.csv"
+JEONGANBI_RATE_MASTER_PATH = MASTER_DIR / "표준제간비율.csv"
+EVALUATION_RATE_MASTER_PATH = MASTER_DIR / "평가율마스터.csv"
+
+
+def _file_signature(filepath: str) -> Tuple[int, int]:
+    """파일 변경 감지용 시그니처 (mtime_ns, size)"""
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _text(series: pd.Series) -> pd.Series:
+    """값을 문자열로 변환 후 공백 제거 (빈 값은 'nan', 기존 str(row[col]).strip()과 동일)"""
+    return series.map(str).str.strip()
+
+
+class MasterFile:
+    """
+    읽어 둔 마스터 파일 하나와 그 파일에서 만든 인덱스
+
+    Attributes:
+        filepath: 파일 경로
+        data: 원본 데이터 (pd.read_csv 기본 옵션, 수정 금지 - 복사본은 frame())
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.signature = _file_signature(filepath)
+        self.data = pd.read_csv(filepath, encoding="utf-8-sig")
+        self._indexes: Dict[tuple, object] = {}
+
+    def frame(self) -> pd.DataFrame:
+        """데이터 복사본 (호출측에서 수정해도 캐시에 영향 없음)"""
+        return self.data.copy()
+
+    def index(self, name: str, builder: Callable[[pd.DataFrame], object], key: tuple = ()) -> object:
+        """
+        인덱스 캐시 (파일당 이름/키별 1회 생성)
+
+        Args:
+            name: 인덱스 이름
+            builder: 데이터프레임 -> 인덱스
+            key: 추가 캐시 키 (평가월 등)
+        """
+        cache_key = (name,) + tuple(key)
+        if cache_key not in self._indexes:
+            self._indexes[cache_key] = builder(self.data)
+        return self._indexes[cache_key]
+
+
+_FILES: Dict[str, MasterFile] = {}
+
+
+def get_master_file(filepath) -> MasterFile:
+    """마스터 파일 (프로세스 내 공유, 파일이 바뀌었으면 다시 읽음)"""
+    key = os.path.abspath(str(filepath))
+    if not os.path.exists(key):
+        raise FileNotFoundError(f"[ERROR] 마스터 파일이 없습니다: {key}")
+    cached = _FILES.get(key)
+    if cached is not None and cached.signature == _file_signature(key):
+        return cached
+    master_file = MasterFile(key)
+    _FILES[key] = master_file
+    return master_file
+
+
+def load_master_frame(filepath) -> pd.DataFrame:
+    """마스터 파일 데이터프레임 복사본"""
+    return get_master_file(filepath).frame()
+
+
+# ================================
+# 인덱스 생성 (데이터프레임 -> 조회용 딕셔너리)
+# ================================
+
+def _parse_rate(value) -> float:
+    """
+    비율 문자열 → 소수 ('5%' -> 0.05, '5' -> 0.05, '0.05' -> 0.05, 변환 불가 -> 0)
+    """
+    rate_str = str(value).strip().replace(',', '').replace(' ', '')
+    try:
+        if '%' in rate_str:
+            return float(rate_str.replace('%', '')) / 100
+        rate = float(rate_str)
+    except (ValueError, TypeError):
+        return 0
+    if rate != rate:  # NaN
+        return 0
+    # 값이 1보다 크면 퍼센트로 간주하여 100으로 나눔 (예: 5 -> 0.05)
+    return rate / 100 if rate > 1 else rate
+
+
+def build_channel_code_to_name(df: pd.DataFrame) -> Dict[str, str]:
+    """채널번호 → 채널명 (한 자리 숫자는 앞에 0: 1 -> '01')"""
+    codes = _text(df['채널번호'])
+    codes = codes.where(~(codes.str.isdigit() & (codes.str.len() == 1)), '0' + codes)
+    return dict(zip(codes, _text(df['채널명'])))
+
+
+def build_channel_sap_to_number(df: pd.DataFrame) -> Dict[str, int]:
+    """채널sap → 채널번호 (RF는 0, 숫자가 아닌 채널번호는 제외)"""
+    channel_sap_col = None
+    channel_num_col = None
+    for col in df.columns:
+        col_str = str(col).strip()
+        if channel_sap_col is None and ("채널sap" in col_str.lower() or "채널 sap" in col_str.lower()):
+            channel_sap_col = col
+        if channel_num_col is None and ("채널번호" in col_str or "채널 번호" in col_str):
+            channel_num_col = col
+
+    if not channel_sap_col or not channel_num_col:
+        # 기본값: 첫 번째와 세 번째 컬럼
+        if len(df.columns) >= 3:
+            channel_num_col = df.columns[0]
+            channel_sap_col = df.columns[2]
+        else:
+            raise ValueError(f"[ERROR] 채널 마스터 컬럼을 찾을 수 없습니다. 현재 컬럼: {list(df.columns)}")
+
+    pairs = df[[channel_num_col, channel_sap_col]].dropna()
+    raw_numbers = pairs[channel_num_col]
+    numbers = pd.to_numeric(raw_numbers, errors='coerce')
+    numbers = numbers.where(raw_numbers.astype(object) != 'RF', 0)
+    names = _text(pairs[channel_sap_col])
+    valid = numbers.notna() & (names != '')
+    return dict(zip(names[valid], numbers[valid].astype(float).astype(int).tolist()))
+
+
+def build_channel_sap_to_name(df: pd.DataFrame) -> Dict[str, str]:
+    """채널sap(C열) → 채널명(B열)"""
+    name_col = None
+    sap_col = None
+    for col in df.columns:
+        col_str = str(col).strip()
+        if name_col is None and ("채널명" in col_str and "sap" not in col_str.lower()):
+            name_col = col
+        if sap_col is None and ("채널sap" in col_str or ("sap" in col_str.lower() and "채널" in col_str)):
+            sap_col = col
+
+    if name_col is None or sap_col is None:
+        raise ValueError(f"[ERROR] 채널마스터 컬럼을 찾을 수 없습니다. 현재 컬럼: {list(df.columns)}")
+
+    pairs = df[[name_col, sap_col]].dropna()
+    saps = _text(pairs[sap_col])
+    names = _text(pairs[name_col])
+    valid = (saps != '') & (names != '')
+    return dict(zip(saps[valid], names[valid]))
+
+
+def build_royalty_rates(df: pd.DataFrame) -> Dict[tuple, Dict]:
+    """(브랜드, 유통채널 번호) → {'rate': 비율(소수), 'base': 기준매출}"""
+    df = df.dropna(subset=['브랜드', '유통채널'])
+    brands = _text(df['브랜드'])
+    channels = pd.to_numeric(df['유통채널'], errors='coerce')
+    rates = pd.to_numeric(_text(df['%/원']).str.replace('%', '', regex=False), errors='coerce') / 100
+    bases = _text(df['기준매출'])
+    valid = (brands != '') & channels.notna() & rates.notna()
+
+    royalty_dict = {}
+    for brand, channel, rate, base in zip(brands[valid], channels[valid], rates[valid], bases[valid]):
+        royalty_dict[(brand, int(channel))] = {
+            'rate': float(rate),
+            'base': base  # '실판가(V-)' 또는 '출고가(V-)'
+        }
+    return royalty_dict
+
+
+def build_direct_cost_categories(df: pd.DataFrame) -> Dict[str, str]:
+    """계정명 → 계정전환"""
+    account_col = None  # 계정명 컬럼
+    conversion_col = None  # 계정전환 컬럼
+    for col in df.columns:
+        col_str = str(col).strip()
+        if account_col is None and ("계정명" in col_str or "세부" in col_str):
+            account_col = col
+        if conversion_col is None and ("계정전환" in col_str or "대분류" in col_str):
+            conversion_col = col
+
+    if account_col is None or conversion_col is None:
+        # 기본값: 두 번째와 세 번째 컬럼
+        if len(df.columns) >= 3:
+            account_col, conversion_col = df.columns[1], df.columns[2]
+        elif len(df.columns) >= 2:
+            account_col, conversion_col = df.columns[0], df.columns[1]
+        else:
+            raise ValueError(f"[ERROR] 직접비 마스터 컬럼을 찾을 수 없습니다. 현재 컬럼: {list(df.columns)}")
+
+    pairs = df[[account_col, conversion_col]].dropna()
+    accounts = _text(pairs[account_col])
+    conversions = _text(pairs[conversion_col])
+    valid = (accounts != '') & (conversions != '')
+    return dict(zip(accounts[valid], conversions[valid]))
+
+
+def build_jeonganbi_rates(df: pd.DataFrame) -> Dict[tuple, float]:
+    """
+    (브랜드, 시즌) → 표준제간비율 (비율이 빈 행은 0)
+
+    컬럼명은 공백이 섞여 있어 (' 비율 ') 포함 여부로 찾습니다.
+    """
+    brand_col = None
+    season_col = None
+    rate_col = None
+    for col in df.columns:
+        col_clean = str(col).strip()
+        if '브랜드' in col_clean:
+            brand_col = col
+        elif '대상시즌' in col_clean or '시즌' in col_clean:
+            season_col = col
+        elif '비율' in col_clean:
+            rate_col = col
+
+    if not (brand_col and season_col and rate_col):
+        raise ValueError(f"[ERROR] 제간비율 마스터 컬럼을 찾을 수 없습니다. 현재 컬럼: {list(df.columns)}")
+
+    brands = _text(df[brand_col])
+    seasons = _text(df[season_col])
+    has_rate = df[rate_col].notna() & (brands != '') & (seasons != '')
+    rates = df[rate_col].map(_parse_rate).where(has_rate, 0)
+    return dict(zip(zip(brands, seasons), rates.tolist()))
+
+
+def find_evaluation_month_column(columns, evaluation_month: str) -> Optional[str]:
+    """
+    평가율 마스터의 월 컬럼 찾기 (정확히 일치 우선, 포함 허용, 10월은 'YYYY.1' 표기도 허용)
+
+    Args:
+        columns: 평가율 마스터 컬럼
+        evaluation_month: 평가감 환입월 'YYYY.MM'
+    """
+    for col in columns:
+        col_str = str(col).strip()
+        if col_str == evaluation_month or evaluation_month in col_str:
+            return col
+
+    # "2025.10" -> "2025.1" 형식 매칭 (10월이 "2025.1"로 표기된 경우)
+    if evaluation_month.endswith('.10'):
+        alt_format = evaluation_month.replace('.10', '.1')
+        for col in columns:
+            if str(col).strip() == alt_format:
+                return col
+    return None
+
+
+def build_evaluation_rates(df: pd.DataFrame, evaluation_month: str) -> Dict[tuple, float]:
+    """
+    (브랜드, 시즌) → 평가감 환입월 평가율 (평가율이 빈 칸이면 0)
+
+    Args:
+        df: 평가율 마스터 (브랜드, 시즌, 월별 컬럼)
+        evaluation_month: 평가감 환입월 'YYYY.MM'
+
+    Returns:
+        dict (월 컬럼이 없으면 빈 dict)
+    """
+    month_col = find_evaluation_month_column(df.columns, evaluation_month)
+    if month_col is None:
+        return {}
+
+    brands = _text(df['브랜드'])
+    seasons = _text(df['시즌'])
+    valid = (brands != '') & (seasons != '') & (brands != 'nan') & (seasons != 'nan')
+    rates = df[month_col].map(_parse_rate).where(df[month_col].notna(), 0)
+    return dict(zip(zip(brands[valid], seasons[valid]), rates[valid].tolist()))
+
+
+# ================================
+# 인덱스 조회 (파일별 캐시, 호출측 수정에 대비해 복사본 반환)
+# ================================
+
+def channel_code_to_name(filepath=CHANNEL_MASTER_PATH) -> Dict[str, str]:
+    """유통채널 코드 → 채널명"""
+    return dict(get_master_file(filepath).index('channel_code_to_name', build_channel_code_to_name))
+
+
+def channel_sap_to_number(filepath=CHANNEL_MASTER_PATH) -> Dict[str, int]:
+    """채널sap → 채널번호"""
+    return dict(get_master_file(filepath).index('channel_sap_to_number', build_channel_sap_to_number))
+
+
+def channel_sap_to_name(filepath=CHANNEL_MASTER_PATH) -> Dict[str, str]:
+    """채널sap → 채널명"""
+    return dict(get_master_file(filepath).index('channel_sap_to_name', build_channel_sap_to_name))
+
+
+def royalty_rates(filepath=ROYALTY_RATE_MASTER_PATH) -> Dict[tuple, Dict]:
+    """(브랜드, 유통채널) → {'rate', 'base'}"""
+    rates = get_master_file(filepath).index('royalty_rates', build_royalty_rates)
+    return {key: dict(value) for key, value in rates.items()}
+
+
+def direct_cost_categories(filepath=DIRECT_COST_MASTER_PATH) -> Dict[str, str]:
+    """직접비 계정명 → 계정전환"""
+    return dict(get_master_file(filepath).index('direct_cost_categories', build_direct_cost_categories))
+
+
+def jeonganbi_rates(filepath=JEONGANBI_RATE_MASTER_PATH) -> Dict[tuple, float]:
+    """(브랜드, 시즌) → 표준제간비율"""
+    return dict(get_master_file(filepath).index('jeonganbi_rates', build_jeonganbi_rates))
+
+
+def evaluation_rates(evaluation_month: str, filepath=EVALUATION_RATE_MASTER_PATH) -> Dict[tuple, float]:
+    """(브랜드, 시즌) → 평가율 (평가감 환입월 'YYYY.MM' 기준)"""
+    return dict(get_master_file(filepath).index(
+        'evaluation_rates',
+        lambda df: build_evaluation_rates(df, evaluation_month),
+        key=(evaluation_month,)
+    ))
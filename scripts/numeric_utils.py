@@ -0,0 +1,109 @@
+"""
+숫자 컬럼 변환 유틸리티 (콤마/% 문자열 → float, 컬럼 단위 벡터 연산)
+===============================================================
+
+process_plan_data.format_plan_data 등이 "1,234,000", "31.8" 같은 문자열로
+저장한 값을 컬럼 단위로 한 번에 float로 변환합니다.
+
+변환 규칙 (extract_numeric과 동일):
+    - 콤마, %, 공백 제거 후 숫자로 변환
+    - 결측값, 빈 문자열, '-', 변환 불가 값은 0.0
+
+같은 데이터프레임의 같은 컬럼은 한 번만 변환하고 결과를 재사용합니다.
+(데이터프레임이 메모리에서 해제되면 캐시도 함께 삭제.
+ 변환 후 원본 값을 직접 수정하는 경우 clear_numeric_cache() 호출)
+
+사용법:
+    from numeric_utils import numeric_column, numeric_frame
+
+    sales = numeric_column(df, '실판매액 [v+]')               # pd.Series (float)
+    values = numeric_frame(df, ['TAG가 [v+]', '실판매액 [v+]'])  # pd.DataFrame (float)
+
+작성일: 2026-10
+"""
+
+import re
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# 숫자 변환 전에 제거할 문자 (천단위 콤마, 퍼센트, 공백)
+STRIP_PATTERN = re.compile(r'[,%\s]')
+
+# id(df) -> (df 약한 참조, {컬럼: 변환된 Series})
+_cache: Dict[int, Tuple[weakref.ref, Dict[object, pd.Series]]] = {}
+
+
+def extract_numeric(value) -> float:
+    """숫자 문자열(콤마/% 포함) 하나를 float로 변환 (단일 값용)"""
+    if pd.isna(value):
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = STRIP_PATTERN.sub("", value)
+        if value == "" or value == "-":
+            return 0.0
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return 0.0
+    return 0.0
+
+
+def to_numeric_series(series: pd.Series, fill_value: Optional[float] = 0.0) -> pd.Series:
+    """
+    Series 전체를 float로 변환 (캐시 없음)
+
+    숫자형 컬럼은 결측값만 채우고, 문자열 컬럼은
+    str.replace로 콤마/%/공백을 제거한 뒤 pd.to_numeric으로 변환합니다.
+
+    Args:
+        series: 원본 Series
+        fill_value: 결측/변환 불가 값을 채울 값 (None이면 NaN 유지)
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.astype(float)
+    else:
+        text = series.astype(str).str.replace(STRIP_PATTERN, "", regex=True)
+        values = pd.to_numeric(text, errors='coerce').astype(float)
+    return values if fill_value is None else values.fillna(fill_value)
+
+
+def _frame_cache(df: pd.DataFrame) -> Dict[object, pd.Series]:
+    key = id(df)
+    entry = _cache.get(key)
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    columns: Dict[object, pd.Series] = {}
+    _cache[key] = (weakref.ref(df, lambda _ref, key=key: _cache.pop(key, None)), columns)
+    return columns
+
+
+def numeric_column(df: pd.DataFrame, col) -> pd.Series:
+    """df[col]을 float로 변환 (같은 데이터프레임/컬럼은 캐시 재사용)"""
+    columns = _frame_cache(df)
+    if col not in columns:
+        columns[col] = to_numeric_series(df[col])
+    return columns[col]
+
+
+def numeric_frame(df: pd.DataFrame, cols: Optional[List] = None) -> pd.DataFrame:
+    """
+    여러 컬럼을 float로 변환한 데이터프레임 (인덱스는 원본과 동일)
+
+    Args:
+        df: 원본 데이터프레임
+        cols: 변환할 컬럼 (None이면 전체 컬럼)
+    """
+    cols = list(df.columns) if cols is None else list(cols)
+    return pd.DataFrame({col: numeric_column(df, col) for col in cols}, index=df.index, columns=cols)
+
+
+def clear_numeric_cache(df: pd.DataFrame = None):
+    """변환 캐시 삭제 (df를 주면 해당 데이터프레임만)"""
+    if df is None:
+        _cache.clear()
+    else:
+        _cache.pop(id(df), None)
@@ -0,0 +1,224 @@
+"""
+계획 파일 저장소
+===============================================================
+
+raw/YYYYMM/plan/*R_*.csv 계획 파일을 파일당 한 번만 읽어 캐시하고,
+여러 파이프라인 단계가 같은 파싱 결과를 공유하도록 합니다.
+
+- 와이드 포맷: 구분 + 채널 컬럼 (read_plan_csv 호환, extract_evaluation_setting 등 행 검색용)
+- 롱 포맷: 브랜드, Version, 행, 채널, 구분, 값 (구분 × 채널 값 조회용,
+  직접비율/계획 금액 추출은 value_matrix로 롱 포맷에서 조회)
+- 파생 결과 캐시: 직접비율/계획 금액 등 계획 파일에서 계산되는 결과
+
+파일이 수정되면 (mtime, size 변경) 해당 파일만 다시 읽습니다.
+
+사용법:
+    from plan_repository import get_plan_repository
+
+    repo = get_plan_repository(plan_dir)
+    plan_file = repo.get_file(filepath)
+    matrix = plan_file.value_matrix(['실판매액 [v-]'], ['백화점', '면세점'])
+
+작성일: 2025-12
+"""
+
+import os
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 계획 파일 1행에서 인식하는 브랜드 코드
+PLAN_BRAND_CODES = ['M', 'I', 'ST', 'V', 'W', 'X']
+
+# 롱 포맷 컬럼
+LONG_COLUMNS = ['파일', '브랜드', 'Version', '행', '채널', '구분', '값']
+
+
+def _file_signature(filepath: str) -> Tuple[int, int]:
+    """파일 변경 감지용 시그니처 (mtime_ns, size)"""
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PlanFile:
+    """
+    파싱된 계획 파일 하나
+
+    Attributes:
+        filepath: 파일 경로
+        brand_code: 1행에서 찾은 브랜드 코드 (없으면 None, 파일명 추론은 호출측에서 처리)
+        version: 2행 Version 값
+        channels: 3행 채널명 목록 (첫 번째 컬럼 제외)
+        data: 4행부터의 데이터 (구분 + 채널 컬럼, 원본 문자열 유지)
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.signature = _file_signature(filepath)
+
+        df = pd.read_csv(filepath, encoding="utf-8-sig", header=None)
+
+        # 첫 3행이 헤더 정보 (브랜드, Version, 채널)
+        if len(df) < 3:
+            raise ValueError(f"[ERROR] 파일 형식이 올바르지 않습니다: {filepath}")
+
+        # 브랜드 코드 추출 (1행)
+        self.brand_code = None
+        for val in df.iloc[0].values[1:]:
+            if pd.notna(val) and str(val).strip() in PLAN_BRAND_CODES:
+                self.brand_code = str(val).strip()
+                break
+
+        # Version 추출 (2행)
+        version_row = df.iloc[1]
+        self.version = str(version_row.iloc[1]) if len(version_row) > 1 else "F11_2025_R"
+
+        # 채널명 추출 (3행)
+        self.channels = [str(val).strip() if pd.notna(val) else "" for val in df.iloc[2].values[1:]]
+
+        # 데이터 부분 (4행부터)
+        data_df = df.iloc[3:].copy()
+        data_df.columns = ["구분"] + self.channels
+        data_df["구분"] = data_df["구분"].astype(str).str.strip()
+        data_df = data_df[data_df["구분"].notna() & (data_df["구분"] != "")]
+        self.data = data_df.reset_index(drop=True)
+
+        self._long = None
+        self._first_rows = None
+
+    def wide(self) -> pd.DataFrame:
+        """와이드 포맷 데이터 복사본 (호출측에서 수정해도 캐시에 영향 없음)"""
+        return self.data.copy()
+
+    def long(self) -> pd.DataFrame:
+        """
+        롱 포맷 데이터 (숫자 값이 있는 셀만, 결과 캐시)
+
+        Returns:
+            pd.DataFrame: 파일, 브랜드, Version, 행(데이터 행 위치), 채널, 구분, 값
+        """
+        if self._long is None:
+            values = self.data.iloc[:, 1:].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+            row_pos, col_pos = np.nonzero(~np.isnan(values))
+            self._long = pd.DataFrame({
+                '파일': os.path.basename(self.filepath),
+                '브랜드': self.brand_code,
+                'Version': self.version,
+                '행': row_pos,
+                '채널': np.asarray(self.channels, dtype=object)[col_pos],
+                '구분': self.data["구분"].to_numpy()[row_pos],
+                '값': values[row_pos, col_pos]
+            }, columns=LONG_COLUMNS)
+        return self._long
+
+    def first_rows(self) -> Dict[str, int]:
+        """구분 → 행 위치 (같은 구분이 여러 번 나오면 첫 번째 행)"""
+        if self._first_rows is None:
+            labels = self.data["구분"]
+            labels = labels[~labels.duplicated(keep="first")]
+            self._first_rows = dict(zip(labels.values, labels.index))
+        return self._first_rows
+
+    def value_matrix(self, items: List[str], channels: List[str]) -> pd.DataFrame:
+        """
+        구분 항목 × 채널 값 행렬 (롱 포맷에서 조회, 각 구분의 첫 번째 행 사용)
+
+        Args:
+            items: 구분 항목 목록 (파일에 없는 항목은 제외)
+            channels: 채널 목록 (같은 이름의 채널 컬럼이 여러 개인 채널은 넘기지 않음)
+
+        Returns:
+            pd.DataFrame: index=구분, columns=채널 (숫자가 아닌 셀은 NaN)
+        """
+        first_rows = self.first_rows()
+        found_items = [item for item in items if item in first_rows]
+        channels = list(channels)
+        long_df = self.long()
+        cells = long_df[
+            long_df['행'].isin([first_rows[item] for item in found_items]) & long_df['채널'].isin(channels)
+        ]
+        values = np.full((len(found_items), len(channels)), np.nan)
+        values[
+            pd.Index(found_items).get_indexer(cells['구분']),
+            pd.Index(channels).get_indexer(cells['채널'])
+        ] = cells['값'].to_numpy()
+        return pd.DataFrame(values, index=found_items, columns=channels)
+
+
+class PlanRepository:
+    """
+    계획 폴더 단위 저장소
+
+    파일별 파싱 결과와 계획 파일에서 계산되는 파생 결과를 캐시합니다.
+    """
+
+    def __init__(self, plan_dir: str):
+        self.plan_dir = os.path.abspath(str(plan_dir))
+        self._files: Dict[str, PlanFile] = {}
+        self._derived: Dict[str, Tuple[tuple, object]] = {}
+
+    def list_files(self, include_rf: bool = False) -> List[str]:
+        """
+        계획 폴더의 CSV 파일 목록
+
+        Args:
+            include_rf: RF 파일 포함 여부
+        """
+        if not os.path.exists(self.plan_dir):
+            return []
+        files = []
+        for filename in sorted(os.listdir(self.plan_dir)):
+            if not filename.endswith(".csv"):
+                continue
+            if not include_rf and "RF" in filename.upper():
+                continue
+            files.append(os.path.join(self.plan_dir, filename))
+        return files
+
+    def get_file(self, filepath: str) -> PlanFile:
+        """계획 파일 파싱 결과 (파일이 바뀌지 않았으면 캐시 사용)"""
+        key = os.path.abspath(str(filepath))
+        cached = self._files.get(key)
+        if cached is not None and cached.signature == _file_signature(key):
+            return cached
+        plan_file = PlanFile(key)
+        self._files[key] = plan_file
+        return plan_file
+
+    def derived(self, name: str, builder: Callable[[], object], key: tuple = ()) -> object:
+        """
+        계획 파일에서 계산되는 파생 결과 캐시
+
+        계획 폴더의 파일 구성이나 내용이 바뀌면 다시 계산합니다.
+
+        Args:
+            name: 파생 결과 이름
+            builder: 결과 생성 함수
+            key: 추가 캐시 키 (마스터 등 입력이 다를 때 구분용)
+        """
+        signature = (tuple(
+            (filepath, _file_signature(filepath)) for filepath in self.list_files(include_rf=True)
+        ), key)
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        result = builder()
+        self._derived[name] = (signature, result)
+        return result
+
+
+_REPOSITORIES: Dict[str, PlanRepository] = {}
+
+
+def get_plan_repository(plan_dir: str) -> PlanRepository:
+    """계획 폴더별 저장소 (프로세스 내 공유)"""
+    key = os.path.abspath(str(plan_dir))
+    if key not in _REPOSITORIES:
+        _REPOSITORIES[key] = PlanRepository(key)
+    return _REPOSITORIES[key]
+
+
+def get_plan_file(filepath: str) -> PlanFile:
+    """계획 파일 파싱 결과 (파일이 속한 폴더의 저장소 사용)"""
+    return get_plan_repository(os.path.dirname(os.path.abspath(str(filepath)))).get_file(filepath)
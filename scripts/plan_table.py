@@ -0,0 +1,157 @@
+"""
+계획 전처리 결과 숫자형 저장소 (plan_YYYYMM_전처리완료.typed.json)
+===============================================================
+
+process_plan_data.py는 사람이 보는 용도의 plan_YYYYMM_전처리완료.csv
+(천단위 콤마, 소숫점 한자리 문자열)와 함께, 같은 값을 숫자형 그대로 담은
+컬럼 단위 JSON을 저장합니다.
+
+후속 단계(update_brand_kpi, update_brand_radar, create_brand_pl_data,
+process_channel_profit_loss)는 load_plan_table()로 숫자형 데이터를 바로
+읽으므로 콤마 문자열을 다시 파싱하지 않습니다.
+
+저장 형식:
+    {
+      "source": {"file": CSV 파일명, "sha256": CSV 내용 해시},
+      "columns": [컬럼 순서],
+      "dtypes": {컬럼: "float64" | "str"},
+      "data": {컬럼: [값, ...]}          (결측값은 null)
+    }
+
+CSV를 직접 수정했거나 typed 파일이 없으면 CSV에서 한 번 변환해 다시 저장합니다.
+
+사용법:
+    from plan_table import load_plan_table
+
+    df_plan = load_plan_table(get_plan_file_path(year_month))
+
+작성일: 2026-10
+"""
+
+import os
+import json
+import hashlib
+from typing import Optional
+
+import pandas as pd
+
+from numeric_utils import to_numeric_series
+
+TYPED_SUFFIX = ".typed.json"
+
+# 숫자로 변환하지 않는 컬럼 (그 외 컬럼은 값이 모두 숫자일 때만 숫자형)
+PLAN_TEXT_COLUMNS = ['브랜드', 'Version', '채널', '채널명', '구분']
+
+
+def typed_plan_path(csv_path) -> str:
+    """plan_YYYYMM_전처리완료.csv -> plan_YYYYMM_전처리완료.typed.json"""
+    csv_path = str(csv_path)
+    base = csv_path[:-4] if csv_path.lower().endswith(".csv") else csv_path
+    return base + TYPED_SUFFIX
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def to_typed_plan_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    계획 데이터를 숫자형으로 정리 (콤마/% 문자열 → float, 결측값은 NaN 유지)
+
+    텍스트 컬럼과 숫자로 변환할 수 없는 값이 섞인 컬럼은 그대로 둡니다.
+    """
+    converted = {}
+    for col in df.columns:
+        if col in PLAN_TEXT_COLUMNS:
+            continue
+        values = to_numeric_series(df[col], fill_value=None)
+        if values.notna().sum() == df[col].notna().sum():
+            converted[col] = values
+    return df.assign(**converted) if converted else df
+
+
+def save_plan_table(df: pd.DataFrame, csv_path) -> str:
+    """
+    숫자형 계획 데이터를 typed JSON으로 저장 (CSV를 먼저 저장한 뒤 호출)
+
+    Args:
+        df: to_typed_plan_frame() 결과 또는 process_plan_files(formatted=False) 결과
+        csv_path: 같은 내용의 사람용 CSV 경로 (변경 감지용 해시 기록)
+
+    Returns:
+        str: 저장된 typed 파일 경로
+    """
+    df = to_typed_plan_frame(df)
+    dtypes = {col: ("float64" if pd.api.types.is_numeric_dtype(df[col]) else "str") for col in df.columns}
+    payload = {
+        "source": {"file": os.path.basename(str(csv_path)), "sha256": _file_hash(str(csv_path))},
+        "columns": [str(col) for col in df.columns],
+        "dtypes": dtypes,
+        "data": {
+            str(col): [None if pd.isna(value) else value for value in df[col].tolist()]
+            for col in df.columns
+        },
+    }
+
+    typed_path = typed_plan_path(csv_path)
+    tmp_path = typed_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, typed_path)
+    return typed_path
+
+
+def _read_typed(typed_path: str, expected_hash: Optional[str]) -> Optional[pd.DataFrame]:
+    """typed 파일 읽기 (없거나 CSV 해시가 다르면 None)"""
+    if not os.path.exists(typed_path):
+        return None
+    try:
+        with open(typed_path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if expected_hash is not None and payload.get("source", {}).get("sha256") != expected_hash:
+        return None
+
+    columns = payload["columns"]
+    df = pd.DataFrame({col: payload["data"][col] for col in columns}, columns=columns)
+    for col, dtype in payload.get("dtypes", {}).items():
+        if dtype == "float64":
+            df[col] = df[col].astype(float)
+    return df
+
+
+def load_plan_table(csv_path) -> pd.DataFrame:
+    """
+    숫자형 계획 데이터 로드
+
+    typed 파일이 CSV와 같은 내용이면 그대로 읽고, 아니면 CSV를 한 번 변환해
+    typed 파일을 다시 저장합니다.
+
+    Raises:
+        FileNotFoundError: CSV와 typed 파일이 모두 없는 경우
+    """
+    csv_path = str(csv_path)
+    typed_path = typed_plan_path(csv_path)
+
+    if not os.path.exists(csv_path):
+        df = _read_typed(typed_path, None)
+        if df is None:
+            raise FileNotFoundError(f"[ERROR] 계획 파일을 찾을 수 없습니다: {csv_path}")
+        return df
+
+    df = _read_typed(typed_path, _file_hash(csv_path))
+    if df is not None:
+        return df
+
+    # typed 파일이 없거나 CSV가 수정됨 → CSV에서 변환 후 저장
+    df = to_typed_plan_frame(pd.read_csv(csv_path, encoding="utf-8-sig"))
+    try:
+        save_plan_table(df, csv_path)
+        print(f"[INFO] 계획 typed 파일 갱신: {os.path.basename(typed_path)}")
+    except OSError as e:
+        print(f"[WARNING] 계획 typed 파일 저장 실패: {e}")
+    return df
@@ -23,6 +23,9 @@ import sys
 script_dir = Path(__file__).parent
 sys.path.append(str(script_dir))
 
+from artifact_store import ArtifactStore
+from plan_table import load_plan_table
+
 
 def get_project_root() -> Path:
     """프로젝트 루트 경로 반환"""
@@ -43,6 +46,22 @@ class ChannelProfitLossProcessor:
     EXCLUDE_PREVIOUS = ['공통']   # 전년: 공통 채널 제외
     EXCLUDE_PLAN = ['내수합계']   # 계획: 내수합계 제외
     
+    # 대시보드 브랜드 순서 및 브랜드 코드 -> 대시보드 브랜드명 매핑
+    BRAND_CODES = ['M', 'I', 'X', 'V', 'ST', 'W']
+    BRAND_NAME_MAP = {
+        'M': 'MLB',
+        'I': 'MLB_KIDS',
+        'X': 'DISCOVERY',
+        'V': 'DUVETICA',
+        'ST': 'SERGIO',
+        'W': 'SUPRA'
+    }
+    
+    # 집계 값 컬럼, 비교 기준 순서, 전체 브랜드 키
+    VALUE_COLS = ['TAG가', '실판매액', '직접이익']
+    SOURCES = ['전년', '계획', '당년']
+    ALL_BRANDS = '전체'
+    
     def __init__(self, base_date: str = None, target_month: str = None):
         """
         Args:
@@ -61,6 +80,10 @@ class ChannelProfitLossProcessor:
         self.previous_year_data = None  # 전년
         self.plan_data = None  # 계획
         
+        # 채널 × 브랜드 손익 테이블 및 브랜드/지표별 투영 (데이터 로드 시 초기화)
+        self._channel_table = None
+        self._projections = {}
+        
     def load_current_year_data(self, use_forecast: bool = True) -> pd.DataFrame:
         """
         당년 채널별 집계 데이터 로드
@@ -110,6 +133,7 @@ class ChannelProfitLossProcessor:
         df['유통채널'] = pd.to_numeric(df['유통채널'], errors='coerce')
         
         self.current_year_data = df
+        self._invalidate()
         print(f"✅ 당년 데이터 로드 완료: {len(df)} 행")
         return df
     
@@ -145,11 +169,12 @@ class ChannelProfitLossProcessor:
                 df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
         
         self.previous_year_data = df
+        self._invalidate()
         print(f"✅ 전년 데이터 로드 완료: {len(df)} 행")
         return df
     
     def load_plan_data(self) -> pd.DataFrame:
-        """계획 데이터 로드"""
+        """계획 데이터 로드 (숫자형 typed 파일 우선)"""
         file_path = self.raw_path / 'plan' / f'plan_{self.target_month}_전처리완료.csv'
         
         if not file_path.exists():
@@ -157,7 +182,7 @@ class ChannelProfitLossProcessor:
             return None
             
         print(f"📂 계획 데이터 로드 중: {file_path}")
-        df = pd.read_csv(file_path, encoding='utf-8-sig')
+        df = load_plan_table(file_path)
         
         print(f"  ℹ️ 계획 데이터 컬럼: {list(df.columns)[:10]}...")  # 처음 10개만 출력
         print(f"  ℹ️ 계획 데이터 행 수: {len(df)}")
@@ -179,21 +204,14 @@ class ChannelProfitLossProcessor:
             print(f"  ✓ 채널명 예시: {df['채널명'].unique()[:8].tolist()}")
             print(f"  ✓ 브랜드 예시: {df['브랜드'].unique().tolist()}")
         
-        # 숫자형 변환 (쉼표 제거)
-        numeric_cols = ['TAG가', '실판매액', '실판매액_V-', '출고매출액', '매출원가', '매출총이익', '직접비', '직접이익']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.replace(',', '').str.replace('-', '0')
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        
-        # 숫자형 변환 (쉼표 제거)
+        # 숫자형 컬럼 결측값은 0 (typed 파일이라 콤마 문자열 파싱 불필요)
         numeric_cols = ['TAG가', '실판매액', '실판매액_V-', '출고매출액', '매출원가', '매출총이익', '직접비', '직접이익']
         for col in numeric_cols:
             if col in df.columns:
-                df[col] = df[col].astype(str).str.replace(',', '').str.replace('-', '0')
                 df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
         
         self.plan_data = df
+        self._invalidate()
         print(f"✅ 계획 데이터 로드 완료: {len(df)} 행")
         return df
     
@@ -210,231 +228,133 @@ class ChannelProfitLossProcessor:
         # 직접이익/실판매출*1.1*100 (예: 98.5/343.2*1.1*100 = 31.6%)
         return (direct_profit / actual_price) * 1.1 * 100
     
+    @staticmethod
+    def discount_rates(tag_price: pd.Series, actual_price: pd.Series) -> pd.Series:
+        """할인율 (calculate_discount_rate의 벡터 버전)"""
+        zero = (tag_price == 0) | tag_price.isna()
+        return ((tag_price - actual_price) / tag_price.where(~zero) * 100).where(~zero, 0.0)
+    
+    @staticmethod
+    def profit_rates(direct_profit: pd.Series, actual_price: pd.Series) -> pd.Series:
+        """직접이익율 (calculate_profit_rate의 벡터 버전)"""
+        zero = (actual_price == 0) | actual_price.isna()
+        return ((direct_profit / actual_price.where(~zero)) * 1.1 * 100).where(~zero, 0.0)
+    
     def to_억원(self, value: float) -> float:
         """원 단위를 억원 단위로 변환 (소수점 2자리)"""
         return round(value / 100000000, 2)
     
-    def aggregate_by_channel(self, df: pd.DataFrame, brand: str = None, is_plan_data: bool = False) -> pd.DataFrame:
-        """채널별 집계"""
+    def _invalidate(self):
+        """데이터가 다시 로드되면 집계 테이블 재계산"""
+        self._channel_table = None
+        self._projections = {}
+    
+    @classmethod
+    def _sum_by_brand_channel(cls, df: pd.DataFrame, value_cols: list) -> pd.DataFrame:
+        """(브랜드, 채널명)별 합계 + 전체 브랜드(ALL_BRANDS) 채널명별 합계"""
+        by_brand = df.groupby(['브랜드', '채널명'])[value_cols].sum()
+        total = df.groupby('채널명')[value_cols].sum()
+        total.index = pd.MultiIndex.from_product([[cls.ALL_BRANDS], total.index], names=['브랜드', '채널명'])
+        return pd.concat([by_brand, total])
+    
+    def aggregate_by_brand_channel(self, df: pd.DataFrame, is_plan_data: bool = False) -> pd.DataFrame:
+        """
+        브랜드 × 채널별 집계 (한 번의 groupby로 전체 브랜드 포함)
+        
+        Returns:
+            pd.DataFrame: (브랜드, 채널명) 인덱스, 존재하는 값 컬럼(TAG가/실판매액/직접이익)
+                          브랜드 전체 합계는 브랜드 = ALL_BRANDS
+        """
         if df is None or df.empty:
             return pd.DataFrame()
         
-        # 브랜드 필터링
-        if brand:
-            df = df[df['브랜드'] == brand]
+        # 일반 데이터 (당년/전년)
+        if not is_plan_data:
+            available_cols = [col for col in self.VALUE_COLS if col in df.columns]
+            if not available_cols:
+                return pd.DataFrame()
+            return self._sum_by_brand_channel(df, available_cols)
         
         # ★★★ 계획 데이터 처리 ★★★
-        if is_plan_data:
-            # 계획 데이터 형식 확인:
-            # 1. 롱 포맷 (지표 컬럼): 브랜드, 채널명, TAG가, 실판매액, 직접이익 등 (구분 컬럼 없음)
-            # 2. 롱 포맷 (구분 컬럼): 브랜드, 구분, 채널명, 값
-            # 3. 와이드 포맷: 브랜드, 구분, 백화점, 면세점, ... (채널이 컬럼)
-            
-            # 케이스 1: 지표 컬럼이 직접 있는 롱 포맷 (구분 컬럼 없음)
-            if '채널명' in df.columns and '실판매액' in df.columns and '구분' not in df.columns:
-                print(f"  ✓ 계획 데이터: 롱 포맷 (지표 컬럼)")
-                # 내수합계 제외하고 채널별 집계
-                df_channels = df[df['채널명'] != '내수합계']
-                
-                # 채널별 집계
-                agg_dict = {
-                    'TAG가': 'sum',
-                    '실판매액': 'sum',
-                    '직접이익': 'sum'
-                }
-                available_cols = {k: v for k, v in agg_dict.items() if k in df_channels.columns}
-                
-                if available_cols:
-                    grouped = df_channels.groupby('채널명').agg(available_cols).reset_index()
-                    print(f"  ✓ 계획 데이터 집계: {len(grouped)}개 채널")
-                    for _, row in grouped.iterrows():
-                        print(f"    - {row['채널명']}: 매출 {row['실판매액']/100000000:.1f}억원")
-                else:
-                    return pd.DataFrame()
-            
-            # 케이스 2: 구분 컬럼이 있는 롱 포맷
-            elif '구분' in df.columns and '채널명' in df.columns:
-                # 롱 포맷: 브랜드, 구분, 채널명, 값 형태
-                # 실판매액 데이터 (구분에 '실판매액' 포함)
-                revenue_df = df[df['구분'].str.contains('실판매액', na=False, case=False)].copy()
-                # 직접이익 데이터
-                profit_df = df[df['구분'].str.contains('직접이익', na=False, case=False)].copy()
-                # TAG가 데이터
-                tag_df = df[df['구분'].str.contains('TAG가', na=False, case=False)].copy()
-                
-                # 값 컬럼 찾기 (브랜드, 구분, 채널명 제외한 숫자형 컬럼)
-                value_cols = [col for col in df.columns 
-                             if col not in ['브랜드', '구분', '채널명'] 
-                             and pd.api.types.is_numeric_dtype(df[col])]
-                
+        # 계획 데이터 형식 확인:
+        # 1. 롱 포맷 (지표 컬럼): 브랜드, 채널명, TAG가, 실판매액, 직접이익 등 (구분 컬럼 없음)
+        # 2. 롱 포맷 (구분 컬럼): 브랜드, 구분, 채널명, 값
+        # 3. 와이드 포맷: 브랜드, 구분, 백화점, 면세점, ... (채널이 컬럼)
+        
+        # 케이스 1: 지표 컬럼이 직접 있는 롱 포맷 (구분 컬럼 없음)
+        if '채널명' in df.columns and '실판매액' in df.columns and '구분' not in df.columns:
+            print(f"  ✓ 계획 데이터: 롱 포맷 (지표 컬럼)")
+            # 내수합계 제외하고 채널별 집계
+            df_channels = df[~df['채널명'].isin(self.EXCLUDE_PLAN)]
+            available_cols = [col for col in self.VALUE_COLS if col in df_channels.columns]
+            grouped = self._sum_by_brand_channel(df_channels, available_cols)
+            totals = grouped.loc[self.ALL_BRANDS]
+            print(f"  ✓ 계획 데이터 집계: {len(totals)}개 채널")
+            for channel, revenue in totals['실판매액'].items():
+                print(f"    - {channel}: 매출 {revenue/100000000:.1f}억원")
+            return grouped
+        
+        # 케이스 2/3: 구분(실판매액/직접이익/TAG가)별 값을 (브랜드, 채널명, 값) 롱 포맷으로 정리
+        metric_frames = {}
+        for metric in ['실판매액', '직접이익', 'TAG가']:
+            if '구분' not in df.columns:
+                continue
+            metric_df = df[df['구분'].str.contains(metric, na=False, case=False)]
+            if metric_df.empty:
+                continue
+            
+            # 케이스 2: 구분 컬럼이 있는 롱 포맷 (첫 번째 숫자형 컬럼을 값으로 사용)
+            if '채널명' in df.columns:
+                value_cols = [col for col in df.columns
+                              if col not in ['브랜드', '구분', '채널명']
+                              and pd.api.types.is_numeric_dtype(df[col])]
                 if not value_cols:
                     print(f"⚠️ 계획 데이터에서 값 컬럼을 찾을 수 없습니다. 컬럼: {list(df.columns)}")
                     return pd.DataFrame()
-                
-                # 첫 번째 숫자형 컬럼을 값으로 사용 (일반적으로 하나의 값 컬럼만 있음)
-                value_col = value_cols[0]
-                
-                # 각 구분별로 채널명 기준 집계
-                grouped = pd.DataFrame()
-                
-                if not revenue_df.empty:
-                    revenue_grouped = revenue_df.groupby('채널명')[value_col].sum().reset_index()
-                    revenue_grouped.rename(columns={value_col: '실판매액'}, inplace=True)
-                    grouped = revenue_grouped
-                    print(f"  ✓ 계획 매출 데이터: {len(revenue_grouped)}개 채널")
-                
-                if not profit_df.empty:
-                    profit_grouped = profit_df.groupby('채널명')[value_col].sum().reset_index()
-                    profit_grouped.rename(columns={value_col: '직접이익'}, inplace=True)
-                    if grouped.empty:
-                        grouped = profit_grouped
-                    else:
-                        grouped = grouped.merge(profit_grouped, on='채널명', how='outer')
-                    print(f"  ✓ 계획 직접이익 데이터: {len(profit_grouped)}개 채널")
-                
-                if not tag_df.empty:
-                    tag_grouped = tag_df.groupby('채널명')[value_col].sum().reset_index()
-                    tag_grouped.rename(columns={value_col: 'TAG가'}, inplace=True)
-                    if grouped.empty:
-                        grouped = tag_grouped
-                    else:
-                        grouped = grouped.merge(tag_grouped, on='채널명', how='outer')
-                
-                # 누락된 컬럼은 0으로 채우기
-                for col in ['TAG가', '실판매액', '직접이익']:
-                    if col not in grouped.columns:
-                        grouped[col] = 0.0
-                
-                if grouped.empty:
-                    print(f"⚠️ 계획 데이터 집계 결과가 비어있습니다")
-                    return pd.DataFrame()
-                
-                print(f"  ✓ 계획 데이터 집계 완료: {len(grouped)}개 채널")
+                long_df = metric_df[['브랜드', '채널명', value_cols[0]]].rename(columns={value_cols[0]: metric})
+            
+            # 케이스 3: 와이드 포맷 (브랜드, 구분 제외한 컬럼이 채널명) → 행열 전환
             else:
-                # 와이드 포맷: 브랜드, 구분, 백화점, 면세점, ... 형태 (채널이 컬럼)
-                # 행열 전환 필요: 구분을 행으로, 채널을 열로
-                print(f"  ℹ️ 계획 데이터가 와이드 포맷입니다. 행열 전환 수행...")
-                
-                # 브랜드, 구분 제외한 컬럼이 채널명
                 channel_cols = [col for col in df.columns if col not in ['브랜드', '구분']]
-                
                 if not channel_cols:
                     print(f"⚠️ 계획 데이터에서 채널 컬럼을 찾을 수 없습니다.")
                     return pd.DataFrame()
-                
-                # 행열 전환: 구분을 인덱스로, 채널을 컬럼으로
-                # 실판매액 데이터
-                revenue_df = df[df['구분'].str.contains('실판매액', na=False, case=False)].copy()
-                # 직접이익 데이터
-                profit_df = df[df['구분'].str.contains('직접이익', na=False, case=False)].copy()
-                # TAG가 데이터
-                tag_df = df[df['구분'].str.contains('TAG가', na=False, case=False)].copy()
-                
-                # 각 구분별로 채널 컬럼을 행으로 변환
-                grouped = pd.DataFrame()
-                
-                if not revenue_df.empty:
-                    # 채널 컬럼을 행으로 변환
-                    revenue_melted = revenue_df.melt(
-                        id_vars=['브랜드', '구분'],
-                        value_vars=channel_cols,
-                        var_name='채널명',
-                        value_name='실판매액'
-                    )
-                    # 숫자형 변환
-                    revenue_melted['실판매액'] = pd.to_numeric(revenue_melted['실판매액'], errors='coerce').fillna(0)
-                    # 채널명 기준 집계
-                    revenue_grouped = revenue_melted.groupby('채널명')['실판매액'].sum().reset_index()
-                    grouped = revenue_grouped
-                    print(f"  ✓ 계획 매출 데이터: {len(revenue_grouped)}개 채널")
-                
-                if not profit_df.empty:
-                    profit_melted = profit_df.melt(
-                        id_vars=['브랜드', '구분'],
-                        value_vars=channel_cols,
-                        var_name='채널명',
-                        value_name='직접이익'
-                    )
-                    profit_melted['직접이익'] = pd.to_numeric(profit_melted['직접이익'], errors='coerce').fillna(0)
-                    profit_grouped = profit_melted.groupby('채널명')['직접이익'].sum().reset_index()
-                    if grouped.empty:
-                        grouped = profit_grouped
-                    else:
-                        grouped = grouped.merge(profit_grouped, on='채널명', how='outer')
-                    print(f"  ✓ 계획 직접이익 데이터: {len(profit_grouped)}개 채널")
-                
-                if not tag_df.empty:
-                    tag_melted = tag_df.melt(
-                        id_vars=['브랜드', '구분'],
-                        value_vars=channel_cols,
-                        var_name='채널명',
-                        value_name='TAG가'
-                    )
-                    tag_melted['TAG가'] = pd.to_numeric(tag_melted['TAG가'], errors='coerce').fillna(0)
-                    tag_grouped = tag_melted.groupby('채널명')['TAG가'].sum().reset_index()
-                    if grouped.empty:
-                        grouped = tag_grouped
-                    else:
-                        grouped = grouped.merge(tag_grouped, on='채널명', how='outer')
-                
-                # 누락된 컬럼은 0으로 채우기
-                for col in ['TAG가', '실판매액', '직접이익']:
-                    if col not in grouped.columns:
-                        grouped[col] = 0.0
-                
-                if grouped.empty:
-                    print(f"⚠️ 계획 데이터 집계 결과가 비어있습니다")
-                    return pd.DataFrame()
-                
-                print(f"  ✓ 계획 데이터 집계 완료: {len(grouped)}개 채널")
-        else:
-            # 일반 데이터 처리 (기존 로직)
-            # 채널별 집계
-            agg_dict = {
-                'TAG가': 'sum',
-                '실판매액': 'sum',
-                '직접이익': 'sum'
-            }
-            
-            # 존재하는 컬럼만 집계
-            available_cols = {k: v for k, v in agg_dict.items() if k in df.columns}
-            
-            if not available_cols:
-                return pd.DataFrame()
-            
-            grouped = df.groupby('채널명').agg(available_cols).reset_index()
-        
-        # 할인율 계산: (TAG가 - 실판매액) / TAG가 * 100
-        if 'TAG가' in grouped.columns and '실판매액' in grouped.columns:
-            grouped['할인율'] = grouped.apply(
-                lambda row: self.calculate_discount_rate(row['TAG가'], row['실판매액']), 
-                axis=1
-            )
-        else:
-            grouped['할인율'] = 0.0
-        
-        # 직접이익율 계산: 직접이익 / 실판매출 * 1.1 * 100
-        if '직접이익' in grouped.columns and '실판매액' in grouped.columns:
-            grouped['직접이익율'] = grouped.apply(
-                lambda row: self.calculate_profit_rate(row['직접이익'], row['실판매액']), 
-                axis=1
-            )
-        else:
-            grouped['직접이익율'] = 0.0
+                long_df = metric_df.melt(
+                    id_vars=['브랜드', '구분'],
+                    value_vars=channel_cols,
+                    var_name='채널명',
+                    value_name=metric
+                )
+                long_df[metric] = pd.to_numeric(long_df[metric], errors='coerce').fillna(0)
+            
+            metric_frames[metric] = self._sum_by_brand_channel(long_df, [metric])
+            print(f"  ✓ 계획 {metric} 데이터: {len(metric_frames[metric].loc[self.ALL_BRANDS])}개 채널")
+        
+        if not metric_frames:
+            print(f"⚠️ 계획 데이터 집계 결과가 비어있습니다")
+            return pd.DataFrame()
         
+        # 구분별 집계를 채널 기준으로 합침 (없는 구분은 0)
+        grouped = pd.concat(list(metric_frames.values()), axis=1)
+        for col in self.VALUE_COLS:
+            if col not in grouped.columns:
+                grouped[col] = 0.0
+        print(f"  ✓ 계획 데이터 집계 완료: {len(grouped.loc[self.ALL_BRANDS])}개 채널")
         return grouped
     
-    def process_channel_data(self, brand: str = None, metric: str = '매출') -> pd.DataFrame:
+    def build_channel_table(self) -> pd.DataFrame:
         """
-        채널별 손익 데이터 처리
+        채널 × 브랜드 × {전년, 계획, 당년} 손익 테이블 (한 번만 계산)
+        
+        모든 출력 형식(print/excel/json/js/dashboard)은 이 테이블의 투영입니다.
         
-        Args:
-            brand: 브랜드 코드 (None이면 전체)
-            metric: '매출' 또는 '직접이익'
-            
         Returns:
-            채널별 손익 DataFrame
+            pd.DataFrame: (브랜드, 채널) 인덱스 (채널은 CHANNEL_ORDER),
+                          컬럼 '{전년|계획|당년}_{TAG가|실판매액|직접이익|할인율|직접이익율}'
         """
+        if self._channel_table is not None:
+            return self._channel_table
+        
         # 데이터 로드
         if self.current_year_data is None:
             self.load_current_year_data()
@@ -443,53 +363,68 @@ class ChannelProfitLossProcessor:
         if self.plan_data is None:
             self.load_plan_data()
         
-        # 채널별 집계
-        current_agg = self.aggregate_by_channel(self.current_year_data, brand, is_plan_data=False)
-        previous_agg = self.aggregate_by_channel(self.previous_year_data, brand, is_plan_data=False)
+        sources = {
+            '전년': self.aggregate_by_brand_channel(self.previous_year_data, is_plan_data=False),
+            '계획': self.aggregate_by_brand_channel(self.plan_data, is_plan_data=True),
+            '당년': self.aggregate_by_brand_channel(self.current_year_data, is_plan_data=False),
+        }
         
-        # ★★★ 계획 데이터: 매출은 채널별로, 직접이익은 채널별 직접이익 컬럼 사용 ★★★
-        if metric == '매출':
-            # 매출 모드: 채널별 계획 데이터 사용
-            plan_agg = self.aggregate_by_channel(self.plan_data, brand, is_plan_data=True)
-        else:
-            # 직접이익 모드: 계획 데이터에서 채널별 직접이익 컬럼 사용
-            plan_agg = self.aggregate_by_channel(self.plan_data, brand, is_plan_data=True)
-            # 계획 데이터에 직접이익 컬럼이 없으면 실판매액으로 대체 (폴백)
-            if '직접이익' not in plan_agg.columns and '실판매액' in plan_agg.columns:
-                plan_agg['직접이익'] = plan_agg['실판매액']
-                print(f"  ⚠️ 계획 데이터에 직접이익 컬럼이 없어 실판매액을 사용합니다")
-            elif '직접이익' not in plan_agg.columns:
-                plan_agg['직접이익'] = 0.0
-                print(f"  ⚠️ 계획 데이터에 직접이익 컬럼이 없습니다")
+        brands = [self.ALL_BRANDS]
+        for grouped in sources.values():
+            if not grouped.empty:
+                brands += [brand for brand in grouped.index.get_level_values(0).unique() if brand not in brands]
+        index = pd.MultiIndex.from_product([brands, self.CHANNEL_ORDER], names=['브랜드', '채널'])
+        
+        columns = {}
+        for source, grouped in sources.items():
+            # 집계에 없는 (브랜드, 채널)과 값 컬럼은 0
+            grouped = grouped.reindex(index, fill_value=0.0) if not grouped.empty else pd.DataFrame(index=index)
+            values = {col: grouped[col] if col in grouped.columns else pd.Series(0.0, index=index) for col in self.VALUE_COLS}
+            
+            # 할인율 계산: (TAG가 - 실판매액) / TAG가 * 100
+            if 'TAG가' in grouped.columns and '실판매액' in grouped.columns:
+                discount = self.discount_rates(values['TAG가'], values['실판매액'])
+            else:
+                discount = pd.Series(0.0, index=index)
             
-            # 직접이익율 계산: 계획 데이터에 직접이익율 컬럼이 있으면 사용, 없으면 계산
-            if '직접이익율' not in plan_agg.columns:
-                # 직접이익율: 전년 데이터의 직접이익율을 사용 (계획 데이터에 직접이익율이 없으므로)
-                # 전년 데이터에서 채널별 직접이익율 가져오기
-                if previous_agg is not None and not previous_agg.empty:
-                    for idx, row in plan_agg.iterrows():
-                        channel = row['채널명']
-                        prev_channel_row = previous_agg[previous_agg['채널명'] == channel]
-                        if not prev_channel_row.empty and '직접이익율' in prev_channel_row.columns:
-                            plan_agg.at[idx, '직접이익율'] = prev_channel_row['직접이익율'].values[0]
-                        else:
-                            # 전년 데이터가 없으면 기본값 계산
-                            if '실판매액' in plan_agg.columns:
-                                plan_agg.at[idx, '직접이익율'] = self.calculate_profit_rate(row['직접이익'], row['실판매액'])
-                            else:
-                                plan_agg.at[idx, '직접이익율'] = 0.0
+            # 직접이익율 계산: 직접이익 / 실판매출 * 1.1 * 100
+            if '직접이익' in grouped.columns and '실판매액' in grouped.columns:
+                profit_rate = self.profit_rates(values['직접이익'], values['실판매액'])
+            else:
+                profit_rate = pd.Series(0.0, index=index)
+            
+            # 계획 데이터에 직접이익 컬럼이 없으면 실판매액으로 대체 (폴백)
+            if source == '계획' and '직접이익' not in grouped.columns:
+                if '실판매액' in grouped.columns:
+                    values['직접이익'] = values['실판매액']
+                    print(f"  ⚠️ 계획 데이터에 직접이익 컬럼이 없어 실판매액을 사용합니다")
                 else:
-                    # 전년 데이터가 없으면 기본값 계산
-                    if '실판매액' in plan_agg.columns:
-                        plan_agg['직접이익율'] = plan_agg.apply(
-                            lambda row: self.calculate_profit_rate(row['직접이익'], row['실판매액']), 
-                            axis=1
-                        )
-                    else:
-                        plan_agg['직접이익율'] = 0.0
-        
-        # 결과 DataFrame 생성
-        result_data = []
+                    print(f"  ⚠️ 계획 데이터에 직접이익 컬럼이 없습니다")
+            
+            for col in self.VALUE_COLS:
+                columns[f'{source}_{col}'] = values[col]
+            columns[f'{source}_할인율'] = discount
+            columns[f'{source}_직접이익율'] = profit_rate
+        
+        self._channel_table = pd.DataFrame(columns, index=index)
+        return self._channel_table
+    
+    def process_channel_data(self, brand: str = None, metric: str = '매출') -> pd.DataFrame:
+        """
+        채널별 손익 데이터 처리 (build_channel_table()의 브랜드/지표 투영)
+        
+        Args:
+            brand: 브랜드 코드 (None이면 전체)
+            metric: '매출' 또는 '직접이익'
+            
+        Returns:
+            채널별 손익 DataFrame
+        """
+        key = (brand if brand else self.ALL_BRANDS, metric)
+        if key in self._projections:
+            return self._projections[key].copy()
+        
+        table = self.build_channel_table()
         
         # 값 컬럼 및 비율 컬럼 선택
         if metric == '매출':
@@ -499,63 +434,24 @@ class ChannelProfitLossProcessor:
             value_col = '직접이익'
             rate_col = '직접이익율'  # 직접이익 모드: 직접이익율
         
-        for channel in self.CHANNEL_ORDER:
-            row = {'채널': channel}
-            
-            # 전년 데이터
-            prev_row = previous_agg[previous_agg['채널명'] == channel]
-            if not prev_row.empty:
-                prev_value = prev_row[value_col].values[0] if value_col in prev_row.columns else 0
-                prev_rate = prev_row[rate_col].values[0] if rate_col in prev_row.columns else 0
-                row['전년_매출'] = self.to_억원(prev_value)
-                row['전년_할인율'] = round(prev_rate, 1)
-            else:
-                row['전년_매출'] = 0.0
-                row['전년_할인율'] = 0.0
-            
-            # 계획 데이터
-            plan_row = plan_agg[plan_agg['채널명'] == channel]
-            if not plan_row.empty:
-                plan_value = plan_row[value_col].values[0] if value_col in plan_row.columns else 0
-                plan_rate = plan_row[rate_col].values[0] if rate_col in plan_row.columns else 0
-                row['계획_매출'] = self.to_억원(plan_value)
-                row['계획_할인율'] = round(plan_rate, 1)
-            else:
-                row['계획_매출'] = 0.0
-                row['계획_할인율'] = 0.0
-            
-            # 당년 데이터
-            curr_row = current_agg[current_agg['채널명'] == channel]
-            if not curr_row.empty:
-                curr_value = curr_row[value_col].values[0] if value_col in curr_row.columns else 0
-                curr_rate = curr_row[rate_col].values[0] if rate_col in curr_row.columns else 0
-                row['당년_매출'] = self.to_억원(curr_value)
-                row['당년_할인율'] = round(curr_rate, 1)
-            else:
-                row['당년_매출'] = 0.0
-                row['당년_할인율'] = 0.0
-            
-            # 전년대비 (%) - 정수로 표시
-            if row['전년_매출'] > 0:
-                row['전년대비'] = int(round((row['당년_매출'] / row['전년_매출']) * 100))
-            elif row['전년_매출'] < 0 and row['당년_매출'] != 0:
-                # 전년이 음수인 경우 부호 고려
-                row['전년대비'] = int(round((row['당년_매출'] / row['전년_매출']) * 100))
-            else:
-                row['전년대비'] = 0
-            
-            # 계획대비 (%) - 정수로 표시
-            if row['계획_매출'] > 0:
-                row['계획대비'] = int(round((row['당년_매출'] / row['계획_매출']) * 100))
-            elif row['계획_매출'] < 0 and row['당년_매출'] != 0:
-                # 계획이 음수인 경우 부호 고려
-                row['계획대비'] = int(round((row['당년_매출'] / row['계획_매출']) * 100))
-            else:
-                row['계획대비'] = 0
-            
-            result_data.append(row)
-        
-        result_df = pd.DataFrame(result_data)
+        if key[0] in table.index.get_level_values(0):
+            part = table.loc[key[0]]
+        else:
+            part = pd.DataFrame(0.0, index=pd.Index(self.CHANNEL_ORDER, name='채널'), columns=table.columns)
+        
+        result_df = pd.DataFrame({'채널': self.CHANNEL_ORDER})
+        for source in self.SOURCES:
+            result_df[f'{source}_매출'] = np.round(part[f'{source}_{value_col}'].to_numpy() / 100000000, 2)
+            result_df[f'{source}_할인율'] = np.round(part[f'{source}_{rate_col}'].to_numpy(), 1)
+        
+        # 전년대비/계획대비 (%) - 정수로 표시 (기준이 음수인 경우 부호 고려)
+        current = result_df['당년_매출'].to_numpy()
+        for base_col, ratio_col in [('전년_매출', '전년대비'), ('계획_매출', '계획대비')]:
+            base = result_df[base_col].to_numpy()
+            valid = (base > 0) | ((base < 0) & (current != 0))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = np.rint((current / base) * 100)
+            result_df[ratio_col] = np.where(valid, ratio, 0).astype(int)
         
         # 값이 없는 채널 제거 (전년, 계획, 당년 모두 0인 경우)
         result_df = result_df[
@@ -564,7 +460,8 @@ class ChannelProfitLossProcessor:
             (result_df['당년_매출'] != 0)
         ]
         
-        return result_df
+        self._projections[key] = result_df
+        return result_df.copy()
     
     def get_available_brands(self) -> list:
         """사용 가능한 브랜드 목록 반환"""
@@ -579,6 +476,91 @@ class ChannelProfitLossProcessor:
         
         return sorted(list(brands))
     
+    @staticmethod
+    def channel_records(df: pd.DataFrame) -> tuple:
+        """
+        채널별 손익 DataFrame → 대시보드 레코드
+        
+        Returns:
+            tuple: (채널 레코드 리스트, 비율 레코드 리스트)
+                   전년_할인율 등은 매출 모드면 할인율, 직접이익 모드면 직접이익율
+        """
+        columns = {col: df[col].tolist() for col in df.columns}
+        channels = []
+        rates = []
+        for i, channel in enumerate(columns['채널']):
+            channels.append({
+                'channel': channel,
+                'prev': columns['전년_매출'][i],
+                'target': columns['계획_매출'][i],
+                'forecast': columns['당년_매출'][i],
+                'prevRate': columns['전년_할인율'][i],
+                'targetRate': columns['계획_할인율'][i],
+                'forecastRate': columns['당년_할인율'][i],
+                'yoy': columns['전년대비'][i],
+                'achievement': columns['계획대비'][i]
+            })
+            rates.append({
+                'channel': channel,
+                'prev': columns['전년_할인율'][i],
+                'target': columns['계획_할인율'][i],
+                'forecast': columns['당년_할인율'][i]
+            })
+        return channels, rates
+    
+    @staticmethod
+    def _brand_sums(df: pd.DataFrame, col: str, channel: str = None) -> dict:
+        """브랜드별 원본 데이터 합계 (channel 지정 시 해당 채널명 행만)"""
+        if df is None or col not in df.columns:
+            return {}
+        if channel is not None:
+            df = df[df['채널명'] == channel]
+        return {brand: values.sum() for brand, values in df.groupby('브랜드')[col]}
+    
+    def build_dashboard_sections(self) -> dict:
+        """
+        브랜드별 대시보드 데이터 (channelProfitLossData 섹션, 채널별 손익 JS 파일 공용)
+        
+        Returns:
+            dict: channelRevenueData, channelProfitData, channelDiscountData,
+                  channelProfitRateData, brandRevenueTotals, brandProfitTotals
+        """
+        sections = {
+            'channelRevenueData': {},
+            'channelProfitData': {},
+            'channelDiscountData': {},
+            'channelProfitRateData': {},
+            'brandRevenueTotals': {},
+            'brandProfitTotals': {}
+        }
+        
+        for brand_code in self.BRAND_CODES:
+            brand_name = self.BRAND_NAME_MAP.get(brand_code, brand_code)
+            
+            # 매출 데이터 (할인율 포함)
+            revenue_df = self.process_channel_data(brand=brand_code, metric='매출')
+            revenue_channels, discount_channels = self.channel_records(revenue_df)
+            sections['channelRevenueData'][brand_name] = revenue_channels
+            sections['channelDiscountData'][brand_name] = discount_channels
+            sections['brandRevenueTotals'][brand_name] = {
+                'prev': round(revenue_df['전년_매출'].sum(), 1),
+                'target': round(revenue_df['계획_매출'].sum(), 1),
+                'forecast': round(revenue_df['당년_매출'].sum(), 1)
+            }
+            
+            # 직접이익 데이터 (직접이익율 포함)
+            profit_df = self.process_channel_data(brand=brand_code, metric='직접이익')
+            profit_channels, profit_rate_channels = self.channel_records(profit_df)
+            sections['channelProfitData'][brand_name] = profit_channels
+            sections['channelProfitRateData'][brand_name] = profit_rate_channels
+            sections['brandProfitTotals'][brand_name] = {
+                'prev': round(profit_df['전년_매출'].sum(), 1),
+                'target': round(profit_df['계획_매출'].sum(), 1),
+                'forecast': round(profit_df['당년_매출'].sum(), 1)
+            }
+        
+        return sections
+    
     def export_to_excel(self, output_path: str = None, brand: str = None):
         """엑셀 파일로 내보내기"""
         if output_path is None:
@@ -608,16 +590,6 @@ class ChannelProfitLossProcessor:
             brand: 특정 브랜드만 출력 (None이면 전체)
             include_all_brands: True면 모든 브랜드별 데이터 포함
         """
-        # 브랜드 코드 -> 대시보드 브랜드명 매핑
-        brand_name_map = {
-            'M': 'MLB',
-            'I': 'MLB_KIDS',
-            'X': 'DISCOVERY',
-            'V': 'DUVETICA',
-            'ST': 'SERGIO',
-            'W': 'SUPRA'
-        }
-        
         result = {
             'metadata': {
                 'base_date': self.base_date,
@@ -629,113 +601,45 @@ class ChannelProfitLossProcessor:
         
         if include_all_brands:
             # ★ 브랜드별 데이터 구조 (Dashboard.html에서 바로 사용 가능) ★
-            channel_revenue_data = {}
-            channel_profit_data = {}
+            sections = self.build_dashboard_sections()
+            
+            # ★★★ 매출 합계: 계획은 내수합계에서 가져오기 ★★★
+            plan_revenue = self._brand_sums(self.plan_data, '실판매액', channel='내수합계')
+            
+            # ★★★ 직접이익 합계 ★★★
+            # 전년: 공통 채널 포함 전체 채널 직접이익 합계 (원본 데이터에서 직접 합산)
+            # 당년: 전체 채널 직접이익 합계 (원본 데이터에서 직접 합산)
+            # 계획: 내수합계 행의 직접이익
+            prev_profit = self._brand_sums(self.previous_year_data, '직접이익')
+            forecast_profit = self._brand_sums(self.current_year_data, '직접이익')
+            plan_profit = self._brand_sums(self.plan_data, '직접이익', channel='내수합계')
+            
             brand_revenue_totals = {}
             brand_profit_totals = {}
-            
-            for brand_code in ['M', 'I', 'X', 'V', 'ST', 'W']:
-                brand_name = brand_name_map.get(brand_code, brand_code)
-                
-                # 매출 데이터
-                revenue_df = self.process_channel_data(brand=brand_code, metric='매출')
-                revenue_channels = []
-                for _, row in revenue_df.iterrows():
-                    revenue_channels.append({
-                        'channel': row['채널'],
-                        'prev': row['전년_매출'],
-                        'target': row['계획_매출'],
-                        'forecast': row['당년_매출'],
-                        'prevRate': row['전년_할인율'],
-                        'targetRate': row['계획_할인율'],
-                        'forecastRate': row['당년_할인율'],
-                        'yoy': row['전년대비'],
-                        'achievement': row['계획대비']
-                    })
-                channel_revenue_data[brand_name] = revenue_channels
-                
-                # ★★★ 매출 합계: 계획은 내수합계에서 가져오기 ★★★
-                prev_revenue = round(revenue_df['전년_매출'].sum(), 1)
-                forecast_revenue = round(revenue_df['당년_매출'].sum(), 1)
-                
-                # 계획 매출: 내수합계에서 가져오기
-                target_revenue = 0.0
-                if self.plan_data is not None:
-                    brand_plan_df = self.plan_data[self.plan_data['브랜드'] == brand_code]
-                    내수합계_df = brand_plan_df[brand_plan_df['채널명'] == '내수합계']
-                    if not 내수합계_df.empty and '실판매액' in 내수합계_df.columns:
-                        target_revenue = round(self.to_억원(내수합계_df['실판매액'].sum()), 1)
-                
+            for brand_code in self.BRAND_CODES:
+                brand_name = self.BRAND_NAME_MAP.get(brand_code, brand_code)
+                revenue_totals = sections['brandRevenueTotals'][brand_name]
                 brand_revenue_totals[brand_name] = {
-                    'prev': prev_revenue,
-                    'target': target_revenue,
-                    'forecast': forecast_revenue
+                    'prev': revenue_totals['prev'],
+                    'target': round(self.to_억원(plan_revenue[brand_code]), 1) if brand_code in plan_revenue else 0.0,
+                    'forecast': revenue_totals['forecast']
                 }
-                
-                # 직접이익 데이터
-                profit_df = self.process_channel_data(brand=brand_code, metric='직접이익')
-                profit_channels = []
-                for _, row in profit_df.iterrows():
-                    profit_channels.append({
-                        'channel': row['채널'],
-                        'prev': row['전년_매출'],  # 직접이익
-                        'target': row['계획_매출'],
-                        'forecast': row['당년_매출'],
-                        'prevRate': row['전년_할인율'],  # 직접이익율
-                        'targetRate': row['계획_할인율'],
-                        'forecastRate': row['당년_할인율'],
-                        'yoy': row['전년대비'],
-                        'achievement': row['계획대비']
-                    })
-                channel_profit_data[brand_name] = profit_channels
-                
-                # ★★★ 직접이익 합계 계산 로직 ★★★
-                # 전년: 공통 채널 포함 전체 채널 직접이익 합계 (원본 데이터에서 직접 합산)
-                prev_direct_profit = 0.0
-                if self.previous_year_data is not None:
-                    brand_prev_df = self.previous_year_data[self.previous_year_data['브랜드'] == brand_code]
-                    if '직접이익' in brand_prev_df.columns:
-                        # 공통 채널 포함하여 전체 합산
-                        prev_direct_profit = brand_prev_df['직접이익'].sum()
-                
-                # 당년: 전체 채널 포함 전체 채널 직접이익 합계 (원본 데이터에서 직접 합산)
-                forecast_direct_profit = 0.0
-                if self.current_year_data is not None:
-                    brand_forecast_df = self.current_year_data[self.current_year_data['브랜드'] == brand_code]
-                    if '직접이익' in brand_forecast_df.columns:
-                        # 전체 채널 포함하여 전체 합산
-                        forecast_direct_profit = brand_forecast_df['직접이익'].sum()
-                
-                # 계획: 내수합계의 직접이익 합계 (내수합계 행에서 직접 가져오기)
-                target_direct_profit = 0.0
-                if self.plan_data is not None:
-                    brand_plan_df = self.plan_data[self.plan_data['브랜드'] == brand_code]
-                    내수합계_df = brand_plan_df[brand_plan_df['채널명'] == '내수합계']
-                    if not 내수합계_df.empty:
-                        # 직접이익 컬럼이 있으면 사용
-                        if '직접이익' in 내수합계_df.columns:
-                            target_direct_profit = 내수합계_df['직접이익'].sum()
-                
                 brand_profit_totals[brand_name] = {
-                    'prev': round(self.to_억원(prev_direct_profit), 1),
-                    'target': round(self.to_억원(target_direct_profit), 1),
-                    'forecast': round(self.to_억원(forecast_direct_profit), 1)
+                    'prev': round(self.to_억원(prev_profit.get(brand_code, 0.0)), 1),
+                    'target': round(self.to_억원(plan_profit.get(brand_code, 0.0)), 1),
+                    'forecast': round(self.to_억원(forecast_profit.get(brand_code, 0.0)), 1)
                 }
             
-            # 전체 합산 데이터도 추가
-            total_revenue_df = self.process_channel_data(brand=None, metric='매출')
-            total_profit_df = self.process_channel_data(brand=None, metric='직접이익')
-            
-            result['channelRevenueData'] = channel_revenue_data
-            result['channelProfitData'] = channel_profit_data
+            result['channelRevenueData'] = sections['channelRevenueData']
+            result['channelProfitData'] = sections['channelProfitData']
             result['brandRevenueTotals'] = brand_revenue_totals
             result['brandProfitTotals'] = brand_profit_totals
             
             # 전체 합산 (기존 호환성 유지)
-            result['매출'] = total_revenue_df.to_dict('records')
-            result['직접이익'] = total_profit_df.to_dict('records')
+            result['매출'] = self.process_channel_data(brand=None, metric='매출').to_dict('records')
+            result['직접이익'] = self.process_channel_data(brand=None, metric='직접이익').to_dict('records')
             
-            print(f"✅ 브랜드별 데이터 생성 완료: {list(brand_name_map.values())}")
+            print(f"✅ 브랜드별 데이터 생성 완료: {list(self.BRAND_NAME_MAP.values())}")
         else:
             # 단일 브랜드 또는 전체만
             result['metadata']['brand'] = brand if brand else '전체'
@@ -756,97 +660,7 @@ class ChannelProfitLossProcessor:
         대시보드용 JavaScript 파일로 내보내기
         Dashboard.html의 channelRevenueData, channelProfitData 형식에 맞춤
         """
-        # 브랜드 코드 -> 대시보드 브랜드명 매핑
-        brand_name_map = {
-            'M': 'MLB',
-            'I': 'MLB_KIDS',
-            'X': 'DISCOVERY',
-            'V': 'DUVETICA',
-            'ST': 'SERGIO',
-            'W': 'SUPRA'
-        }
-        
-        channel_revenue_data = {}
-        channel_profit_data = {}
-        brand_revenue_totals = {}
-        brand_profit_totals = {}
-        
-        # 할인율 데이터도 추가
-        channel_discount_data = {}
-        
-        # 직접이익율 데이터도 추가
-        channel_profit_rate_data = {}
-        
-        for brand_code in ['M', 'I', 'X', 'V', 'ST', 'W']:
-            brand_name = brand_name_map.get(brand_code, brand_code)
-            
-            # 매출 데이터 (할인율 포함)
-            revenue_df = self.process_channel_data(brand=brand_code, metric='매출')
-            revenue_channels = []
-            discount_channels = []
-            
-            for _, row in revenue_df.iterrows():
-                revenue_channels.append({
-                    'channel': row['채널'],
-                    'prev': row['전년_매출'],
-                    'target': row['계획_매출'],
-                    'forecast': row['당년_매출'],
-                    'prevRate': row['전년_할인율'],  # 할인율
-                    'targetRate': row['계획_할인율'],
-                    'forecastRate': row['당년_할인율'],
-                    'yoy': row['전년대비'],
-                    'achievement': row['계획대비']
-                })
-                discount_channels.append({
-                    'channel': row['채널'],
-                    'prev': row['전년_할인율'],
-                    'target': row['계획_할인율'],
-                    'forecast': row['당년_할인율']
-                })
-            
-            channel_revenue_data[brand_name] = revenue_channels
-            channel_discount_data[brand_name] = discount_channels
-            
-            # 매출 합계
-            brand_revenue_totals[brand_name] = {
-                'prev': round(revenue_df['전년_매출'].sum(), 1),
-                'target': round(revenue_df['계획_매출'].sum(), 1),
-                'forecast': round(revenue_df['당년_매출'].sum(), 1)
-            }
-            
-            # 직접이익 데이터 (직접이익율 포함)
-            profit_df = self.process_channel_data(brand=brand_code, metric='직접이익')
-            profit_channels = []
-            profit_rate_channels = []
-            
-            for _, row in profit_df.iterrows():
-                profit_channels.append({
-                    'channel': row['채널'],
-                    'prev': row['전년_매출'],  # 직접이익 모드에서는 이 값이 직접이익
-                    'target': row['계획_매출'],
-                    'forecast': row['당년_매출'],
-                    'prevRate': row['전년_할인율'],  # 직접이익율
-                    'targetRate': row['계획_할인율'],
-                    'forecastRate': row['당년_할인율'],
-                    'yoy': row['전년대비'],
-                    'achievement': row['계획대비']
-                })
-                profit_rate_channels.append({
-                    'channel': row['채널'],
-                    'prev': row['전년_할인율'],  # 직접이익율
-                    'target': row['계획_할인율'],
-                    'forecast': row['당년_할인율']
-                })
-            
-            channel_profit_data[brand_name] = profit_channels
-            channel_profit_rate_data[brand_name] = profit_rate_channels
-            
-            # 직접이익 합계
-            brand_profit_totals[brand_name] = {
-                'prev': round(profit_df['전년_매출'].sum(), 1),
-                'target': round(profit_df['계획_매출'].sum(), 1),
-                'forecast': round(profit_df['당년_매출'].sum(), 1)
-            }
+        sections = self.build_dashboard_sections()
         
         # JavaScript 코드 생성
         js_content = f"""// 채널별 손익 데이터 (자동 생성)
@@ -854,22 +668,22 @@ class ChannelProfitLossProcessor:
 // 기준일: {self.base_date}, 대상월: {self.target_month}
 
 // 채널별 매출 데이터 (단위: 억원, prevRate/targetRate/forecastRate: 할인율 %)
-var channelRevenueDataFromFile = {json.dumps(channel_revenue_data, ensure_ascii=False, indent=2)};
+var channelRevenueDataFromFile = {json.dumps(sections['channelRevenueData'], ensure_ascii=False, indent=2)};
 
 // 채널별 직접이익 데이터 (단위: 억원, prevRate/targetRate/forecastRate: 직접이익율 %)
-var channelProfitDataFromFile = {json.dumps(channel_profit_data, ensure_ascii=False, indent=2)};
+var channelProfitDataFromFile = {json.dumps(sections['channelProfitData'], ensure_ascii=False, indent=2)};
 
 // 채널별 할인율 데이터 (단위: %)
-var channelDiscountDataFromFile = {json.dumps(channel_discount_data, ensure_ascii=False, indent=2)};
+var channelDiscountDataFromFile = {json.dumps(sections['channelDiscountData'], ensure_ascii=False, indent=2)};
 
 // 채널별 직접이익율 데이터 (단위: %)
-var channelProfitRateDataFromFile = {json.dumps(channel_profit_rate_data, ensure_ascii=False, indent=2)};
+var channelProfitRateDataFromFile = {json.dumps(sections['channelProfitRateData'], ensure_ascii=False, indent=2)};
 
 // 브랜드별 매출 합계 (단위: 억원)
-var brandRevenueTotalsFromFile = {json.dumps(brand_revenue_totals, ensure_ascii=False, indent=2)};
+var brandRevenueTotalsFromFile = {json.dumps(sections['brandRevenueTotals'], ensure_ascii=False, indent=2)};
 
 // 브랜드별 직접이익 합계 (단위: 억원)
-var brandProfitTotalsFromFile = {json.dumps(brand_profit_totals, ensure_ascii=False, indent=2)};
+var brandProfitTotalsFromFile = {json.dumps(sections['brandProfitTotals'], ensure_ascii=False, indent=2)};
 
 // 전역 객체에 할당
 if (typeof window !== 'undefined') {{
@@ -898,150 +712,23 @@ if (typeof window !== 'undefined') {{
     
     def append_to_main_data_js(self, main_js_path: str = None):
         """
-        기존 data_YYYYMMDD.js 파일에 채널별 손익 데이터 추가
+        채널별 손익 데이터를 data_YYYYMMDD.js 섹션 저장소에 저장
+        
+        메인 JS 파일을 다시 읽거나 정규식으로 치환하지 않고
+        channelProfitLossData 섹션 파일만 갱신합니다.
         """
         if main_js_path is None:
             main_js_path = self.project_root / 'public' / f'data_{self.base_date}.js'
         else:
             main_js_path = Path(main_js_path)
         
-        if not main_js_path.exists():
-            print(f"⚠️ 메인 데이터 파일을 찾을 수 없습니다: {main_js_path}")
-            return None
-        
-        # 브랜드 코드 -> 대시보드 브랜드명 매핑
-        brand_name_map = {
-            'M': 'MLB',
-            'I': 'MLB_KIDS',
-            'X': 'DISCOVERY',
-            'V': 'DUVETICA',
-            'ST': 'SERGIO',
-            'W': 'SUPRA'
-        }
-        
-        channel_revenue_data = {}
-        channel_profit_data = {}
-        brand_revenue_totals = {}
-        brand_profit_totals = {}
-        channel_discount_data = {}
-        channel_profit_rate_data = {}
-        
-        for brand_code in ['M', 'I', 'X', 'V', 'ST', 'W']:
-            brand_name = brand_name_map.get(brand_code, brand_code)
-            
-            # 매출 데이터 (할인율 포함)
-            revenue_df = self.process_channel_data(brand=brand_code, metric='매출')
-            revenue_channels = []
-            discount_channels = []
-            
-            for _, row in revenue_df.iterrows():
-                revenue_channels.append({
-                    'channel': row['채널'],
-                    'prev': row['전년_매출'],
-                    'target': row['계획_매출'],
-                    'forecast': row['당년_매출'],
-                    'prevRate': row['전년_할인율'],  # 할인율
-                    'targetRate': row['계획_할인율'],
-                    'forecastRate': row['당년_할인율'],
-                    'yoy': row['전년대비'],
-                    'achievement': row['계획대비']
-                })
-                discount_channels.append({
-                    'channel': row['채널'],
-                    'prev': row['전년_할인율'],
-                    'target': row['계획_할인율'],
-                    'forecast': row['당년_할인율']
-                })
-            
-            channel_revenue_data[brand_name] = revenue_channels
-            channel_discount_data[brand_name] = discount_channels
-            
-            brand_revenue_totals[brand_name] = {
-                'prev': round(revenue_df['전년_매출'].sum(), 1),
-                'target': round(revenue_df['계획_매출'].sum(), 1),
-                'forecast': round(revenue_df['당년_매출'].sum(), 1)
-            }
-            
-            # 직접이익 데이터 (직접이익율 포함)
-            profit_df = self.process_channel_data(brand=brand_code, metric='직접이익')
-            profit_channels = []
-            profit_rate_channels = []
-            
-            for _, row in profit_df.iterrows():
-                profit_channels.append({
-                    'channel': row['채널'],
-                    'prev': row['전년_매출'],
-                    'target': row['계획_매출'],
-                    'forecast': row['당년_매출'],
-                    'prevRate': row['전년_할인율'],  # 직접이익율
-                    'targetRate': row['계획_할인율'],
-                    'forecastRate': row['당년_할인율'],
-                    'yoy': row['전년대비'],
-                    'achievement': row['계획대비']
-                })
-                profit_rate_channels.append({
-                    'channel': row['채널'],
-                    'prev': row['전년_할인율'],  # 직접이익율
-                    'target': row['계획_할인율'],
-                    'forecast': row['당년_할인율']
-                })
-            
-            channel_profit_data[brand_name] = profit_channels
-            channel_profit_rate_data[brand_name] = profit_rate_channels
-            
-            brand_profit_totals[brand_name] = {
-                'prev': round(profit_df['전년_매출'].sum(), 1),
-                'target': round(profit_df['계획_매출'].sum(), 1),
-                'forecast': round(profit_df['당년_매출'].sum(), 1)
-            }
-        
-        # 기존 파일 읽기
-        with open(main_js_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # 이미 채널별 손익 데이터가 있는지 확인
-        if 'channelProfitLossData' in content:
-            print(f"ℹ️ 채널별 손익 데이터가 이미 존재합니다. 업데이트합니다.")
-            # 기존 데이터 제거 (정규식으로 처리)
-            import re
-            content = re.sub(
-                r'// === 채널별 손익 데이터 \(자동 생성\) ===.*?// === 채널별 손익 데이터 끝 ===\n?',
-                '',
-                content,
-                flags=re.DOTALL
-            )
-        
-        # 새 데이터 추가
-        new_data = f"""
-// === 채널별 손익 데이터 (자동 생성) ===
-// 생성일: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-// 기준일: {self.base_date}, 대상월: {self.target_month}
-// 매출: prevRate/targetRate/forecastRate = 할인율(%)
-// 직접이익: prevRate/targetRate/forecastRate = 직접이익율(%)
-
-var channelProfitLossData = {{
-  channelRevenueData: {json.dumps(channel_revenue_data, ensure_ascii=False, indent=2)},
-  channelProfitData: {json.dumps(channel_profit_data, ensure_ascii=False, indent=2)},
-  channelDiscountData: {json.dumps(channel_discount_data, ensure_ascii=False, indent=2)},
-  channelProfitRateData: {json.dumps(channel_profit_rate_data, ensure_ascii=False, indent=2)},
-  brandRevenueTotals: {json.dumps(brand_revenue_totals, ensure_ascii=False, indent=2)},
-  brandProfitTotals: {json.dumps(brand_profit_totals, ensure_ascii=False, indent=2)}
-}};
-
-if (typeof window !== 'undefined') {{
-  window.channelProfitLossData = channelProfitLossData;
-}}
-// === 채널별 손익 데이터 끝 ===
-"""
-        
-        # 파일 끝에 추가
-        content = content.rstrip() + '\n' + new_data
-        
-        with open(main_js_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # channelProfitLossData 섹션만 저장 (JS 번들은 artifact_store.py --assemble-js에서 생성)
+        store = ArtifactStore.for_js_bundle(str(main_js_path))
+        store.put('channelProfitLossData', self.build_dashboard_sections())
         
-        print(f"✅ 메인 데이터 파일에 채널별 손익 데이터 추가 완료: {main_js_path}")
-        return str(main_js_path)
+        section_path = store.section_path('channelProfitLossData')
+        print(f"✅ 채널별 손익 데이터 섹션 저장 완료: {section_path}")
+        return str(section_path)
 
     def print_summary(self, brand: str = None, metric: str = '매출'):
         """요약 출력"""
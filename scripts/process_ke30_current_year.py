@@ -43,6 +43,9 @@ from datetime import datetime
 import sys
 import re
 
+from ke30_rollup import find_groupby_columns, find_value_columns, order_columns, rollup
+from master_registry import build_evaluation_rates, build_jeonganbi_rates, find_evaluation_month_column, load_master_frame
+
 # ================================
 # 설정 (Configuration)
 # ================================
@@ -68,13 +71,13 @@ FILE_PREFIX = "ke30_"
 
 def load_channel_master():
     """
-    채널 마스터 파일 로드
+    채널 마스터 파일 로드 (master_registry 캐시의 복사본)
     
     Returns:
         pd.DataFrame: 채널 마스터 데이터
     """
     try:
-        df = pd.read_csv(CHANNEL_MASTER_PATH, encoding='utf-8-sig')
+        df = load_master_frame(CHANNEL_MASTER_PATH)
         print(f"[OK] 채널 마스터 로드: {len(df)}행")
         return df
     except Exception as e:
@@ -84,13 +87,13 @@ def load_channel_master():
 
 def load_item_master():
     """
-    아이템 마스터 파일 로드
+    아이템 마스터 파일 로드 (master_registry 캐시의 복사본)
     
     Returns:
         pd.DataFrame: 아이템 마스터 데이터
     """
     try:
-        df = pd.read_csv(ITEM_MASTER_PATH, encoding='utf-8-sig')
+        df = load_master_frame(ITEM_MASTER_PATH)
         print(f"[OK] 아이템 마스터 로드: {len(df)}행")
         return df
     except Exception as e:
@@ -100,13 +103,13 @@ def load_item_master():
 
 def load_jeonganbi_rate_master():
     """
-    표준제간비율 마스터 파일 로드
+    표준제간비율 마스터 파일 로드 (master_registry 캐시의 복사본)
     
     Returns:
         pd.DataFrame: 표준제간비율 마스터 데이터
     """
     try:
-        df = pd.read_csv(JEONGANBI_RATE_MASTER_PATH, encoding='utf-8-sig')
+        df = load_master_frame(JEONGANBI_RATE_MASTER_PATH)
         print(f"[OK] 표준제간비율 마스터 로드: {len(df)}행")
         return df
     except Exception as e:
@@ -116,13 +119,13 @@ def load_jeonganbi_rate_master():
 
 def load_evaluation_rate_master():
     """
-    평가율 마스터 파일 로드
+    평가율 마스터 파일 로드 (master_registry 캐시의 복사본)
     
     Returns:
         pd.DataFrame: 평가율 마스터 데이터
     """
     try:
-        df = pd.read_csv(EVALUATION_RATE_MASTER_PATH, encoding='utf-8-sig')
+        df = load_master_frame(EVALUATION_RATE_MASTER_PATH)
         print(f"[OK] 평가율 마스터 로드: {len(df)}행")
         return df
     except Exception as e:
@@ -660,64 +663,19 @@ def add_cost_calculation_fields(df, jeonganbi_master, evaluation_master, analysi
     print(f"     TAG매출: {TAG매출_col}")
     print(f"     출고매출: {출고매출_col}")
     
-    # 제간비율 마스터 딕셔너리 생성 (브랜드+시즌 -> 비율)
-    jeonganbi_map = {}
-    
-    # 컬럼명 찾기 (공백 제거하여 매칭)
-    brand_col = None
-    season_col = None
-    rate_col = None
-    
-    for col in jeonganbi_master.columns:
-        col_clean = str(col).strip()
-        if '브랜드' in col_clean:
-            brand_col = col
-        elif '대상시즌' in col_clean or '시즌' in col_clean:
-            season_col = col
-        elif '비율' in col_clean:
-            rate_col = col
-    
-    if brand_col and season_col and rate_col:
-        print(f"   제간비율 마스터 컬럼: 브랜드={brand_col}, 시즌={season_col}, 비율={rate_col}")
-        
-        for _, row in jeonganbi_master.iterrows():
-            brand = str(row[brand_col]).strip()
-            season = str(row[season_col]).strip()
-            rate_val = row[rate_col]
-            
-            if pd.notna(rate_val) and brand and season:
-                # 퍼센트 문자열 처리 ('5%' -> 0.05, '5' -> 0.05, '0.05' -> 0.05)
-                rate_str = str(rate_val).strip().replace(',', '').replace(' ', '')
-                
-                try:
-                    # 퍼센트 기호가 있는 경우
-                    if '%' in rate_str:
-                        rate = float(rate_str.replace('%', '')) / 100
-                    else:
-                        rate = float(rate_str)
-                        # 값이 1보다 크면 퍼센트로 간주하여 100으로 나눔 (예: 5 -> 0.05)
-                        if rate > 1:
-                            rate = rate / 100
-                        # 값이 이미 소수 형태인 경우 (0~1 사이)는 그대로 사용
-                except (ValueError, TypeError):
-                    rate = 0
-            else:
-                rate = 0
-            
-            key = f"{brand}_{season}"
-            jeonganbi_map[key] = rate
-        
+    # 제간비율 마스터 딕셔너리 생성 ((브랜드, 시즌) -> 비율)
+    try:
+        jeonganbi_map = build_jeonganbi_rates(jeonganbi_master)
         print(f"   제간비율 매핑: {len(jeonganbi_map)}개 조합")
         # 샘플 출력 (최대 5개)
-        sample_count = 0
-        for key, rate in list(jeonganbi_map.items())[:5]:
-            print(f"     {key}: {rate}")
-            sample_count += 1
-    else:
+        for (brand, season), rate in list(jeonganbi_map.items())[:5]:
+            print(f"     {brand}_{season}: {rate}")
+    except ValueError:
+        jeonganbi_map = {}
         print(f"   [WARNING] 제간비율 마스터 컬럼을 찾을 수 없습니다.")
         print(f"     현재 컬럼: {list(jeonganbi_master.columns)}")
     
-    # 평가율 마스터 딕셔너리 생성 (브랜드+시즌+평가감환입월 -> 평가율)
+    # 평가율 마스터 딕셔너리 생성 ((브랜드, 시즌) -> 평가감 환입월 평가율)
     # 평가감 환입월 = 분석월의 1달 전 (예: 분석월 2025.11 -> 평가감 환입월 2025.10)
     evaluation_map = {}
     if '브랜드' in evaluation_master.columns and '시즌' in evaluation_master.columns:
@@ -736,56 +694,10 @@ def add_cost_calculation_fields(df, jeonganbi_master, evaluation_master, analysi
         # 평가감 환입월을 YYYY.MM 형식으로 변환 (예: 202510 -> 2025.10)
         evaluation_month_formatted = f"{prev_year}.{prev_month:02d}"
         
-        # 평가감 환입월 컬럼 찾기 (정확한 매칭 우선, 부분 매칭도 시도)
-        month_col = None
-        for col in evaluation_master.columns:
-            col_str = str(col).strip()
-            # 정확한 매칭
-            if col_str == evaluation_month_formatted:
-                month_col = col
-                break
-            # 부분 매칭 (예: "2025.10"이 포함된 경우)
-            elif evaluation_month_formatted in col_str:
-                month_col = col
-                break
-        
-        # "2025.10" -> "2025.1" 형식 매칭 (10월이 "2025.1"로 표기된 경우)
-        if not month_col and evaluation_month_formatted.endswith('.10'):
-            alt_format = evaluation_month_formatted.replace('.10', '.1')
-            for col in evaluation_master.columns:
-                col_str = str(col).strip()
-                if col_str == alt_format:
-                    month_col = col
-                    break
-        
+        month_col = find_evaluation_month_column(evaluation_master.columns, evaluation_month_formatted)
         if month_col:
             print(f"   평가율 컬럼 사용: {month_col} (평가감 환입월: {evaluation_month_formatted})")
-            for _, row in evaluation_master.iterrows():
-                brand = str(row['브랜드']).strip()
-                season = str(row['시즌']).strip()
-                
-                # 브랜드나 시즌이 비어있으면 스킵
-                if not brand or not season or brand == 'nan' or season == 'nan':
-                    continue
-                
-                eval_rate_str = str(row[month_col]).strip() if pd.notna(row[month_col]) else ''
-                
-                # 평가율 문자열에서 % 제거하고 숫자로 변환 (예: "15%" -> 0.15)
-                if eval_rate_str and '%' in eval_rate_str:
-                    eval_rate = float(eval_rate_str.replace('%', '').replace(' ', '')) / 100
-                elif eval_rate_str and eval_rate_str != 'nan':
-                    try:
-                        eval_rate = float(eval_rate_str)
-                        # 1보다 크면 퍼센트로 간주 (예: 15 -> 0.15)
-                        if eval_rate > 1:
-                            eval_rate = eval_rate / 100
-                    except:
-                        eval_rate = 0
-                else:
-                    eval_rate = 0
-                
-                key = f"{brand}_{season}"
-                evaluation_map[key] = eval_rate
+            evaluation_map = build_evaluation_rates(evaluation_master, evaluation_month_formatted)
             print(f"   평가율 매핑: {len(evaluation_map)}개 조합")
         else:
             print(f"   [WARNING] 평가감 환입월 컬럼을 찾을 수 없습니다: {evaluation_month_formatted} (분석월: {analysis_month})")
@@ -795,8 +707,7 @@ def add_cost_calculation_fields(df, jeonganbi_master, evaluation_master, analysi
     def calculate_jeonganbi(row):
         brand = str(row.get('브랜드', '')).strip()
         season = str(row.get('시즌', '')).strip()
-        key = f"{brand}_{season}"
-        rate = jeonganbi_map.get(key, 0)
+        rate = jeonganbi_map.get((brand, season), 0)
         표준매출원가_val = row.get(표준매출원가_col, 0)
         if pd.isna(표준매출원가_val):
             표준매출원가_val = 0
@@ -815,8 +726,7 @@ def add_cost_calculation_fields(df, jeonganbi_master, evaluation_master, analysi
         def calculate_evaluation_return(row):
             brand = str(row.get('브랜드', '')).strip()
             season = str(row.get('시즌', '')).strip()
-            key = f"{brand}_{season}"
-            평가율 = evaluation_map.get(key, None)  # 평가율이 없으면 None 반환
+            평가율 = evaluation_map.get((brand, season), None)  # 평가율이 없으면 None 반환
             
             # 평가율이 없으면 재고평가감 환입을 0으로 처리
             if 평가율 is None:
@@ -894,151 +804,50 @@ def add_cost_calculation_fields(df, jeonganbi_master, evaluation_master, analysi
     return df_result
 
 
-def aggregate_by_requested_fields(df):
+# Shop_item / Shop 집계 기준 (요청 이름, 유통코드는 없으면 고객 사용)
+SHOP_ITEM_GROUPBY = ['브랜드', '유통코드', '채널명', '아이템_중분류', '아이템_소분류', '아이템코드']
+SHOP_GROUPBY = ['브랜드', '채널명', '아이템_중분류', '아이템_소분류', '아이템코드']
+
+
+def aggregate_levels(df, levels):
     """
-    매출총이익 필드 추가 후 요청된 기준으로 집계
-    
-    행: 브랜드, 유통코드, 채널명, 아이템_중분류, 아이템_소분류, 아이템코드
-    값: 판매금액(TAG가), 실판매액, 실판매액V-, 출고매출액V-, 매출원가(평가감환입), 매출총이익
+    여러 집계 단위를 한 번에 집계 (가장 세밀한 단위 1회 집계 후 상위 단위 파생)
     
     Args:
         df: 원가 계산 필드가 추가된 데이터프레임
+        levels: {단위 이름: 집계 기준 컬럼 (요청 이름)}
     
     Returns:
-        pd.DataFrame: 집계된 데이터프레임
+        dict: {단위 이름: 집계된 데이터프레임} (값 컬럼은 요청 이름으로 변경)
     """
-    print(f"\n[PROCESSING] 추가 집계 시작 (브랜드, 유통코드, 채널명, 아이템_중분류, 아이템_소분류, 아이템코드)...")
-    
-    # 집계 기준 컬럼
-    groupby_cols = [
-        '브랜드',
-        '유통코드',
-        '채널명',
-        '아이템_중분류',
-        '아이템_소분류',
-        '아이템코드'
-    ]
-    
-    # 컬럼명 매핑 (다양한 형태의 컬럼명 지원)
-    col_mapping = {}
-    
-    # 집계 기준 컬럼 확인
-    available_groupby = []
-    for col in groupby_cols:
-        if col in df.columns:
-            available_groupby.append(col)
-        else:
-            # 유통코드의 경우 '고객' 컬럼을 찾아서 사용
-            if col == '유통코드':
-                if '고객' in df.columns:
-                    available_groupby.append('고객')
-                    print(f"   '{col}' → '고객' 사용")
-                else:
-                    print(f"   [WARNING] '{col}' 컬럼 없음 (스킵)")
-            else:
-                # 유사한 컬럼명 찾기
-                similar = [c for c in df.columns if col in str(c) or str(c).replace(' ', '').replace('-', '') == col.replace(' ', '').replace('-', '')]
-                if similar:
-                    available_groupby.append(similar[0])
-                    print(f"   '{col}' → '{similar[0]}' 사용")
-                else:
-                    print(f"   [WARNING] '{col}' 컬럼 없음 (스킵)")
-    
-    # 집계 대상 컬럼 찾기 (더 구체적인 패턴을 먼저 찾기 위해 순서 중요)
-    value_col_patterns = {
-        '판매금액(TAG가)': ['합계 : 판매금액(TAG가)', '판매금액(TAG가)', 'TAG매출'],
-        # 실판매액(V-)를 먼저 찾아야 함 (실판매액보다 구체적)
-        '실판매액V-': ['합계 : 실판매액(V-)', '실판매액(V-)', '실판매액V-'],
-        # 실판매액은 실판매액(V-)가 아닌 컬럼만 찾아야 함
-        '실판매액': ['합계 : 실판매액', '실판매액'],
-        '출고매출액V-': ['합계 : 출고매출액(V-) Actual', '출고매출액(V-) Actual', '출고매출액V-'],
-        '매출원가(평가감환입)': ['매출원가(평가감환입반영)', '매출원가(평가감환입)', '매출원가'],
-        '매출총이익': ['매출총이익']
-    }
-    
-    available_agg = []
-    used_columns = set()  # 이미 사용된 컬럼 추적
-    
-    for target_name, patterns in value_col_patterns.items():
-        found = False
-        for pattern in patterns:
-            for col in df.columns:
-                if col in used_columns:
-                    continue  # 이미 사용된 컬럼은 건너뛰기
-                    
-                col_str = str(col).strip()
-                
-                # 정확한 매칭 우선
-                if col_str == pattern:
-                    available_agg.append(col)
-                    col_mapping[target_name] = col
-                    used_columns.add(col)
-                    print(f"   '{target_name}' → '{col}' 사용")
-                    found = True
-                    break
-                # 부분 매칭 (더 구체적인 패턴 체크)
-                elif pattern in col_str:
-                    # 실판매액의 경우, 실판매액(V-)가 포함된 컬럼은 제외
-                    if target_name == '실판매액' and ('(V-)' in col_str or 'V-' in col_str):
-                        continue
-                    available_agg.append(col)
-                    col_mapping[target_name] = col
-                    used_columns.add(col)
-                    print(f"   '{target_name}' → '{col}' 사용")
-                    found = True
-                    break
-            if found:
-                break
-        if not found:
-            print(f"   [WARNING] '{target_name}' 컬럼 없음 (스킵)")
-    
-    if not available_groupby:
-        raise ValueError("[ERROR] 집계 기준 컬럼을 찾을 수 없습니다.")
-    
-    if not available_agg:
+    available_levels = {}
+    for name, groupby_cols in levels.items():
+        available_groupby = find_groupby_columns(df, groupby_cols)
+        if not available_groupby:
+            raise ValueError("[ERROR] 집계 기준 컬럼을 찾을 수 없습니다.")
+        available_levels[name] = available_groupby
+    
+    value_map = find_value_columns(df)
+    if not value_map:
         raise ValueError("[ERROR] 집계 대상 컬럼을 찾을 수 없습니다.")
     
-    print(f"   집계 기준 (행): {available_groupby}")
-    print(f"   집계 대상 (값): {len(available_agg)}개 컬럼")
-    
-    # 숫자 컬럼 변환
-    for col in available_agg:
-        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    for name, available_groupby in available_levels.items():
+        print(f"   집계 기준 (행): {available_groupby}")
+    print(f"   집계 대상 (값): {len(value_map)}개 컬럼")
     
-    # 집계 전 원본 행 수
-    before_count = len(df)
+    tables = rollup(df, available_levels, list(value_map.values()))
     
-    # GROUP BY 집계
-    agg_dict = {col: 'sum' for col in available_agg}
-    df_aggregated = df.groupby(available_groupby, as_index=False).agg(agg_dict)
-    
-    # 컬럼명을 사용자가 요청한 이름으로 변경
-    reverse_mapping = {v: k for k, v in col_mapping.items()}
-    df_aggregated.rename(columns=reverse_mapping, inplace=True)
-    
-    # 컬럼 순서 정리 (행 컬럼 + 값 컬럼 순서대로)
-    ordered_cols = []
-    # 집계 기준 컬럼 먼저
-    for col in groupby_cols:
-        if col in df_aggregated.columns:
-            ordered_cols.append(col)
-    # 집계 대상 컬럼 (사용자가 요청한 순서대로)
-    for target_name in ['판매금액(TAG가)', '실판매액', '실판매액V-', '출고매출액V-', '매출원가(평가감환입)', '매출총이익']:
-        if target_name in df_aggregated.columns:
-            ordered_cols.append(target_name)
-    # 나머지 컬럼
-    for col in df_aggregated.columns:
-        if col not in ordered_cols:
-            ordered_cols.append(col)
-    
-    df_aggregated = df_aggregated[ordered_cols]
-    
-    # 집계 후 행 수
-    after_count = len(df_aggregated)
-    
-    print(f"   [OK] 집계 완료: {before_count:,}행 → {after_count:,}행")
-    
-    # 집계 결과 요약
+    # 컬럼명을 사용자가 요청한 이름으로 변경 후 순서 정리
+    reverse_mapping = {v: k for k, v in value_map.items()}
+    result = {}
+    for name, groupby_cols in levels.items():
+        result[name] = order_columns(tables[name].rename(columns=reverse_mapping), groupby_cols)
+        print(f"   [OK] 집계 완료: {len(df):,}행 → {len(result[name]):,}행 ({name})")
+    return result
+
+
+def _print_shop_item_counts(df_aggregated):
+    """Shop_item 브랜드별/채널명별 집계 건수 출력"""
     if '브랜드' in df_aggregated.columns:
         print(f"\n   [INFO] 브랜드별 집계 건수:")
         brand_counts = df_aggregated.groupby('브랜드').size().sort_values(ascending=False)
@@ -1050,7 +859,43 @@ def aggregate_by_requested_fields(df):
         channel_counts = df_aggregated.groupby('채널명').size().sort_values(ascending=False)
         for channel, count in channel_counts.items():
             print(f"      {channel}: {count:,}건")
+
+
+def aggregate_shop_tables(df):
+    """
+    Shop_item / Shop 집계를 한 번에 수행
+    
+    Shop(브랜드, 채널명, 아이템)은 Shop_item(브랜드, 유통코드, 채널명, 아이템) 집계 결과에서
+    다시 집계합니다. (원본 데이터 groupby 1회)
+    
+    Args:
+        df: 원가 계산 필드가 추가된 데이터프레임
+    
+    Returns:
+        tuple: (Shop_item 데이터프레임, Shop 데이터프레임)
+    """
+    print(f"\n[PROCESSING] Shop_item / Shop 집계 시작...")
+    tables = aggregate_levels(df, {'shop_item': SHOP_ITEM_GROUPBY, 'shop': SHOP_GROUPBY})
+    _print_shop_item_counts(tables['shop_item'])
+    return tables['shop_item'], tables['shop']
+
+
+def aggregate_by_requested_fields(df):
+    """
+    매출총이익 필드 추가 후 요청된 기준으로 집계
     
+    행: 브랜드, 유통코드, 채널명, 아이템_중분류, 아이템_소분류, 아이템코드
+    값: 판매금액(TAG가), 실판매액, 실판매액V-, 출고매출액V-, 매출원가(평가감환입), 매출총이익
+    
+    Args:
+        df: 원가 계산 필드가 추가된 데이터프레임
+    
+    Returns:
+        pd.DataFrame: 집계된 데이터프레임
+    """
+    print(f"\n[PROCESSING] 추가 집계 시작 (브랜드, 유통코드, 채널명, 아이템_중분류, 아이템_소분류, 아이템코드)...")
+    df_aggregated = aggregate_levels(df, {'shop_item': SHOP_ITEM_GROUPBY})['shop_item']
+    _print_shop_item_counts(df_aggregated)
     return df_aggregated
 
 
@@ -1068,118 +913,7 @@ def aggregate_by_brand_channel(df):
         pd.DataFrame: 집계된 데이터프레임
     """
     print(f"\n[PROCESSING] 브랜드/채널별 집계 시작...")
-    
-    # 집계 기준 컬럼
-    groupby_cols = [
-        '브랜드',
-        '채널명',
-        '아이템_중분류',
-        '아이템_소분류',
-        '아이템코드'
-    ]
-    
-    # 집계 대상 컬럼 찾기
-    value_col_patterns = {
-        '판매금액(TAG가)': ['합계 : 판매금액(TAG가)', '판매금액(TAG가)', 'TAG매출'],
-        '실판매액V-': ['합계 : 실판매액(V-)', '실판매액(V-)', '실판매액V-'],
-        '실판매액': ['합계 : 실판매액', '실판매액'],
-        '출고매출액V-': ['합계 : 출고매출액(V-) Actual', '출고매출액(V-) Actual', '출고매출액V-'],
-        '매출원가(평가감환입)': ['매출원가(평가감환입반영)', '매출원가(평가감환입)', '매출원가'],
-        '매출총이익': ['매출총이익']
-    }
-    
-    col_mapping = {}
-    used_columns = set()
-    available_agg = []
-    
-    # 집계 기준 컬럼 확인
-    available_groupby = []
-    for col in groupby_cols:
-        if col in df.columns:
-            available_groupby.append(col)
-        else:
-            similar = [c for c in df.columns if col in str(c) or str(c).replace(' ', '').replace('-', '') == col.replace(' ', '').replace('-', '')]
-            if similar:
-                available_groupby.append(similar[0])
-                print(f"   '{col}' → '{similar[0]}' 사용")
-            else:
-                print(f"   [WARNING] '{col}' 컬럼 없음 (스킵)")
-    
-    # 집계 대상 컬럼 찾기
-    for target_name, patterns in value_col_patterns.items():
-        found = False
-        for pattern in patterns:
-            for col in df.columns:
-                if col in used_columns:
-                    continue
-                    
-                col_str = str(col).strip()
-                
-                if col_str == pattern:
-                    available_agg.append(col)
-                    col_mapping[target_name] = col
-                    used_columns.add(col)
-                    print(f"   '{target_name}' → '{col}' 사용")
-                    found = True
-                    break
-                elif pattern in col_str:
-                    if target_name == '실판매액' and ('(V-)' in col_str or 'V-' in col_str):
-                        continue
-                    available_agg.append(col)
-                    col_mapping[target_name] = col
-                    used_columns.add(col)
-                    print(f"   '{target_name}' → '{col}' 사용")
-                    found = True
-                    break
-            if found:
-                break
-        if not found:
-            print(f"   [WARNING] '{target_name}' 컬럼 없음 (스킵)")
-    
-    if not available_groupby:
-        raise ValueError("[ERROR] 집계 기준 컬럼을 찾을 수 없습니다.")
-    
-    if not available_agg:
-        raise ValueError("[ERROR] 집계 대상 컬럼을 찾을 수 없습니다.")
-    
-    print(f"   집계 기준 (행): {available_groupby}")
-    print(f"   집계 대상 (값): {len(available_agg)}개 컬럼")
-    
-    # 숫자 컬럼 변환
-    for col in available_agg:
-        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    
-    # 집계 전 원본 행 수
-    before_count = len(df)
-    
-    # GROUP BY 집계
-    agg_dict = {col: 'sum' for col in available_agg}
-    df_aggregated = df.groupby(available_groupby, as_index=False).agg(agg_dict)
-    
-    # 컬럼명을 사용자가 요청한 이름으로 변경
-    reverse_mapping = {v: k for k, v in col_mapping.items()}
-    df_aggregated.rename(columns=reverse_mapping, inplace=True)
-    
-    # 컬럼 순서 정리
-    ordered_cols = []
-    for col in groupby_cols:
-        if col in df_aggregated.columns:
-            ordered_cols.append(col)
-    for target_name in ['판매금액(TAG가)', '실판매액', '실판매액V-', '출고매출액V-', '매출원가(평가감환입)', '매출총이익']:
-        if target_name in df_aggregated.columns:
-            ordered_cols.append(target_name)
-    for col in df_aggregated.columns:
-        if col not in ordered_cols:
-            ordered_cols.append(col)
-    
-    df_aggregated = df_aggregated[ordered_cols]
-    
-    # 집계 후 행 수
-    after_count = len(df_aggregated)
-    
-    print(f"   [OK] 집계 완료: {before_count:,}행 → {after_count:,}행")
-    
-    return df_aggregated
+    return aggregate_levels(df, {'shop': SHOP_GROUPBY})['shop']
 
 
 # ================================
@@ -1254,9 +988,9 @@ def main():
         df_with_cost = add_cost_calculation_fields(df_processed, jeonganbi_master, evaluation_master, year_month)
         
         # ----------------
-        # Step 7: [2-1차 전처리] 브랜드/채널/아이템별 집계 (Shop_item)
+        # Step 7: [2-1차/2-2차 전처리] 브랜드/채널/아이템별 집계 (Shop_item, Shop 한 번에)
         # ----------------
-        df_shop_item = aggregate_by_requested_fields(df_with_cost)
+        df_shop_item, df_shop = aggregate_shop_tables(df_with_cost)
         
         # ----------------
         # Step 8: [2-1차 전처리] Shop_item 파일 저장
@@ -1267,12 +1001,7 @@ def main():
         print(f"   데이터: {len(df_shop_item)}행 × {len(df_shop_item.columns)}열")
         
         # ----------------
-        # Step 9: [2-2차 전처리] 브랜드/채널별 집계 (Shop)
-        # ----------------
-        df_shop = aggregate_by_brand_channel(df_with_cost)
-        
-        # ----------------
-        # Step 10: [2-2차 전처리] Shop 파일 저장
+        # Step 9: [2-2차 전처리] Shop 파일 저장 (Step 7에서 Shop_item과 함께 집계)
         # ----------------
         shop_output_path = os.path.join(date_output_dir, f"{base_filename}_Shop.csv")
         df_shop.to_csv(shop_output_path, index=False, encoding='utf-8-sig')
@@ -1282,7 +1011,7 @@ def main():
         print(f"\n[DATE_FOLDER] {date_str}")  # 배치 파일에서 날짜 추출용
         
         # ----------------
-        # Step 11: 결과 요약
+        # Step 10: 결과 요약
         # ----------------
         print(f"\n" + "=" * 60)
         print("[REPORT] 처리 결과 요약")
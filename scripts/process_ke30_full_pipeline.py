@@ -54,6 +54,9 @@ if str(scripts_dir) not in sys.path:
 import process_ke30_current_year as process_ke30
 import extract_direct_cost_rates as extract_direct
 import aggregate_direct_costs_by_master as aggregate_direct
+from csv_sink import CsvSink, as_csv_dtypes
+from ke30_rollup import find_groupby_columns, find_value_columns, rollup
+from plan_repository import get_plan_file
 
 # 경로 설정
 KE30_INPUT_DIR = r"C:\ke30"
@@ -160,6 +163,52 @@ def aggregate_direct_costs_by_master(df, direct_cost_master):
     return df
 
 
+# 집계 기준 (채널별/아이템별 = Shop_item, 채널별 = Shop)
+CHANNEL_ITEM_GROUPBY = ['브랜드', '유통채널', '채널명', '아이템_중분류', '아이템_소분류', '아이템코드']
+CHANNEL_GROUPBY = ['브랜드', '유통채널', '채널명']
+
+
+def aggregate_levels(df, levels: Dict[str, List[str]]) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    여러 집계 단위를 한 번에 집계 (매출총이익까지, 직접비는 집계 후 별도 계산)
+    
+    가장 세밀한 단위를 한 번 집계한 뒤 상위 단위는 그 결과에서 다시 집계합니다.
+    값 컬럼은 원래 컬럼명(합계 : 판매금액(TAG가) 등)을 유지합니다.
+    
+    Returns:
+        dict: {단위 이름: 집계된 데이터프레임}, 집계 기준/값 컬럼이 없으면 None
+    """
+    available_levels = {}
+    for name, groupby_cols in levels.items():
+        available_levels[name] = find_groupby_columns(df, groupby_cols)
+    value_cols = list(find_value_columns(df).values())
+    
+    if not all(available_levels.values()) or not value_cols:
+        print("  [ERROR] 집계 기준 또는 값 컬럼을 찾을 수 없습니다.")
+        return None
+    
+    tables = rollup(df, available_levels, value_cols)
+    for name, table in tables.items():
+        print(f"  [OK] 집계 완료: {len(table)}행 ({name})")
+    return tables
+
+
+def aggregate_shop_tables(df, plan_dir: str = None, channel_master: Dict[str, int] = None):
+    """
+    채널별/아이템별(Shop_item)과 채널별(Shop) 집계를 한 번에 수행
+    
+    채널별 집계는 채널별/아이템별 집계 결과에서 다시 집계하고, 평가감설정 행을 추가합니다.
+    
+    Returns:
+        tuple: (채널별/아이템별 데이터프레임, 채널별 데이터프레임)
+    """
+    print("\n[채널별/아이템별 + 채널별 집계] 집계 중...")
+    tables = aggregate_levels(df, {'shop_item': CHANNEL_ITEM_GROUPBY, 'shop': CHANNEL_GROUPBY})
+    if tables is None:
+        return df, df
+    return tables['shop_item'], add_evaluation_setting(tables['shop'], plan_dir, channel_master)
+
+
 def aggregate_by_channel_item(df):
     """
     채널별/아이템별 집계 (매출총이익까지)
@@ -169,83 +218,8 @@ def aggregate_by_channel_item(df):
     (직접비는 집계 후 별도 계산)
     """
     print("\n[채널별/아이템별 집계] 집계 중...")
-    
-    # 집계 기준 컬럼
-    groupby_cols = ['브랜드', '유통채널', '채널명', '아이템_중분류', '아이템_소분류', '아이템코드']
-    
-    # 집계 기준 컬럼 확인
-    available_groupby = []
-    for col in groupby_cols:
-        if col in df.columns:
-            available_groupby.append(col)
-        else:
-            print(f"  [WARNING] '{col}' 컬럼 없음 (스킵)")
-    
-    # 집계 대상 컬럼 (직접비 제외, 매출총이익까지만)
-    value_cols = [
-        '합계 : 판매금액(TAG가)', '합계 : 실판매액', '합계 : 실판매액(V-)',
-        '합계 : 출고매출액(V-) Actual', '매출원가(평가감환입반영)', '매출총이익'
-    ]
-    
-    # 직접비 관련 컬럼은 제외 (집계 후 별도 계산)
-    
-    # 실제 존재하는 컬럼만 사용
-    available_value_cols = []
-    processed_cols = set()  # 이미 처리된 컬럼 추적
-    
-    for col in value_cols:
-        found = False
-        # 1단계: 정확히 일치하는 컬럼 찾기
-        if col in df.columns and col not in processed_cols:
-            available_value_cols.append(col)
-            processed_cols.add(col)
-            found = True
-        else:
-            # 2단계: 유사한 컬럼명 찾기
-            # 실판매액의 경우 두 컬럼을 모두 포함
-            if col == '합계 : 실판매액':
-                # '합계 : 실판매액'과 '합계 : 실판매액(V-)' 모두 찾기
-                if '합계 : 실판매액' in df.columns and '합계 : 실판매액' not in processed_cols:
-                    available_value_cols.append('합계 : 실판매액')
-                    processed_cols.add('합계 : 실판매액')
-                    found = True
-                if '합계 : 실판매액(V-)' in df.columns and '합계 : 실판매액(V-)' not in processed_cols:
-                    available_value_cols.append('합계 : 실판매액(V-)')
-                    processed_cols.add('합계 : 실판매액(V-)')
-                    found = True
-            elif col == '합계 : 실판매액(V-)':
-                # 이미 '합계 : 실판매액'에서 처리했을 수 있으므로 확인
-                if '합계 : 실판매액(V-)' in df.columns and '합계 : 실판매액(V-)' not in processed_cols:
-                    available_value_cols.append('합계 : 실판매액(V-)')
-                    processed_cols.add('합계 : 실판매액(V-)')
-                    found = True
-            else:
-                # 다른 컬럼은 유사한 컬럼명 찾기
-                best_match = None
-                for df_col in df.columns:
-                    if (col in str(df_col) or str(df_col) in col) and df_col not in processed_cols:
-                        if best_match is None or len(str(df_col)) > len(str(best_match)):
-                            best_match = df_col
-                            found = True
-                if found and best_match:
-                    available_value_cols.append(best_match)
-                    processed_cols.add(best_match)
-        
-        if not found:
-            # 직접비 관련 컬럼은 제외 (집계 후 별도 계산)
-            pass
-    
-    if not available_groupby or not available_value_cols:
-        print("  [ERROR] 집계 기준 또는 값 컬럼을 찾을 수 없습니다.")
-        return df
-    
-    # 집계 실행
-    agg_dict = {col: 'sum' for col in available_value_cols}
-    df_aggregated = df.groupby(available_groupby, as_index=False).agg(agg_dict)
-    
-    print(f"  [OK] 집계 완료: {len(df_aggregated)}행")
-    
-    return df_aggregated
+    tables = aggregate_levels(df, {'shop_item': CHANNEL_ITEM_GROUPBY})
+    return df if tables is None else tables['shop_item']
 
 
 def calculate_analysis_month_from_update_date(update_date_str: str) -> str:
@@ -325,7 +299,10 @@ def extract_evaluation_setting(plan_dir: str, channel_master: Dict[str, int]) ->
         filename = os.path.basename(filepath)
         
         try:
-            df, channels, brand_code = extract_direct.read_plan_file(filepath)
+            plan_file = get_plan_file(filepath)
+            df = plan_file.wide()
+            channels = plan_file.channels
+            brand_code = extract_direct.plan_brand_code(filepath, plan_file)
             
             # Unassigned 컬럼 찾기
             unassigned_col = None
@@ -341,8 +318,7 @@ def extract_evaluation_setting(plan_dir: str, channel_master: Dict[str, int]) ->
             # 재고평가감_설정 또는 재고자산평가_설정 행 찾기
             evaluation_row_idx = None
             evaluation_row_name = None
-            for idx, row in df.iterrows():
-                row_str = str(row["구분"]).strip()
+            for idx, row_str in df["구분"].items():
                 if "재고평가감_설정" in row_str or "재고평가감 설정" in row_str:
                     evaluation_row_idx = idx
                     evaluation_row_name = "재고평가감_설정"
@@ -410,128 +386,61 @@ def aggregate_by_channel(df, plan_dir: str = None, channel_master: Dict[str, int
         channel_master: 채널 마스터 매핑 (평가감설정 추출용)
     """
     print("\n[채널별 집계] 집계 중...")
-    
-    # 집계 기준 컬럼
-    groupby_cols = ['브랜드', '유통채널', '채널명']
-    
-    # 집계 기준 컬럼 확인
-    available_groupby = []
-    for col in groupby_cols:
-        if col in df.columns:
-            available_groupby.append(col)
-        else:
-            print(f"  [WARNING] '{col}' 컬럼 없음 (스킵)")
-    
-    # 집계 대상 컬럼 (직접비 제외, 매출총이익까지만)
-    value_cols = [
-        '합계 : 판매금액(TAG가)', '합계 : 실판매액', '합계 : 실판매액(V-)',
-        '합계 : 출고매출액(V-) Actual', '매출원가(평가감환입반영)', '매출총이익'
-    ]
-    
-    # 직접비 관련 컬럼은 제외 (집계 후 별도 계산)
-    
-    # 실제 존재하는 컬럼만 사용
-    available_value_cols = []
-    processed_cols = set()  # 이미 처리된 컬럼 추적
-    
-    for col in value_cols:
-        found = False
-        # 1단계: 정확히 일치하는 컬럼 찾기
-        if col in df.columns and col not in processed_cols:
-            available_value_cols.append(col)
-            processed_cols.add(col)
-            found = True
-        else:
-            # 2단계: 유사한 컬럼명 찾기
-            # 실판매액의 경우 두 컬럼을 모두 포함
-            if col == '합계 : 실판매액':
-                # '합계 : 실판매액'과 '합계 : 실판매액(V-)' 모두 찾기
-                if '합계 : 실판매액' in df.columns and '합계 : 실판매액' not in processed_cols:
-                    available_value_cols.append('합계 : 실판매액')
-                    processed_cols.add('합계 : 실판매액')
-                    found = True
-                if '합계 : 실판매액(V-)' in df.columns and '합계 : 실판매액(V-)' not in processed_cols:
-                    available_value_cols.append('합계 : 실판매액(V-)')
-                    processed_cols.add('합계 : 실판매액(V-)')
-                    found = True
-            elif col == '합계 : 실판매액(V-)':
-                # 이미 '합계 : 실판매액'에서 처리했을 수 있으므로 확인
-                if '합계 : 실판매액(V-)' in df.columns and '합계 : 실판매액(V-)' not in processed_cols:
-                    available_value_cols.append('합계 : 실판매액(V-)')
-                    processed_cols.add('합계 : 실판매액(V-)')
-                    found = True
-            else:
-                # 다른 컬럼은 유사한 컬럼명 찾기
-                best_match = None
-                for df_col in df.columns:
-                    if (col in str(df_col) or str(df_col) in col) and df_col not in processed_cols:
-                        if best_match is None or len(str(df_col)) > len(str(best_match)):
-                            best_match = df_col
-                            found = True
-                if found and best_match:
-                    available_value_cols.append(best_match)
-                    processed_cols.add(best_match)
-        
-        if not found:
-            # 직접비 관련 컬럼은 제외 (집계 후 별도 계산)
-            pass
-    
-    if not available_groupby or not available_value_cols:
-        print("  [ERROR] 집계 기준 또는 값 컬럼을 찾을 수 없습니다.")
+    tables = aggregate_levels(df, {'shop': CHANNEL_GROUPBY})
+    if tables is None:
         return df
+    return add_evaluation_setting(tables['shop'], plan_dir, channel_master)
+
+
+def add_evaluation_setting(df_aggregated, plan_dir: str = None, channel_master: Dict[str, int] = None):
+    """
+    채널별 집계 결과에 평가감설정 행 추가 (계획 파일에서 추출, 집계 컬럼 외 값은 공란)
     
-    # 집계 실행
-    agg_dict = {col: 'sum' for col in available_value_cols}
-    df_aggregated = df.groupby(available_groupby, as_index=False).agg(agg_dict)
-    
-    print(f"  [OK] 집계 완료: {len(df_aggregated)}행")
-    
-    # 평가감설정 추가
-    if plan_dir and channel_master:
-        print("\n[평가감설정 추가] 계획 파일에서 평가감설정 추출 중...")
-        evaluation_df = extract_evaluation_setting(plan_dir, channel_master)
-        
-        if not evaluation_df.empty:
-            # 평가감설정 행을 위한 빈 컬럼 생성 (나머지 컬럼은 공란/NaN)
-            for col in available_value_cols:
-                if col not in evaluation_df.columns:
-                    evaluation_df[col] = None  # 공란으로 설정
-            
-            # 집계 결과와 평가감설정 합치기
-            # 컬럼 순서 맞추기 (중복 제거)
-            all_cols = list(dict.fromkeys(available_groupby + available_value_cols))
-            
-            # evaluation_df에 없는 컬럼 추가
-            for col in all_cols:
-                if col not in evaluation_df.columns:
-                    evaluation_df[col] = None
-            
-            # df_aggregated에 없는 컬럼 추가
-            for col in all_cols:
-                if col not in df_aggregated.columns:
-                    df_aggregated[col] = None
-            
-            # 컬럼 순서 맞추기
-            evaluation_df = evaluation_df[all_cols]
-            df_aggregated = df_aggregated[all_cols]
-            
-            # 합치기
-            df_aggregated = pd.concat([df_aggregated, evaluation_df], ignore_index=True)
-            print(f"  [OK] 평가감설정 추가 완료: {len(evaluation_df)}건")
-        else:
-            print("  [WARNING] 평가감설정을 추출할 수 없습니다.")
-    
+    Args:
+        df_aggregated: 채널별 집계 데이터프레임
+        plan_dir: 계획 파일 디렉토리
+        channel_master: 채널 마스터 매핑
+    """
+    if not (plan_dir and channel_master):
+        return df_aggregated
+    
+    print("\n[평가감설정 추가] 계획 파일에서 평가감설정 추출 중...")
+    evaluation_df = extract_evaluation_setting(plan_dir, channel_master)
+    
+    if evaluation_df.empty:
+        print("  [WARNING] 평가감설정을 추출할 수 없습니다.")
+        return df_aggregated
+    
+    # 평가감설정 행을 위한 빈 컬럼 생성 (나머지 컬럼은 공란/NaN), 컬럼 순서는 집계 결과 기준
+    all_cols = list(df_aggregated.columns)
+    for col in all_cols:
+        if col not in evaluation_df.columns:
+            evaluation_df[col] = None
+    evaluation_df = evaluation_df[all_cols]
+    
+    # 집계 결과와 평가감설정 합치기
+    df_aggregated = pd.concat([df_aggregated, evaluation_df], ignore_index=True)
+    print(f"  [OK] 평가감설정 추가 완료: {len(evaluation_df)}건")
     return df_aggregated
 
 
-def main(analysis_month=None, update_date=None):
+def main(analysis_month=None, update_date=None, sink: CsvSink = None):
     """
     메인 실행 함수
     
     Args:
         analysis_month: YYYYMM 형식의 분석월 (지정된 경우)
         update_date: YYYYMMDD 형식의 업데이트일자 (지정된 경우)
+        sink: 중간 결과 저장소 (None이면 즉시 저장). 지연 모드 sink를 넘기면
+              호출측에서 flush()할 때 CSV를 저장하고, 다음 단계는 sink.read()로
+              CSV 재파싱 없이 결과를 받습니다.
+    
+    Returns:
+        dict: update_date, analysis_month, shop_path, shop_item_path
     """
+    if sink is None:
+        sink = CsvSink()
+    
     print("=" * 80)
     print("KE30 전체 전처리 파이프라인 시작")
     print("=" * 80)
@@ -632,88 +541,39 @@ def main(analysis_month=None, update_date=None):
     
     # 전처리 완료 파일 저장
     preprocessed_output_path = date_output_dir / f"{base_filename}_전처리완료.csv"
-    df_with_cost.to_csv(preprocessed_output_path, index=False, encoding='utf-8-sig')
-    print(f"\n[OK] [전체 전처리] 파일 저장: {preprocessed_output_path}")
-    print(f"   데이터: {len(df_with_cost)}행 × {len(df_with_cost.columns)}열")
+    sink.write(df_with_cost, preprocessed_output_path, "[전체 전처리]")
     
     # ==========================================
-    # Step 4: [채널별/아이템별 전처리] 집계 (매출총이익까지)
+    # Step 4~5: [채널별/아이템별 전처리] + [채널별 전처리] 집계 (매출총이익까지)
     # ==========================================
-    print("\n[4단계] [채널별/아이템별 전처리] 집계 (매출총이익까지)...")
-    df_shop_item = aggregate_by_channel_item(df_with_cost)
+    # 채널별 집계는 채널별/아이템별 집계 결과에서 파생 (원본 groupby 1회)
+    print("\n[4~5단계] [채널별/아이템별 전처리] + [채널별 전처리] 집계 (매출총이익까지)...")
+    df_shop_item, df_shop = aggregate_shop_tables(df_with_cost, str(plan_dir), channel_master_for_direct_cost)
     
     shop_item_output_path = date_output_dir / f"{base_filename}_Shop_item.csv"
-    df_shop_item.to_csv(shop_item_output_path, index=False, encoding='utf-8-sig')
-    print(f"\n[OK] [채널별/아이템별 전처리] 파일 저장: {shop_item_output_path}")
-    print(f"   데이터: {len(df_shop_item)}행 × {len(df_shop_item.columns)}열")
-    
-    # ==========================================
-    # Step 5: [채널별 전처리] 집계 (매출총이익까지)
-    # ==========================================
-    print("\n[5단계] [채널별 전처리] 집계 (매출총이익까지)...")
-    df_shop = aggregate_by_channel(df_with_cost, str(plan_dir), channel_master_for_direct_cost)
+    sink.write(df_shop_item, shop_item_output_path, "[채널별/아이템별 전처리]")
     
+    # 직접비 계산 후 한 번만 저장 (6단계로 메모리 전달)
     shop_output_path = date_output_dir / f"{base_filename}_Shop.csv"
-    df_shop.to_csv(shop_output_path, index=False, encoding='utf-8-sig')
-    print(f"\n[OK] [채널별 전처리] 파일 저장: {shop_output_path}")
-    print(f"   데이터: {len(df_shop)}행 × {len(df_shop.columns)}열")
+    print(f"\n[OK] [채널별 전처리] 집계 완료: {len(df_shop)}행 × {len(df_shop.columns)}열")
     
     # ==========================================
     # Step 6: [직접비 계산] 집계된 데이터에 직접비 계산 및 직접이익 계산
     # ==========================================
     print("\n[6단계] [직접비 계산] 집계된 데이터에 직접비 계산 및 직접이익 계산...")
     
-    # 직접비율 파일 경로 (분석월 포함)
-    rates_output_path = plan_dir / f"{analysis_month}R_직접비율_추출결과.csv"
-    
-    # 직접비율 및 계획 금액 추출
-    if rates_output_path.exists():
-        print(f"  [INFO] 기존 직접비율 파일 발견: {rates_output_path}")
-        print(f"  [INFO] 기존 파일 재사용 중 (계획 파일 재계산 생략)...")
-        rates_pivoted_df = pd.read_csv(rates_output_path, encoding='utf-8-sig')
-        print(f"  [OK] 기존 직접비율 파일 로드 완료")
-        
-        # 직접비율 파일이 있으면 rates_df와 plan_amounts_df도 별도 파일에서 로드 시도
-        # rates_df 파일 경로
-        rates_df_path = plan_dir / f"{analysis_month}R_직접비율_상세.csv"
-        plan_amounts_path = plan_dir / f"{analysis_month}R_직접비금액_상세.csv"
-        
-        if rates_df_path.exists() and plan_amounts_path.exists():
-            print(f"  [INFO] 기존 상세 데이터 파일 발견, 재사용 중...")
-            rates_df = pd.read_csv(rates_df_path, encoding='utf-8-sig')
-            plan_amounts_df = pd.read_csv(plan_amounts_path, encoding='utf-8-sig')
-            print(f"  [OK] 기존 상세 데이터 파일 로드 완료 (계획 파일 재계산 생략)")
-        else:
-            # 상세 파일이 없으면 계획 파일에서 추출 (하위 호환성)
-            print(f"  [INFO] 상세 데이터 파일이 없어 계획 파일에서 추출합니다...")
-            plan_amounts_df = extract_direct.extract_plan_amounts(str(plan_dir), channel_master_for_direct_cost)
-            rates_df = extract_direct.extract_direct_cost_rates(str(plan_dir), channel_master_for_direct_cost)
-    else:
-        # 기존 파일이 없으면 추출 및 저장
-        print(f"  [INFO] 직접비율 파일이 없어 계획 파일에서 새로 추출합니다...")
-        plan_amounts_df = extract_direct.extract_plan_amounts(str(plan_dir), channel_master_for_direct_cost)
-        rates_df = extract_direct.extract_direct_cost_rates(str(plan_dir), channel_master_for_direct_cost)
-        rates_pivoted_df = extract_direct.pivot_and_format_rates(rates_df, channel_master_for_direct_cost)
-        
-        # 직접비율 파일 저장
-        rates_output_path.parent.mkdir(parents=True, exist_ok=True)
-        rates_pivoted_df.to_csv(rates_output_path, index=False, encoding='utf-8-sig')
-        print(f"  [OK] 직접비율 파일 저장: {rates_output_path}")
-        
-        # 상세 데이터도 저장 (다음 실행 시 재사용)
-        rates_df_path = plan_dir / f"{analysis_month}R_직접비율_상세.csv"
-        plan_amounts_path = plan_dir / f"{analysis_month}R_직접비금액_상세.csv"
-        rates_df.to_csv(rates_df_path, index=False, encoding='utf-8-sig')
-        plan_amounts_df.to_csv(plan_amounts_path, index=False, encoding='utf-8-sig')
-        print(f"  [OK] 상세 데이터 파일 저장: {rates_df_path.name}, {plan_amounts_path.name}")
+    # 직접비율 및 계획 금액 (계획 파일/마스터 해시 기반 캐시, 바뀐 브랜드만 재추출)
+    rates_df, plan_amounts_df, rates_pivoted_df = extract_direct.load_direct_cost_tables_cached(
+        plan_dir, analysis_month, channel_master_for_direct_cost
+    )
     
     # 채널/아이템별 집계 데이터는 직접비 계산 제외 (매출총이익까지만)
     print("\n  [채널/아이템별 집계 데이터] 직접비 계산 제외 (매출총이익까지만 유지)")
     
     # 채널별 집계 데이터에 직접비 계산 적용
     print("\n  [채널별 집계 데이터에 직접비 계산 적용]")
-    df_shop_with_costs = extract_direct.apply_direct_costs_to_ke30(
-        str(shop_output_path),
+    df_shop_with_costs = extract_direct.apply_direct_costs(
+        as_csv_dtypes(df_shop),
         rates_df,
         plan_amounts_df,
         royalty_master
@@ -732,7 +592,7 @@ def main(analysis_month=None, update_date=None):
         df_shop_with_costs['직접이익'] = 0
     
     # 채널별 파일 저장
-    df_shop_with_costs.to_csv(shop_output_path, index=False, encoding='utf-8-sig')
+    sink.write(df_shop_with_costs, shop_output_path, "[채널별 전처리]")
     print(f"  [OK] 채널별 직접비 계산 완료: {len(df_shop_with_costs)}행")
     
     print(f"\n[OK] [직접비 계산] 완료")
@@ -768,8 +628,15 @@ def main(analysis_month=None, update_date=None):
     print(f"  1. {preprocessed_output_path}")
     print(f"  2. {shop_item_output_path}")
     print(f"  3. {shop_output_path}")
-    print(f"  4. {rates_output_path}")
+    print(f"  4. {plan_dir / f'{analysis_month}R_직접비율_추출결과.csv'}")
     print(f"  5. {metadata_path}")
+    
+    return {
+        "update_date": date_str,
+        "analysis_month": analysis_month,
+        "shop_path": shop_output_path,
+        "shop_item_path": shop_item_output_path
+    }
 
 
 if __name__ == "__main__":
@@ -42,6 +42,9 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
 from path_utils import get_plan_dir, get_plan_file_path
+from plan_repository import get_plan_file
+from master_registry import channel_sap_to_name, direct_cost_categories
+from plan_table import save_plan_table
 
 ROOT = os.path.dirname(os.path.dirname(__file__))
 MASTER_DIR = os.path.join(ROOT, "Master")
@@ -58,69 +61,73 @@ BRAND_CODE_MAP = {
     'X': 'X'
 }
 
+# 천단위 콤마가 필요한 컬럼 목록
+PLAN_COMMA_COLUMNS = [
+    "TAG가 [v+]",
+    "실판매액 [v+]",
+    "실판매액 [v-]",
+    "수수료차감매출 [v-]",
+    "매출(출고)",
+    "매출원가(환입후)",  # "매출원가"에서 변경
+    "재고평가감_환입",
+    "재고평가감_설정",
+    "재고자산평가",
+    "재고자산평가_설정",
+    "재고자산평가_환입",
+    "매출총이익",
+    "인건비",
+    "물류운송비",
+    "로열티",
+    "임차관리비",
+    "감가상각비",
+    "기타",
+    "직접비",
+    "직접이익",
+    "영업비",
+    "영업이익",
+    # 직접비 세부 항목들
+    "지급수수료_중간관리수수료",
+    "지급수수료_중간관리수수료(직영)",
+    "지급수수료_판매사원도급비(직영)",
+    "지급수수료_판매사원도급비(면세)",
+    "지급수수료_물류용역비",
+    "지급수수료_물류운송비",
+    "지급수수료_이천보관료",
+    "지급수수료_카드수수료",
+    "지급수수료_온라인위탁판매수수료",
+    "지급수수료_로열티",
+    "지급임차료_매장(변동)",
+    "지급임차료_매장(고정)",
+    "지급임차료_관리비",
+    "감가상각비_임차시설물"
+]
+
+# 소숫점 한자리까지 표시할 컬럼 목록
+PLAN_DECIMAL_COLUMNS = [
+    "할인율(%)",
+    "출고율(%)",
+    "매출원가율(%)",
+    "직접제조원가율(%)",
+    "매출총이익율(%)",
+    "직접이익율(%)",
+    "영업이익율(%)"
+]
+
 def load_channel_master() -> Dict[str, str]:
-    """채널마스터 파일 로드: 채널sap(C열) -> 채널명(B열) 매핑"""
+    """채널마스터 파일 로드: 채널sap(C열) -> 채널명(B열) 매핑 (master_registry 캐시 사용)"""
     if not os.path.exists(CHANNEL_MASTER_PATH):
         raise FileNotFoundError(f"[ERROR] 채널마스터 파일이 없습니다: {CHANNEL_MASTER_PATH}")
     
-    df = pd.read_csv(CHANNEL_MASTER_PATH, encoding="utf-8-sig")
-    
-    # 컬럼 찾기
-    name_col = None  # B열: 채널명
-    sap_col = None   # C열: 채널sap
-    
-    for col in df.columns:
-        col_str = str(col).strip()
-        if name_col is None and ("채널명" in col_str and "sap" not in col_str.lower()):
-            name_col = col
-        if sap_col is None and ("채널sap" in col_str or ("sap" in col_str.lower() and "채널" in col_str)):
-            sap_col = col
-    
-    if name_col is None or sap_col is None:
-        raise ValueError(f"[ERROR] 채널마스터 컬럼을 찾을 수 없습니다. 현재 컬럼: {list(df.columns)}")
-    
-    mapping = {}
-    for _, row in df[[name_col, sap_col]].dropna().iterrows():
-        sap = str(row[sap_col]).strip()
-        name = str(row[name_col]).strip()
-        if sap and name:
-            mapping[sap] = name
-    
+    mapping = channel_sap_to_name(CHANNEL_MASTER_PATH)
     print(f"[OK] 채널마스터 로드: {len(mapping)}개 매핑")
     return mapping
 
 def load_direct_cost_master() -> Dict[str, str]:
-    """직접비 마스터 파일 로드: 계정명 -> 계정전환 매핑"""
+    """직접비 마스터 파일 로드: 계정명 -> 계정전환 매핑 (master_registry 캐시 사용)"""
     if not os.path.exists(DIRECT_COST_MASTER_PATH):
         raise FileNotFoundError(f"[ERROR] 직접비 마스터 파일이 없습니다: {DIRECT_COST_MASTER_PATH}")
     
-    df = pd.read_csv(DIRECT_COST_MASTER_PATH, encoding="utf-8-sig")
-    
-    # 컬럼 찾기
-    account_col = None
-    conversion_col = None
-    
-    for col in df.columns:
-        col_str = str(col).strip()
-        if account_col is None and ("계정명" in col_str or "세부" in col_str):
-            account_col = col
-        if conversion_col is None and ("계정전환" in col_str or "대분류" in col_str):
-            conversion_col = col
-    
-    if account_col is None or conversion_col is None:
-        # 기본값: 첫 번째와 두 번째 컬럼
-        if len(df.columns) >= 2:
-            account_col, conversion_col = df.columns[0], df.columns[1]
-        else:
-            raise ValueError(f"[ERROR] 직접비 마스터 컬럼을 찾을 수 없습니다. 현재 컬럼: {list(df.columns)}")
-    
-    mapping = {}
-    for _, row in df[[account_col, conversion_col]].dropna().iterrows():
-        account = str(row[account_col]).strip()
-        conversion = str(row[conversion_col]).strip()
-        if account and conversion:
-            mapping[account] = conversion
-    
+    mapping = direct_cost_categories(DIRECT_COST_MASTER_PATH)
     print(f"[OK] 직접비 마스터 로드: {len(mapping)}개 매핑")
     return mapping
 
@@ -153,42 +160,19 @@ def is_rf_file(filename: str) -> bool:
     return "RF" in filename.upper()
 
 def read_plan_csv(filepath: str) -> tuple[pd.DataFrame, List[str], str, str]:
-    """계획 CSV 파일 읽기 (와이드 포맷)"""
-    df = pd.read_csv(filepath, encoding="utf-8-sig", header=None)
-    
-    # 첫 3행이 헤더 정보 (브랜드, Version, 채널)
-    if len(df) < 3:
-        raise ValueError(f"[ERROR] 파일 형식이 올바르지 않습니다: {filepath}")
-    
-    # 브랜드 코드 추출 (1행)
-    brand_row = df.iloc[0]
-    brand_code = None
-    for val in brand_row.values[1:]:  # 첫 번째 컬럼 제외
-        if pd.notna(val) and str(val).strip() in BRAND_CODE_MAP:
-            brand_code = str(val).strip()
-            break
+    """계획 CSV 파일 읽기 (와이드 포맷, plan_repository 캐시 사용)"""
+    plan_file = get_plan_file(filepath)
     
+    # 브랜드 코드 (1행, 없으면 파일명에서 추출)
+    brand_code = plan_file.brand_code
     if not brand_code:
         brand_code = detect_brand_from_filename(os.path.basename(filepath)) or "UNKNOWN"
     
-    # Version 추출 (2행)
-    version_row = df.iloc[1]
-    version = str(version_row.iloc[1]) if len(version_row) > 1 else "F11_2025_R"
-    
-    # 채널명 추출 (3행)
-    channel_row = df.iloc[2]
-    channels = [str(val).strip() if pd.notna(val) else "" for val in channel_row.values[1:]]
-    
-    # 데이터 부분 (4행부터)
-    data_df = df.iloc[3:].copy()
-    # 같은 이름의 컬럼이 여러 개 있을 수 있으므로, 인덱스 기반으로 접근할 수 있도록 처리
-    # 컬럼명을 설정하되, 같은 이름이 여러 개 있어도 모두 유지
-    data_df.columns = ["구분"] + channels
+    version = plan_file.version
+    channels = list(plan_file.channels)
     
-    # 구분 컬럼 정리
-    data_df["구분"] = data_df["구분"].astype(str).str.strip()
-    data_df = data_df[data_df["구분"].notna() & (data_df["구분"] != "")]
-    data_df = data_df.reset_index(drop=True)
+    # 데이터 부분 (4행부터, 같은 이름의 채널 컬럼도 모두 유지)
+    data_df = plan_file.wide()
     
     # 브랜드와 Version 추가
     data_df["브랜드"] = brand_code
@@ -549,6 +533,55 @@ def pivot_data(df: pd.DataFrame, channels: List[str], channel_map: Dict[str, str
     return result_df, column_order
 
 
+def round_plan_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    계획 데이터 숫자 정리 (format_plan_data와 같은 반올림, 숫자형 유지)
+    
+    1. 금액 필드: 정수 반올림
+    2. 비율 필드: 소숫점 한자리 반올림
+    
+    typed 계획 파일(plan_table)에 저장되며, format_plan_data()로 사람용 CSV를 만듭니다.
+    
+    Args:
+        df: 데이터프레임
+    
+    Returns:
+        pd.DataFrame: 숫자형 데이터프레임 (변환할 수 없는 값은 원래 값 유지)
+    """
+    df_result = df.copy()
+    
+    def to_number(x):
+        if isinstance(x, str):
+            return float(x.replace(",", "").replace("%", "").strip())
+        return float(x)
+    
+    def round_amount(x):
+        if pd.isna(x):
+            return x
+        try:
+            return float(int(round(to_number(x))))
+        except (ValueError, TypeError):
+            return x
+    
+    def round_rate(x):
+        if pd.isna(x):
+            return x
+        try:
+            return round(to_number(x), 1)
+        except (ValueError, TypeError):
+            return x
+    
+    for col in PLAN_COMMA_COLUMNS:
+        if col in df_result.columns:
+            df_result[col] = df_result[col].apply(round_amount)
+    
+    for col in PLAN_DECIMAL_COLUMNS:
+        if col in df_result.columns:
+            df_result[col] = df_result[col].apply(round_rate)
+    
+    return df_result
+
+
 def format_plan_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     계획 데이터 포맷팅
@@ -564,60 +597,8 @@ def format_plan_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     df_result = df.copy()
     
-    # 천단위 콤마가 필요한 컬럼 목록
-    comma_columns = [
-        "TAG가 [v+]",
-        "실판매액 [v+]",
-        "실판매액 [v-]",
-        "수수료차감매출 [v-]",
-        "매출(출고)",
-        "매출원가(환입후)",  # "매출원가"에서 변경
-        "재고평가감_환입",
-        "재고평가감_설정",
-        "재고자산평가",
-        "재고자산평가_설정",
-        "재고자산평가_환입",
-        "매출총이익",
-        "인건비",
-        "물류운송비",
-        "로열티",
-        "임차관리비",
-        "감가상각비",
-        "기타",
-        "직접비",
-        "직접이익",
-        "영업비",
-        "영업이익",
-        # 직접비 세부 항목들
-        "지급수수료_중간관리수수료",
-        "지급수수료_중간관리수수료(직영)",
-        "지급수수료_판매사원도급비(직영)",
-        "지급수수료_판매사원도급비(면세)",
-        "지급수수료_물류용역비",
-        "지급수수료_물류운송비",
-        "지급수수료_이천보관료",
-        "지급수수료_카드수수료",
-        "지급수수료_온라인위탁판매수수료",
-        "지급수수료_로열티",
-        "지급임차료_매장(변동)",
-        "지급임차료_매장(고정)",
-        "지급임차료_관리비",
-        "감가상각비_임차시설물"
-    ]
-    
-    # 소숫점 한자리까지 표시할 컬럼 목록
-    decimal_columns = [
-        "할인율(%)",
-        "출고율(%)",
-        "매출원가율(%)",
-        "직접제조원가율(%)",
-        "매출총이익율(%)",
-        "직접이익율(%)",
-        "영업이익율(%)"
-    ]
-    
     # 천단위 콤마 적용
-    for col in comma_columns:
+    for col in PLAN_COMMA_COLUMNS:
         if col in df_result.columns:
             def format_with_comma(x):
                 if pd.isna(x):
@@ -637,7 +618,7 @@ def format_plan_data(df: pd.DataFrame) -> pd.DataFrame:
             df_result[col] = df_result[col].apply(format_with_comma)
     
     # 소숫점 한자리까지 표시
-    for col in decimal_columns:
+    for col in PLAN_DECIMAL_COLUMNS:
         if col in df_result.columns:
             def format_decimal(x):
                 if pd.isna(x):
@@ -947,8 +928,14 @@ def filter_rows(df: pd.DataFrame) -> pd.DataFrame:
     
     return filtered_df
 
-def process_plan_files(year_month: str) -> pd.DataFrame:
-    """계획 파일들 처리 및 통합"""
+def process_plan_files(year_month: str, formatted: bool = True) -> pd.DataFrame:
+    """
+    계획 파일들 처리 및 통합
+    
+    Args:
+        year_month: YYYYMM 형식의 분석월
+        formatted: True면 사람용 문자열 포맷(format_plan_data), False면 숫자형(round_plan_data)
+    """
     plan_dir = get_plan_dir(year_month)
     
     if not os.path.exists(plan_dir):
@@ -1374,6 +1361,11 @@ def process_plan_files(year_month: str) -> pd.DataFrame:
     final_df = recalculate_ratios(final_df)
     print(f"[OK] 비율 필드 재계산 완료")
     
+    # 숫자 반올림 (금액 정수, 비율 소숫점 한자리)
+    final_df = round_plan_data(final_df)
+    if not formatted:
+        return final_df
+    
     # 데이터 포맷팅 (천단위 콤마, 소숫점 한자리)
     print(f"[INFO] 데이터 포맷팅 중...")
     final_df = format_plan_data(final_df)
@@ -1450,8 +1442,13 @@ def main():
     print(f"분석월: {year_month}")
     
     try:
-        # 파일 처리
-        result_df = process_plan_files(year_month)
+        # 파일 처리 (숫자형 결과)
+        typed_df = process_plan_files(year_month, formatted=False)
+        
+        # 사람용 CSV (천단위 콤마, 소숫점 한자리)
+        print(f"[INFO] 데이터 포맷팅 중...")
+        result_df = format_plan_data(typed_df)
+        print(f"[OK] 데이터 포맷팅 완료")
         
         # 저장
         output_path = get_plan_file_path(year_month)
@@ -1460,6 +1457,10 @@ def main():
         result_df.to_csv(output_path, index=False, encoding="utf-8-sig")
         
         print(f"[OK] 저장 완료: {output_path}")
+        
+        # 후속 단계용 숫자형 파일 (콤마 문자열 재파싱 없이 사용)
+        typed_path = save_plan_table(typed_df, output_path)
+        print(f"[OK] 숫자형 저장 완료: {typed_path}")
         print(f"[OK] 총 {len(result_df)}행, {len(result_df.columns)}컬럼")
         
     except Exception as e:
@@ -31,6 +31,7 @@
 수정일: 2025-11-21
 """
 
+import numpy as np
 import pandas as pd
 import os
 import sys
@@ -42,6 +43,11 @@ from dotenv import load_dotenv
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+scripts_dir = project_root / "scripts"
+if str(scripts_dir) not in sys.path:
+    sys.path.insert(0, str(scripts_dir))
+
+from master_registry import direct_cost_categories, load_master_frame
 
 # .env 파일 로드
 env_path = project_root / '.env'
@@ -144,7 +150,7 @@ ORDER BY a.brd_cd
 
 def load_direct_cost_master() -> Dict[str, str]:
     """
-    직접비 마스터 파일 로드: 계정명 -> 계정전환 매핑
+    직접비 마스터 파일 로드: 계정명 -> 계정전환 매핑 (master_registry 캐시 사용)
     
     Returns:
         Dict[str, str]: 계정명 -> 계정전환 매핑 딕셔너리
@@ -152,43 +158,14 @@ def load_direct_cost_master() -> Dict[str, str]:
     if not DIRECT_COST_MASTER_PATH.exists():
         raise FileNotFoundError(f"[ERROR] 직접비 마스터 파일이 없습니다: {DIRECT_COST_MASTER_PATH}")
     
-    df = pd.read_csv(DIRECT_COST_MASTER_PATH, encoding="utf-8-sig")
-    
-    # 컬럼 찾기
-    account_col = None  # 계정명 컬럼
-    conversion_col = None  # 계정전환 컬럼 (C열)
-    
-    for col in df.columns:
-        col_str = str(col).strip()
-        if account_col is None and ("계정명" in col_str or "세부" in col_str):
-            account_col = col
-        if conversion_col is None and ("계정전환" in col_str or "대분류" in col_str):
-            conversion_col = col
-    
-    if account_col is None or conversion_col is None:
-        # 기본값: 첫 번째와 세 번째 컬럼 (C열)
-        if len(df.columns) >= 3:
-            account_col, conversion_col = df.columns[1], df.columns[2]  # B열, C열
-        elif len(df.columns) >= 2:
-            account_col, conversion_col = df.columns[0], df.columns[1]
-        else:
-            raise ValueError(f"[ERROR] 직접비 마스터 컬럼을 찾을 수 없습니다. 현재 컬럼: {list(df.columns)}")
-    
-    mapping = {}
-    for _, row in df[[account_col, conversion_col]].dropna().iterrows():
-        account = str(row[account_col]).strip()
-        conversion = str(row[conversion_col]).strip()
-        if account and conversion:
-            # 유사한 이름도 매칭하기 위해 부분 매칭 지원
-            mapping[account] = conversion
-    
+    mapping = direct_cost_categories(DIRECT_COST_MASTER_PATH)
     print(f"[OK] 직접비 마스터 로드: {len(mapping)}개 매핑")
     return mapping
 
 
 def load_channel_master() -> pd.DataFrame:
     """
-    채널 마스터 파일 로드
+    채널 마스터 파일 로드 (master_registry 캐시의 복사본)
     
     Returns:
         pd.DataFrame: 채널 마스터 데이터
@@ -196,7 +173,7 @@ def load_channel_master() -> pd.DataFrame:
     if not CHANNEL_MASTER_PATH.exists():
         raise FileNotFoundError(f"[ERROR] 채널 마스터 파일이 없습니다: {CHANNEL_MASTER_PATH}")
     
-    df = pd.read_csv(CHANNEL_MASTER_PATH, encoding="utf-8-sig")
+    df = load_master_frame(CHANNEL_MASTER_PATH)
     print(f"[OK] 채널 마스터 로드: {len(df)}행")
     return df
 
@@ -423,6 +400,20 @@ def convert_and_aggregate_direct_costs(df: pd.DataFrame, dc_map: Dict[str, str])
 # 3단계: 채널명 필드 추가
 # ================================
 
+def _stripped_text(df: pd.DataFrame, col: str) -> pd.Series:
+    """
+    컬럼 값을 str(value).strip()으로 변환 (컬럼이 없으면 빈 문자열)
+
+    같은 값이 반복되는 코드/분류 컬럼이므로 고유값별로 한 번만 변환해 행에 매핑합니다.
+    (결측값은 기존 행 단위 처리와 같이 'nan')
+    """
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    codes, uniques = pd.factorize(df[col], use_na_sentinel=False)
+    texts = np.array([str(value).strip() for value in uniques], dtype=object)
+    return pd.Series(texts[codes], index=df.index, dtype=object)
+
+
 def add_channel_name(df: pd.DataFrame, channel_master: pd.DataFrame) -> pd.DataFrame:
     """
     채널명 필드 추가
@@ -467,25 +458,18 @@ def add_channel_name(df: pd.DataFrame, channel_master: pd.DataFrame) -> pd.DataF
     # 채널번호 -> 채널명 매핑
     channel_mapping = {}
     if channel_num_col and channel_name_col:
-        for _, row in channel_master[[channel_num_col, channel_name_col]].dropna().iterrows():
-            channel_num = str(row[channel_num_col]).strip()
-            channel_name = str(row[channel_name_col]).strip()
+        pairs = channel_master[[channel_num_col, channel_name_col]].dropna()
+        for channel_num, channel_name in zip(pairs[channel_num_col].astype(str).str.strip(), pairs[channel_name_col].astype(str).str.strip()):
             if channel_num and channel_name:
                 channel_mapping[channel_num] = channel_name
     
-    # 채널명 매핑 함수
-    def map_channel_name(row):
-        shop_cd = str(row.get("매장코드 (SAP기준)", "")).strip()
-        channel_cd = str(row.get("채널코드", "")).strip()
-        
-        # ① 매장코드가 SAP_CD 리스트에 있으면 'RF' 반환
-        if shop_cd in rf_customers:
-            return "RF"
-        
-        # ② 채널코드로 채널명 매핑
-        return channel_mapping.get(channel_cd, channel_cd)
+    # 채널명 매핑 (행 단위 apply 대신 고유 코드별로 한 번만 변환)
+    shop_cd = _stripped_text(df_result, "매장코드 (SAP기준)")
+    channel_cd = _stripped_text(df_result, "채널코드")
     
-    df_result["채널명"] = df_result.apply(map_channel_name, axis=1)
+    # ① 매장코드가 SAP_CD 리스트에 있으면 'RF', ② 아니면 채널코드로 채널명 매핑
+    channel_name = channel_cd.map(channel_mapping).fillna(channel_cd)
+    df_result["채널명"] = channel_name.where(~shop_cd.isin(rf_customers), "RF")
     
     # 채널명을 채널코드 옆에 위치시키기
     cols = list(df_result.columns)
@@ -538,24 +522,21 @@ def add_item_middle_category(df: pd.DataFrame) -> pd.DataFrame:
         df_result["아이템_중분류"] = ""
         return df_result
     
-    def determine_item_middle_category(row):
-        hrrc1 = str(row.get(hrrc1_col, "")).strip()
-        hrrc2 = str(row.get(hrrc2_col, "")).strip() if hrrc2_col in df_result.columns else ""
-        season = str(row.get(season_col, "")).strip() if season_col in df_result.columns else ""
-        
-        # PRDT_HRRC1_NM이 '의류'인 경우
-        if "의류" in hrrc1:
-            if season == "24F":
-                return "당시즌의류"
-            elif "25" in season:
-                return "차시즌의류"
-            else:
-                return "과시즌의류"
-        else:
-            # PRDT_HRRC1_NM이 '의류'가 아닌 경우 PRDT_HRRC2_NM 반환
-            return hrrc2 if hrrc2 else ""
-    
-    df_result["아이템_중분류"] = df_result.apply(determine_item_middle_category, axis=1)
+    hrrc1 = _stripped_text(df_result, hrrc1_col)
+    hrrc2 = _stripped_text(df_result, hrrc2_col)
+    season = _stripped_text(df_result, season_col)
+    
+    # PRDT_HRRC1_NM이 '의류'인 경우 시즌으로 구분, 아니면 PRDT_HRRC2_NM 반환
+    is_clothing = hrrc1.str.contains("의류", regex=False)
+    df_result["아이템_중분류"] = np.select(
+        [
+            is_clothing & (season == "24F"),
+            is_clothing & season.str.contains("25", regex=False),
+            is_clothing
+        ],
+        ["당시즌의류", "차시즌의류", "과시즌의류"],
+        default=hrrc2.to_numpy(dtype=object)
+    )
     
     # 아이템_중분류를 제품계층2(중분류) 옆에 위치시키기
     cols = list(df_result.columns)
@@ -1097,10 +1078,8 @@ def aggregate_by_brand_channel_with_direct_costs(df: pd.DataFrame, operating_exp
                                 print(f"    [영업비] {brand_code} 브랜드: 공통 채널 없음, 영업비 {brand_op_expense:,.0f}원으로 공통 채널 행 추가")
                 
                 # 채널명이 '공통'인 경우만 영업비_merge 값을 사용, 나머지는 0
-                df_aggregated['영업비'] = df_aggregated.apply(
-                    lambda row: row['영업비_merge'] if pd.notna(row.get('영업비_merge', 0)) and str(row.get('채널명', '')).strip() == '공통' else 0,
-                    axis=1
-                )
+                is_common = df_aggregated['영업비_merge'].notna() & (_stripped_text(df_aggregated, '채널명') == '공통')
+                df_aggregated['영업비'] = df_aggregated['영업비_merge'].where(is_common, 0) if is_common.any() else 0
                 
                 # 임시 컬럼 제거
                 if '영업비_merge' in df_aggregated.columns:
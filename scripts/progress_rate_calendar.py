@@ -0,0 +1,274 @@
+"""
+가중치 진척율 달력 (명절계수 + 요일계수, 여러 해 한 번에 계산)
+===============================================================
+
+Master/명절계수.csv와 Master/요일계수.csv로 여러 해의 일자별 계수를
+한 번에(벡터 연산) 계산하고, 월별 진척율 조회표를 만들어 둡니다.
+
+- 일자별 계수: 명절계수(적용일자 매칭) 우선, 없으면 요일계수
+- 월말계수 = 해당 월 계수 합, 진척계수 = 월 내 누적 합
+- 진척율 = 진척계수 / 월말계수
+
+캐시:
+    - 메모리: 마스터 디렉토리별 달력 1개 (같은 프로세스에서 재계산 안 함)
+    - 디스크: raw/_progress_rate_calendar/calendar.json
+      (마스터 파일 해시가 다르면 무시하고 다시 계산)
+
+사용법:
+    from progress_rate_calendar import get_progress_rate_calendar
+
+    calendar = get_progress_rate_calendar()
+    rate = calendar.progress_rate(2026, 1, 11)     # 1월 11일까지의 진척율
+    df = calendar.month_frame(2026, 1)             # 기존 CSV와 같은 형식
+
+작성일: 2026-10
+"""
+
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent
+MASTER_DIR = ROOT / "Master"
+CACHE_DIR = ROOT / "raw" / "_progress_rate_calendar"
+CACHE_FILENAME = "calendar.json"
+
+HOLIDAY_FILENAME = "명절계수.csv"
+WEEKDAY_FILENAME = "요일계수.csv"
+
+# 기존 진척율 CSV 저장 정밀도 (float_format='%.6f')
+RATE_DECIMALS = 6
+
+# 명절계수 마스터 범위 앞뒤로 여유 있게 계산할 연수
+YEAR_MARGIN = 1
+
+MONTH_COLUMNS = ['월', '일', '요일', '계수구분', '계수', '월말계수', '진척계수', '진척율']
+
+
+def _master_paths(master_dir: Path) -> Tuple[Path, Path]:
+    holiday_file = master_dir / HOLIDAY_FILENAME
+    weekday_file = master_dir / WEEKDAY_FILENAME
+    if not holiday_file.exists():
+        raise FileNotFoundError(f"명절계수 파일을 찾을 수 없습니다: {holiday_file}")
+    if not weekday_file.exists():
+        raise FileNotFoundError(f"요일계수 파일을 찾을 수 없습니다: {weekday_file}")
+    return holiday_file, weekday_file
+
+
+def master_hash(master_dir: Path = MASTER_DIR) -> str:
+    """명절계수/요일계수 마스터 파일 내용 해시 (캐시 유효성 확인용)"""
+    digest = hashlib.sha256()
+    for path in _master_paths(Path(master_dir)):
+        digest.update(path.name.encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def build_daily_coefficients(start_year: int, end_year: int,
+                             holiday_df: pd.DataFrame, weekday_dict: dict) -> pd.DataFrame:
+    """
+    start_year 1월 1일 ~ end_year 12월 31일 일자별 계수 (벡터 연산)
+
+    get_daily_coefficient()와 같은 규칙입니다.
+    (같은 적용일자가 여러 번 있으면 첫 행의 명절계수 사용)
+
+    Returns:
+        pd.DataFrame: 일자, 요일, 계수구분, 계수
+    """
+    dates = pd.date_range(f"{start_year}-01-01", f"{end_year}-12-31", freq='D')
+    weekdays = pd.Series(dates.strftime('%a'), index=dates)
+
+    holidays = holiday_df.drop_duplicates('적용일자', keep='first')
+    holiday_coef = pd.Series(holidays['명절계수'].values, index=pd.DatetimeIndex(holidays['적용일자']))
+    holiday_coef = holiday_coef.reindex(dates)
+    is_holiday = holiday_coef.notna()
+
+    weekday_coef = weekdays.map(weekday_dict)
+    missing = ~is_holiday & weekday_coef.isna()
+    if missing.any():
+        first = dates[missing.values][0]
+        raise ValueError(f"요일계수를 찾을 수 없습니다: {weekdays[first]} ({first.strftime('%Y-%m-%d')})")
+
+    return pd.DataFrame({
+        '일자': dates,
+        '요일': weekdays.values,
+        '계수구분': np.where(is_holiday, '명절', '요일'),
+        '계수': holiday_coef.where(is_holiday, weekday_coef).astype(float).values,
+    })
+
+
+class ProgressRateCalendar:
+    """
+    여러 해의 일자별 계수와 월별 진척율 조회표
+
+    Args:
+        daily: build_daily_coefficients() 결과 (일자, 요일, 계수구분, 계수)
+        source_hash: 계산에 사용한 마스터 파일 해시
+    """
+
+    def __init__(self, daily: pd.DataFrame, source_hash: str = None):
+        self.source_hash = source_hash
+        daily = daily.reset_index(drop=True)
+        dates = pd.DatetimeIndex(daily['일자'])
+        month_key = dates.year * 100 + dates.month
+
+        coef = daily['계수']
+        total = coef.groupby(month_key).transform('sum')
+        cumulative = coef.groupby(month_key).cumsum()
+
+        self.daily = daily.assign(
+            월=dates.month,
+            일=dates.day,
+            월말계수=total.values,
+            진척계수=cumulative.values,
+            진척율=(cumulative / total).values
+        )
+        self.start_year = int(dates.year.min())
+        self.end_year = int(dates.year.max())
+
+        # (연, 월) -> 일자별 진척율 배열 (index = 일 - 1)
+        rates = self.daily['진척율'].round(RATE_DECIMALS).to_numpy()
+        bounds = np.flatnonzero(np.diff(month_key.to_numpy(), prepend=-1, append=-1))
+        self._rates: Dict[Tuple[int, int], np.ndarray] = {}
+        self._rows: Dict[Tuple[int, int], slice] = {}
+        for begin, end in zip(bounds[:-1], bounds[1:]):
+            key = (int(dates.year[begin]), int(dates.month[begin]))
+            self._rates[key] = rates[begin:end]
+            self._rows[key] = slice(begin, end)
+
+    def covers(self, year: int) -> bool:
+        return self.start_year <= year <= self.end_year
+
+    def _month(self, year: int, month: int) -> Tuple[int, int]:
+        key = (int(year), int(month))
+        if key not in self._rates:
+            raise ValueError(f"진척율 달력 범위({self.start_year}~{self.end_year}년)에 {year}년 {month}월이 없습니다")
+        return key
+
+    def progress_rate(self, year: int, month: int, day: int) -> float:
+        """
+        해당 월 day일까지의 진척율 (기존 CSV와 같은 소수 6자리)
+
+        Raises:
+            ValueError: 달력 범위 밖이거나 해당 일자가 없는 경우
+        """
+        rates = self._rates[self._month(year, month)]
+        if not 1 <= day <= len(rates):
+            raise ValueError(f"진척율 달력에 {year}년 {month}월 {day}일 데이터가 없습니다")
+        return float(rates[day - 1])
+
+    def month_frame(self, year: int, month: int) -> pd.DataFrame:
+        """calculate_weighted_progress_rate()와 같은 형식의 월별 진척율 표"""
+        rows = self._rows[self._month(year, month)]
+        return self.daily.iloc[rows][MONTH_COLUMNS].reset_index(drop=True)
+
+    # ------------------------------------------------------------------
+    # 디스크 캐시
+    # ------------------------------------------------------------------
+    def save(self, path: Path):
+        """일자별 계수를 JSON으로 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'master_hash': self.source_hash,
+            'start_year': self.start_year,
+            'end_year': self.end_year,
+            '요일': self.daily['요일'].tolist(),
+            '계수구분': self.daily['계수구분'].tolist(),
+            '계수': self.daily['계수'].tolist(),
+        }
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path, expected_hash: str) -> Optional["ProgressRateCalendar"]:
+        """저장된 달력 읽기 (없거나 마스터 해시가 다르면 None)"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if payload.get('master_hash') != expected_hash:
+            return None
+        dates = pd.date_range(f"{payload['start_year']}-01-01", f"{payload['end_year']}-12-31", freq='D')
+        if len(dates) != len(payload.get('계수', [])):
+            return None
+        daily = pd.DataFrame({
+            '일자': dates,
+            '요일': payload['요일'],
+            '계수구분': payload['계수구분'],
+            '계수': payload['계수'],
+        })
+        return cls(daily, source_hash=expected_hash)
+
+
+def _load_masters(master_dir: Path) -> Tuple[pd.DataFrame, dict]:
+    """마스터 파일 로드 (calculate_weighted_progress_rate의 로더 재사용, 로그 출력 포함)"""
+    from calculate_weighted_progress_rate import load_holiday_coefficients, load_weekday_coefficients
+    return load_holiday_coefficients(master_dir), load_weekday_coefficients(master_dir)
+
+
+_calendars: Dict[str, ProgressRateCalendar] = {}
+_lock = threading.Lock()
+
+
+def get_progress_rate_calendar(year: int = None, master_dir: Path = None,
+                               cache_dir: Optional[Path] = CACHE_DIR) -> ProgressRateCalendar:
+    """
+    진척율 달력 반환 (메모리 → 디스크 캐시 → 마스터에서 계산 순)
+
+    Args:
+        year: 반드시 포함해야 하는 연도 (범위 밖이면 범위를 넓혀 다시 계산)
+        master_dir: Master 디렉토리 (기본: 프로젝트 Master)
+        cache_dir: 디스크 캐시 디렉토리 (None이면 디스크 캐시 안 함)
+
+    Raises:
+        FileNotFoundError: 마스터 파일이 없는 경우
+    """
+    master_dir = Path(master_dir) if master_dir else MASTER_DIR
+    source_hash = master_hash(master_dir)
+    memory_key = os.path.abspath(str(master_dir))
+    cache_path = Path(cache_dir) / CACHE_FILENAME if cache_dir else None
+
+    with _lock:
+        calendar = _calendars.get(memory_key)
+        if calendar is None or calendar.source_hash != source_hash:
+            calendar = ProgressRateCalendar.load(cache_path, source_hash) if cache_path else None
+        if calendar is not None and (year is None or calendar.covers(year)):
+            _calendars[memory_key] = calendar
+            return calendar
+
+        holiday_df, weekday_dict = _load_masters(master_dir)
+        years = holiday_df['적용일자'].dt.year
+        start_year = int(years.min()) - YEAR_MARGIN if len(years) else pd.Timestamp.today().year
+        end_year = int(years.max()) + YEAR_MARGIN if len(years) else pd.Timestamp.today().year
+        if calendar is not None:
+            start_year = min(start_year, calendar.start_year)
+            end_year = max(end_year, calendar.end_year)
+        if year is not None:
+            start_year = min(start_year, int(year))
+            end_year = max(end_year, int(year))
+
+        daily = build_daily_coefficients(start_year, end_year, holiday_df, weekday_dict)
+        calendar = ProgressRateCalendar(daily, source_hash=source_hash)
+        print(f"[OK] 진척율 달력 계산: {start_year}~{end_year}년 ({len(daily)}일)")
+
+        if cache_path:
+            try:
+                calendar.save(cache_path)
+            except OSError as e:
+                print(f"[WARNING] 진척율 달력 캐시 저장 실패: {e}")
+
+        _calendars[memory_key] = calendar
+        return calendar
@@ -34,20 +34,26 @@ def main():
         print("=" * 80)
         print()
     
+    # 중간 결과는 메모리로 전달하고 CSV는 마지막에 한 번 저장
+    sys.path.insert(0, str(project_root / "scripts"))
+    from csv_sink import CsvSink
+    sink = CsvSink(deferred=True)
+    
     # Step 1: KE30 Full Pipeline
     print("[Step 1/3] Running KE30 full pipeline (전처리 + 직접비 계산)...")
     from scripts.process_ke30_full_pipeline import main as run_ke30_pipeline
     try:
         if analysis_month and update_date:
             # 날짜가 지정된 경우
-            run_ke30_pipeline(analysis_month=analysis_month, update_date=update_date)
+            pipeline_result = run_ke30_pipeline(analysis_month=analysis_month, update_date=update_date, sink=sink)
         else:
             # 최신 파일 자동 선택
-            run_ke30_pipeline()
+            pipeline_result = run_ke30_pipeline(sink=sink)
     except Exception as e:
         print(f"[ERROR] KE30 full pipeline failed: {e}")
         import traceback
         traceback.print_exc()
+        sink.flush()
         return 1
     print()
     
@@ -56,6 +62,10 @@ def main():
         # 날짜가 지정된 경우 해당 날짜 사용
         date_folder = update_date
         print(f"[Step 2/3] Using specified date folder: {date_folder}")
+    elif pipeline_result:
+        # 1단계에서 처리한 업데이트일자 사용
+        date_folder = pipeline_result["update_date"]
+        print(f"[Step 2/3] Using processed date folder: {date_folder}")
     else:
         # 기존 로직: 최신 파일 찾기
         print("[Step 2/3] Finding date folder from metadata...")
@@ -80,6 +90,7 @@ def main():
         if not date_folder:
             print("[WARNING] Date folder with metadata.json not found.")
             print("Preprocessing completed.")
+            sink.flush()
             return 0
     
     print(f"Date folder found: {date_folder}")
@@ -88,20 +99,16 @@ def main():
     # Step 3: Convert KE30 to Forecast
     print("[Step 3/3] Converting KE30 to Forecast...")
     try:
-        # convert_ke30_to_forecast.py를 직접 실행
-        import subprocess
-        result = subprocess.run(
-            [sys.executable, str(project_root / "scripts" / "convert_ke30_to_forecast.py"), date_folder],
-            cwd=str(project_root),
-            capture_output=False
-        )
-        if result.returncode != 0:
-            print(f"[WARNING] KE30 to Forecast conversion failed (exit code: {result.returncode})")
+        # 같은 프로세스에서 변환 (1단계 결과를 CSV 재파싱 없이 사용)
+        from scripts.convert_ke30_to_forecast import convert_update_date
+        convert_update_date(date_folder, sink=sink)
     except Exception as e:
         print(f"[WARNING] KE30 to Forecast conversion failed: {e}")
         import traceback
         traceback.print_exc()
+        sink.flush()
     else:
+        sink.flush()
         print()
         print("=" * 80)
         print("  Complete!")
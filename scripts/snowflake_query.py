@@ -2,18 +2,43 @@
 Snowflake 쿼리 실행 스크립트 (API용)
 
 사용법:
+    # 단발 실행 (쿼리 1건 실행 후 종료)
     python scripts/snowflake_query.py "SELECT * FROM table_name LIMIT 10"
-    
+
+    # 상주 워커 (stdin/stdout JSON-lines)
+    python scripts/snowflake_query.py --worker
+
+워커 프로토콜:
+    입력 (한 줄에 하나): {"id": "1", "query": "SELECT ...", "noCache": false}
+    출력 (한 줄에 하나): {"id": "1", "success": true, "columns": [...], "data": [...], "rowCount": 10}
+    준비 완료 시 {"ready": true} 한 줄을 먼저 출력합니다.
+
+    워커는 Snowflake 연결 풀을 유지하고 (요청마다 새로 로그인하지 않음),
+    같은 읽기 전용 쿼리(SELECT/WITH) 결과를 TTL 동안 캐시합니다.
+    DML/DDL/CALL/세션 명령은 캐시하지 않고 매번 실행합니다.
+
+환경 변수:
+    SNOWFLAKE_QUERY_POOL_SIZE: 워커 연결 풀 크기 (기본 4)
+    SNOWFLAKE_QUERY_CACHE_TTL: 결과 캐시 유지 시간(초, 기본 300, 0이면 캐시 안 함)
+    SNOWFLAKE_QUERY_CACHE_SIZE: 결과 캐시 최대 건수 (기본 128)
+
 출력: JSON 형식의 쿼리 결과
 """
 
 import os
+import re
 import sys
 import json
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
 from pathlib import Path
 from dotenv import load_dotenv
 import snowflake.connector
-import pandas as pd
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
@@ -23,70 +48,311 @@ sys.path.insert(0, str(project_root))
 env_path = project_root / '.env'
 load_dotenv(env_path)
 
+
+def connect():
+    """Snowflake 연결 생성 (.env 설정 사용)"""
+    return snowflake.connector.connect(
+        account=os.getenv('SNOWFLAKE_ACCOUNT'),
+        user=os.getenv('SNOWFLAKE_USERNAME'),
+        password=os.getenv('SNOWFLAKE_PASSWORD'),
+        warehouse=os.getenv('SNOWFLAKE_WAREHOUSE'),
+        database=os.getenv('SNOWFLAKE_DATABASE'),
+        client_session_keep_alive=True
+    )
+
+
+def _json_default(value):
+    """JSON 직렬화 보조 (Decimal, 날짜 타입)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return str(value)
+
+
+def dumps_compact(result: dict) -> str:
+    """결과를 한 줄 JSON으로 직렬화 (공백 없는 구분자)"""
+    return json.dumps(result, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+
+def run_query(conn, query: str) -> dict:
+    """
+    연결에서 쿼리를 실행하고 API 응답 형식으로 변환
+
+    DataFrame을 거치지 않고 커서 결과를 바로 레코드로 변환합니다.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query)
+
+        # 컬럼명 가져오기
+        columns = [desc[0] for desc in cursor.description] if cursor.description else []
+
+        # 데이터 가져오기
+        rows = cursor.fetchall() if columns else []
+    finally:
+        cursor.close()
+
+    return {
+        'success': True,
+        'columns': columns,
+        'data': [dict(zip(columns, row)) for row in rows],
+        'rowCount': len(rows)
+    }
+
+
 def execute_query(query: str):
     """
     Snowflake 쿼리 실행 및 결과를 JSON으로 반환
-    
+
     Args:
         query: 실행할 SQL 쿼리
-        
+
     Returns:
         dict: 쿼리 결과 (JSON 형식)
     """
     conn = None
     try:
-        # Snowflake 연결
-        conn = snowflake.connector.connect(
-            account=os.getenv('SNOWFLAKE_ACCOUNT'),
-            user=os.getenv('SNOWFLAKE_USERNAME'),
-            password=os.getenv('SNOWFLAKE_PASSWORD'),
-            warehouse=os.getenv('SNOWFLAKE_WAREHOUSE'),
-            database=os.getenv('SNOWFLAKE_DATABASE')
-        )
-        
-        # 쿼리 실행
-        cursor = conn.cursor()
-        cursor.execute(query)
-        
-        # 컬럼명 가져오기
-        columns = [desc[0] for desc in cursor.description]
-        
-        # 데이터 가져오기
-        data = cursor.fetchall()
-        
-        # DataFrame 생성
-        df = pd.DataFrame(data, columns=columns)
-        
-        cursor.close()
-        conn.close()
-        
-        # JSON으로 변환
-        result = {
-            'success': True,
-            'columns': columns,
-            'data': df.to_dict('records'),
-            'rowCount': len(df)
-        }
-        
-        return result
-        
+        conn = connect()
+        return run_query(conn, query)
+
     except Exception as e:
         error_result = {
             'success': False,
             'error': str(e)
         }
         return error_result
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+class ConnectionPool:
+    """
+    Snowflake 연결 풀
+
+    연결은 필요할 때 생성하고 (최대 max_size개), 사용 후 반납해 재사용합니다.
+    쿼리 중 오류가 난 연결은 닫고 버립니다.
+    """
+
+    def __init__(self, max_size: int = 4, factory=connect):
+        self.max_size = max_size
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                create = self._created < self.max_size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    return self.factory()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            # 풀이 가득 찼으면 반납을 기다림 (버려진 연결이 있으면 다시 생성 시도)
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def release(self, conn, broken: bool = False):
+        if broken:
+            with self._lock:
+                self._created -= 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+            return
+        self._idle.put(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except Exception:
+                pass
+        with self._lock:
+            self._created = 0
+
+
+class ResultCache:
+    """쿼리 결과 캐시 (TTL + 최대 건수, 오래된 항목부터 제거)"""
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 128):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    # 캐시 대상: 읽기 전용 쿼리 (앞쪽 주석/괄호 제외 첫 키워드가 SELECT/WITH)
+    _LEADING_NOISE = re.compile(r'^(?:\s+|--[^\n]*(?:\n|$)|/\*.*?\*/|\()*', re.S)
+    _READ_ONLY = re.compile(r'(?:SELECT|WITH)\b', re.I)
+
+    @classmethod
+    def is_cacheable(cls, query: str) -> bool:
+        """읽기 전용 쿼리인지 (INSERT/UPDATE/CALL/USE 등은 캐시하지 않고 매번 실행)"""
+        body = cls._LEADING_NOISE.sub('', query, count=1)
+        return cls._READ_ONLY.match(body) is not None
+
+    @staticmethod
+    def make_key(query: str) -> str:
+        """공백 차이를 무시한 캐시 키"""
+        return ' '.join(query.split())
+
+    def get(self, query: str):
+        if self.ttl_seconds <= 0 or not self.is_cacheable(query):
+            return None
+        key = self.make_key(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, payload = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, query: str, payload: str):
+        if self.ttl_seconds <= 0 or not self.is_cacheable(query):
+            return
+        key = self.make_key(query)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class QueryService:
+    """
+    상주 쿼리 서비스 (연결 풀 + 결과 캐시)
+
+    결과는 직렬화된 JSON 문자열로 캐시하므로 캐시 적중 시 재직렬화도 하지 않습니다.
+    """
+
+    def __init__(self, pool: ConnectionPool, cache: ResultCache):
+        self.pool = pool
+        self.cache = cache
+
+    def query_json(self, query: str, use_cache: bool = True) -> str:
+        """
+        쿼리 실행 결과를 한 줄 JSON 문자열로 반환
+
+        Returns:
+            str: {"success": ..., "columns": ..., "data": ..., "rowCount": ...}
+        """
+        if use_cache:
+            cached = self.cache.get(query)
+            if cached is not None:
+                return cached
+
+        try:
+            conn = self.pool.acquire()
+        except Exception as e:
+            return dumps_compact({'success': False, 'error': str(e)})
+
+        try:
+            result = run_query(conn, query)
+        except Exception as e:
+            self.pool.release(conn, broken=self._is_connection_error(e))
+            return dumps_compact({'success': False, 'error': str(e)})
+
+        self.pool.release(conn)
+        payload = dumps_compact(result)
+        self.cache.put(query, payload)
+        return payload
+
+    @staticmethod
+    def _is_connection_error(error: Exception) -> bool:
+        """연결 자체의 문제인지 (SQL 오류는 연결을 계속 사용)"""
+        return not isinstance(error, snowflake.connector.errors.ProgrammingError)
+
+
+def run_worker(max_workers: int = None):
+    """
+    stdin/stdout JSON-lines 워커 실행
+
+    요청은 스레드 풀에서 병렬로 처리되며, 응답 순서는 완료 순서입니다 (id로 매칭).
+    """
+    pool_size = int(os.getenv('SNOWFLAKE_QUERY_POOL_SIZE', '4'))
+    service = QueryService(
+        ConnectionPool(max_size=pool_size),
+        ResultCache(
+            ttl_seconds=float(os.getenv('SNOWFLAKE_QUERY_CACHE_TTL', '300')),
+            max_entries=int(os.getenv('SNOWFLAKE_QUERY_CACHE_SIZE', '128'))
+        )
+    )
+    write_lock = threading.Lock()
+
+    def respond(request_id, payload: str):
+        # payload는 '{'로 시작하는 객체 JSON이므로 id 필드를 앞에 붙여 재직렬화를 피함
+        line = '{"id":' + json.dumps(request_id) + ',' + payload[1:]
+        with write_lock:
+            sys.stdout.write(line + '\n')
+            sys.stdout.flush()
+
+    def handle(request_id, query: str, use_cache: bool):
+        respond(request_id, service.query_json(query, use_cache=use_cache))
+
+    with write_lock:
+        sys.stdout.write(dumps_compact({'ready': True}) + '\n')
+        sys.stdout.flush()
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or pool_size)
+    try:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                respond(None, dumps_compact({'success': False, 'error': f'요청 파싱 실패: {e}'}))
+                continue
+
+            request_id = request.get('id')
+            query = request.get('query')
+            if not query:
+                respond(request_id, dumps_compact({'success': False, 'error': '쿼리가 필요합니다.'}))
+                continue
+
+            executor.submit(handle, request_id, query, not request.get('noCache', False))
+    finally:
+        executor.shutdown(wait=True)
+        service.pool.close_all()
+
 
 if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == '--worker':
+        run_worker()
+        sys.exit(0)
+
     if len(sys.argv) < 2:
         print(json.dumps({
             'success': False,
             'error': '쿼리가 필요합니다.'
         }))
         sys.exit(1)
-    
+
     query = sys.argv[1]
     result = execute_query(query)
-    print(json.dumps(result, ensure_ascii=False, indent=2))
-
-
+    print(dumps_compact(result))
@@ -0,0 +1,183 @@
+"""
+재고 분석 단일 산출물 (stock_analysis.json)
+===============================================================
+
+재고주수/판매율 데이터를 날짜별 stock_analysis.json 하나로 저장합니다.
+예전에는 거의 같은 내용의 overview_stock_analysis.json(요약 섹션 추가본)을
+따로 저장했지만, 이제 요약 섹션도 같은 파일에 두고 브랜드별/전체현황 화면은
+이 파일에서 참조로 잘라 씁니다. (복사 없음)
+
+섹션:
+    brandStockMetadata        기준 주차/시즌 정보
+    clothingBrandStatus       {브랜드코드: [의류 아이템]}      - 브랜드 뷰
+    accStockAnalysis          {브랜드코드: [ACC 아이템]}       - 브랜드 뷰
+    clothingSummary           의류 전체 요약                   - 전체현황 뷰
+    accSummary                ACC 전체 요약                    - 전체현황 뷰
+    clothingItemRatesOverall  아이템별 전체 판매율             - 전체현황 뷰
+
+생성처:
+    - export_to_json.py (brand_stock_analysis_YYYYMMDD.js 변환)
+    - generate_ai_insights.transform_api_to_stock_format (재고주수/판매율 API)
+
+사용법:
+    from stock_analysis_artifact import build_stock_analysis, load_stock_analysis, brand_view
+
+    stock = build_stock_analysis({'clothingBrandStatus': ..., 'accStockAnalysis': ...})
+    save_stock_analysis(data_dir, stock)
+    brand_stock = brand_view(load_stock_analysis(data_dir), 'M')
+
+    # 기존 overview_stock_analysis.json 정리 (요약 섹션을 stock_analysis.json으로 합친 뒤 삭제)
+    python scripts/stock_analysis_artifact.py 20260112
+    python scripts/stock_analysis_artifact.py --all
+
+작성일: 2026-10
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent
+PUBLIC_DIR = ROOT / "public"
+
+STOCK_ANALYSIS_FILE = "stock_analysis.json"
+LEGACY_OVERVIEW_FILE = "overview_stock_analysis.json"
+
+METADATA_SECTION = 'brandStockMetadata'
+BRAND_SECTIONS = ['clothingBrandStatus', 'accStockAnalysis']
+OVERVIEW_SECTIONS = ['clothingSummary', 'accSummary', 'clothingItemRatesOverall']
+
+# 파일 내 섹션 순서
+STOCK_SECTIONS = [METADATA_SECTION] + BRAND_SECTIONS + OVERVIEW_SECTIONS
+
+
+def build_stock_analysis(sections: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    섹션 묶음 → 단일 재고 분석 데이터 (섹션 순서 고정, 값은 참조 그대로)
+
+    브랜드 섹션은 없으면 빈 dict, 메타데이터/요약 섹션은 있는 것만 포함합니다.
+    그 밖의 섹션(예전 파일의 clothingBrandRates 등)은 버리지 않고 뒤에 붙입니다.
+    """
+    stock = {}
+    for name in STOCK_SECTIONS:
+        if sections.get(name) is not None:
+            stock[name] = sections[name]
+        elif name in BRAND_SECTIONS:
+            stock[name] = {}
+    for name, value in sections.items():
+        if name not in stock and value is not None:
+            stock[name] = value
+    return stock
+
+
+def brand_view(stock: Optional[Dict[str, Any]], brand_code: str) -> Dict[str, Any]:
+    """브랜드 부분만 잘라낸 뷰 (원본 리스트 참조, 해당 브랜드가 없는 섹션은 제외)"""
+    if not stock:
+        return {}
+    return {
+        name: stock[name][brand_code]
+        for name in BRAND_SECTIONS
+        if brand_code in stock.get(name, {})
+    }
+
+
+def overview_view(stock: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """전체현황 뷰 (메타데이터 + 요약 섹션, 원본 참조)"""
+    if not stock:
+        return {}
+    return {name: stock[name] for name in [METADATA_SECTION] + OVERVIEW_SECTIONS if name in stock}
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] 재고 분석 파일 읽기 실패: {path} - {e}")
+        return None
+
+
+def load_stock_analysis(data_dir) -> Optional[Dict[str, Any]]:
+    """
+    날짜 폴더의 재고 분석 데이터 로드
+
+    stock_analysis.json을 기준으로 하고, 예전 overview_stock_analysis.json이
+    남아 있으면 stock_analysis.json에 없는 섹션만 보충합니다.
+
+    Returns:
+        dict 또는 None (두 파일 모두 없는 경우)
+    """
+    data_dir = Path(data_dir)
+    stock = None
+    for filename in (STOCK_ANALYSIS_FILE, LEGACY_OVERVIEW_FILE):
+        path = data_dir / filename
+        if not path.exists():
+            continue
+        data = _read_json(path)
+        if data is None:
+            continue
+        if stock is None:
+            stock = data
+        else:
+            stock = dict(data, **stock)
+    return build_stock_analysis(stock) if stock is not None else None
+
+
+def save_stock_analysis(data_dir, stock: Dict[str, Any]) -> Path:
+    """
+    stock_analysis.json 저장 (예전 overview_stock_analysis.json은 삭제)
+
+    Returns:
+        Path: 저장된 파일 경로
+    """
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    path = data_dir / STOCK_ANALYSIS_FILE
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(build_stock_analysis(stock), f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+    legacy_path = data_dir / LEGACY_OVERVIEW_FILE
+    if legacy_path.exists():
+        legacy_path.unlink()
+        print(f"  [삭제] {legacy_path.name} (stock_analysis.json으로 통합)")
+    return path
+
+
+def dedupe_date(date_str: str) -> bool:
+    """날짜 폴더의 overview_stock_analysis.json을 stock_analysis.json으로 합침"""
+    data_dir = PUBLIC_DIR / "data" / date_str
+    if not (data_dir / LEGACY_OVERVIEW_FILE).exists():
+        return False
+    stock = load_stock_analysis(data_dir)
+    if stock is None:
+        return False
+    path = save_stock_analysis(data_dir, stock)
+    print(f"[OK] {date_str}: {path.name} ({', '.join(stock)})")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='overview_stock_analysis.json을 stock_analysis.json으로 통합')
+    parser.add_argument('date', nargs='?', help='날짜 (YYYYMMDD)')
+    parser.add_argument('--all', action='store_true', help='public/data의 모든 날짜 처리')
+    args = parser.parse_args()
+
+    if args.all:
+        dates: List[str] = sorted(p.name for p in (PUBLIC_DIR / "data").iterdir() if p.is_dir())
+    elif args.date:
+        dates = [args.date]
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+    merged = [date_str for date_str in dates if dedupe_date(date_str)]
+    print(f"[INFO] 통합 완료: {len(merged)}개 날짜")
+
+
+if __name__ == '__main__':
+    main()
@@ -20,32 +20,17 @@
 import os
 import sys
 import json
-import re
 import pandas as pd
 from typing import Dict, Optional
 from datetime import datetime
 from path_utils import get_current_year_file_path, get_plan_file_path, extract_year_month_from_date, get_previous_year_file_path, get_previous_year_month
+from artifact_store import ArtifactStore
+from numeric_utils import numeric_column
+from plan_table import load_plan_table
 
 ROOT = os.path.dirname(os.path.dirname(__file__))
 PUBLIC_DIR = os.path.join(ROOT, "public")
 
-def extract_numeric(value) -> float:
-    """숫자 문자열(콤마 포함)을 float로 변환"""
-    if pd.isna(value):
-        return 0.0
-    if isinstance(value, (int, float)):
-        return float(value)
-    # 문자열인 경우 콤마 제거
-    if isinstance(value, str):
-        value = value.replace(",", "").replace(" ", "").strip()
-        if value == "" or value == "-":
-            return 0.0
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return 0.0
-    return 0.0
-
 def load_ke30_shop_data(date_str: str) -> pd.DataFrame:
     """
     ke30 Shop 파일 로드
@@ -71,7 +56,7 @@ def load_ke30_shop_data(date_str: str) -> pd.DataFrame:
 
 def load_plan_data(year_month: str) -> pd.DataFrame:
     """
-    계획 전처리 완료 파일 로드
+    계획 전처리 완료 파일 로드 (숫자형 typed 파일 우선)
     
     Args:
         year_month: YYYYMM 형식의 연월 (예: "202511")
@@ -85,7 +70,7 @@ def load_plan_data(year_month: str) -> pd.DataFrame:
         raise FileNotFoundError(f"[ERROR] 계획 파일을 찾을 수 없습니다: {filepath}")
     
     print(f"[읽기] {filepath}")
-    df = pd.read_csv(filepath, encoding="utf-8-sig")
+    df = load_plan_table(filepath)
     print(f"  데이터: {len(df)}행 × {len(df.columns)}열")
     
     return df
@@ -225,31 +210,24 @@ def calculate_brand_kpi(date_str: str, year_month: Optional[str] = None) -> pd.D
             continue
         
         brand_str = str(brand).strip()
-        brand_df = df_shop[df_shop[brand_col] == brand]
+        brand_mask = df_shop[brand_col] == brand
         
         # 실판매액 합계
-        sales_sum = 0.0
-        for val in brand_df[sales_col]:
-            sales_sum += extract_numeric(val)
+        sales_sum = float(numeric_column(df_shop, sales_col)[brand_mask].sum())
         
         # TAG가 합계 (할인율 계산용)
         tag_sum = 0.0
         if tag_col:
-            for val in brand_df[tag_col]:
-                tag_sum += extract_numeric(val)
+            tag_sum = float(numeric_column(df_shop, tag_col)[brand_mask].sum())
         
         # 직접이익 합계
-        profit_sum = 0.0
-        for val in brand_df[profit_col]:
-            profit_sum += extract_numeric(val)
+        profit_sum = float(numeric_column(df_shop, profit_col)[brand_mask].sum())
         
         # 영업비 합계 (채널명='공통'인 경우만)
         operating_expense_sum = 0.0
         if operating_expense_col and channel_col:
-            common_df = brand_df[brand_df[channel_col].astype(str).str.strip() == '공통']
-            if not common_df.empty:
-                for val in common_df[operating_expense_col]:
-                    operating_expense_sum += extract_numeric(val)
+            common_mask = brand_mask & (df_shop[channel_col].astype(str).str.strip() == '공통')
+            operating_expense_sum = float(numeric_column(df_shop, operating_expense_col)[common_mask].sum())
         
         brand_agg[brand_str] = {
             '실판매출(현시점)': sales_sum,
@@ -323,23 +301,18 @@ def calculate_brand_kpi(date_str: str, year_month: Optional[str] = None) -> pd.D
                     continue
                 
                 brand_str = str(brand).strip()
-                brand_df = df_forecast[df_forecast[forecast_brand_col] == brand]
+                brand_mask = df_forecast[forecast_brand_col] == brand
                 
                 # 월말예상 실판매액 합계
-                forecast_sales_sum = 0.0
-                for val in brand_df[forecast_sales_col]:
-                    forecast_sales_sum += extract_numeric(val)
+                forecast_sales_sum = float(numeric_column(df_forecast, forecast_sales_col)[brand_mask].sum())
                 
                 # 월말예상 직접이익 합계
-                forecast_profit_sum = 0.0
-                for val in brand_df[forecast_profit_col]:
-                    forecast_profit_sum += extract_numeric(val)
+                forecast_profit_sum = float(numeric_column(df_forecast, forecast_profit_col)[brand_mask].sum())
                 
                 # 월말예상 TAG가 합계 (할인율 계산용)
                 forecast_tag_sum = 0.0
                 if forecast_tag_col:
-                    for val in brand_df[forecast_tag_col]:
-                        forecast_tag_sum += extract_numeric(val)
+                    forecast_tag_sum = float(numeric_column(df_forecast, forecast_tag_col)[brand_mask].sum())
                 
                 # 브랜드별 집계에 추가
                 if brand_str not in brand_agg:
@@ -372,9 +345,8 @@ def calculate_brand_kpi(date_str: str, year_month: Optional[str] = None) -> pd.D
                 # ★ 월말예상 영업비 집계 ('공통' 채널에서) ★
                 forecast_op_expense_sum = 0.0
                 if forecast_op_expense_col and forecast_channel_col:
-                    common_df = brand_df[brand_df[forecast_channel_col].astype(str).str.contains('공통', na=False)]
-                    for val in common_df[forecast_op_expense_col]:
-                        forecast_op_expense_sum += extract_numeric(val)
+                    common_mask = brand_mask & df_forecast[forecast_channel_col].astype(str).str.contains('공통', na=False)
+                    forecast_op_expense_sum = float(numeric_column(df_forecast, forecast_op_expense_col)[common_mask].sum())
                 brand_agg[brand_str]['영업비(월말예상)'] = forecast_op_expense_sum
                 
                 print(f"  {brand_str}: 월말예상 실판매출 {forecast_sales_sum:,.0f}원, 직접이익 {forecast_profit_sum:,.0f}원, 영업비 {forecast_op_expense_sum:,.0f}원")
@@ -436,31 +408,23 @@ def calculate_brand_kpi(date_str: str, year_month: Optional[str] = None) -> pd.D
                     continue
                 
                 brand_str = str(brand).strip()
-                brand_df = df_previous[df_previous[prev_brand_col] == brand]
+                brand_mask = df_previous[prev_brand_col] == brand
                 
                 # 전년 TAG매출액 합계
-                prev_tag_sum = 0.0
-                for val in brand_df[prev_tag_col]:
-                    prev_tag_sum += extract_numeric(val)
+                prev_tag_sum = float(numeric_column(df_previous, prev_tag_col)[brand_mask].sum())
                 
                 # 전년 실매출액 합계
-                prev_sales_sum = 0.0
-                for val in brand_df[prev_sales_col]:
-                    prev_sales_sum += extract_numeric(val)
+                prev_sales_sum = float(numeric_column(df_previous, prev_sales_col)[brand_mask].sum())
                 
                 # 전년 직접이익 합계
-                prev_profit_sum = 0.0
-                for val in brand_df[prev_profit_col]:
-                    prev_profit_sum += extract_numeric(val)
+                prev_profit_sum = float(numeric_column(df_previous, prev_profit_col)[brand_mask].sum())
                 
                 # 전년 영업비 합계 (채널명='공통'인 경우만)
                 prev_operating_expense_sum = 0.0
                 if prev_operating_expense_col and prev_channel_col:
                     # 채널명='공통'인 행만 필터링
-                    common_df = brand_df[brand_df[prev_channel_col].astype(str).str.strip() == '공통']
-                    if not common_df.empty and prev_operating_expense_col in common_df.columns:
-                        for val in common_df[prev_operating_expense_col]:
-                            prev_operating_expense_sum += extract_numeric(val)
+                    common_mask = brand_mask & (df_previous[prev_channel_col].astype(str).str.strip() == '공통')
+                    prev_operating_expense_sum = float(numeric_column(df_previous, prev_operating_expense_col)[common_mask].sum())
                 
                 # 브랜드별 집계에 추가
                 if brand_str not in brand_agg:
@@ -573,9 +537,9 @@ def calculate_brand_kpi(date_str: str, year_month: Optional[str] = None) -> pd.D
                 plan_operating_profit = 0.0
                 plan_operating_profit_rate = 0.0
                 
-                for _, row in plan_df.iterrows():
-                    구분 = str(row[plan_구분_col]).strip()
-                    내수합계값 = extract_numeric(row[plan_내수합계_col])
+                plan_values = numeric_column(df_plan, plan_내수합계_col)[plan_df.index]
+                for 구분, 내수합계값 in zip(plan_df[plan_구분_col], plan_values.tolist()):
+                    구분 = str(구분).strip()
                     
                     if 'TAG가' in 구분 and '[v+]' in 구분:
                         plan_tag_vp = 내수합계값
@@ -679,35 +643,28 @@ def calculate_brand_kpi(date_str: str, year_month: Optional[str] = None) -> pd.D
                 if '내수합계' in df_plan[plan_channel_col].values:
                     plan_domestic = df_plan[df_plan[plan_channel_col] == '내수합계']
                     
-                    for _, row in plan_domestic.iterrows():
-                        brand = str(row[plan_brand_col]).strip()
-                        plan_sales = extract_numeric(row[plan_sales_col])
-                        
-                        # 영업이익 가져오기
-                        plan_op_profit = 0.0
-                        if plan_operating_profit_col:
-                            plan_op_profit = extract_numeric(row[plan_operating_profit_col])
-                        
-                        # 영업이익율 가져오기
-                        plan_op_profit_rate = 0.0
-                        if plan_operating_profit_rate_col:
-                            plan_op_profit_rate = extract_numeric(row[plan_operating_profit_rate_col])
-                        
-                        # 영업비 가져오기
-                        plan_op_expense = 0.0
-                        if plan_operating_expense_col:
-                            plan_op_expense = extract_numeric(row[plan_operating_expense_col])
+                    # 숫자 컬럼은 한 번에 변환 (없는 컬럼은 0)
+                    def plan_numbers(col):
+                        if not col:
+                            return [0.0] * len(plan_domestic)
+                        return numeric_column(df_plan, col)[plan_domestic.index].tolist()
+                    
+                    plan_rows = zip(
+                        plan_domestic[plan_brand_col],
+                        plan_numbers(plan_sales_col),
+                        plan_numbers(plan_operating_profit_col),
+                        plan_numbers(plan_operating_profit_rate_col),
+                        plan_numbers(plan_operating_expense_col),
+                        plan_numbers(plan_direct_profit_col)
+                    )
+                    for brand, plan_sales, plan_op_profit, plan_op_profit_rate, plan_op_expense, plan_direct_profit_val in plan_rows:
+                        brand = str(brand).strip()
                         
                         if brand in brand_agg:
                             ke30_sales = brand_agg[brand]['실판매출(현시점)']
                             ke30_profit = brand_agg[brand]['직접이익(현시점)']
                             forecast_profit = brand_agg[brand].get('직접이익(월말예상)', 0)
                             
-                            # 직접이익 계획 가져오기
-                            plan_direct_profit_val = 0.0
-                            if plan_direct_profit_col:
-                                plan_direct_profit_val = extract_numeric(row[plan_direct_profit_col])
-                            
                             # ★ 진척율 계산: 직접이익 기준 ★
                             # 현시점 진척율 = 현시점 직접이익 / 계획 직접이익
                             if plan_direct_profit_val > 0:
@@ -986,40 +943,6 @@ def convert_to_dict_format(result_df: pd.DataFrame, brand_agg: Dict) -> Dict:
     
     return kpi_dict
 
-def load_existing_data_js(data_js_path: str) -> tuple:
-    """
-    기존 data.js 파일을 읽어서 brandKPI를 추출하고 전체 내용 반환
-    
-    Args:
-        data_js_path: data.js 파일 경로
-    
-    Returns:
-        tuple: (전체 파일 내용, 기존 brandKPI 딕셔너리 또는 None)
-    """
-    if not os.path.exists(data_js_path):
-        return None, None
-    
-    try:
-        with open(data_js_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        # brandKPI 부분 추출 (정규표현식 사용)
-        # var brandKPI = {...}; 패턴 찾기
-        pattern = r'var brandKPI = (\{.*?\});'
-        match = re.search(pattern, content, re.DOTALL)
-        
-        if match:
-            brand_kpi_str = match.group(1)
-            # JSON 파싱
-            existing_brand_kpi = json.loads(brand_kpi_str)
-            return content, existing_brand_kpi
-        else:
-            print(f"[WARNING] data.js에서 brandKPI를 찾을 수 없습니다: {data_js_path}")
-            return content, None
-    except Exception as e:
-        print(f"[WARNING] data.js 읽기 실패: {e}")
-        return None, None
-
 def merge_brand_kpi(existing_kpi: Dict, new_kpi: Dict) -> Dict:
     """
     기존 brandKPI와 새로운 brandKPI를 병합
@@ -1051,17 +974,17 @@ def merge_brand_kpi(existing_kpi: Dict, new_kpi: Dict) -> Dict:
 
 def update_data_js_with_brand_kpi(data_js_path: str, new_kpi_dict: Dict):
     """
-    data.js 파일의 brandKPI 부분을 업데이트
+    brandKPI 섹션을 업데이트 (섹션 저장소 사용, data.js 전체를 다시 쓰지 않음)
+    
+    저장소에 brandKPI가 없으면 기존 data.js에서 한 번 가져와 병합합니다.
+    JS 번들은 artifact_store.py --assemble-js 단계에서 생성합니다.
     
     Args:
-        data_js_path: data.js 파일 경로
+        data_js_path: data.js 파일 경로 (저장소 날짜 및 최초 마이그레이션용)
         new_kpi_dict: 새로운 brandKPI 딕셔너리
     """
-    # 기존 파일 읽기
-    content, existing_kpi = load_existing_data_js(data_js_path)
-    
-    if content is None:
-        raise FileNotFoundError(f"[ERROR] data.js 파일을 찾을 수 없습니다: {data_js_path}")
+    store = ArtifactStore.for_js_bundle(data_js_path)
+    existing_kpi = store.get_or_import('brandKPI', data_js_path)
     
     # brandKPI 병합
     if existing_kpi:
@@ -1071,30 +994,10 @@ def update_data_js_with_brand_kpi(data_js_path: str, new_kpi_dict: Dict):
         merged_kpi = new_kpi_dict
         print(f"[신규] brandKPI 생성")
     
-    # brandKPI 부분 교체
-    import re
-    pattern = r'var brandKPI = (\{.*?\});'
-    
-    # 새로운 brandKPI JSON 문자열 생성
-    new_brand_kpi_str = json.dumps(merged_kpi, ensure_ascii=False, indent=2)
-    
-    # 교체
-    new_content = re.sub(
-        pattern,
-        f'var brandKPI = {new_brand_kpi_str};',
-        content,
-        flags=re.DOTALL
-    )
+    store.put('brandKPI', merged_kpi)
     
-    # 파일 저장
-    os.makedirs(os.path.dirname(data_js_path), exist_ok=True)
-    with open(data_js_path, "w", encoding="utf-8") as f:
-        f.write(new_content)
-    
-    file_size = os.path.getsize(data_js_path) / 1024  # KB
-    print(f"\n[저장] {data_js_path}")
+    print(f"\n[저장] {store.section_path('brandKPI')}")
     print(f"  데이터: {len(merged_kpi)}개 브랜드")
-    print(f"  파일 크기: {file_size:.2f} KB")
 
 
 def main():
@@ -1126,11 +1029,13 @@ def main():
         # data.js 파일 경로
         data_js_path = os.path.join(PUBLIC_DIR, f"data_{date_str}.js")
         
+        # brandKPI 섹션 업데이트 (data.js 전체를 다시 쓰지 않음)
+        update_data_js_with_brand_kpi(data_js_path, kpi_dict)
+        
         # data.js가 없으면 경고
         if not os.path.exists(data_js_path):
             print(f"[WARNING] data.js 파일이 없습니다: {data_js_path}")
-            print(f"[WARNING] 먼저 create_treemap_data.py를 실행하여 data.js를 생성하세요.")
-            print(f"[INFO] 임시로 brand_kpi.js 파일을 생성합니다.")
+            print(f"[INFO] 임시로 brand_kpi.js 파일을 생성합니다. (번들 생성: artifact_store.py --assemble-js)")
             # 임시로 brand_kpi.js 생성 (하위 호환성)
             brand_kpi_js_path = os.path.join(PUBLIC_DIR, f"brand_kpi_{date_str}.js")
             with open(brand_kpi_js_path, "w", encoding="utf-8") as f:
@@ -1146,12 +1051,8 @@ def main():
                 f.write("  console.log('[Brand KPI] 브랜드별 KPI 데이터 로드 완료');\n")
                 f.write("})();\n")
             print(f"  임시 파일: {brand_kpi_js_path}")
-        else:
-            # data.js 업데이트
-            update_data_js_with_brand_kpi(data_js_path, kpi_dict)
         
         print("\n[OK] 브랜드별 KPI 계산 및 저장 완료")
-        print(f"  업데이트된 파일: {data_js_path}")
         
         # ★★★ JSON 파일로도 저장 ★★★
         json_dir = os.path.join(PUBLIC_DIR, "data", date_str)
@@ -13,44 +13,30 @@
 import os
 import sys
 import json
-import re
 import pandas as pd
 from typing import Dict, Optional
 from path_utils import get_plan_file_path, get_previous_year_file_path, extract_year_month_from_date, get_current_year_file_path
+from artifact_store import ArtifactStore
+from numeric_utils import numeric_column
+from plan_table import load_plan_table
 
 ROOT = os.path.dirname(os.path.dirname(__file__))
 PUBLIC_DIR = os.path.join(ROOT, "public")
 RAW_DIR = os.path.join(ROOT, "raw")
 
-def extract_numeric(value) -> float:
-    """숫자 문자열(콤마 포함)을 float로 변환"""
-    if pd.isna(value):
-        return 0.0
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        value = value.replace(",", "").replace(" ", "").strip()
-        if value == "" or value == "-":
-            return 0.0
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return 0.0
-    return 0.0
-
 # ============================================
 # 채널별 데이터 처리 함수들
 # ============================================
 
 def load_plan_data(year_month: str) -> pd.DataFrame:
-    """계획 전처리 완료 파일 로드"""
+    """계획 전처리 완료 파일 로드 (숫자형 typed 파일 우선)"""
     filepath = get_plan_file_path(year_month)
     
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"[ERROR] 계획 파일을 찾을 수 없습니다: {filepath}")
     
     print(f"[읽기] {filepath}")
-    df = pd.read_csv(filepath, encoding="utf-8-sig")
+    df = load_plan_table(filepath)
     print(f"  데이터: {len(df)}행 × {len(df.columns)}열")
     
     return df
@@ -146,10 +132,10 @@ def extract_channel_plan_data(df_plan: pd.DataFrame) -> Dict:
     
     result = {}
     
-    for _, row in df_plan.iterrows():
-        brand_code = str(row[brand_col]).strip()
-        channel_name = str(row[channel_col]).strip()
-        sales = extract_numeric(row[sales_col])
+    sales_values = numeric_column(df_plan, sales_col).tolist()
+    for brand_value, channel_value, sales in zip(df_plan[brand_col], df_plan[channel_col], sales_values):
+        brand_code = str(brand_value).strip()
+        channel_name = str(channel_value).strip()
         
         # 내수합계는 제외
         if channel_name == '내수합계':
@@ -249,10 +235,10 @@ def extract_channel_yoy_data(df_prev: pd.DataFrame) -> Dict:
     
     result = {}
     
-    for _, row in df_prev.iterrows():
-        brand_code = str(row[brand_col]).strip()
-        channel_name = str(row[channel_col]).strip()
-        sales = extract_numeric(row[sales_col])
+    sales_values = numeric_column(df_prev, sales_col).tolist()
+    for brand_value, channel_value, sales in zip(df_prev[brand_col], df_prev[channel_col], sales_values):
+        brand_code = str(brand_value).strip()
+        channel_name = str(channel_value).strip()
         
         # 브랜드 코드 변환
         brand_key = brand_mapping.get(brand_code, brand_code)
@@ -351,10 +337,10 @@ def extract_channel_current_data(df_forecast: pd.DataFrame) -> Dict:
     
     result = {}
     
-    for _, row in df_forecast.iterrows():
-        brand_code = str(row[brand_col]).strip()
-        channel_name = str(row[channel_col]).strip()
-        sales = extract_numeric(row[sales_col])
+    sales_values = numeric_column(df_forecast, sales_col).tolist()
+    for brand_value, channel_value, sales in zip(df_forecast[brand_col], df_forecast[channel_col], sales_values):
+        brand_code = str(brand_value).strip()
+        channel_name = str(channel_value).strip()
         
         # 브랜드 코드 변환
         brand_key = brand_mapping.get(brand_code, brand_code)
@@ -428,10 +414,10 @@ def extract_brand_total_plan_data(df_plan: pd.DataFrame) -> Dict:
     
     result = {}
     
-    for _, row in df_plan.iterrows():
-        brand_code = str(row[brand_col]).strip()
-        channel_name = str(row[channel_col]).strip()
-        sales = extract_numeric(row[sales_col])
+    sales_values = numeric_column(df_plan, sales_col).tolist()
+    for brand_value, channel_value, sales in zip(df_plan[brand_col], df_plan[channel_col], sales_values):
+        brand_code = str(brand_value).strip()
+        channel_name = str(channel_value).strip()
         
         # 내수합계만 추출
         if channel_name != '내수합계':
@@ -491,9 +477,9 @@ def extract_brand_total_item_plan_data(df_plan: pd.DataFrame) -> Dict:
     
     result = {}
     
-    for _, row in df_plan.iterrows():
-        brand_code = str(row[brand_col]).strip()
-        sales = extract_numeric(row[sales_col]) * 1000  # 1000 곱하기 (아이템 계획 파일 특성)
+    sales_values = (numeric_column(df_plan, sales_col) * 1000).tolist()  # 1000 곱하기 (아이템 계획 파일 특성)
+    for brand_value, sales in zip(df_plan[brand_col], sales_values):
+        brand_code = str(brand_value).strip()
         
         # 브랜드 코드 변환
         brand_key = brand_mapping.get(brand_code, brand_code)
@@ -623,10 +609,10 @@ def extract_item_plan_data(df_plan: pd.DataFrame) -> Dict:
     
     result = {}
     
-    for _, row in df_plan.iterrows():
-        brand_code = str(row[brand_col]).strip()
-        item_name = str(row[item_col]).strip()
-        sales = extract_numeric(row[sales_col]) * 1000  # 1000 곱하기
+    sales_values = (numeric_column(df_plan, sales_col) * 1000).tolist()  # 1000 곱하기
+    for brand_value, item_value, sales in zip(df_plan[brand_col], df_plan[item_col], sales_values):
+        brand_code = str(brand_value).strip()
+        item_name = str(item_value).strip()
         
         # 브랜드 코드 변환
         brand_key = brand_mapping.get(brand_code, brand_code)
@@ -698,10 +684,10 @@ def extract_item_yoy_data(df_prev: pd.DataFrame) -> Dict:
     
     result = {}
     
-    for _, row in df_prev.iterrows():
-        brand_code = str(row[brand_col]).strip()
-        item_name = str(row[item_col]).strip()
-        sales = extract_numeric(row[sales_col])
+    sales_values = numeric_column(df_prev, sales_col).tolist()
+    for brand_value, item_value, sales in zip(df_prev[brand_col], df_prev[item_col], sales_values):
+        brand_code = str(brand_value).strip()
+        item_name = str(item_value).strip()
         
         # 브랜드 코드 변환
         brand_key = brand_mapping.get(brand_code, brand_code)
@@ -774,10 +760,10 @@ def extract_item_current_data(df_forecast: pd.DataFrame) -> Dict:
     
     result = {}
     
-    for _, row in df_forecast.iterrows():
-        brand_code = str(row[brand_col]).strip()
-        item_name = str(row[item_col]).strip()
-        sales = extract_numeric(row[sales_col])
+    sales_values = numeric_column(df_forecast, sales_col).tolist()
+    for brand_value, item_value, sales in zip(df_forecast[brand_col], df_forecast[item_col], sales_values):
+        brand_code = str(brand_value).strip()
+        item_name = str(item_value).strip()
         
         # 브랜드 코드 변환
         brand_key = brand_mapping.get(brand_code, brand_code)
@@ -813,11 +799,9 @@ def update_data_js_with_radar_data(
     item_yoy: Dict,
     item_current: Dict
 ):
-    """data.js 파일에 채널별/아이템별 계획/전년/당년 데이터 추가"""
+    """brandKPI 섹션에 채널별/아이템별 계획/전년/당년 데이터 추가 (섹션 저장소 사용)"""
     
-    if not os.path.exists(data_js_path):
-        print(f"[WARNING] data.js 파일이 없습니다: {data_js_path}")
-        return
+    store = ArtifactStore.for_js_bundle(data_js_path)
     
     # 브랜드명 -> 브랜드 코드 매핑 (data.js에서 사용하는 코드)
     brand_name_to_code = {
@@ -829,22 +813,10 @@ def update_data_js_with_radar_data(
         'SUPRA': 'W'
     }
     
-    # 기존 파일 읽기
-    with open(data_js_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # brandKPI 객체 찾기
-    brand_kpi_match = re.search(r'var\s+brandKPI\s*=\s*({.*?});', content, re.DOTALL)
-    if not brand_kpi_match:
-        print("[WARNING] brandKPI 객체를 찾을 수 없습니다.")
-        return
-    
-    # brandKPI 객체 파싱
-    try:
-        brand_kpi_str = brand_kpi_match.group(1)
-        brand_kpi_obj = json.loads(brand_kpi_str)
-    except:
-        print("[WARNING] brandKPI 객체를 파싱할 수 없습니다.")
+    # brandKPI 섹션 읽기 (없으면 기존 data.js에서 한 번 가져옴)
+    brand_kpi_obj = store.get_or_import('brandKPI', data_js_path)
+    if not brand_kpi_obj:
+        print("[WARNING] brandKPI 섹션을 찾을 수 없습니다.")
         return
     
     # 각 브랜드에 채널별/아이템별 데이터 추가
@@ -877,19 +849,10 @@ def update_data_js_with_radar_data(
             if brand_name in item_current:
                 brand_kpi_obj[brand_code]['itemCurrent'] = item_current[brand_name]
     
-    # 파일 업데이트
-    new_brand_kpi_str = json.dumps(brand_kpi_obj, ensure_ascii=False, indent=2)
-    new_content = re.sub(
-        r'var\s+brandKPI\s*=\s*{.*?};',
-        f'var brandKPI = {new_brand_kpi_str};',
-        content,
-        flags=re.DOTALL
-    )
+    # brandKPI 섹션만 저장
+    store.put('brandKPI', brand_kpi_obj)
     
-    with open(data_js_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
-    
-    print(f"\n[저장] {data_js_path}")
+    print(f"\n[저장] {store.section_path('brandKPI')}")
     print(f"  채널별 계획 데이터: {len(channel_plan)}개 브랜드")
     print(f"  채널별 전년 데이터: {len(channel_yoy)}개 브랜드")
     print(f"  채널별 당년 데이터: {len(channel_current)}개 브랜드")
@@ -993,40 +956,8 @@ def main():
             json.dump(radar_data, f, ensure_ascii=False, indent=2)
         print(f"  ✅ JSON 저장: {json_path}")
         
-        # ★★★ weekly_trend.json에도 브랜드별 계획 데이터 추가 ★★★
-        weekly_trend_path = os.path.join(json_dir, "weekly_trend.json")
-        if os.path.exists(weekly_trend_path):
-            print(f"\n[업데이트] weekly_trend.json에 브랜드별 계획 데이터 추가...")
-            with open(weekly_trend_path, 'r', encoding='utf-8') as f:
-                weekly_trend_data = json.load(f)
-            
-            # 브랜드 코드 매핑 (MLB -> M 등)
-            brand_code_mapping = {
-                'MLB': 'M',
-                'MLB_KIDS': 'I',
-                'DISCOVERY': 'X',
-                'DUVETICA': 'V',
-                'SERGIO': 'ST',
-                'SUPRA': 'W'
-            }
-            
-            # 브랜드별 계획 데이터 추가
-            if 'byBrand' not in weekly_trend_data:
-                weekly_trend_data['byBrand'] = {}
-            
-            for brand_name, brand_code in brand_code_mapping.items():
-                if brand_code in weekly_trend_data['byBrand']:
-                    # 브랜드별 전체 계획 추가
-                    if brand_name in brand_total_plan:
-                        weekly_trend_data['byBrand'][brand_code]['totalPlan'] = brand_total_plan[brand_name]
-                        print(f"  ✓ {brand_code} ({brand_name}): 전체 계획 {brand_total_plan[brand_name]:,.0f}원 추가")
-            
-            # 파일 저장
-            with open(weekly_trend_path, 'w', encoding='utf-8') as f:
-                json.dump(weekly_trend_data, f, ensure_ascii=False, indent=2)
-            print(f"  ✅ weekly_trend.json 업데이트 완료: {weekly_trend_path}")
-        else:
-            print(f"  [WARNING] weekly_trend.json 파일을 찾을 수 없습니다: {weekly_trend_path}")
+        # 브랜드별 전체 계획(totalPlan)은 download_weekly_sales_trend.py가
+        # weekly_trend.json을 만들 때 summary.byBrand에 함께 저장
         
     except Exception as e:
         print(f"[ERROR] 처리 실패: {e}")
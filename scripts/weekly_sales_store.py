@@ -0,0 +1,198 @@
+"""
+주차별 매출 저장소 (주차 종료일 단위 파티션, 누적 저장)
+===============================================================
+
+download_weekly_sales_trend.py가 Snowflake(FNF.PRCS.DB_SH_S_W)에서 조회한
+주차별 매출을 주차 종료일(일요일)별 CSV로 쌓아 둡니다.
+
+매 실행마다 조회가 필요한 주차(저장소에 없거나 아직 확정 전인 주차)만
+조회하고, 9주(또는 N주) 분석 구간은 저장소에서 바로 읽습니다.
+
+확정 기준:
+    - 주차 종료일로부터 SETTLE_DAYS일 이상 지난 뒤 조회한 주차
+      (직후 조회한 최근 주차는 사입/반품 등이 늦게 반영되므로 다음 실행 때 다시 조회)
+    - 조회 쿼리 버전(query_version)이 현재 쿼리와 같은 주차
+
+저장 위치:
+    raw/_weekly_sales_store/weekly_sales_YYYYMMDD.csv   (YYYYMMDD = 주차 종료일)
+    - 컬럼: 브랜드, 구분(당년/전년), 종료일, 유통채널, 실판매출
+    - 전년 행의 종료일도 당년 주차 종료일 (쿼리 결과 그대로)
+    - 채널명은 저장하지 않음 (읽은 뒤 채널마스터로 매핑)
+    raw/_weekly_sales_store/_manifest.json  (주차별 조회일, 쿼리 버전)
+
+사용법:
+    from scripts.weekly_sales_store import WeeklySalesStore
+
+    store = WeeklySalesStore(query_version=version)
+    fetch_weeks = store.weeks_to_fetch(week_end_dates)   # 조회가 필요한 주차
+    store.append(df_query_result)                        # 조회 결과를 주차별로 저장
+    df = store.read(week_end_dates)                      # 분석 구간 데이터
+
+작성일: 2026-10
+"""
+
+import os
+import json
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent
+STORE_DIR = ROOT / "raw" / "_weekly_sales_store"
+MANIFEST_NAME = "_manifest.json"
+
+STORE_COLUMNS = ['브랜드', '구분', '종료일', '유통채널', '실판매출']
+
+# 주차 종료 후 이 일수 이상 지나서 조회한 데이터는 확정으로 간주
+SETTLE_DAYS = 7
+
+# CSV로 읽을 때 문자열로 유지할 컬럼 (유통채널 '01' 등 앞자리 0 보존)
+STRING_DTYPES = {'브랜드': str, '구분': str, '종료일': str, '유통채널': str}
+
+WeekEnd = Union[date, datetime, str]
+
+
+def _to_date(value: WeekEnd) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(str(value)).date()
+
+
+def _week_key(week_end: WeekEnd) -> str:
+    """주차 종료일 → 'YYYY-MM-DD'"""
+    return _to_date(week_end).strftime('%Y-%m-%d')
+
+
+def _write_atomic(path: Path, write):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class WeeklySalesStore:
+    """
+    주차 종료일별 매출 파티션 저장소
+
+    Args:
+        root_dir: 저장 디렉토리 (기본: raw/_weekly_sales_store)
+        query_version: 현재 조회 쿼리 버전 (다른 버전으로 저장된 주차는 다시 조회)
+    """
+
+    def __init__(self, root_dir: Union[str, Path] = None, query_version: Optional[str] = None):
+        self.root_dir = Path(root_dir) if root_dir else STORE_DIR
+        self.query_version = query_version
+        self._manifest: Optional[Dict[str, dict]] = None
+
+    # ------------------------------------------------------------------
+    # 매니페스트 (주차별 조회일, 쿼리 버전)
+    # ------------------------------------------------------------------
+    def manifest(self) -> Dict[str, dict]:
+        if self._manifest is None:
+            path = self.root_dir / MANIFEST_NAME
+            self._manifest = {}
+            if path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._manifest = json.load(f).get('weeks', {})
+        return self._manifest
+
+    def _save_manifest(self):
+        payload = json.dumps({'weeks': dict(sorted(self.manifest().items()))}, ensure_ascii=False, indent=2)
+        _write_atomic(self.root_dir / MANIFEST_NAME, lambda path: path.write_text(payload, encoding='utf-8'))
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def partition_path(self, week_end: WeekEnd) -> Path:
+        return self.root_dir / f"weekly_sales_{_week_key(week_end).replace('-', '')}.csv"
+
+    def has(self, week_end: WeekEnd) -> bool:
+        return _week_key(week_end) in self.manifest() and self.partition_path(week_end).exists()
+
+    def is_final(self, week_end: WeekEnd) -> bool:
+        """확정된 주차인지 (저장됨 + 종료 후 SETTLE_DAYS일 이상 지나 조회 + 같은 쿼리 버전)"""
+        if not self.has(week_end):
+            return False
+        entry = self.manifest()[_week_key(week_end)]
+        if self.query_version and entry.get('query') != self.query_version:
+            return False
+        fetched = _to_date(entry['fetched'])
+        return fetched - _to_date(week_end) >= timedelta(days=SETTLE_DAYS)
+
+    def weeks(self) -> List[str]:
+        """저장된 주차 종료일 ('YYYY-MM-DD', 오래된 순)"""
+        return sorted(key for key in self.manifest() if self.partition_path(key).exists())
+
+    def weeks_to_fetch(self, week_end_dates: Iterable[WeekEnd]) -> list:
+        """조회가 필요한 주차 (없거나 확정 전, 입력 순서 유지)"""
+        return [week_end for week_end in week_end_dates if not self.is_final(week_end)]
+
+    def read(self, week_end_dates: Iterable[WeekEnd]) -> pd.DataFrame:
+        """
+        분석 구간 주차 데이터 (저장소에 없는 주차는 제외)
+
+        Returns:
+            pd.DataFrame: STORE_COLUMNS (종료일은 'YYYY-MM-DD' 문자열)
+        """
+        frames = []
+        for week_end in week_end_dates:
+            if self.has(week_end):
+                frames.append(pd.read_csv(self.partition_path(week_end), encoding='utf-8-sig', dtype=STRING_DTYPES))
+        if not frames:
+            return pd.DataFrame(columns=STORE_COLUMNS)
+        return pd.concat(frames, ignore_index=True)[STORE_COLUMNS]
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+    def append(self, df: pd.DataFrame, fetched_on: WeekEnd = None) -> List[str]:
+        """
+        조회 결과를 주차 종료일별로 나눠 저장 (같은 주차는 교체)
+
+        조회 결과에 없는 주차는 파티션을 만들지 않습니다.
+        (아직 적재되지 않은 주차를 빈 데이터로 고정하지 않도록)
+
+        Args:
+            df: 조회 결과 (STORE_COLUMNS 포함)
+            fetched_on: 조회일 (기본: 오늘)
+
+        Returns:
+            List[str]: 저장한 주차 종료일 ('YYYY-MM-DD')
+        """
+        if df is None or df.empty:
+            return []
+        fetched = _week_key(fetched_on or date.today())
+        keys = df['종료일'].map(_week_key)
+        written = []
+        for key, week_df in df.assign(종료일=keys).groupby(keys, sort=True):
+            _write_atomic(
+                self.partition_path(key),
+                lambda path, week_df=week_df: week_df[STORE_COLUMNS].to_csv(path, index=False, encoding='utf-8-sig')
+            )
+            self.manifest()[key] = {'fetched': fetched, 'query': self.query_version, 'rows': int(len(week_df))}
+            written.append(key)
+        self._save_manifest()
+        return written
+
+    def import_csv(self, csv_path: Union[str, Path], fetched_on: WeekEnd, overwrite: bool = False) -> List[str]:
+        """
+        기존 weekly_sales_trend_YYYYMMDD.csv를 저장소로 가져오기 (최초 1회 채우기용)
+
+        가져온 데이터는 현재 쿼리 버전으로 조회한 것으로 간주합니다.
+
+        Args:
+            csv_path: 다운로드 결과 CSV (채널명 컬럼은 무시)
+            fetched_on: 해당 CSV를 조회한 날짜 (파일명의 업데이트일자)
+            overwrite: 이미 있는 주차도 덮어쓸지 여부
+
+        Returns:
+            List[str]: 가져온 주차 종료일
+        """
+        df = pd.read_csv(csv_path, encoding='utf-8-sig', dtype=STRING_DTYPES)
+        if not overwrite:
+            df = df[~df['종료일'].map(self.has)]
+        return self.append(df, fetched_on=fetched_on)
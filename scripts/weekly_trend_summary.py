@@ -0,0 +1,233 @@
+"""
+주차별 매출추세 요약 생성 (피벗 1회로 브랜드/주차/채널 집계)
+===============================================================
+
+weekly_sales_trend 데이터(브랜드, 구분, 종료일, 채널명, 실판매출)를
+브랜드 × 종료일 × 채널명 × 구분(당년/전년) 피벗 한 번으로 집계한 뒤,
+같은 피벗에서 아래 요약을 모두 만듭니다.
+
+    - summary.byBrand[브랜드].weekly / .channels   (weekly_trend.json)
+    - summary.byBrand[브랜드].channelWeekly        (weekly_trend.json, 주차별 매출추세 차트)
+    - summary.total.weekly / .channels             (weekly_trend.json)
+    - 최근 4주 주차별/누적 매출                       (overview_trend.json)
+
+weekly_trend.json에는 요약만 두고, 원본 행(rawData)은 컬럼 단위
+weekly_trend_raw.json으로 따로 저장합니다. (차트는 요약으로 그리고,
+원본 행은 행 단위 드릴다운할 때만 로드)
+브랜드별 전체 계획(totalPlan)은 저장 전에 summary.byBrand에 합칩니다.
+
+사용처:
+    - download_weekly_sales_trend.save_to_js
+    - update_overview_data (overview_trend.json)
+
+사용법:
+    from weekly_trend_summary import build_weekly_summary, build_overview_trend
+
+    summary = build_weekly_summary(df, week_end_dates, brand_total_plan)
+    raw_table = to_raw_table(df)          # weekly_trend_raw.json
+    overview_trend = build_overview_trend(summary['total']['weekly'], weeks)
+
+작성일: 2026-10
+"""
+
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+SUMMARY_INDEX = ['브랜드', '종료일', '채널명']
+SUMMARY_COLUMNS = ['당년', '전년']
+
+# weekly_trend.json에서 분리한 원본 행 파일 (weekly_trend.json의 rawDataFile)
+RAW_FILE_NAME = "weekly_trend_raw.json"
+RAW_COLUMNS = ['브랜드', '구분', '종료일', '유통채널', '채널명', '실판매출']
+
+# 계획 브랜드명 → 주차별 매출 브랜드 코드
+PLAN_BRAND_CODES = {
+    'MLB': 'M',
+    'MLB_KIDS': 'I',
+    'DISCOVERY': 'X',
+    'DUVETICA': 'V',
+    'SERGIO': 'ST',
+    'SUPRA': 'W'
+}
+
+
+def _yoy_entry(curr, prev) -> Dict:
+    """당년/전년 합계 → {'당년', '전년', 'YOY'} (전년 0이면 YOY 0)"""
+    yoy = round((curr - prev) / prev * 100, 2) if prev != 0 else 0
+    return {
+        '당년': int(curr),
+        '전년': int(prev),
+        'YOY': yoy
+    }
+
+
+def _entries(table: pd.DataFrame, keys: list, labels: list = None) -> Dict:
+    """집계 테이블에서 keys 순서대로 YOY 항목 생성 (없는 키는 0)"""
+    labels = keys if labels is None else labels
+    result = {}
+    for key, label in zip(keys, labels):
+        if key in table.index:
+            row = table.loc[key]
+            result[label] = _yoy_entry(row['당년'], row['전년'])
+        else:
+            result[label] = _yoy_entry(0, 0)
+    return result
+
+
+def week_label(end_date) -> str:
+    """주차 종료일 → 'M/D' 표시"""
+    end_date = pd.Timestamp(end_date)
+    return f"{end_date.month}/{end_date.day}"
+
+
+def build_weekly_pivot(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    브랜드 × 종료일 × 채널명 × 구분 피벗 (실판매출 합계)
+
+    Returns:
+        pd.DataFrame: index=(브랜드, 종료일 'YYYY-MM-DD', 채널명), columns=['당년', '전년']
+    """
+    data = df[SUMMARY_INDEX + ['구분', '실판매출']].assign(
+        종료일=pd.to_datetime(df['종료일'].astype(str)).dt.strftime('%Y-%m-%d')
+    )
+    pivot = data.pivot_table(
+        index=SUMMARY_INDEX,
+        columns='구분',
+        values='실판매출',
+        aggfunc='sum',
+        fill_value=0,
+        observed=True
+    )
+    return pivot.reindex(columns=SUMMARY_COLUMNS, fill_value=0)
+
+
+def _channel_weekly(pivot: pd.DataFrame, brand, channels, week_keys: list) -> Dict:
+    """브랜드의 채널별 주차 매출 {채널명: {'당년': [...], '전년': [...]}} (week_keys 순서, 없는 주차는 0)"""
+    result = {}
+    for channel in channels:
+        table = pivot.reindex([(brand, key, channel) for key in week_keys], fill_value=0)
+        result[channel] = {col: [int(value) for value in table[col]] for col in SUMMARY_COLUMNS}
+    return result
+
+
+def build_weekly_summary(df: pd.DataFrame, week_end_dates: list,
+                         brand_total_plan: Optional[Dict[str, float]] = None) -> Dict:
+    """
+    weekly_trend.json의 summary 생성
+
+    Args:
+        df: 주차별 매출 데이터 (브랜드, 구분, 종료일, 채널명, 실판매출)
+        week_end_dates: 주차 종료일 리스트 (summary.weekly의 주차 순서)
+        brand_total_plan: 브랜드별 전체 계획 {브랜드명: 원} (있으면 byBrand[코드].totalPlan)
+
+    Returns:
+        dict: {'total': {'weekly', 'channels'},
+               'byBrand': {브랜드: {'weekly', 'channels', 'channelWeekly'}}}
+              (브랜드/채널 순서는 데이터 등장 순서)
+    """
+    pivot = build_weekly_pivot(df)
+    week_keys = [pd.Timestamp(d).strftime('%Y-%m-%d') for d in week_end_dates]
+    week_labels = [week_label(d) for d in week_end_dates]
+
+    by_brand_week = pivot.groupby(level=['브랜드', '종료일']).sum()
+    by_brand_channel = pivot.groupby(level=['브랜드', '채널명']).sum()
+    by_week = pivot.groupby(level='종료일').sum()
+    by_channel = pivot.groupby(level='채널명').sum()
+
+    brand_summary = {}
+    brand_channels = df[['브랜드', '채널명']].drop_duplicates()
+    for brand, channels in brand_channels.groupby('브랜드', sort=False)['채널명']:
+        brand_summary[brand] = {
+            'weekly': _entries(by_brand_week, [(brand, key) for key in week_keys], week_labels),
+            'channels': _entries(by_brand_channel, [(brand, ch) for ch in channels], list(channels)),
+            'channelWeekly': _channel_weekly(pivot, brand, channels, week_keys)
+        }
+
+    for brand_name, total_plan in (brand_total_plan or {}).items():
+        brand_code = PLAN_BRAND_CODES.get(brand_name, brand_name)
+        if brand_code in brand_summary:
+            brand_summary[brand_code]['totalPlan'] = total_plan
+
+    total_summary = {
+        'weekly': _entries(by_week, week_keys, week_labels),
+        'channels': _entries(by_channel, list(df['채널명'].unique()))
+    }
+
+    return {
+        'total': total_summary,
+        'byBrand': brand_summary
+    }
+
+
+def to_raw_table(df: pd.DataFrame) -> Dict:
+    """
+    원본 행을 컬럼 단위 테이블로 변환 (weekly_trend_raw.json)
+
+    Returns:
+        dict: {'columns': [...], 'rowCount': n, 'data': {컬럼: [값, ...]}}
+    """
+    table = df[RAW_COLUMNS].assign(종료일=df['종료일'].astype(str))
+    return {
+        'columns': RAW_COLUMNS,
+        'rowCount': int(len(table)),
+        'data': {col: table[col].tolist() for col in RAW_COLUMNS}
+    }
+
+
+def raw_table_to_records(table: Dict) -> List[Dict]:
+    """컬럼 단위 테이블 → 행 목록 (기존 rawData 형식)"""
+    columns = table['columns']
+    return [dict(zip(columns, values)) for values in zip(*(table['data'][col] for col in columns))]
+
+
+def build_overview_trend(total_weekly: Dict, weeks: List[str], recent_weeks: int = 4) -> Dict:
+    """
+    overview_trend.json 생성 (최근 N주 주차별/누적 매출, 백만원)
+
+    Args:
+        total_weekly: build_weekly_summary()['total']['weekly']
+        weeks: 주차 표시 리스트 ('M/D', 오래된 순)
+        recent_weeks: 사용할 최근 주차 수
+    """
+    weeks = list(weeks)[-recent_weeks:]
+    weekly_current = []  # 당년 (백만원 단위)
+    weekly_prev = []     # 전년 (백만원 단위)
+    for label in weeks:
+        week_data = total_weekly.get(label, {})
+        weekly_current.append(round(week_data.get('당년', 0) / 1_000_000, 1))
+        weekly_prev.append(round(week_data.get('전년', 0) / 1_000_000, 1))
+
+    # 누적 계산 (반올림한 주차 값 기준)
+    cumulative_current = []
+    cumulative_prev = []
+    cum_current = 0
+    cum_prev = 0
+    for current, prev in zip(weekly_current, weekly_prev):
+        cum_current += current
+        cum_prev += prev
+        cumulative_current.append(round(cum_current, 1))
+        cumulative_prev.append(round(cum_prev, 1))
+
+    return {
+        'weeks': weeks,
+        'weekly_current': weekly_current,
+        'weekly_prev': weekly_prev,
+        'cumulative_current': cumulative_current,
+        'cumulative_prev': cumulative_prev
+    }
+
+
+def split_raw_data(weekly_trend: Dict):
+    """
+    기존 weekly_trend 데이터(rawData 포함)를 요약/원본 테이블로 분리
+
+    Returns:
+        tuple: (rawData를 뺀 weekly_trend, 컬럼 단위 원본 테이블 또는 None)
+    """
+    rows = weekly_trend.get('rawData')
+    if not isinstance(rows, list):
+        return weekly_trend, None
+    slim = {key: value for key, value in weekly_trend.items() if key != 'rawData'}
+    slim['rawDataFile'] = RAW_FILE_NAME
+    return slim, to_raw_table(pd.DataFrame(rows).reindex(columns=RAW_COLUMNS))